@@ -25,6 +25,10 @@ def get_agent_config_loader(request: Request) -> 'AgentConfigLoader':
     """FastAPI dependency that provides the AgentConfigLoader from app state."""
     return request.app.state.agent_config_loader
 
+def get_batch_runner(request: Request) -> 'BatchJobRunner':
+    """FastAPI dependency that provides the BatchJobRunner from app state."""
+    return request.app.state.batch_runner
+
 def get_heygen_client(request: Request) -> 'HeyGenStreamingClient':
     """FastAPI dependency that provides the HeyGenStreamingClient from app state."""
     return request.app.state.heygen_client
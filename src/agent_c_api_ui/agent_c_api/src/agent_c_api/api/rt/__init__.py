@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request
 from .session import router as sessions_router
 from .file import router as file_router
+from .batch import router as batch_router
 
 def get_agent_manager(request: Request) -> 'RealtimeSessionManager':
     return request.app.state.realtime_manager
@@ -8,4 +9,5 @@ def get_agent_manager(request: Request) -> 'RealtimeSessionManager':
 router = APIRouter(tags=["rt"])
 router.include_router(sessions_router)
 router.include_router(sessions_router)
-router.include_router(file_router)
\ No newline at end of file
+router.include_router(file_router)
+router.include_router(batch_router)
\ No newline at end of file
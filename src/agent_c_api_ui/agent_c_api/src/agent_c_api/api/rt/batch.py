@@ -0,0 +1,94 @@
+from typing import Optional, List, TYPE_CHECKING
+
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+
+from agent_c.util.logging_utils import LoggingManager
+from agent_c_api.api.dependencies import get_batch_runner
+from agent_c_api.core.batch.models import BatchJob, BatchJobRequest, BatchJobProgress, BatchJobItemsResponse, BatchRunnerStats
+from agent_c_api.core.util.jwt import validate_request_jwt
+
+if TYPE_CHECKING:
+    from agent_c_api.core.batch.runner import BatchJobRunner
+
+
+router = APIRouter(prefix="/batch")
+logger = LoggingManager(__name__).get_logger()
+
+
+async def _job_for_user(runner: "BatchJobRunner", job_id: str, user_id: str) -> BatchJob:
+    job = await runner.store.get_job(job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail=f"Batch job '{job_id}' not found")
+    return job
+
+
+@router.post("/jobs", response_model=BatchJob)
+async def create_batch_job(job_request: BatchJobRequest, request: Request,
+                           runner: "BatchJobRunner" = Depends(get_batch_runner)) -> BatchJob:
+    """
+    Queue a batch job that runs an agent over each of the supplied inputs.
+    """
+    user_info = await validate_request_jwt(request)
+    try:
+        request.app.state.agent_config_loader.duplicate(job_request.agent_key)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Agent '{job_request.agent_key}' not found")
+
+    return await runner.submit(user_info['user_id'], job_request)
+
+
+@router.get("/jobs", response_model=List[BatchJob])
+async def list_batch_jobs(request: Request,
+                          limit: int = Query(50, ge=1, le=500),
+                          offset: int = Query(0, ge=0),
+                          runner: "BatchJobRunner" = Depends(get_batch_runner)) -> List[BatchJob]:
+    """
+    List the current user's batch jobs, newest first.
+    """
+    user_info = await validate_request_jwt(request)
+    return await runner.store.list_jobs(user_info['user_id'], limit=limit, offset=offset)
+
+
+@router.get("/jobs/{job_id}", response_model=BatchJobProgress)
+async def get_batch_job(job_id: str, request: Request,
+                        runner: "BatchJobRunner" = Depends(get_batch_runner)) -> BatchJobProgress:
+    """
+    Get the progress of a batch job.
+    """
+    user_info = await validate_request_jwt(request)
+    await _job_for_user(runner, job_id, user_info['user_id'])
+    return await runner.progress(job_id)
+
+
+@router.get("/jobs/{job_id}/items", response_model=BatchJobItemsResponse)
+async def get_batch_job_items(job_id: str, request: Request,
+                              status: Optional[str] = None,
+                              limit: int = Query(100, ge=1, le=1000),
+                              offset: int = Query(0, ge=0),
+                              runner: "BatchJobRunner" = Depends(get_batch_runner)) -> BatchJobItemsResponse:
+    """
+    Page through the checkpointed items and results of a batch job.
+    """
+    user_info = await validate_request_jwt(request)
+    await _job_for_user(runner, job_id, user_info['user_id'])
+    return await runner.store.get_items(job_id, status=status, limit=limit, offset=offset)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=BatchJob)
+async def cancel_batch_job(job_id: str, request: Request,
+                           runner: "BatchJobRunner" = Depends(get_batch_runner)) -> BatchJob:
+    """
+    Cancel the remaining items of a batch job.
+    """
+    user_info = await validate_request_jwt(request)
+    await _job_for_user(runner, job_id, user_info['user_id'])
+    return await runner.cancel(job_id)
+
+
+@router.get("/stats", response_model=BatchRunnerStats)
+async def get_batch_stats(request: Request, runner: "BatchJobRunner" = Depends(get_batch_runner)) -> BatchRunnerStats:
+    """
+    Get runner-wide throughput statistics.
+    """
+    await validate_request_jwt(request)
+    return runner.stats()
@@ -152,10 +152,14 @@ class GetUserSessionsEvent(BaseEvent):
     """
     Event to request a list of user chat sessions.
 
-    This event does not require any additional data.
+    Attributes:
+        offset (int): Number of sessions to skip, ignored when a cursor is given
+        limit (int): Maximum number of sessions to return
+        cursor (Optional[str]): The next_cursor of a previous response, to get the page after it
     """
     offset: int = 0
     limit: int = 50
+    cursor: Optional[str] = None
 
 class GetUserSessionsResponseEvent(BaseEvent):
     """
@@ -204,6 +208,15 @@ class SetSessionMessagesEvent(BaseEvent):
     """
     messages: List[dict[str, Any]] = Field(default_factory=list, description="New list of messages in the session")
 
+class GetSessionHistoryEvent(BaseEvent):
+    """
+    Event to request the entire message history of the current chat session.
+
+    Sent by clients whose copy of the history is out of step with the `history`
+    events they receive, which only carry what changed since the version before.
+    """
+    pass
+
 class SetAgentVoiceEvent(BaseEvent):
     """
     Event to set the voice for the current agent.
@@ -1,17 +1,19 @@
-from typing import Optional, Dict, Any, TYPE_CHECKING
+import asyncio
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 
 from agent_c_api.models.realtime_session import RealtimeSession
-from fastapi import APIRouter, HTTPException, Depends, WebSocket, Request, Form
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, Request, Form, Query
 from fastapi.responses import JSONResponse
 
 
 from agent_c.util import MnemonicSlugs
 from agent_c.util.logging_utils import LoggingManager
-from agent_c_api.api.dependencies import get_auth_service, get_heygen_client
+from agent_c_api.api.dependencies import get_auth_service, get_heygen_client, get_chat_session_manager
 from agent_c_api.core.util.jwt import validate_request_jwt, create_jwt_token, verify_jwt_token
 from agent_c_api.models.auth_models import UserLoginRequest, RealtimeLoginResponse, LoginResponse
 
 if TYPE_CHECKING:
+    from agent_c.chat.session_manager import ChatSessionManager
     from agent_c.util.heygen_streaming_avatar_client import HeyGenStreamingClient
     from agent_c_api.core.services.auth_service import AuthService
     from agent_c_api.core.realtime_session_manager import RealtimeSessionManager
@@ -124,3 +126,28 @@ async def cancel_chat(request: Request, ui_session_id: str = Form(...)):
         "status": "success",
         "message": f"Cancellation signal sent for session: {ui_session_id}"
     })
+
+
+@router.get("/sessions/{session_id}/messages", response_model=List[Dict[str, Any]])
+async def get_session_messages(session_id: str, request: Request,
+                               offset: int = Query(0, description="Index of the first message, negative counts from the end"),
+                               limit: int = Query(50, ge=1, le=500),
+                               chat_session_manager: "ChatSessionManager" = Depends(get_chat_session_manager)) -> List[Dict[str, Any]]:
+    """
+    Page through the messages of one of the user's chat sessions.
+
+    Only the requested messages are read from storage, so clients can show
+    the end of a long session, or scroll back through it, without it being
+    loaded.  Stored image, document and audio payloads are put back in place
+    of their blob references.
+    """
+    user_info = await validate_request_jwt(request)
+    if not user_info:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # Reads the session file when the session isn't cached, keep that off the event loop
+    messages = await asyncio.to_thread(chat_session_manager.get_session_messages, session_id, user_info['user_id'],
+                                       offset=offset, limit=limit)
+    if messages is None:
+        raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
+    return messages
@@ -35,13 +35,17 @@ async def stream_events(
     session_id: str,
     event_types: Optional[List[EventType]] = Query(None, description="Filter by event types"),
     real_time: bool = Query(False, description="Replay events with original timing"),
-    speed_factor: float = Query(1.0, description="Speed multiplier for real-time replay")
+    speed_factor: float = Query(1.0, description="Speed multiplier for real-time replay"),
+    start_interaction: Optional[str] = Query(None, description="Start the replay at this interaction"),
+    start_time: Optional[str] = Query(None, description="Start the replay at this timestamp"),
+    max_gap_seconds: Optional[float] = Query(None, description="Longest pause between events in real-time replay")
 ):
     """
     Stream events for a specific session, optionally in real-time.
     """
     return StreamingResponse(
-        event_service.stream_events(session_id, event_types, real_time, speed_factor),
+        event_service.stream_events(session_id, event_types, real_time, speed_factor,
+                                    start_interaction, start_time, max_gap_seconds),
         media_type="text/event-stream"
     )
 
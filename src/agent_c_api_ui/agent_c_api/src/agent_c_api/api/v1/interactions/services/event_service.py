@@ -1,16 +1,15 @@
 import os
-import glob
 import json
-import asyncio
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from fastapi import BackgroundTasks
 from agent_c_api.api.v1.interactions.interaction_models.event_model import Event, EventType
-from agent_c_api.api.v1.interactions.utils.file_utils import read_jsonl_file, get_session_directory
+from agent_c.util.event_log_replay import EventLogReplay
+from agent_c_api.api.v1.interactions.utils.file_utils import query_session_events, get_session_directory, to_log_timestamp
 
 class EventService:
     def __init__(self):
-        self.active_replays = {}  # session_id -> replay state
+        self.active_replays: Dict[str, EventLogReplay] = {}  # session_id -> most recent replay
 
     async def get_events(
             self,
@@ -29,11 +28,6 @@ class EventService:
         if not os.path.isdir(session_dir):
             return []
 
-        # Find all JSONL files for this session
-        jsonl_files = glob.glob(os.path.join(session_dir, "*.jsonl"))
-        if not jsonl_files:
-            return []
-
         # Parse datetime filters if provided
         start_datetime = None
         if start_time:
@@ -43,54 +37,13 @@ class EventService:
         if end_time:
             end_datetime = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
 
-        # Collect and filter events
+        # Filter through the session index and read only the matching events
         all_events = []
-        event_count = 0
-
-        for file_path in jsonl_files:
-            file_events = await read_jsonl_file(file_path)
-
-            for event_data in file_events:
-                # Skip if we've reached the limit
-                if event_count >= limit:
-                    break
-
-                # Extract event type and timestamp
-                event_type_str = event_data.get("event", {}).get("type")
-                if not event_type_str:
-                    continue
-
-                # Filter by event type if specified
-                if event_types and EventType(event_type_str) not in event_types:
-                    continue
-
-                # Parse timestamp
-                timestamp_str = event_data.get("timestamp")
-                if not timestamp_str:
-                    continue
-
-                timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-
-                # Filter by time range if specified
-                if start_datetime and timestamp < start_datetime:
-                    continue
-
-                if end_datetime and timestamp > end_datetime:
-                    continue
-
-                # Create Event object
-                event_obj = self._create_event_object(event_data)
-                if event_obj:
-                    all_events.append(event_obj)
-                    event_count += 1
-
-                # Check if we've reached the limit
-                if event_count >= limit:
-                    break
-
-            # Check if we've reached the limit
-            if event_count >= limit:
-                break
+        event_type_names = [event_type.value for event_type in (event_types or EventType)]
+        for event_data in await query_session_events(session_dir, event_type_names, start_datetime, end_datetime, limit):
+            event_obj = self._create_event_object(event_data)
+            if event_obj:
+                all_events.append(event_obj)
 
         # Sort events by timestamp
         all_events.sort(key=lambda x: x.timestamp)
@@ -101,62 +54,46 @@ class EventService:
             session_id: str,
             event_types: Optional[List[EventType]],
             real_time: bool,
-            speed_factor: float
+            speed_factor: float,
+            start_interaction: Optional[str] = None,
+            start_time: Optional[str] = None,
+            max_gap_seconds: Optional[float] = None
     ):
         """
         Stream events for a session, optionally with real-time timing.
-        """
-        # Get all events first
-        all_events = await self.get_events(session_id, event_types, None, None, 10000)
 
-        if not all_events:
+        The replay seeks through the session index to its starting point and reads the log a page at a
+        time as the client consumes events, so it starts immediately however long the session is.
+        """
+        session_dir = os.path.join(get_session_directory(), session_id)
+        if not os.path.isdir(session_dir):
             yield json.dumps({"error": "No events found"})
             return
 
-        # Initialize replay state
-        self.active_replays[session_id] = {
-            "status": "playing",
-            "current_index": 0,
-            "total_events": len(all_events),
-            "real_time": real_time,
-            "speed_factor": speed_factor
-        }
-
-        # Stream events
-        prev_timestamp = None
-
-        for i, event in enumerate(all_events):
-            # Check if replay was stopped or paused
-            replay_state = self.active_replays.get(session_id, {})
-            if replay_state.get("status") == "stopped":
-                break
-
-            if replay_state.get("status") == "paused":
-                while replay_state.get("status") == "paused":
-                    await asyncio.sleep(0.1)
-                    replay_state = self.active_replays.get(session_id, {})
-                    if replay_state.get("status") == "stopped":
-                        break
-
-            # Update current index
-            self.active_replays[session_id]["current_index"] = i
-
-            # Calculate delay if in real-time mode
-            if real_time and prev_timestamp:
-                time_diff = (event.timestamp - prev_timestamp).total_seconds()
-                adjusted_delay = time_diff / speed_factor
-                if adjusted_delay > 0:
-                    await asyncio.sleep(adjusted_delay)
-
-            # Send event
+        start_datetime = datetime.fromisoformat(start_time.replace("Z", "+00:00")) if start_time else None
+        replay = EventLogReplay(
+            session_dir,
+            event_types=[event_type.value for event_type in (event_types or EventType)],
+            start_interaction=start_interaction,
+            start_time=to_log_timestamp(start_datetime),
+            real_time=real_time,
+            speed_factor=speed_factor,
+            max_gap_seconds=max_gap_seconds
+        )
+        self.active_replays[session_id] = replay
+
+        sent = 0
+        async for event_data in replay:
+            event = self._create_event_object(event_data)
+            if event is None:
+                continue
+            sent += 1
             yield f"data: {json.dumps(event.model_dump(mode='json'))}\n\n"
 
-            prev_timestamp = event.timestamp
+        if not sent:
+            yield json.dumps({"error": "No events found"})
+            return
 
-        # Cleanup when done
-        if session_id in self.active_replays:
-            self.active_replays[session_id]["status"] = "completed"
-            
         # Send a properly formatted end message to prevent parsing errors
         yield f"data: {json.dumps({"type": "stream_complete", "message": "Event stream complete"})}\n\n"
 
@@ -164,7 +101,8 @@ class EventService:
         """
         Get the current status of a session replay.
         """
-        return self.active_replays.get(session_id)
+        replay = self.active_replays.get(session_id)
+        return replay.status().to_dict() if replay else None
 
     async def control_replay(
             self,
@@ -175,39 +113,33 @@ class EventService:
     ) -> bool:
         """
         Control a session replay (play, pause, stop, seek).
+
+        A seek position is either a timestamp or the id of an interaction to replay from.
         """
-        if session_id not in self.active_replays:
+        replay = self.active_replays.get(session_id)
+        if replay is None:
             return False
 
         if action == "play":
-            self.active_replays[session_id]["status"] = "playing"
+            replay.resume()
             return True
 
         elif action == "pause":
-            self.active_replays[session_id]["status"] = "paused"
+            replay.pause()
             return True
 
         elif action == "stop":
-            self.active_replays[session_id]["status"] = "stopped"
+            replay.stop()
             return True
 
         elif action == "seek" and position:
-            # Seek to a specific timestamp
             try:
                 target_timestamp = datetime.fromisoformat(position.replace("Z", "+00:00"))
-
-                # Get all events
-                events = await self.get_events(session_id, None, None, None, 10000)
-
-                # Find the closest event
-                for i, event in enumerate(events):
-                    if event.timestamp >= target_timestamp:
-                        self.active_replays[session_id]["current_index"] = i
-                        return True
-
-                return False
-            except:
-                return False
+            except ValueError:
+                replay.seek(interaction_id=position)
+            else:
+                replay.seek(timestamp=to_log_timestamp(target_timestamp))
+            return True
 
         return False
 
@@ -1,8 +1,13 @@
 import os
 import json
-from typing import List, Dict, Any
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence
 import aiofiles
 
+from agent_c.util.event_log_index import EventLogIndex
+from agent_c.util.event_log_segments import session_segment_files
+
 
 def get_session_directory() -> str:
     """
@@ -32,4 +37,52 @@ async def read_jsonl_file(file_path: str) -> List[Dict[str, Any]]:
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
 
-    return events
\ No newline at end of file
+    return events
+
+
+def list_session_log_files(session_dir: str) -> List[str]:
+    """
+    List the event log segments of a session in event order, sealed (compressed) segments included.
+    """
+    return [str(path) for path in session_segment_files(session_dir)]
+
+
+async def get_session_summary(session_dir: str) -> Dict[str, Any]:
+    """
+    Event count, first/last timestamps, per-type counts and segment files for a session, answered from its index.
+    """
+    def summarize():
+        with EventLogIndex(session_dir) as index:
+            index.catch_up()
+            summary = index.summary()
+        summary["files"] = [path.name for path in session_segment_files(session_dir)]
+        return summary
+
+    return await asyncio.to_thread(summarize)
+
+
+def to_log_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """
+    Convert a datetime to the naive local ISO format the event logs are written and indexed with.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
+async def query_session_events(session_dir: str, event_types: Optional[Sequence[str]] = None,
+                               start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                               limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Read the events of a session that match the filters, using its index to seek directly to them.
+    """
+    def query():
+        with EventLogIndex(session_dir) as index:
+            index.catch_up()
+            rows = index.query(event_types=event_types, start_time=to_log_timestamp(start_time),
+                               end_time=to_log_timestamp(end_time), limit=limit, offset=offset)
+            return index.read(rows)
+
+    return await asyncio.to_thread(query)
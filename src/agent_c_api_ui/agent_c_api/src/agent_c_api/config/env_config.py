@@ -72,6 +72,19 @@ class Settings(BaseSettings):
     SESSION_CLEANUP_INTERVAL: int = 60 * 60  # 1 hour
     SESSION_CLEANUP_BATCH_SIZE: int = 100
 
+    # In-memory chat session cache, sessions are flushed to disk before they are evicted
+    SESSION_CACHE_MAX_SESSIONS: int = 256
+    SESSION_CACHE_MAX_MB: int = 512
+    SESSION_CACHE_TTL: int = 60 * 60  # Evict sessions idle for an hour
+    SESSION_WRITE_DELAY: float = 2.0  # Coalesce saves of a session within this many seconds, 0 to save on every flush
+    SESSION_BLOB_GC_INTERVAL: int = 6 * 60 * 60  # Delete image / file payloads no session references this often, 0 to never
+
+    # Headless batch jobs
+    BATCH_DB_PATH: str = "agent_c_config/batch_jobs.db"
+    BATCH_CONCURRENCY: int = 4     # Number of items processed at once
+    BATCH_MAX_ATTEMPTS: int = 3    # Attempts per item before it is marked failed
+    BATCH_RETRY_BACKOFF: float = 2.0  # Seconds before a failed item is retried, doubling per attempt
+
     # Feature Flags
     USE_REDIS_SESSIONS: bool = True
 
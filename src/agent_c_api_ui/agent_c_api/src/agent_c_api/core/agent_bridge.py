@@ -16,6 +16,7 @@ from agent_c_api.api.rt.models.control_events import ErrorEvent, SessionMetadata
 from agent_c_api.config.env_config import settings
 from agent_c.models.input.file_input import FileInput
 from agent_c.agents.base import BaseAgent, ChatSession
+from agent_c.chat.history_sync import HistorySync
 from agent_c_api.core.file_handler import FileHandler
 from agent_c.models.input.image_input import ImageInput
 from agent_c_tools.tools.think.prompt import ThinkSection
@@ -118,6 +119,7 @@ class AgentBridge:
 
         self.debug_event = None
         self.session_manager = session_manager
+        self.history_sync = HistorySync()
 
 
         # Tool Chest, Cache, and Setup
@@ -151,7 +153,7 @@ class AgentBridge:
 
         auth_info = agent_config.agent_params.auth.model_dump() if agent_config.agent_params.auth is not None else  {}
         client = runtime_cls.client(**auth_info)
-        return runtime_cls(model_name=model_config["id"], client=client)
+        return runtime_cls(model_name=model_config["id"], client=client, blob_store=self.session_manager.blob_store)
 
 
     def __init_events(self) -> None:
@@ -364,7 +366,8 @@ class AgentBridge:
         agent_params |= {
             "prompt_builder": prompt_builder,
             "tool_chest": self.tool_chest,
-            "streaming_callback": self.streaming_callback_with_logging
+            "streaming_callback": self.streaming_callback_with_logging,
+            "blob_store": self.session_manager.blob_store
         }
 
         self.logger.info(f"Agent initialized using the following parameters: {agent_params}")
@@ -782,24 +785,29 @@ class AgentBridge:
         """
         Handle history events which update the chat log.
         
-        Updates the chat session with new message history and flushes
-        the session to persistent storage.
+        Applies the messages that changed to the chat session and flushes
+        the session to persistent storage.  The payload carries only what
+        changed, unless the session's messages were replaced since the
+        last history event.
         
         Args:
             event: Session event containing message history.
             
         Returns:
-            str: JSON-formatted history payload.
+            str: JSON-formatted history payload, see `HistoryEvent` for its fields.
             
         Raises:
             Exception: If session flushing fails.
         """
-        self.chat_session.messages = event.messages
+        self.chat_session.messages, event = self.history_sync.apply(event, self.chat_session.messages)
         await self.session_manager.flush(self.chat_session.session_id, self.chat_session.user_id)
         
         payload = json.dumps({
             "type": "history",
-            "messages": event.messages,
+            "messages": await self.session_manager.inflate_messages(event.messages),
+            "version": event.version,
+            "base_version": event.base_version,
+            "keep": event.keep,
             "vendor": self.runtime_for_agent(self.chat_session.agent_config).tool_format,
             "model_name": self.chat_session.agent_config.agent_params.model_name,
         }) + "\n"
@@ -1050,6 +1058,7 @@ class AgentBridge:
                 tool_params = self.tool_chest.get_inference_data(self.chat_session.agent_config.tools, agent_runtime.tool_format)
                 tool_params['schemas'] = self.chat_session.agent_config.filter_allowed_tools(tool_params['schemas'])
                 tool_params["toolsets"] = self.chat_session.agent_config.tools
+                tool_params["tool_index"] = self.chat_session.agent_config.tool_index
 
             if self.sections is not None:
                 agent_sections = self.sections
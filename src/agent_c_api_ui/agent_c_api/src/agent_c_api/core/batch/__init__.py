@@ -0,0 +1,3 @@
+from agent_c_api.core.batch.models import BatchJob, BatchJobItem, BatchJobRequest, BatchJobProgress, BatchJobItemsResponse, BatchRunnerStats
+from agent_c_api.core.batch.job_store import BatchJobStore
+from agent_c_api.core.batch.runner import BatchJobRunner, BatchItemExecutor
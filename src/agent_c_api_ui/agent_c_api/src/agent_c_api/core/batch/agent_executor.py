@@ -0,0 +1,125 @@
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+from agent_c.models.agent_config import CurrentAgentConfiguration
+from agent_c.prompting import PromptBuilder, EnvironmentInfoSection
+from agent_c.prompting.basic_sections.persona import DynamicPersonaSection
+from agent_c.util.logging_utils import LoggingManager
+from agent_c_api.core.batch.models import BatchJob, BatchJobItem
+from agent_c_tools.tools.think.prompt import ThinkSection
+
+if TYPE_CHECKING:
+    from agent_c_api.core.realtime_session_manager import RealtimeSessionManager
+
+
+class HeadlessBridge:
+    """
+    Stands in for the realtime bridge in the tool context of a batch item.
+
+    Tools report status to the user through the bridge; with no client
+    connected those messages are written to the log instead.
+    """
+
+    def __init__(self, job_id: str, item_index: int):
+        self.job_id = job_id
+        self.item_index = item_index
+        self.logger = LoggingManager(__name__).get_logger()
+
+    async def send_system_message(self, content: str, severity: str = "info") -> None:
+        self.logger.info(f"Batch {self.job_id}:{self.item_index} system message ({severity}): {content}")
+
+    async def send_error(self, message: str, source: Optional[str] = None) -> None:
+        self.logger.warning(f"Batch {self.job_id}:{self.item_index} error from {source or 'unknown'}: {message}")
+
+
+class AgentBatchExecutor:
+    """
+    Runs batch items as agent one-shots using the user's runtime cache entry.
+
+    The tool chest, model clients and workspaces are shared with the user's
+    interactive sessions, so a batch job sees the same tools and credentials
+    as a chat would.
+    """
+
+    def __init__(self, realtime_manager: 'RealtimeSessionManager'):
+        self.realtime_manager = realtime_manager
+        self.logger = LoggingManager(__name__).get_logger()
+
+    async def __call__(self, job: BatchJob, item: BatchJobItem) -> str:
+        agent_config = self._agent_config(job)
+        runtime_cache = await self.realtime_manager.create_user_runtime_cache_entry(job.user_id)
+        agent_runtime = runtime_cache.runtime_for_agent(agent_config)
+        session_id = f"batch-{job.job_id}-{item.item_index}"
+
+        prompt_metadata = {"session_id": session_id, "persona_prompt": agent_config.persona,
+                           "agent_config": agent_config, "user_session_id": session_id,
+                           "parent_session_id": None, "timestamp": datetime.now().isoformat()}
+        prompt_metadata |= (agent_config.prompt_metadata or {}) | job.prompt_metadata
+
+        client_wants_cancel = threading.Event()
+        tool_context = {'active_agent': agent_config,
+                        'bridge': HeadlessBridge(job.job_id, item.item_index),
+                        'parent_session_id': None,
+                        'user_session_id': session_id,
+                        'user_id': job.user_id,
+                        'session_id': session_id,
+                        'client_wants_cancel': client_wants_cancel,
+                        'env_name': os.getenv('ENV_NAME', 'development'),
+                        'streaming_callback': None,
+                        'prompt_metadata': prompt_metadata}
+
+        if "ThinkTools" in agent_config.tools:
+            agent_sections = [ThinkSection(), EnvironmentInfoSection(), DynamicPersonaSection()]
+        else:
+            agent_sections = [EnvironmentInfoSection(), DynamicPersonaSection()]
+
+        chat_params: Dict[str, Any] = {"user_id": job.user_id, "prompt_metadata": prompt_metadata,
+                                       "output_format": 'raw', "client_wants_cancel": client_wants_cancel,
+                                       "tool_chest": runtime_cache.tool_chest,
+                                       "prompt_builder": PromptBuilder(sections=agent_sections),
+                                       "session_id": session_id, "user_session_id": session_id,
+                                       "tool_context": tool_context}
+
+        tool_params = {}
+        if len(agent_config.tools):
+            await runtime_cache.tool_chest.initialize_toolsets(agent_config.tools)
+            tool_params = runtime_cache.tool_chest.get_inference_data(agent_config.tools, agent_runtime.tool_format)
+            tool_params['schemas'] = agent_config.filter_allowed_tools(tool_params['schemas'])
+            tool_params["toolsets"] = agent_config.tools
+            tool_params["tool_index"] = agent_config.tool_index
+
+        agent_params = agent_config.agent_params.model_dump(exclude_none=True)
+        if "model_name" not in agent_params:
+            agent_params["model_name"] = agent_config.model_id
+
+        try:
+            messages = await agent_runtime.one_shot(user_message=item.input, **(chat_params | tool_params | agent_params))
+        finally:
+            # Each item runs in a session of its own that is never used again
+            runtime_cache.tool_chest.clear_loaded_tools(session_id)
+        if not messages:
+            raise RuntimeError("Agent returned no messages")
+
+        return self._response_text(messages)
+
+    def _agent_config(self, job: BatchJob) -> CurrentAgentConfiguration:
+        try:
+            agent_config = self.realtime_manager.agent_config_loader.duplicate(job.agent_key)
+        except ValueError:
+            raise ValueError(f"Agent '{job.agent_key}' not found") from None
+
+        if job.tools is not None:
+            agent_config.tools = job.tools
+
+        return agent_config
+
+    @staticmethod
+    def _response_text(messages: List[Dict[str, Any]]) -> str:
+        content = messages[-1].get('content', '')
+        if isinstance(content, str):
+            return content
+
+        return "\n".join(block.get('text', '') for block in content
+                         if isinstance(block, dict) and block.get('type') == 'text')
@@ -0,0 +1,391 @@
+"""
+SQLite backed storage for headless batch jobs.
+
+Every item of a job is its own row so that progress is checkpointed as each
+input finishes; a restarted server picks up where the previous one stopped.
+"""
+import asyncio
+import datetime
+import json
+import uuid
+from pathlib import Path
+from typing import Optional, List, Dict, Iterable
+
+from sqlalchemy import String, Text, Integer, Index, select, update, func, event, insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from agent_c.util.logging_utils import LoggingManager
+from agent_c_api.core.batch.models import BatchJob, BatchJobItem, BatchJobRequest, BatchJobItemsResponse
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class BatchJobRecord(Base):
+    """
+    SQLAlchemy table model for batch jobs.
+    """
+    __tablename__ = "batch_jobs"
+
+    job_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    agent_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    tools: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    prompt_metadata: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    total_items: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[str] = mapped_column(String(32), nullable=False)
+    started_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    finished_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
+    __table_args__ = (
+        Index("idx_batch_job_user_created", "user_id", "created_at"),
+    )
+
+
+class BatchJobItemRecord(Base):
+    """
+    SQLAlchemy table model for the individual inputs of a batch job.
+    """
+    __tablename__ = "batch_job_items"
+
+    item_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    item_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    input: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    output: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    started_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    completed_at: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+
+    __table_args__ = (
+        Index("idx_batch_item_job_index", "job_id", "item_index"),
+        Index("idx_batch_item_job_status", "job_id", "status"),
+        Index("idx_batch_item_status", "status", "item_id"),
+    )
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat()
+
+
+class BatchJobStore:
+    """
+    Persists batch jobs and their items in a SQLite database.
+
+    Items are claimed one at a time in FIFO order, their results are written
+    as soon as they finish, and items left running by a crashed or stopped
+    process are returned to the queue by `recover_interrupted`.
+    """
+
+    def __init__(self, db_path: str = "agent_c_config/batch_jobs.db"):
+        self.db_path = db_path
+        self.logger = LoggingManager(__name__).get_logger()
+        self._engine = None
+        self._async_session_factory = None
+        self._claim_lock = asyncio.Lock()
+
+    @property
+    def engine(self):
+        """Get the async SQLAlchemy engine, creating it if necessary."""
+        if self._engine is None:
+            self._engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+            event.listen(self._engine.sync_engine, "connect", self._configure_connection)
+        return self._engine
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, _connection_record) -> None:
+        # WAL lets the API read progress while the workers are writing checkpoints
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    @property
+    def async_session_factory(self):
+        """Get the async session factory, creating it if necessary."""
+        if self._async_session_factory is None:
+            self._async_session_factory = async_sessionmaker(
+                bind=self.engine,
+                class_=AsyncSession,
+                expire_on_commit=False
+            )
+        return self._async_session_factory
+
+    async def initialize_database(self) -> None:
+        """
+        Create the database file and tables if they do not exist.
+        """
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        self.logger.info(f"Initialized batch job database at {self.db_path}")
+
+    async def close_database(self) -> None:
+        """
+        Dispose of the database engine.
+        """
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+            self._async_session_factory = None
+
+    async def create_job(self, user_id: str, request: BatchJobRequest) -> BatchJob:
+        """
+        Persist a new job and all of its items.
+
+        Args:
+            user_id: The user submitting the job
+            request: The job definition
+
+        Returns:
+            The newly created job
+        """
+        job = BatchJob(job_id=str(uuid.uuid4()), user_id=user_id, agent_key=request.agent_key,
+                       tools=request.tools, prompt_metadata=request.prompt_metadata,
+                       total_items=len(request.inputs))
+
+        async with self.async_session_factory() as db_session:
+            db_session.add(BatchJobRecord(job_id=job.job_id, user_id=job.user_id, agent_key=job.agent_key,
+                                          tools=json.dumps(job.tools) if job.tools is not None else None,
+                                          prompt_metadata=json.dumps(job.prompt_metadata),
+                                          status=job.status, total_items=job.total_items,
+                                          created_at=job.created_at))
+            await db_session.execute(insert(BatchJobItemRecord),
+                                     [{"job_id": job.job_id, "item_index": index, "input": text,
+                                       "status": "pending", "attempts": 0}
+                                      for index, text in enumerate(request.inputs)])
+            await db_session.commit()
+
+        self.logger.info(f"Created batch job {job.job_id} with {job.total_items} items for user {user_id}")
+        return job
+
+    async def recover_interrupted(self) -> int:
+        """
+        Return items left in the running state by a previous process to the queue.
+
+        Returns:
+            The number of items requeued
+        """
+        async with self.async_session_factory() as db_session:
+            result = await db_session.execute(update(BatchJobItemRecord)
+                                              .where(BatchJobItemRecord.status == "running")
+                                              .values(status="pending", started_at=None))
+            await db_session.commit()
+
+        if result.rowcount:
+            self.logger.info(f"Requeued {result.rowcount} interrupted batch items")
+        return result.rowcount or 0
+
+    async def claim_next_item(self) -> Optional[BatchJobItem]:
+        """
+        Claim the oldest pending item of any active job.
+
+        Returns:
+            The claimed item, now marked running, or None if the queue is empty
+        """
+        async with self._claim_lock:
+            async with self.async_session_factory() as db_session:
+                stmt = (select(BatchJobItemRecord)
+                        .join(BatchJobRecord, BatchJobRecord.job_id == BatchJobItemRecord.job_id)
+                        .where(BatchJobItemRecord.status == "pending",
+                               BatchJobRecord.status.in_(("queued", "running")))
+                        .order_by(BatchJobItemRecord.item_id)
+                        .limit(1))
+                record = (await db_session.execute(stmt)).scalar_one_or_none()
+                if record is None:
+                    return None
+
+                now = _now()
+                record.status = "running"
+                record.attempts += 1
+                record.started_at = now
+                await db_session.execute(update(BatchJobRecord)
+                                         .where(BatchJobRecord.job_id == record.job_id,
+                                                BatchJobRecord.status == "queued")
+                                         .values(status="running", started_at=now))
+                await db_session.commit()
+                return self._item_from_record(record)
+
+    async def complete_item(self, item: BatchJobItem, output: str) -> None:
+        """
+        Checkpoint the successful result of an item.
+
+        Args:
+            item: The item that finished
+            output: The agent's final response
+        """
+        await self._finish_item(item, status="completed", output=output, error=None)
+
+    async def fail_item(self, item: BatchJobItem, error: str, max_attempts: int) -> bool:
+        """
+        Record a failed attempt, requeueing the item if it has attempts left.
+
+        Only items still marked running are updated, so an item whose job was
+        cancelled while it waited to retry stays cancelled.
+
+        Args:
+            item: The item that failed
+            error: Description of the failure
+            max_attempts: The maximum number of attempts per item
+
+        Returns:
+            True if the item was requeued, False if it failed permanently
+        """
+        if item.attempts < max_attempts:
+            async with self.async_session_factory() as db_session:
+                await db_session.execute(update(BatchJobItemRecord)
+                                         .where(BatchJobItemRecord.item_id == item.item_id,
+                                                BatchJobItemRecord.status == "running")
+                                         .values(status="pending", error=error, started_at=None))
+                await db_session.commit()
+            return True
+
+        await self._finish_item(item, status="failed", output=None, error=error)
+        return False
+
+    async def release_item(self, item: BatchJobItem) -> None:
+        """
+        Return an item to the queue without counting the attempt, used when a worker is stopped mid-item.
+        """
+        async with self.async_session_factory() as db_session:
+            await db_session.execute(update(BatchJobItemRecord)
+                                     .where(BatchJobItemRecord.item_id == item.item_id,
+                                            BatchJobItemRecord.status == "running")
+                                     .values(status="pending", started_at=None,
+                                             attempts=BatchJobItemRecord.attempts - 1))
+            await db_session.commit()
+
+    async def _finish_item(self, item: BatchJobItem, status: str, output: Optional[str], error: Optional[str]) -> None:
+        now = _now()
+        async with self.async_session_factory() as db_session:
+            await db_session.execute(update(BatchJobItemRecord)
+                                     .where(BatchJobItemRecord.item_id == item.item_id,
+                                            BatchJobItemRecord.status == "running")
+                                     .values(status=status, output=output, error=error, completed_at=now))
+            remaining = (await db_session.execute(
+                select(func.count()).select_from(BatchJobItemRecord)
+                .where(BatchJobItemRecord.job_id == item.job_id,
+                       BatchJobItemRecord.status.in_(("pending", "running"))))).scalar_one()
+            if remaining == 0:
+                await db_session.execute(update(BatchJobRecord)
+                                         .where(BatchJobRecord.job_id == item.job_id,
+                                                BatchJobRecord.status.in_(("queued", "running")))
+                                         .values(status="completed", finished_at=now))
+            await db_session.commit()
+
+    async def cancel_job(self, job_id: str, backoff_item_ids: Iterable[int] = ()) -> Optional[BatchJob]:
+        """
+        Cancel a job; pending items are cancelled, items already running are allowed to finish.
+
+        Args:
+            job_id: The job to cancel
+            backoff_item_ids: Items the runner holds in retry backoff. They are still marked
+                running but are not executing, so they are cancelled along with the pending items.
+
+        Returns:
+            The updated job or None if it does not exist
+        """
+        now = _now()
+        async with self.async_session_factory() as db_session:
+            result = await db_session.execute(update(BatchJobRecord)
+                                              .where(BatchJobRecord.job_id == job_id,
+                                                     BatchJobRecord.status.in_(("queued", "running")))
+                                              .values(status="cancelled", finished_at=now))
+            if result.rowcount:
+                await db_session.execute(update(BatchJobItemRecord)
+                                         .where(BatchJobItemRecord.job_id == job_id,
+                                                BatchJobItemRecord.status == "pending")
+                                         .values(status="cancelled", completed_at=now))
+                backoff_item_ids = list(backoff_item_ids)
+                if backoff_item_ids:
+                    await db_session.execute(update(BatchJobItemRecord)
+                                             .where(BatchJobItemRecord.job_id == job_id,
+                                                    BatchJobItemRecord.item_id.in_(backoff_item_ids),
+                                                    BatchJobItemRecord.status == "running")
+                                             .values(status="cancelled", started_at=None, completed_at=now))
+            await db_session.commit()
+
+        return await self.get_job(job_id)
+
+    async def get_job(self, job_id: str) -> Optional[BatchJob]:
+        """
+        Load a job along with its completed and failed item counts.
+        """
+        async with self.async_session_factory() as db_session:
+            record = await db_session.get(BatchJobRecord, job_id)
+            if record is None:
+                return None
+            counts = await self._status_counts(db_session, job_id)
+
+        return self._job_from_record(record, counts)
+
+    async def get_status_counts(self, job_id: str) -> Dict[str, int]:
+        """
+        Count the items of a job by status.
+        """
+        async with self.async_session_factory() as db_session:
+            return await self._status_counts(db_session, job_id)
+
+    @staticmethod
+    async def _status_counts(db_session: AsyncSession, job_id: str) -> Dict[str, int]:
+        stmt = (select(BatchJobItemRecord.status, func.count())
+                .where(BatchJobItemRecord.job_id == job_id)
+                .group_by(BatchJobItemRecord.status))
+        return {status: count for status, count in (await db_session.execute(stmt)).all()}
+
+    async def list_jobs(self, user_id: str, limit: int = 50, offset: int = 0) -> List[BatchJob]:
+        """
+        List a user's jobs, newest first.
+        """
+        async with self.async_session_factory() as db_session:
+            stmt = (select(BatchJobRecord)
+                    .where(BatchJobRecord.user_id == user_id)
+                    .order_by(BatchJobRecord.created_at.desc())
+                    .offset(offset).limit(limit))
+            records = (await db_session.execute(stmt)).scalars().all()
+            return [self._job_from_record(record, await self._status_counts(db_session, record.job_id))
+                    for record in records]
+
+    async def get_items(self, job_id: str, status: Optional[str] = None,
+                        limit: int = 100, offset: int = 0) -> BatchJobItemsResponse:
+        """
+        Page through the items of a job in input order.
+        """
+        async with self.async_session_factory() as db_session:
+            conditions = [BatchJobItemRecord.job_id == job_id]
+            if status is not None:
+                conditions.append(BatchJobItemRecord.status == status)
+
+            total = (await db_session.execute(select(func.count()).select_from(BatchJobItemRecord)
+                                              .where(*conditions))).scalar_one()
+            stmt = (select(BatchJobItemRecord).where(*conditions)
+                    .order_by(BatchJobItemRecord.item_index)
+                    .offset(offset).limit(limit))
+            records = (await db_session.execute(stmt)).scalars().all()
+
+        return BatchJobItemsResponse(items=[self._item_from_record(record) for record in records],
+                                     total_items=total, offset=offset)
+
+    @staticmethod
+    def _job_from_record(record: BatchJobRecord, counts: Dict[str, int]) -> BatchJob:
+        return BatchJob(job_id=record.job_id, user_id=record.user_id, agent_key=record.agent_key,
+                        tools=json.loads(record.tools) if record.tools else None,
+                        prompt_metadata=json.loads(record.prompt_metadata) if record.prompt_metadata else {},
+                        status=record.status, total_items=record.total_items,
+                        completed_items=counts.get("completed", 0), failed_items=counts.get("failed", 0),
+                        created_at=record.created_at, started_at=record.started_at,
+                        finished_at=record.finished_at)
+
+    @staticmethod
+    def _item_from_record(record: BatchJobItemRecord) -> BatchJobItem:
+        return BatchJobItem(item_id=record.item_id, job_id=record.job_id, item_index=record.item_index,
+                            input=record.input, status=record.status, attempts=record.attempts,
+                            output=record.output, error=record.error, started_at=record.started_at,
+                            completed_at=record.completed_at)
+
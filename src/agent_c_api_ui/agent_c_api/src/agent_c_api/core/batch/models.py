@@ -0,0 +1,86 @@
+import datetime
+
+from typing import Optional, List, Dict, Any, Literal
+from pydantic import Field
+
+from agent_c.models.base import BaseModel
+
+
+BatchJobStatus = Literal["queued", "running", "completed", "cancelled"]
+BatchItemStatus = Literal["pending", "running", "completed", "failed", "cancelled"]
+
+
+class BatchJobRequest(BaseModel):
+    """
+    A request to run an agent over a list of inputs without an interactive session.
+    """
+    agent_key: str = Field(..., description="Key of the agent configuration to run each input through")
+    inputs: List[str] = Field(..., min_length=1, description="The user messages to process, one agent one-shot per input")
+    tools: Optional[List[str]] = Field(None, description="Toolset names to use instead of the agent's configured tools")
+    prompt_metadata: Dict[str, Any] = Field(default_factory=dict, description="Extra prompt metadata merged over the agent's own")
+
+
+class BatchJob(BaseModel):
+    """
+    The persisted state of a batch job.
+    """
+    job_id: str = Field(..., description="Unique identifier for the batch job")
+    user_id: str = Field(..., description="The user that submitted the job")
+    agent_key: str = Field(..., description="Key of the agent configuration used for the job")
+    tools: Optional[List[str]] = Field(None, description="Toolset override for the job, if any")
+    prompt_metadata: Dict[str, Any] = Field(default_factory=dict, description="Extra prompt metadata for the job")
+    status: BatchJobStatus = Field("queued", description="The current status of the job")
+    total_items: int = Field(0, description="Number of inputs in the job")
+    completed_items: int = Field(0, description="Number of inputs processed successfully")
+    failed_items: int = Field(0, description="Number of inputs that failed after all attempts")
+    created_at: str = Field(default_factory=lambda: datetime.datetime.now().isoformat())
+    started_at: Optional[str] = Field(None, description="When the first item of the job was started")
+    finished_at: Optional[str] = Field(None, description="When the last item of the job finished")
+
+
+class BatchJobItem(BaseModel):
+    """
+    A single input of a batch job and its checkpointed result.
+    """
+    item_id: int = Field(..., description="Store identifier for the item")
+    job_id: str = Field(..., description="The job this item belongs to")
+    item_index: int = Field(..., description="Position of the input within the job")
+    input: str = Field(..., description="The user message for this item")
+    status: BatchItemStatus = Field("pending", description="The current status of the item")
+    attempts: int = Field(0, description="Number of times the item has been started")
+    output: Optional[str] = Field(None, description="The agent's final response text")
+    error: Optional[str] = Field(None, description="The last error raised while processing the item")
+    started_at: Optional[str] = Field(None, description="When the latest attempt started")
+    completed_at: Optional[str] = Field(None, description="When the item reached a final state")
+
+
+class BatchJobProgress(BaseModel):
+    """
+    Progress and throughput for a single batch job.
+    """
+    job: BatchJob = Field(..., description="The job being reported on")
+    pending_items: int = Field(0, description="Items waiting for a worker")
+    running_items: int = Field(0, description="Items currently being processed")
+    items_per_minute: float = Field(0.0, description="Finished items per minute since the job started")
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until the job finishes, if it can be estimated")
+
+
+class BatchJobItemsResponse(BaseModel):
+    """
+    A page of batch job items.
+    """
+    items: List[BatchJobItem] = Field(default_factory=list, description="The items in this page")
+    total_items: int = Field(0, description="Total number of items matching the query")
+    offset: int = Field(0, description="The offset used in the query")
+
+
+class BatchRunnerStats(BaseModel):
+    """
+    Runner-wide throughput statistics.
+    """
+    workers: int = Field(..., description="Number of worker tasks")
+    active_items: int = Field(0, description="Items currently being processed by the workers")
+    completed_items: int = Field(0, description="Items finished successfully since the runner started")
+    failed_items: int = Field(0, description="Items that failed permanently since the runner started")
+    items_per_minute: float = Field(0.0, description="Items finished per minute over the trailing throughput window")
+    average_item_seconds: Optional[float] = Field(None, description="Mean processing time of the items in the throughput window")
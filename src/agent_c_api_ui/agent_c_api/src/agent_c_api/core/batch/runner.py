@@ -0,0 +1,237 @@
+import asyncio
+import datetime
+import time
+from collections import deque
+from typing import Optional, Protocol, List, Deque, Tuple
+
+from agent_c.util.logging_utils import LoggingManager
+from agent_c_api.core.batch.job_store import BatchJobStore
+from agent_c_api.core.batch.models import BatchJob, BatchJobItem, BatchJobRequest, BatchJobProgress, BatchRunnerStats
+
+
+class BatchItemExecutor(Protocol):
+    """
+    Runs a single batch item and returns the agent's response text.
+    """
+    async def __call__(self, job: BatchJob, item: BatchJobItem) -> str: ...
+
+
+class BatchJobRunner:
+    """
+    Processes queued batch items with a fixed pool of worker tasks.
+
+    Each item is claimed from the store, handed to the executor and its result
+    checkpointed before the worker moves on, so stopping the runner (or losing
+    the process) never costs more than the items that were in flight.
+
+    A failed item with attempts left is requeued after an exponential backoff
+    of `retry_backoff` seconds, doubling per attempt up to `MAX_RETRY_BACKOFF`.
+    It stays claimed while it waits, so the worker is free to move on.
+    """
+
+    THROUGHPUT_WINDOW_SECONDS = 300
+    MAX_RETRY_BACKOFF = 60.0
+
+    def __init__(self, store: BatchJobStore, executor: BatchItemExecutor, concurrency: int = 4,
+                 max_attempts: int = 3, poll_interval: float = 5.0, retry_backoff: float = 2.0):
+        self.store = store
+        self.executor = executor
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.poll_interval = poll_interval
+        self.retry_backoff = max(0.0, retry_backoff)
+        self.logger = LoggingManager(__name__).get_logger()
+        self._workers: List[asyncio.Task] = []
+        self._wake_event = asyncio.Event()
+        self._in_flight: dict[int, BatchJobItem] = {}
+        self._retrying: dict[int, Tuple[asyncio.Task, BatchJobItem, str]] = {}
+        self._finished: Deque[Tuple[float, float]] = deque()
+        self._completed_count = 0
+        self._failed_count = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """
+        Requeue interrupted items and start the worker tasks.
+        """
+        if self.running:
+            return
+
+        await self.store.recover_interrupted()
+        self._workers = [asyncio.create_task(self._worker(index), name=f"batch-worker-{index}")
+                         for index in range(self.concurrency)]
+        self.logger.info(f"Batch runner started with {self.concurrency} workers")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers, returning any in-flight items to the queue.
+
+        Items waiting out a retry backoff are requeued straight away.
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        for item in list(self._in_flight.values()):
+            await self.store.release_item(item)
+        self._in_flight.clear()
+
+        retrying, self._retrying = self._retrying, {}
+        for task, _, _ in retrying.values():
+            task.cancel()
+        await asyncio.gather(*(task for task, _, _ in retrying.values()), return_exceptions=True)
+        for _, item, error in retrying.values():
+            await self.store.fail_item(item, error, self.max_attempts)
+        self.logger.info("Batch runner stopped")
+
+    async def submit(self, user_id: str, request: BatchJobRequest) -> BatchJob:
+        """
+        Persist a new job and wake the workers.
+        """
+        job = await self.store.create_job(user_id, request)
+        self._wake_event.set()
+        return job
+
+    async def cancel(self, job_id: str) -> Optional[BatchJob]:
+        """
+        Cancel a job, including any of its items waiting out a retry backoff.
+        """
+        backoff = [item_id for item_id, (_, item, _) in self._retrying.items() if item.job_id == job_id]
+        job = await self.store.cancel_job(job_id, backoff)
+        if job is not None and job.status == "cancelled":
+            for item_id in backoff:
+                retry = self._retrying.pop(item_id, None)
+                if retry is not None:
+                    retry[0].cancel()
+        return job
+
+    async def progress(self, job_id: str) -> Optional[BatchJobProgress]:
+        """
+        Report progress for a job, including its throughput and an estimated time to completion.
+        """
+        job = await self.store.get_job(job_id)
+        if job is None:
+            return None
+
+        counts = await self.store.get_status_counts(job_id)
+        pending = counts.get("pending", 0)
+        running = counts.get("running", 0)
+        finished = job.completed_items + job.failed_items
+
+        items_per_minute = 0.0
+        eta_seconds = None
+        if job.started_at and finished:
+            elapsed = self._elapsed_seconds(job.started_at, job.finished_at)
+            if elapsed > 0:
+                items_per_minute = finished / elapsed * 60
+                if pending or running:
+                    eta_seconds = (pending + running) / (items_per_minute / 60)
+
+        return BatchJobProgress(job=job, pending_items=pending, running_items=running,
+                                items_per_minute=round(items_per_minute, 3),
+                                eta_seconds=round(eta_seconds, 1) if eta_seconds is not None else None)
+
+    def stats(self) -> BatchRunnerStats:
+        """
+        Report runner-wide throughput over the trailing window.
+        """
+        now = time.monotonic()
+        self._trim_window(now)
+        items_per_minute = 0.0
+        average = None
+        if self._finished:
+            window = min(self.THROUGHPUT_WINDOW_SECONDS, max(now - self._finished[0][0], 1.0))
+            items_per_minute = len(self._finished) / window * 60
+            average = sum(duration for _, duration in self._finished) / len(self._finished)
+
+        return BatchRunnerStats(workers=len(self._workers), active_items=len(self._in_flight),
+                                completed_items=self._completed_count, failed_items=self._failed_count,
+                                items_per_minute=round(items_per_minute, 3),
+                                average_item_seconds=round(average, 3) if average is not None else None)
+
+    @staticmethod
+    def _elapsed_seconds(start: str, end: Optional[str]) -> float:
+        started = datetime.datetime.fromisoformat(start)
+        ended = datetime.datetime.fromisoformat(end) if end else datetime.datetime.now()
+        return (ended - started).total_seconds()
+
+    def _trim_window(self, now: float) -> None:
+        while self._finished and now - self._finished[0][0] > self.THROUGHPUT_WINDOW_SECONDS:
+            self._finished.popleft()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                item = await self.store.claim_next_item()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.exception(f"Batch worker {index} failed to claim an item: {e}")
+                item = None
+
+            if item is None:
+                self._wake_event.clear()
+                try:
+                    await asyncio.wait_for(self._wake_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._process(item)
+
+    async def _process(self, item: BatchJobItem) -> None:
+        self._in_flight[item.item_id] = item
+        start = time.monotonic()
+        try:
+            job = await self.store.get_job(item.job_id)
+            output = await self.executor(job, item)
+        except asyncio.CancelledError:
+            # stop() releases in-flight items back to the queue
+            raise
+        except Exception as e:
+            self._in_flight.pop(item.item_id, None)
+            self.logger.warning(f"Batch item {item.job_id}:{item.item_index} failed on attempt {item.attempts}: {e}")
+            error = f"{type(e).__name__}: {e}"
+            if item.attempts < self.max_attempts and self.retry_backoff > 0:
+                task = asyncio.create_task(self._requeue_later(item, error, self.retry_delay(item.attempts)))
+                self._retrying[item.item_id] = (task, item, error)
+                return
+
+            requeued = await self.store.fail_item(item, error, self.max_attempts)
+            if requeued:
+                self._wake_event.set()
+            else:
+                self._failed_count += 1
+                self._record_finish(start)
+            return
+
+        self._in_flight.pop(item.item_id, None)
+        await self.store.complete_item(item, output)
+        self._completed_count += 1
+        self._record_finish(start)
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        Seconds to wait before requeueing an item that has failed `attempts` times.
+        """
+        return min(self.retry_backoff * 2 ** max(attempts - 1, 0), self.MAX_RETRY_BACKOFF)
+
+    async def _requeue_later(self, item: BatchJobItem, error: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._retrying.pop(item.item_id, None)
+        try:
+            await self.store.fail_item(item, error, self.max_attempts)
+        except Exception as e:
+            # The item is still marked running, recover_interrupted will requeue it on the next start
+            self.logger.exception(f"Failed to requeue batch item {item.job_id}:{item.item_index}: {e}")
+            return
+        self._wake_event.set()
+
+    def _record_finish(self, start: float) -> None:
+        now = time.monotonic()
+        self._finished.append((now, now - start))
+        self._trim_window(now)
@@ -5,7 +5,8 @@ from agent_c.models.events.chat import AudioInputDeltaEvent
 from agent_c_api.api.rt.models.control_events import GetAgentsEvent, GetAvatarsEvent, TextInputEvent, SetAvatarEvent, SetAgentEvent, SetAvatarSessionEvent, ResumeChatSessionEvent, \
     NewChatSessionEvent, SetAgentVoiceEvent, GetUserSessionsEvent, PingEvent, PongEvent, \
     GetToolCatalogEvent, GetVoicesEvent, DeleteChatSessionEvent, ClientWantsCancelEvent, SetAgentToolsEvent
-from agent_c_api.api.rt.models.control_events import SetChatSessionNameEvent, SetSessionMessagesEvent, SetSessionMetadataEvent
+from agent_c_api.api.rt.models.control_events import SetChatSessionNameEvent, SetSessionMessagesEvent, SetSessionMetadataEvent, \
+    GetSessionHistoryEvent
 
 
 class ClientEventHandler:
@@ -73,7 +74,7 @@ class ClientEventHandler:
 
     @handle_client_event.register
     async def _(self, event: GetUserSessionsEvent) -> None:
-        await self.send_user_sessions(event.offset, event.limit)
+        await self.send_user_sessions(event.offset, event.limit, event.cursor)
 
     @handle_client_event.register
     async def _(self, event: SetSessionMetadataEvent) -> None:
@@ -95,6 +96,10 @@ class ClientEventHandler:
     async def _(self, event: SetSessionMessagesEvent) -> None:
         await self.set_session_messages(event.messages)
 
+    @handle_client_event.register
+    async def _(self, _: GetSessionHistoryEvent) -> None:
+        await self.send_history()
+
     @handle_client_event.register
     async def _(self, event: SetAgentEvent) -> None:
         await self.set_agent(event.agent_key)
@@ -1,5 +1,4 @@
 import asyncio
-import copy
 import json
 import os
 import traceback
@@ -19,9 +18,11 @@ from fastapi import WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
 from agent_c.chat import ChatSessionManager
+from agent_c.chat.history_sync import HistorySync
 
 from agent_c.models import ChatSession, ChatUser
 from agent_c.models.events import BaseEvent, TextDeltaEvent, HistoryEvent, RenderMediaEvent
+from agent_c.models.events.chat import HistoryDeltaEvent
 from agent_c.models.heygen import HeygenAvatarSessionData, NewSessionRequest
 from agent_c.models.input import AudioInput
 from agent_c.models.input.file_input import FileInput
@@ -40,6 +41,7 @@ from agent_c_api.api.rt.models.control_events import ErrorEvent, AgentListEvent,
 
 from agent_c_api.core.event_handlers.client_event_handlers import ClientEventHandler
 from agent_c_api.core.file_handler import RTFileHandler, FileMetadata
+from agent_c_api.core.util.event_encoding import encode_event
 from agent_c_api.core.voice.models import open_ai_voice_models, AvailableVoiceModel, heygen_avatar_voice_model, no_voice_model
 from agent_c_api.core.voice.voice_io_manager import VoiceIOManager
 
@@ -95,6 +97,7 @@ class RealtimeBridge(ClientEventHandler):
         self.client_wants_cancel = asyncio.Event()
         self._active_interact_task: Optional[asyncio.Task] = None
         self._send_lock = asyncio.Lock()
+        self._stalled_websocket: Optional[WebSocket] = None
         self.avatar_session: Optional[HeygenAvatarSessionData] = None
         self.avatar_session_id: Optional[str] = None
         self.avatar_session_token: Optional[str] = None
@@ -108,6 +111,8 @@ class RealtimeBridge(ClientEventHandler):
         self.audio_inputs: List[AudioInput] = []
 
         self.command_handler =  ChatCommandHandler()
+        # Applies the history deltas raised by the agent to the chat session
+        self.history_sync = HistorySync()
 
     @property
     def websocket(self) -> Optional[WebSocket]:
@@ -345,8 +350,12 @@ class RealtimeBridge(ClientEventHandler):
 
         await self.send_to_all_user_sessions(ChatSessionNameChangedEvent(session_name=session_name, session_id=session_id))
 
-    async def send_user_sessions(self, offset: int, limit: int = 50) -> None:
-        sessions = await self.chat_session_manager.get_user_sessions(self.chat_user.user_id, offset, limit)
+    async def send_user_sessions(self, offset: int, limit: int = 50, cursor: Optional[str] = None) -> None:
+        try:
+            sessions = await self.chat_session_manager.get_user_sessions(self.chat_user.user_id, offset, limit, cursor)
+        except ValueError as e:
+            await self.send_error(str(e), source="send_user_sessions")
+            return
         await self.send_event(GetUserSessionsResponseEvent(sessions=sessions))
 
     async def add_tool(self, new_tool: str) -> bool:
@@ -413,6 +422,7 @@ class RealtimeBridge(ClientEventHandler):
             return
 
         await self.chat_session_manager.release_session(self.chat_session.session_id, self.chat_session.user_id)
+        self.tool_chest.clear_loaded_tools(self.chat_session.session_id)
 
     async def new_chat_session(self, agent_key: Optional[str] = None) -> None:
         self.logger.info(f"Creating new chat session with {agent_key} from {self.ui_session_id}")
@@ -477,18 +487,12 @@ class RealtimeBridge(ClientEventHandler):
             if not old_session or old_session.user_id != self.chat_user.user_id:
                 await self.send_error(f"Session '{session_id}' not found", source="fork_session")
                 return
-            name = old_session.display_name
-            session_data = old_session.model_dump(exclude={'display_name', 'vendor'})
         else:
-            session_data = self.chat_session.model_dump(exclude={'display_name', 'vendor'})
-            name = self.chat_session.display_name
-
-        session_data['session_id'] = new_session_id
-        session_data['session_name'] = f"{name} (fork)"
+            old_session = self.chat_session
 
         try:
-            new_session = ChatSession.model_validate(session_data)
-            await self.chat_session_manager.flush_session(new_session, True)
+            # Shares the parent's saved messages instead of writing a copy of them
+            new_session = await self.chat_session_manager.fork_session(old_session, new_session_id)
             await self.send_to_all_user_sessions(ChatSessionAddedEvent(chat_session=new_session.as_index_entry()))
             await self.resume_chat_session(new_session.session_id)
             await self.send_system_message(f"Forked from {session_id}.", severity="info")
@@ -513,7 +517,15 @@ class RealtimeBridge(ClientEventHandler):
         self.chat_session.messages = messages
         self.logger.info(f"RealtimeBridge {self.chat_session.session_id}: Session messages updated")
         await self.flush_session()
-        await self.send_event(HistoryEvent(messages=self.chat_session.messages, session_id=self.chat_session.session_id))
+        await self.send_history()
+
+    async def send_history(self) -> None:
+        """Send the entire message history of the current chat session, e.g. to a client that fell out of step"""
+        if self.chat_session:
+            agent_runtime = self.runtime_cache.runtime_for_agent(self.chat_session.agent_config)
+            messages = await self.chat_session_manager.inflate_messages(self.chat_session.messages)
+            await self.send_event(self.history_sync.full_event(messages, vendor=agent_runtime.vendor,
+                                                               session_id=self.chat_session.session_id, role="system"))
 
     async def set_agent(self, agent_key: str) -> None:
         """Set the agent for the current session"""
@@ -554,6 +566,18 @@ class RealtimeBridge(ClientEventHandler):
         """Notify client that user turn is starting"""
         await self.send_event(UserTurnEndEvent())
 
+    def accepts_event(self, event: BaseEvent) -> bool:
+        """
+        Whether an event belongs to this bridge's chat session.
+
+        Events without a session ID go to any session, session events only go
+        to the session they were raised in or to its user session.
+        """
+        if 'session_id' not in type(event).model_fields:
+            return True
+
+        return self.chat_session.session_id in [event.session_id, getattr(event, 'user_session_id', None) or "nousersession"]
+
     async def send_event(self, event: BaseEvent):
         """
         Send event to connected client.
@@ -568,15 +592,47 @@ class RealtimeBridge(ClientEventHandler):
         if self.websocket is None or self.websocket.client_state != WebSocketState.CONNECTED:
             return
 
-        model_dump = event.model_dump()
-        if 'session_id' in model_dump:
-            if self.chat_session.session_id not in [model_dump['session_id'], model_dump.get('user_session_id', "nousersession")]:
-                return
+        if not self.accepts_event(event):
+            return
+
+        try:
+            event_str = encode_event(event)
+        except Exception as e:
+            self.logger.warning(f"Failed to encode event {event.type} for session {self.ui_session_id}: {e}")
+            return
+
+        await self.send_encoded(event_str)
+
+    async def send_encoded(self, event_str: str, timeout: Optional[float] = None) -> bool:
+        """
+        Send an already encoded event to the connected client.
+
+        Used to fan a single encoding of an event out to several bridges, see
+        `RealtimeSessionManager.send_to_all_user_sessions`.  Like `send_event`
+        this silently returns if no client is connected.
+
+        A send still waiting after `timeout` seconds leaves the socket with a
+        partial frame, so the connection is closed and dropped rather than
+        reused; the client reconnects and resyncs.
+
+        Args:
+            event_str: The event, as encoded by `encode_event`
+            timeout: Seconds to wait for a stalled client, None to wait indefinitely
+
+        Returns:
+            bool: True if the event was sent
+        """
+        websocket = self.websocket
+        if websocket is None or websocket.client_state != WebSocketState.CONNECTED:
+            return False
 
         try:
             async with self._send_lock:
-                event_str = json.dumps(model_dump)
-                await self.websocket.send_text(event_str)
+                if self.websocket is not websocket:
+                    # Dropped by a stalled send while we waited for the lock
+                    return False
+                await asyncio.wait_for(websocket.send_text(event_str), timeout=timeout)
+            return True
 
             #if event.type not in ["ping", "pong"]:
             #    self.logger.info(f"Sent event {event.type} to {self.chat_session.session_id}")
@@ -589,10 +645,28 @@ class RealtimeBridge(ClientEventHandler):
             else:
                 # Unexpected RuntimeError, log at warning level
                 self.logger.warning(f"RuntimeError sending event to session {self.ui_session_id}: {e}")
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Timed out sending event to session {self.ui_session_id} after {timeout}s, "
+                                f"dropping the connection")
+            await self._drop_stalled_websocket(websocket)
         except Exception as e:
-            # Other exceptions (JSON errors, network issues, etc.)
+            # Other exceptions (network issues, etc.)
             # Log but don't stop the interaction
             self.logger.warning(f"Failed to send event to session {self.ui_session_id}: {e}")
+        return False
+
+    async def _drop_stalled_websocket(self, websocket: WebSocket) -> None:
+        async with self._websocket_lock:
+            if self._websocket is not websocket:
+                return
+            self._websocket = None
+            self.is_connected = False
+            self._stalled_websocket = websocket
+
+        try:
+            await asyncio.wait_for(websocket.close(code=1011), timeout=1.0)
+        except Exception as e:
+            self.logger.debug(f"Failed to close stalled websocket for session {self.ui_session_id}: {e}")
 
     async def send_error(self, message: str, source: Optional[str] = None):
         """Send error message to client"""
@@ -601,7 +675,11 @@ class RealtimeBridge(ClientEventHandler):
     async def send_chat_session(self):
         """Send the current chat session state to the client"""
         if self.chat_session:
-                await self.send_event(ChatSessionChangedEvent(chat_session=self.chat_session))
+            messages = await self.chat_session_manager.inflate_messages(self.chat_session.messages)
+            chat_session = self.chat_session
+            if messages is not chat_session.messages:
+                chat_session = chat_session.model_copy(update={'messages': messages})
+            await self.send_event(ChatSessionChangedEvent(chat_session=chat_session))
 
     async def send_chat_session_meta(self):
         """Send the current chat session state to the client"""
@@ -620,10 +698,19 @@ class RealtimeBridge(ClientEventHandler):
         """Default handler for runtime events, forward to client"""
         await self.send_event(event)
 
+    @handle_runtime_event.register
+    async def _(self, event: HistoryDeltaEvent):
+        # Agents raise the messages with blob references, clients get the payloads
+        messages = await self.chat_session_manager.inflate_messages(event.messages)
+        if messages is not event.messages:
+            event = event.model_copy(update={'messages': messages})
+        await self.send_event(event)
+
     @handle_runtime_event.register
     async def _(self, event: HistoryEvent):
+        # Kept on the session only; clients ask for the history with get_session_history
         if event.session_id == self.chat_session.session_id:
-            self.chat_session.messages = copy.deepcopy(event.messages)
+            self.chat_session.messages, _ = self.history_sync.apply(event, self.chat_session.messages)
 
     @property
     def avatar_think_message(self) -> str:
@@ -707,7 +794,7 @@ class RealtimeBridge(ClientEventHandler):
                         if "text" in message:
                             event = self.parse_event(json.loads(message["text"]))
                             if event.type not in ["ping", "pong"]:
-                                self.logger.debug(f"Received event {event.type} from session {self.ui_session_id}")
+                                self.logger.debug("Received event %s from session %s", event.type, self.ui_session_id)
 
                             if event.type == "resume_chat_session" and event.session_id == self.chat_session.session_id:
                                 self.logger.info("Client requested to resume the current session, ignoring.")
@@ -736,12 +823,15 @@ class RealtimeBridge(ClientEventHandler):
                 except json.JSONDecodeError:
                     await self.send_error("Invalid JSON received")
                 except Exception as e:
+                    if websocket is self._stalled_websocket:
+                        # send_encoded dropped this connection, the client will reconnect
+                        break
                     self.logger.exception(f"Error handling event for session {self.ui_session_id}: {e}")
                     await self.send_error(f"Error processing event: {str(e)}")
         finally:
             self.logger.info(f"RealtimeBridge stopped servicing websocket for session {self.ui_session_id}")
             # Ensure websocket is cleared if we exit the loop
-            if self.is_connected:
+            if self.is_connected and self._websocket is websocket:
                 await self._clear_websocket()
 
     async def raise_render_media_markdown(self, text: str, sent_by_class: str = "RealtimeBridge"):
@@ -894,6 +984,16 @@ class RealtimeBridge(ClientEventHandler):
         Raises:
             Exception: Any errors during chat processing
         """
+        # Keep the session cached while the interaction runs
+        chat_session = self.chat_session
+        await self.chat_session_manager.pin_session(chat_session)
+        try:
+            await self._interact(user_message, file_ids, on_event)
+        finally:
+            self.chat_session_manager.unpin_session(chat_session)
+
+    async def _interact(self, user_message: str, file_ids: Optional[List[str]] = None, on_event: Optional[callable] = None) -> None:
+        """Runs an interaction for `interact`, which holds a pin on the session while it does"""
         self.client_wants_cancel.clear()
         await self.send_user_turn_end()
         try:
@@ -920,6 +1020,7 @@ class RealtimeBridge(ClientEventHandler):
                 tool_params = self.tool_chest.get_inference_data(self.chat_session.agent_config.tools, agent_runtime.tool_format)
                 tool_params['schemas'] = self.chat_session.agent_config.filter_allowed_tools(tool_params['schemas'])
                 tool_params["toolsets"] = self.chat_session.agent_config.tools
+                tool_params["tool_index"] = self.chat_session.agent_config.tool_index
 
             if "ThinkTools" in self.chat_session.agent_config.tools:
                 agent_sections = [ThinkSection(), EnvironmentInfoSection(),  DynamicPersonaSection(), MarkdownFormatting()]
@@ -1081,7 +1182,8 @@ class RealtimeBridge(ClientEventHandler):
 
         agent_params |= {
             "tool_chest": self.tool_chest,
-            "streaming_callback": self.runtime_callback
+            "streaming_callback": self.runtime_callback,
+            "blob_store": self.chat_session_manager.blob_store
         }
 
         self.logger.info(f"Agent initialized using the following parameters: {agent_params}")
\ No newline at end of file
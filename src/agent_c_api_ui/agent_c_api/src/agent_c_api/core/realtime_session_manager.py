@@ -12,6 +12,7 @@ from agent_c.config.agent_config_loader import AgentConfigLoader
 from agent_c.config import ModelConfigurationLoader
 from agent_c.chat.session_manager import ChatSessionManager
 from agent_c_api.core.realtime_bridge import RealtimeBridge
+from agent_c_api.core.util.event_encoding import encode_event
 from agent_c_api.core.util.logging_utils import LoggingManager
 from agent_c_api.models.realtime_session import RealtimeSession
 from agent_c_tools.tools.workspace.base  import BaseWorkspace
@@ -33,6 +34,7 @@ LOCAL_WORKSPACES_FILE = '.local_workspaces.json'
 DEFAULT_ENV_NAME = 'development'
 OPENAI_REASONING_MODELS = ['o1', 'o1-mini', 'o3', 'o3-mini']
 
+DEFAULT_SEND_TIMEOUT = 5.0
 DEFAULT_TOOLSETS = "ThinkTools,WorkspaceTools,AgentCloneTools,AgentAssistTools,AgentTeamTools,WorkspacePlanningTools,BridgeTools,MarkdownToHtmlReportTools,DynamicCommandTools"
 
 
@@ -56,6 +58,7 @@ class RealtimeSessionManager:
         self._cancel_events: Dict[str, threading.Event] = {}
         self.agent_config_loader: AgentConfigLoader = AgentConfigLoader()
         self.chat_session_manager: ChatSessionManager = session_manager
+        self.send_timeout: float = float(os.environ.get("REALTIME_SEND_TIMEOUT", DEFAULT_SEND_TIMEOUT))
 
     @staticmethod
     def _init__user_workspaces(user_id: str) -> List[BaseWorkspace]:
@@ -196,14 +199,28 @@ class RealtimeSessionManager:
         """
         Send and event to all sessions associated with a specific user.
 
+        The event is encoded once and the same text is sent to every session.
+        Sends run concurrently, each bounded by `send_timeout`, so a stalled
+        connection can't hold up the others; the bridge drops a connection
+        that stalls and it is skipped until the client reconnects.
+
         Args:
             user_id (str): The user ID to send the message to
             event: The event to send
         """
-        sessions: List[RealtimeSession] = [session for session in self.ui_sessions.values() if session.user_id == user_id]
-        for session in sessions:
-            await session.bridge.send_event(event)
+        bridges: List[RealtimeBridge] = [session.bridge for session in self.ui_sessions.values()
+                                         if session.user_id == user_id and session.bridge.is_connected
+                                         and session.bridge.accepts_event(event)]
+        if not bridges:
+            return
+
+        try:
+            event_str = encode_event(event)
+        except Exception as e:
+            self.logger.warning(f"Failed to encode event {event.type} for user {user_id}: {e}")
+            return
 
+        await asyncio.gather(*[bridge.send_encoded(event_str, timeout=self.send_timeout) for bridge in bridges])
 
     async def create_user_runtime_cache_entry(self, user_id: str, hotload_toolsets: Optional[Union[str, List[str]]] = None) -> UserRuntimeCacheEntry:
         """
@@ -245,7 +262,8 @@ class RealtimeSessionManager:
             tool_chest=tool_chest,
             tool_cache=tool_cache,
             model_configs=self.model_configs,
-            workspaces=workspaces
+            workspaces=workspaces,
+            blob_store=self.chat_session_manager.blob_store
         )
 
         self.user_runtime_cache[user_id] = cache_entry
@@ -1,7 +1,9 @@
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
 import json
 import time
-from typing import Dict, List, Any, Optional, Union, Sequence, cast
+from typing import AsyncIterator, Dict, List, Any, Optional, Union, Sequence, cast
 
 import structlog
 from agent_c.models.events.chat import MessageEvent, InteractionEvent
@@ -10,21 +12,60 @@ from agent_c.models.common_chat.models import CommonChatMessage
 from redis import asyncio as aioredis
 
 from ..util.common_chat_converter import CommonChatConverter
+from .write_batcher import RedisWriteBatcher
+
+# Stream fields that are stored as plain strings rather than JSON
+MESSAGE_STRING_FIELDS = ("timestamp", "role", "content", "format", "common_msg_id")
+TOOL_CALL_STRING_FIELDS = ("timestamp", "name", "description", "common_msg_id")
+
+
+def _next_stream_id(entry_id: Union[bytes, str]) -> str:
+    """The smallest stream ID after `entry_id`, to continue an XRANGE after it"""
+    entry_id = entry_id.decode("utf-8") if isinstance(entry_id, bytes) else entry_id
+    ms, seq = entry_id.split("-")
+    return f"{ms}-{int(seq) + 1}"
+
 
 class ChatRepository:
-    """Repository for managing chat messages in Redis"""
+    """
+    Repository for managing chat messages in Redis
+
+    Messages and tool calls are kept in streams, with the CommonChatMessage
+    form of each stored under its own key.  Reads page through a stream with
+    XRANGE and fetch the stored CommonChatMessages for each page with a single
+    MGET, so loading a long history takes a few round trips rather than one
+    per message.  Recently read and written CommonChatMessages are kept in a
+    small local cache.
+
+    Writes are queued on a RedisWriteBatcher and go out together: a message
+    is written when it is complete, an interaction in one MULTI/EXEC, and
+    tool calls and metadata updates with the next flush.  Reads flush first,
+    so they always see this repository's writes.
+    """
+
+    # Stream entries read per XRANGE, and so CommonChatMessages fetched per MGET
+    MESSAGE_PAGE_SIZE: int = 200
+    # CommonChatMessages kept in the local cache
+    COMMON_MESSAGE_CACHE_SIZE: int = 256
     
-    def __init__(self, redis_client: aioredis.Redis, session_id: str):
+    def __init__(self, redis_client: aioredis.Redis, session_id: str, common_message_cache_size: Optional[int] = None,
+                 write_batcher: Optional[RedisWriteBatcher] = None):
         """
         Initialize the chat repository.
         
         Args:
             redis_client (aioredis.Redis): Redis client instance
             session_id (str): The session ID
+            common_message_cache_size (Optional[int]): CommonChatMessages to keep in the local cache, 0 to disable
+            write_batcher (Optional[RedisWriteBatcher]): Batcher for writes, defaults to the one shared for the client
         """
         self.redis = redis_client
+        self.writes = write_batcher or RedisWriteBatcher.for_client(redis_client)
         self.session_id = session_id
         self.logger = structlog.get_logger(__name__)
+        self._common_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._common_cache_size = (self.COMMON_MESSAGE_CACHE_SIZE if common_message_cache_size is None
+                                   else common_message_cache_size)
         
         self.logger.info(
             "chat_repository_initialized",
@@ -58,10 +99,7 @@ class ChatRepository:
                 # Store the CommonChatMessage as JSON
                 common_msg_json = message.model_dump_json()
                 msg_id = message.id
-                await self.redis.set(
-                    f"session:{self.session_id}:common_msg:{msg_id}", 
-                    common_msg_json
-                )
+                self._queue_common(msg_id, common_msg_json)
                 
                 self.logger.debug(
                     "common_chat_message_stored",
@@ -92,10 +130,7 @@ class ChatRepository:
                 common_msg = CommonChatConverter.message_event_to_common_chat(message)
                 common_msg_json = common_msg.model_dump_json()
                 msg_id = common_msg.id
-                await self.redis.set(
-                    f"session:{self.session_id}:common_msg:{msg_id}", 
-                    common_msg_json
-                )
+                self._queue_common(msg_id, common_msg_json)
                 
                 self.logger.debug(
                     "message_event_converted_and_stored",
@@ -107,6 +142,10 @@ class ChatRepository:
             else:
                 msg_data = message
             
+            if not isinstance(message, dict):
+                # Lets reads find the stored CommonChatMessage
+                msg_data["common_msg_id"] = msg_id
+            
             # Add timestamp if not present
             if "timestamp" not in msg_data:
                 msg_data["timestamp"] = datetime.now().isoformat()
@@ -115,12 +154,12 @@ class ChatRepository:
             msg_data = {k: json.dumps(v) if not isinstance(v, str) else v 
                         for k, v in msg_data.items()}
             
-            # Add to Redis stream
-            stream_result = await self.redis.xadd(f"session:{self.session_id}:messages", msg_data)
+            # Add to Redis stream and update session updated_at time
+            stream_future = self.writes.queue("xadd", f"session:{self.session_id}:messages", msg_data)
+            self._queue_touch()
             
-            # Update session updated_at time
-            await self.redis.hset(f"session:{self.session_id}:meta", "updated_at", 
-                                datetime.now().isoformat())
+            # The message is complete, so write it along with anything else queued
+            stream_result, = await self.writes.write(stream_future)
             
             duration = time.time() - start_time
             self.logger.info(
@@ -167,61 +206,12 @@ class ChatRepository:
                 start=start,
                 end=end,
                 count=count,
-                format=format
+                format=msg_format
             )
             
-            # Get messages from Redis stream
-            messages = await self.redis.xrange(f"session:{self.session_id}:messages", start, end, count)
-            
-            # Process messages
-            result = []
-            for msg_id, msg_data in messages:
-                # Convert message ID to string
-                msg_id_str = msg_id.decode("utf-8") if isinstance(msg_id, bytes) else msg_id
-                
-                # Process message data
-                processed_data = {}
-                for k, v in msg_data.items():
-                    # Convert bytes to string
-                    key = k.decode("utf-8") if isinstance(k, bytes) else k
-                    value = v.decode("utf-8") if isinstance(v, bytes) else v
-                    
-                    # Try to parse JSON values
-                    try:
-                        if key not in ["timestamp", "role", "content", "format"]:
-                            processed_value = json.loads(value)
-                        else:
-                            processed_value = value
-                    except json.JSONDecodeError:
-                        processed_value = value
-                        
-                    processed_data[key] = processed_value
-                
-                # Add message ID
-                processed_data["id"] = msg_id_str
-                
-                # Check if we should return CommonChatMessage format
-                if format == "common":
-                    # Check if this is a common chat message
-                    is_common_chat = processed_data.get("is_common_chat") == "true"
-                    
-                    # Try to get the stored CommonChatMessage
-                    common_msg_json = await self.redis.get(f"session:{self.session_id}:common_msg:{processed_data['id']}")
-                    
-                    if common_msg_json:
-                        # Deserialize from JSON
-                        common_msg = CommonChatMessage.model_validate_json(
-                            common_msg_json.decode("utf-8") if isinstance(common_msg_json, bytes) else common_msg_json
-                        )
-                        result.append(common_msg)
-                    else:
-                        # Convert on the fly if not stored
-                        msg_event = MessageEvent(**processed_data)
-                        common_msg = CommonChatConverter.message_event_to_common_chat(msg_event)
-                        result.append(common_msg)
-                else:
-                    # Return original format
-                    result.append(processed_data)
+            round_trips = [0]
+            result = [message async for message in self._iter_stream("messages", start, end, count, msg_format,
+                                                                    MESSAGE_STRING_FIELDS, round_trips)]
             
             duration = time.time() - start_time
             self.logger.info(
@@ -232,6 +222,7 @@ class ChatRepository:
                 count=count,
                 format=msg_format,
                 retrieved_count=len(result),
+                round_trips=round_trips[0],
                 duration_ms=round(duration * 1000, 2)
             )
             
@@ -245,12 +236,178 @@ class ChatRepository:
                 start=start,
                 end=end,
                 count=count,
-                format=format,
+                format=msg_format,
                 error=str(e),
                 duration_ms=round(duration * 1000, 2)
             )
             raise
     
+    async def iter_messages(self, start: str = "-", end: str = "+", count: Optional[int] = None,
+                            msg_format: str = "default",
+                            page_size: Optional[int] = None) -> AsyncIterator[Union[Dict[str, Any], CommonChatMessage]]:
+        """
+        Stream messages from the chat session a page at a time.
+        
+        Unlike `get_messages` this does not hold the whole history in memory,
+        and the first messages are available after the first page is read.
+        
+        Args:
+            start (str): Start ID for range query
+            end (str): End ID for range query
+            count (Optional[int]): Maximum number of messages to retrieve, None for all of them
+            msg_format (str): Message format to return: "default" for original format or "common" for CommonChatMessage
+            page_size (Optional[int]): Stream entries to read per round trip, defaults to MESSAGE_PAGE_SIZE
+            
+        Yields:
+            Union[Dict[str, Any], CommonChatMessage]: Messages, oldest first
+        """
+        async for message in self._iter_stream("messages", start, end, count, msg_format,
+                                                MESSAGE_STRING_FIELDS, page_size=page_size):
+            yield message
+    
+    async def _iter_stream(self, stream: str, start: str, end: str, count: Optional[int], msg_format: str,
+                           string_fields: Sequence[str], round_trips: Optional[List[int]] = None,
+                           page_size: Optional[int] = None) -> AsyncIterator[Union[Dict[str, Any], CommonChatMessage]]:
+        """
+        Read one of the session's streams with paged XRANGEs.
+        
+        For the "common" format the stored CommonChatMessages for each page are
+        fetched with one MGET, skipping those already in the local cache.
+        Entries without one are converted on the fly.
+        """
+        # Include queued writes
+        await self.writes.flush()
+        
+        page_size = page_size or self.MESSAGE_PAGE_SIZE
+        remaining = count
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = await self.redis.xrange(f"session:{self.session_id}:{stream}", start, end, size)
+            if round_trips is not None:
+                round_trips[0] += 1
+            if not page:
+                return
+            
+            entries = [self._decode_entry(entry_id, fields, string_fields) for entry_id, fields in page]
+            if msg_format == "common":
+                for common_msg in await self._to_common(stream, entries, round_trips):
+                    yield common_msg
+            else:
+                # Return original format
+                for entry in entries:
+                    yield entry
+            
+            if remaining is not None:
+                remaining -= len(page)
+            if len(page) < size:
+                return
+            start = _next_stream_id(page[-1][0])
+    
+    async def _to_common(self, stream: str, entries: List[Dict[str, Any]],
+                         round_trips: Optional[List[int]] = None) -> List[CommonChatMessage]:
+        """The CommonChatMessage for each stream entry, converting those that have none stored"""
+        stored = await self._get_common_messages(entries, round_trips)
+        return [common_msg if common_msg is not None else self._convert_entry(stream, entry)
+                for entry, common_msg in zip(entries, stored)]
+    
+    def _convert_entry(self, stream: str, entry: Dict[str, Any]) -> CommonChatMessage:
+        """
+        Convert a stream entry to a CommonChatMessage on the fly.
+        
+        Entries carry keys the events don't have, such as the stream entry ID,
+        timestamp and interaction, so only the event's own fields are kept.
+        """
+        event_cls = MessageEvent if stream == "messages" else ToolCallEvent
+        fields = {key: value for key, value in entry.items() if key in event_cls.model_fields and key != "type"}
+        fields.setdefault("session_id", self.session_id)
+        timestamp = entry.get("timestamp")
+        if stream == "messages":
+            return CommonChatConverter.message_event_to_common_chat(MessageEvent(**fields), entry["id"], timestamp)
+        return CommonChatConverter.tool_call_event_to_common_chat(ToolCallEvent(**fields), entry["id"], timestamp)
+    
+    @staticmethod
+    def _decode_entry(entry_id: Union[bytes, str], fields: Dict[Any, Any], string_fields: Sequence[str]) -> Dict[str, Any]:
+        """Decode a stream entry, parsing the fields that were stored as JSON"""
+        processed_data = {}
+        for k, v in fields.items():
+            # Convert bytes to string
+            key = k.decode("utf-8") if isinstance(k, bytes) else k
+            value = v.decode("utf-8") if isinstance(v, bytes) else v
+            
+            # Try to parse JSON values
+            try:
+                processed_data[key] = json.loads(value) if key not in string_fields else value
+            except json.JSONDecodeError:
+                processed_data[key] = value
+        
+        # Add the stream entry ID
+        processed_data["id"] = entry_id.decode("utf-8") if isinstance(entry_id, bytes) else entry_id
+        return processed_data
+    
+    def _common_key(self, msg_id: str) -> str:
+        return f"session:{self.session_id}:common_msg:{msg_id}"
+    
+    async def _get_common_messages(self, entries: List[Dict[str, Any]],
+                                   round_trips: Optional[List[int]] = None) -> List[Optional[CommonChatMessage]]:
+        """
+        Fetch the stored CommonChatMessage for each stream entry, None where there is none.
+        
+        Entries written by this repository record the ID their CommonChatMessage
+        is stored under; older entries are looked up by their stream entry ID.
+        """
+        keys = [self._common_key(entry.get("common_msg_id") or entry["id"]) for entry in entries]
+        missing = list(dict.fromkeys(key for key in keys if key not in self._common_cache))
+        fetched: Dict[str, str] = {}
+        if missing:
+            values = await self.redis.mget(missing)
+            if round_trips is not None:
+                round_trips[0] += 1
+            for key, value in zip(missing, values):
+                if value is not None:
+                    fetched[key] = value.decode("utf-8") if isinstance(value, bytes) else value
+                    self._remember_common(key, fetched[key])
+        
+        result = []
+        for key in keys:
+            common_msg_json = fetched.get(key)
+            if common_msg_json is None:
+                common_msg_json = self._common_cache.get(key)
+                if common_msg_json is not None:
+                    self._common_cache.move_to_end(key)
+            result.append(CommonChatMessage.model_validate_json(common_msg_json) if common_msg_json else None)
+        return result
+    
+    def _queue_common(self, msg_id: str, common_msg_json: str) -> asyncio.Future:
+        """Queue storing a CommonChatMessage, keeping it in the local cache as well"""
+        key = self._common_key(msg_id)
+        future = self.writes.queue("set", key, common_msg_json)
+        self._remember_common(key, common_msg_json)
+        return future
+    
+    def _queue_touch(self, timestamp: Optional[str] = None) -> asyncio.Future:
+        """Queue updating the session's updated_at time, replacing an update still queued"""
+        meta_key = f"session:{self.session_id}:meta"
+        return self.writes.queue("hset", meta_key, "updated_at", timestamp or datetime.now().isoformat(),
+                                 coalesce_key=("hset", meta_key, "updated_at"))
+    
+    async def flush(self) -> int:
+        """
+        Write everything queued now, e.g. when an interaction ends.
+        
+        Returns:
+            int: The number of commands written
+        """
+        return await self.writes.flush()
+    
+    def _remember_common(self, key: str, common_msg_json: str) -> None:
+        """Keep a stored CommonChatMessage in the local cache, evicting the least recently used"""
+        if self._common_cache_size <= 0:
+            return
+        self._common_cache[key] = common_msg_json
+        self._common_cache.move_to_end(key)
+        while len(self._common_cache) > self._common_cache_size:
+            self._common_cache.popitem(last=False)
+    
     async def get_meta(self) -> Dict[str, Any]:
         """
         Get session metadata.
@@ -266,7 +423,8 @@ class ChatRepository:
                 session_id=self.session_id
             )
             
-            # Get metadata from Redis hash
+            # Get metadata from Redis hash, including queued updates
+            await self.writes.flush()
             meta_data = await self.redis.hgetall(f"session:{self.session_id}:meta")
             
             # Process metadata
@@ -329,8 +487,9 @@ class ChatRepository:
             if not isinstance(value, str):
                 value = json.dumps(value)
                 
-            # Set metadata in Redis hash
-            await self.redis.hset(f"session:{self.session_id}:meta", key, value)
+            # Set metadata in Redis hash with the next flush
+            meta_key = f"session:{self.session_id}:meta"
+            self.writes.queue("hset", meta_key, key, value, coalesce_key=("hset", meta_key, key))
             
             duration = time.time() - start_time
             self.logger.info(
@@ -360,7 +519,8 @@ class ChatRepository:
         Returns:
             Dict[str, Any]: Managed session metadata
         """
-        # Get metadata from Redis hash
+        # Get metadata from Redis hash, including queued updates
+        await self.writes.flush()
         meta_data = await self.redis.hgetall(f"session:{self.session_id}:managed_meta")
         
         # Process metadata (same as get_meta)
@@ -392,8 +552,9 @@ class ChatRepository:
         if not isinstance(value, str):
             value = json.dumps(value)
             
-        # Set metadata in Redis hash
-        await self.redis.hset(f"session:{self.session_id}:managed_meta", key, value)
+        # Set metadata in Redis hash with the next flush
+        meta_key = f"session:{self.session_id}:managed_meta"
+        self.writes.queue("hset", meta_key, key, value, coalesce_key=("hset", meta_key, key))
     
     async def add_tool_call(self, tool_call: Union[ToolCallEvent, CommonChatMessage, Dict[str, Any]]) -> None:
         """
@@ -401,16 +562,15 @@ class ChatRepository:
         
         Args:
             tool_call (Union[ToolCallEvent, CommonChatMessage, Dict[str, Any]]): The tool call to add
+        
+        The tool call is queued and written with the next flush.
         """
         # Handle CommonChatMessage
         if isinstance(tool_call, CommonChatMessage):
             # Store the CommonChatMessage as JSON
             common_msg_json = tool_call.model_dump_json()
             tool_id = tool_call.id
-            await self.redis.set(
-                f"session:{self.session_id}:common_msg:{tool_id}", 
-                common_msg_json
-            )
+            self._queue_common(tool_id, common_msg_json)
             
             # Convert to ToolCallEvent for backward compatibility
             tool_event = CommonChatConverter.common_chat_to_tool_call_event(tool_call)
@@ -430,14 +590,15 @@ class ChatRepository:
             common_msg = CommonChatConverter.tool_call_event_to_common_chat(tool_call)
             common_msg_json = common_msg.model_dump_json()
             tool_id = common_msg.id
-            await self.redis.set(
-                f"session:{self.session_id}:common_msg:{tool_id}", 
-                common_msg_json
-            )
+            self._queue_common(tool_id, common_msg_json)
         # Handle dict
         else:
             tool_data = tool_call
         
+        if not isinstance(tool_call, dict):
+            # Lets reads find the stored CommonChatMessage
+            tool_data["common_msg_id"] = tool_id
+        
         # Add timestamp if not present
         if "timestamp" not in tool_data:
             tool_data["timestamp"] = datetime.now().isoformat()
@@ -446,12 +607,9 @@ class ChatRepository:
         tool_data = {k: json.dumps(v) if not isinstance(v, str) else v 
                     for k, v in tool_data.items()}
         
-        # Add to Redis stream
-        await self.redis.xadd(f"session:{self.session_id}:tool_calls", tool_data)
-        
-        # Update session updated_at time
-        await self.redis.hset(f"session:{self.session_id}:meta", "updated_at", 
-                            datetime.now().isoformat())
+        # Add to Redis stream and update session updated_at time, written with the next flush
+        self.writes.queue("xadd", f"session:{self.session_id}:tool_calls", tool_data)
+        self._queue_touch()
     
     async def get_tool_calls(self, start: str = "-", end: str = "+", count: int = 100,
                        msg_format: str = "default") -> List[Union[Dict[str, Any], CommonChatMessage]]:
@@ -467,60 +625,8 @@ class ChatRepository:
         Returns:
             List[Union[Dict[str, Any], CommonChatMessage]]: List of tool calls
         """
-        # Get tool calls from Redis stream
-        tool_calls = await self.redis.xrange(f"session:{self.session_id}:tool_calls", start, end, count)
-        
-        # Process tool calls
-        result = []
-        for call_id, call_data in tool_calls:
-            # Convert ID to string
-            call_id_str = call_id.decode("utf-8") if isinstance(call_id, bytes) else call_id
-            
-            # Process tool call data
-            processed_data = {}
-            for k, v in call_data.items():
-                # Convert bytes to string
-                key = k.decode("utf-8") if isinstance(k, bytes) else k
-                value = v.decode("utf-8") if isinstance(v, bytes) else v
-                
-                # Try to parse JSON values
-                try:
-                    if key not in ["timestamp", "name", "description"]:
-                        processed_value = json.loads(value)
-                    else:
-                        processed_value = value
-                except json.JSONDecodeError:
-                    processed_value = value
-                    
-                processed_data[key] = processed_value
-            
-            # Add call ID
-            processed_data["id"] = call_id_str
-            
-            # Check if we should return CommonChatMessage format
-            if msg_format == "common":
-                # Check if this is a common chat message
-                is_common_chat = processed_data.get("is_common_chat") == "true"
-                
-                # Try to get the stored CommonChatMessage
-                common_msg_json = await self.redis.get(f"session:{self.session_id}:common_msg:{processed_data['id']}")
-                
-                if common_msg_json:
-                    # Deserialize from JSON
-                    common_msg = CommonChatMessage.model_validate_json(
-                        common_msg_json.decode("utf-8") if isinstance(common_msg_json, bytes) else common_msg_json
-                    )
-                    result.append(common_msg)
-                else:
-                    # Convert on the fly if not stored
-                    tool_event = ToolCallEvent(**processed_data)
-                    common_msg = CommonChatConverter.tool_call_event_to_common_chat(tool_event)
-                    result.append(common_msg)
-            else:
-                # Return original format
-                result.append(processed_data)
-        
-        return result
+        return [tool_call async for tool_call in self._iter_stream("tool_calls", start, end, count, msg_format,
+                                                                   TOOL_CALL_STRING_FIELDS)]
     
     async def add_interaction(self, messages: Sequence[Union[MessageEvent, CommonChatMessage, Dict[str, Any]]], 
                             tool_calls: Optional[Sequence[Union[ToolCallEvent, CommonChatMessage, Dict[str, Any]]]] = None,
@@ -544,16 +650,14 @@ class ChatRepository:
         # Get current timestamp
         timestamp = datetime.now().isoformat()
         
-        # Create a Redis transaction pipeline
-        pipe = self.redis.pipeline()
-        
         # Add interaction metadata
         interaction_meta = {
             "timestamp": timestamp,
             "message_count": str(len(messages)),
             "tool_call_count": str(len(tool_calls) if tool_calls else 0)
         }
-        pipe.hset(f"session:{self.session_id}:interaction:{interaction_id}", mapping=interaction_meta)
+        futures = [self.writes.queue("hset", f"session:{self.session_id}:interaction:{interaction_id}",
+                                     mapping=interaction_meta)]
         
         # Add all messages with the interaction ID
         for i, message in enumerate(messages):
@@ -562,10 +666,7 @@ class ChatRepository:
                 # Store the CommonChatMessage
                 common_msg_json = message.model_dump_json()
                 msg_id = message.id
-                await self.redis.set(
-                    f"session:{self.session_id}:common_msg:{msg_id}", 
-                    common_msg_json
-                )
+                futures.append(self._queue_common(msg_id, common_msg_json))
                 
                 # Convert to MessageEvent for backward compatibility
                 msg_event = CommonChatConverter.common_chat_to_message_event(message)
@@ -587,13 +688,13 @@ class ChatRepository:
                 common_msg = CommonChatConverter.message_event_to_common_chat(message)
                 common_msg_json = common_msg.model_dump_json()
                 msg_id = common_msg.id
-                await self.redis.set(
-                    f"session:{self.session_id}:common_msg:{msg_id}", 
-                    common_msg_json
-                )
+                futures.append(self._queue_common(msg_id, common_msg_json))
             else:
                 msg_data = message.copy()  # Create a copy to avoid modifying the original
             
+            if not isinstance(message, dict):
+                msg_data["common_msg_id"] = msg_id
+            
             # Add interaction ID and timestamp
             msg_data["interaction_id"] = interaction_id
             if "timestamp" not in msg_data:
@@ -607,7 +708,7 @@ class ChatRepository:
                         for k, v in msg_data.items()}
             
             # Add to Redis stream
-            pipe.xadd(f"session:{self.session_id}:messages", msg_data)
+            futures.append(self.writes.queue("xadd", f"session:{self.session_id}:messages", msg_data))
         
         # Add tool calls if provided
         if tool_calls:
@@ -617,10 +718,7 @@ class ChatRepository:
                     # Store the CommonChatMessage
                     common_msg_json = tool_call.model_dump_json()
                     tool_id = tool_call.id
-                    await self.redis.set(
-                        f"session:{self.session_id}:common_msg:{tool_id}", 
-                        common_msg_json
-                    )
+                    futures.append(self._queue_common(tool_id, common_msg_json))
                     
                     # Convert to ToolCallEvent for backward compatibility
                     tool_event = CommonChatConverter.common_chat_to_tool_call_event(tool_call)
@@ -638,13 +736,13 @@ class ChatRepository:
                     common_msg = CommonChatConverter.tool_call_event_to_common_chat(tool_call)
                     common_msg_json = common_msg.model_dump_json()
                     tool_id = common_msg.id
-                    await self.redis.set(
-                        f"session:{self.session_id}:common_msg:{tool_id}", 
-                        common_msg_json
-                    )
+                    futures.append(self._queue_common(tool_id, common_msg_json))
                 else:
                     tool_data = tool_call.copy()  # Create a copy to avoid modifying the original
                 
+                if not isinstance(tool_call, dict):
+                    tool_data["common_msg_id"] = tool_id
+                
                 # Add interaction ID and timestamp
                 tool_data["interaction_id"] = interaction_id
                 if "timestamp" not in tool_data:
@@ -658,16 +756,16 @@ class ChatRepository:
                             for k, v in tool_data.items()}
                 
                 # Add to Redis stream
-                pipe.xadd(f"session:{self.session_id}:tool_calls", tool_data)
+                futures.append(self.writes.queue("xadd", f"session:{self.session_id}:tool_calls", tool_data))
         
         # Update session updated_at time
-        pipe.hset(f"session:{self.session_id}:meta", "updated_at", timestamp)
+        futures.append(self._queue_touch(timestamp))
         
         # Update interactions index
-        pipe.sadd(f"session:{self.session_id}:interactions", interaction_id)
+        futures.append(self.writes.queue("sadd", f"session:{self.session_id}:interactions", interaction_id))
         
-        # Execute pipeline
-        await pipe.execute()
+        # The interaction has ended, write all of it in one transaction
+        await self.writes.write(*futures)
         
         return interaction_id
     
@@ -679,6 +777,7 @@ class ChatRepository:
             List[str]: List of interaction IDs
         """
         # Get interaction IDs from Redis set
+        await self.writes.flush()
         interactions = await self.redis.smembers(f"session:{self.session_id}:interactions")
         
         # Convert to strings
@@ -691,11 +790,13 @@ class ChatRepository:
         
         Args:
             interaction_id (str): The interaction ID
+            format (str): "default" for the stream entries or "common" for CommonChatMessages
             
         Returns:
             Dict[str, Any]: Interaction details including messages and tool calls
         """
         # Get interaction metadata
+        await self.writes.flush()
         meta = await self.redis.hgetall(f"session:{self.session_id}:interaction:{interaction_id}")
         
         # Process metadata
@@ -705,39 +806,17 @@ class ChatRepository:
             value = v.decode("utf-8") if isinstance(v, bytes) else v
             meta_dict[key] = value
         
-        # Get messages for this interaction
-        all_messages = await self.get_messages(format=format)
-        if format == "common":
-            # For CommonChatMessage objects, filter differently
-            interaction_messages = []
-            for msg in all_messages:
-                # Check interaction_id in provider_metadata.additional_data
-                if hasattr(msg, 'provider_metadata') and msg.provider_metadata:
-                    if msg.provider_metadata.additional_data.get("interaction_id") == interaction_id:
-                        interaction_messages.append(msg)
-        else:
-            # For dict objects, filter normally
-            interaction_messages = [msg for msg in all_messages 
-                                  if msg.get("interaction_id") == interaction_id]
-        
-        # Get tool calls for this interaction
-        all_tool_calls = await self.get_tool_calls(format=format)
-        if format == "common":
-            # For CommonChatMessage objects, filter differently
-            interaction_tool_calls = []
-            for call in all_tool_calls:
-                # Check interaction_id in provider_metadata.additional_data
-                if hasattr(call, 'provider_metadata') and call.provider_metadata:
-                    if call.provider_metadata.additional_data.get("interaction_id") == interaction_id:
-                        interaction_tool_calls.append(call)
-        else:
-            # For dict objects, filter normally
-            interaction_tool_calls = [call for call in all_tool_calls 
-                                    if call.get("interaction_id") == interaction_id]
-        
-        # Sort by interaction_index if available
+        # Get messages and tool calls for this interaction, in order, converting them afterwards
+        # as only the stream entries know the interaction
+        interaction_messages = [msg for msg in await self.get_messages()
+                                if msg.get("interaction_id") == interaction_id]
+        interaction_tool_calls = [call for call in await self.get_tool_calls()
+                                  if call.get("interaction_id") == interaction_id]
         interaction_messages.sort(key=lambda x: int(x.get("interaction_index", 0)))
         interaction_tool_calls.sort(key=lambda x: int(x.get("interaction_index", 0)))
+        if format == "common":
+            interaction_messages = await self._to_common("messages", interaction_messages)
+            interaction_tool_calls = await self._to_common("tool_calls", interaction_tool_calls)
         
         # Build result
         result = {
@@ -15,6 +15,7 @@ from agent_c_api.api.v2.models.session_models import (
     SessionSummary,
     SessionUpdate
 )
+from agent_c_api.core.repositories.write_batcher import RedisWriteBatcher
 from agent_c_api.core.repositories.exceptions import (
     SessionRepositoryError,
     SessionNotFoundError,
@@ -43,15 +44,21 @@ class SessionRepository:
     - Single TTL operation per session
     - Reduced Redis memory overhead
     - Simplified key management
+    
+    Writes go through a RedisWriteBatcher.  TTL refreshes on access are only
+    queued, so reading a session costs one round trip, and repeated refreshes
+    of a session are written once with the next flush.
     """
     
-    def __init__(self, redis_client: aioredis.Redis):
+    def __init__(self, redis_client: aioredis.Redis, write_batcher: Optional[RedisWriteBatcher] = None):
         """Initialize the session repository
         
         Args:
             redis_client: Redis client instance
+            write_batcher: Batcher for writes, defaults to the one shared for the client
         """
         self.redis = redis_client
+        self.writes = write_batcher or RedisWriteBatcher.for_client(redis_client)
         self.logger = structlog.get_logger(__name__)
         self.session_ttl = 24 * 60 * 60  # 24 hours default TTL
     
@@ -88,14 +95,23 @@ class SessionRepository:
     # - SessionDetail.model_validate_json() for deserialization
     # This eliminates 70+ lines of unnecessary manual serialization code.
     
-    async def _set_session_ttl(self, session_id: str) -> None:
-        """Set or refresh session TTL
+    def _set_session_ttl(self, session_id: str) -> None:
+        """Set or refresh session TTL with the next flush
         
         Args:
             session_id: Session ID
         """
-        # Set TTL for single session hash
-        await self.redis.expire(f"session:{session_id}", self.session_ttl)
+        # Set TTL for single session hash, replacing a refresh still queued
+        key = f"session:{session_id}"
+        self.writes.queue("expire", key, self.session_ttl, coalesce_key=("expire", key))
+    
+    async def flush(self) -> int:
+        """Write queued TTL refreshes now
+        
+        Returns:
+            Number of commands written
+        """
+        return await self.writes.flush()
     
     async def create_session(self, session_data: SessionCreate) -> SessionDetail:
         """Create a new session
@@ -146,20 +162,14 @@ class SessionRepository:
             # Store the entire model as JSON (proper Pydantic serialization)
             session_json = session_detail.model_dump_json(exclude_none=True)
             
-            # Create Redis pipeline for atomic operations
-            pipe = self.redis.pipeline()
-            
-            # Store session as JSON string
-            pipe.set(f"session:{session_id}", session_json)
+            # Store session as JSON string with its TTL
+            stored = self.writes.queue("set", f"session:{session_id}", session_json, ex=self.session_ttl)
             
             # Add to active sessions set (renamed for clarity)
-            pipe.sadd("sessions:active", session_id)
+            indexed = self.writes.queue("sadd", "sessions:active", session_id)
             
-            # Execute pipeline atomically
-            await pipe.execute()
-            
-            # Set TTL for session JSON
-            pipe.expire(f"session:{session_id}", self.session_ttl)
+            # Execute atomically
+            await self.writes.write(stored, indexed)
             
             # Return session details
             return await self.get_session(session_id)
@@ -201,11 +211,8 @@ class SessionRepository:
             # Validate session ID format
             self._validate_session_id(session_id)
             
-            # Check if session exists
-            if not await self.redis.exists(f"session:{session_id}"):
-                return None
-                
-            # Get session JSON from Redis
+            # Get session JSON from Redis, including queued writes
+            await self.writes.flush()
             session_json = await self.redis.get(f"session:{session_id}")
             
             if not session_json:
@@ -215,7 +222,7 @@ class SessionRepository:
             session_detail = SessionDetail.model_validate_json(session_json)
             
             # Refresh TTL on access
-            await self._set_session_ttl(session_id)
+            self._set_session_ttl(session_id)
             
             return session_detail
             
@@ -281,11 +288,9 @@ class SessionRepository:
             updated_session = SessionDetail.model_validate(updated_data)
             session_json = updated_session.model_dump_json(exclude_none=True)
             
-            # Store updated session JSON
-            await self.redis.set(f"session:{session_id}", session_json)
-            
-            # Refresh TTL
-            await self._set_session_ttl(session_id)
+            # Store updated session JSON, refreshing its TTL
+            await self.writes.write(self.writes.queue("set", f"session:{session_id}", session_json,
+                                                      ex=self.session_ttl))
             
             # Return the updated session (we already have it)
             return updated_session
@@ -328,15 +333,12 @@ class SessionRepository:
             # Validate session ID format
             self._validate_session_id(session_id)
             
-            # Create Redis pipeline for atomic deletion
-            pipe = self.redis.pipeline()
-            
             # Remove session hash and active sessions entry
-            pipe.delete(f"session:{session_id}")
-            pipe.srem("sessions:active", session_id)
+            deleted = self.writes.queue("delete", f"session:{session_id}")
+            unindexed = self.writes.queue("srem", "sessions:active", session_id)
             
-            # Execute pipeline atomically
-            await pipe.execute()
+            # Execute atomically
+            await self.writes.write(deleted, unindexed)
             
             return True
             
@@ -0,0 +1,258 @@
+"""
+Batching Redis writes into pipelines.
+
+Repositories queue their write commands on a `RedisWriteBatcher` instead of
+awaiting each one, and the batcher sends everything queued in a single
+pipeline (a MULTI/EXEC transaction by default) when it is flushed.  Callers
+flush at safe points, e.g. when a message is complete or an interaction ends,
+and anything left queued is flushed after at most `flush_interval` seconds.
+
+The batchers shared per client must be flushed with `close_all` before the
+client is closed, or whatever is still queued is lost.
+"""
+import asyncio
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+import structlog
+from redis import asyncio as aioredis
+
+
+class _QueuedCommand:
+    __slots__ = ("command", "args", "kwargs", "futures")
+
+    def __init__(self, command: str, args: tuple, kwargs: Dict[str, Any], future: asyncio.Future):
+        self.command = command
+        self.args = args
+        self.kwargs = kwargs
+        self.futures = [future]
+
+
+# One batcher per client; RedisConfig keeps a single long-lived client
+_shared_batchers: Dict[aioredis.Redis, "RedisWriteBatcher"] = {}
+
+
+class RedisWriteBatcher:
+    """
+    Collects Redis write commands and sends them in one round trip.
+
+    `queue` returns a future for the command's reply, resolved when the batch
+    is flushed.  Commands queued with the same `coalesce_key` replace each
+    other, so repeated `updated_at` stamps or TTL refreshes for a key cost one
+    command per flush; the replacement moves to the end of the batch so it
+    still lands after anything queued in between.
+
+    Errors are reported through the futures only: a command that fails, fails
+    its own future, and a batch that can't be sent at all fails the futures of
+    every command in it.  `flush` itself never raises, so a reader flushing
+    before it reads isn't handed the errors of other callers' writes; callers
+    that need to know their writes landed use `write`.  Failed commands are not
+    retried.
+    """
+
+    DEFAULT_FLUSH_INTERVAL: float = 0.25
+    DEFAULT_MAX_PENDING: int = 256
+
+    def __init__(self, redis_client: aioredis.Redis, flush_interval: Optional[float] = None,
+                 max_pending: Optional[int] = None, transaction: bool = True):
+        """
+        Initialize the write batcher.
+
+        Args:
+            redis_client (aioredis.Redis): Redis client instance
+            flush_interval (Optional[float]): Seconds a queued command may wait before it is flushed
+            max_pending (Optional[int]): Queued commands that trigger a flush on their own
+            transaction (bool): Whether to send batches as MULTI/EXEC transactions
+        """
+        self.redis = redis_client
+        self.flush_interval = self.DEFAULT_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.max_pending = self.DEFAULT_MAX_PENDING if max_pending is None else max_pending
+        self.transaction = transaction
+        self.logger = structlog.get_logger(__name__)
+
+        self.commands_queued = 0
+        self.commands_coalesced = 0
+        self.commands_written = 0
+        self.flushes = 0
+
+        self._queue: List[Optional[_QueuedCommand]] = []
+        self._coalesced: Dict[Hashable, int] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    @classmethod
+    def for_client(cls, redis_client: aioredis.Redis) -> "RedisWriteBatcher":
+        """
+        The batcher shared by every repository using `redis_client`.
+
+        Repositories are created per request, sharing the batcher lets writes
+        from all of them coalesce and go out together.
+        """
+        batcher = _shared_batchers.get(redis_client)
+        if batcher is None:
+            batcher = _shared_batchers[redis_client] = cls(redis_client)
+        return batcher
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Flush and forget every shared batcher, called at shutdown before the Redis client is closed"""
+        batchers = list(_shared_batchers.values())
+        _shared_batchers.clear()
+        for batcher in batchers:
+            await batcher.close()
+
+    @property
+    def pending(self) -> int:
+        """The number of commands waiting to be flushed"""
+        return sum(1 for queued in self._queue if queued is not None)
+
+    def queue(self, command: str, *args: Any, coalesce_key: Optional[Hashable] = None,
+              **kwargs: Any) -> asyncio.Future:
+        """
+        Queue a write command.
+
+        Args:
+            command (str): The name of the redis client method, e.g. "xadd"
+            *args: Positional arguments for the command
+            coalesce_key (Optional[Hashable]): Commands queued with the same key replace each other
+            **kwargs: Keyword arguments for the command
+
+        Returns:
+            asyncio.Future: Resolves to the command's reply once the batch is flushed
+        """
+        future = asyncio.get_running_loop().create_future()
+        queued = _QueuedCommand(command, args, kwargs, future)
+        self.commands_queued += 1
+
+        if coalesce_key is not None:
+            index = self._coalesced.get(coalesce_key)
+            if index is not None:
+                queued.futures.extend(self._queue[index].futures)
+                self._queue[index] = None
+                self.commands_coalesced += 1
+            self._coalesced[coalesce_key] = len(self._queue)
+        self._queue.append(queued)
+
+        if len(self._queue) >= self.max_pending:
+            self._schedule(0)
+        elif self._timer is None:
+            self._schedule(self.flush_interval)
+        return future
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None and delay > 0:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Send every queued command in one pipeline.
+
+        Returns:
+            int: The number of commands written successfully
+        """
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            batch = [queued for queued in self._queue if queued is not None]
+            self._queue = []
+            self._coalesced = {}
+            if not batch:
+                return 0
+
+            start_time = time.time()
+            pipe = self.redis.pipeline(transaction=self.transaction)
+            sent: List[_QueuedCommand] = []
+            for queued in batch:
+                try:
+                    getattr(pipe, queued.command)(*queued.args, **queued.kwargs)
+                except Exception as e:
+                    self._fail(queued, e)
+                    continue
+                sent.append(queued)
+
+            try:
+                results = await pipe.execute(raise_on_error=False) if sent else []
+            except Exception as e:
+                for queued in sent:
+                    self._fail(queued, e)
+                self.logger.error(
+                    "redis_write_batch_failed",
+                    commands=len(batch),
+                    error=str(e),
+                    duration_ms=round((time.time() - start_time) * 1000, 2)
+                )
+                return 0
+
+            written = 0
+            for queued, result in zip(sent, results):
+                if isinstance(result, Exception):
+                    self._fail(queued, result)
+                    continue
+                written += 1
+                for future in queued.futures:
+                    if not future.done():
+                        future.set_result(result)
+
+            self.flushes += 1
+            self.commands_written += written
+            if written < len(batch):
+                self.logger.error(
+                    "redis_write_commands_failed",
+                    commands=len(batch),
+                    failed=len(batch) - written,
+                    duration_ms=round((time.time() - start_time) * 1000, 2)
+                )
+            else:
+                self.logger.debug(
+                    "redis_write_batch_flushed",
+                    commands=len(batch),
+                    duration_ms=round((time.time() - start_time) * 1000, 2)
+                )
+            return written
+
+    async def write(self, *futures: asyncio.Future) -> List[Any]:
+        """
+        Flush, then return the replies of the given queued commands.
+
+        Args:
+            *futures: Futures returned by `queue`
+
+        Returns:
+            List[Any]: The replies, in the order given
+
+        Raises:
+            Exception: The error of the first of the commands that failed
+        """
+        await self.flush()
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _fail(queued: _QueuedCommand, error: BaseException) -> None:
+        for future in queued.futures:
+            if not future.done():
+                future.set_exception(error)
+                # Nobody has to await a queued command, so don't warn about unretrieved failures
+                future.exception()
+
+    async def close(self) -> None:
+        """Flush anything still queued and stop the flush timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+
+    async def __aenter__(self) -> "RedisWriteBatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -195,7 +195,7 @@ class ChatService:
                 count=count
             )
             
-            messages = await self.chat_repository.get_messages(start, end, count, format="common")
+            messages = await self.chat_repository.get_messages(start, end, count, msg_format="common")
             
             duration = time.time() - start_time
             self.logger.info(
@@ -545,7 +545,7 @@ class ChatService:
                 count=count
             )
             
-            tool_calls = await self.chat_repository.get_tool_calls(start, end, count, format="common")
+            tool_calls = await self.chat_repository.get_tool_calls(start, end, count, msg_format="common")
             
             duration = time.time() - start_time
             self.logger.info(
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import random
 import re
 
@@ -24,6 +25,17 @@ logger = logging_manager.get_logger()
 
 random.seed()
 
+
+async def collect_session_blobs(chat_session_manager: ChatSessionManager, interval: float) -> None:
+    """Periodically delete stored image and file payloads that no chat session references any more"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await chat_session_manager.collect_blobs()
+            logger.info(f"Removed {removed} unreferenced session payloads")
+        except Exception as e:
+            logger.error(f"Failed to collect unreferenced session payloads: {e}")
+
 def get_origins_regex():
     allowed_hosts_str = os.getenv("API_ALLOWED_HOSTS", "localhost,.local")
     patterns = [pattern.strip() for pattern in allowed_hosts_str.split(",")]
@@ -124,7 +136,14 @@ def create_application(router: APIRouter, **kwargs) -> FastAPI:
         # Initialize the chat session manager
         logger.info(f"🔧 Initializing chat session index and migrating old chat sessions (this may take a while):")
         await chat_loader.initialize_with_migration()
-        lifespan_app.state.chat_session_manager = ChatSessionManager(loader=chat_loader)
+        lifespan_app.state.chat_session_manager = ChatSessionManager(loader=chat_loader,
+                                                                     max_cached_sessions=settings.SESSION_CACHE_MAX_SESSIONS,
+                                                                     max_cache_bytes=settings.SESSION_CACHE_MAX_MB * 1024 * 1024,
+                                                                     cache_ttl_seconds=settings.SESSION_CACHE_TTL,
+                                                                     write_delay=settings.SESSION_WRITE_DELAY)
+        if settings.SESSION_BLOB_GC_INTERVAL:
+            lifespan_app.state.blob_gc_task = asyncio.create_task(
+                collect_session_blobs(lifespan_app.state.chat_session_manager, settings.SESSION_BLOB_GC_INTERVAL))
         logger.info("✅ Chat session manager initialized successfully")
 
         logger.info("🤖 Initializing Realtime Manager...")
@@ -150,6 +169,20 @@ def create_application(router: APIRouter, **kwargs) -> FastAPI:
         await lifespan_app.state.auth_service.initialize()
         logger.info("✅ Authentication Service initialized successfully")
 
+        # Initialize the headless batch job runner, resuming any interrupted jobs
+        logger.info("📦 Initializing Batch Job Runner...")
+        from agent_c_api.core.batch import BatchJobStore, BatchJobRunner
+        from agent_c_api.core.batch.agent_executor import AgentBatchExecutor
+        batch_store = BatchJobStore(settings.BATCH_DB_PATH)
+        await batch_store.initialize_database()
+        lifespan_app.state.batch_runner = BatchJobRunner(batch_store,
+                                                         AgentBatchExecutor(lifespan_app.state.realtime_manager),
+                                                         concurrency=settings.BATCH_CONCURRENCY,
+                                                         max_attempts=settings.BATCH_MAX_ATTEMPTS,
+                                                         retry_backoff=settings.BATCH_RETRY_BACKOFF)
+        await lifespan_app.state.batch_runner.start()
+        logger.info("✅ Batch Job Runner initialized successfully")
+
         # Log startup completion
         logger.info("🎉 Application startup completed successfully")
 
@@ -158,7 +191,39 @@ def create_application(router: APIRouter, **kwargs) -> FastAPI:
 
         # Shutdown: Close authentication service, database and Redis connections
         logger.info("🔄 Application shutdown initiated...")
-        
+
+        # Stop the batch runner first so in-flight items are returned to the queue
+        logger.info("📦 Stopping Batch Job Runner...")
+        try:
+            if hasattr(lifespan_app.state, 'batch_runner'):
+                await lifespan_app.state.batch_runner.stop()
+                await lifespan_app.state.batch_runner.store.close_database()
+            logger.info("✅ Batch Job Runner stopped successfully")
+        except Exception as e:
+            logger.error(f"❌ Error during Batch Job Runner cleanup: {e}")
+
+        # Write chat sessions with changes that haven't been saved yet
+        logger.info("💾 Saving chat sessions...")
+        try:
+            if hasattr(lifespan_app.state, 'blob_gc_task'):
+                lifespan_app.state.blob_gc_task.cancel()
+            if hasattr(lifespan_app.state, 'chat_session_manager'):
+                await lifespan_app.state.chat_session_manager.close()
+            await chat_loader.close_database()
+            logger.info("✅ Chat sessions saved successfully")
+        except Exception as e:
+            logger.error(f"❌ Error while saving chat sessions: {e}")
+
+        # Write anything still queued for Redis, then close the client
+        logger.info("🧱 Closing Redis connections...")
+        try:
+            from agent_c_api.core.repositories.write_batcher import RedisWriteBatcher
+            await RedisWriteBatcher.close_all()
+            await RedisConfig.close_client()
+            logger.info("✅ Redis connections closed successfully")
+        except Exception as e:
+            logger.error(f"❌ Error during Redis cleanup: {e}")
+
         # Close authentication service
         logger.info("🔐 Closing Authentication Service...")
         try:
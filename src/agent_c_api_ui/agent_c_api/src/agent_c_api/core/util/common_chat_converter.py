@@ -1,3 +1,4 @@
+import json
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from uuid import uuid4
@@ -21,11 +22,14 @@ class CommonChatConverter:
     """Converter between MessageEvent/ToolCallEvent and CommonChatMessage models."""
     
     @staticmethod
-    def message_event_to_common_chat(message: MessageEvent) -> CommonChatMessage:
+    def message_event_to_common_chat(message: MessageEvent, message_id: Optional[str] = None,
+                                     timestamp: Optional[str] = None) -> CommonChatMessage:
         """Convert a MessageEvent to CommonChatMessage.
         
         Args:
             message (MessageEvent): The message event to convert
+            message_id (Optional[str]): The ID to give the message, events don't carry one
+            timestamp (Optional[str]): When the message was created, in ISO format, defaults to now
             
         Returns:
             CommonChatMessage: The converted message
@@ -45,46 +49,58 @@ class CommonChatConverter:
         
         # Create the CommonChatMessage
         return CommonChatMessage(
-            id=message.id or str(uuid4()),
+            id=message_id or str(uuid4()),
             role=role,
             content=content_blocks,
-            created_at=datetime.fromisoformat(message.timestamp) if message.timestamp else datetime.now()
+            created_at=datetime.fromisoformat(timestamp) if timestamp else datetime.now()
         )
     
     @staticmethod
-    def tool_call_event_to_common_chat(tool_call: ToolCallEvent) -> CommonChatMessage:
+    def tool_call_event_to_common_chat(tool_call: ToolCallEvent, message_id: Optional[str] = None,
+                                       timestamp: Optional[str] = None) -> CommonChatMessage:
         """Convert a ToolCallEvent to CommonChatMessage.
         
+        The tool calls and results may be in either Anthropic or OpenAI format.
+        
         Args:
             tool_call (ToolCallEvent): The tool call event to convert
+            message_id (Optional[str]): The ID to give the message, events don't carry one
+            timestamp (Optional[str]): When the message was created, in ISO format, defaults to now
             
         Returns:
             CommonChatMessage: The converted message
         """
         # Create content blocks
-        content_blocks = []
+        content_blocks: List[Any] = []
+        tool_names: Dict[str, str] = {}
         
         # Add tool use content
-        content_blocks.append(ToolUseContentBlock(
-            tool_name=tool_call.name,
-            tool_id=tool_call.id or str(uuid4()),
-            parameters=tool_call.parameters or {}
-        ))
-        
-        # If result is available, add tool result content
-        if hasattr(tool_call, 'result') and tool_call.result is not None:
+        for call in tool_call.tool_calls:
+            function = call.get("function") or {}
+            tool_id = call.get("id") or str(uuid4())
+            tool_names[tool_id] = call.get("name") or function.get("name", "")
+            parameters = call.get("input")
+            if parameters is None:
+                arguments = function.get("arguments") or {}
+                parameters = json.loads(arguments) if isinstance(arguments, str) else arguments
+            content_blocks.append(ToolUseContentBlock(tool_name=tool_names[tool_id], tool_id=tool_id,
+                                                      parameters=parameters or {}))
+        
+        # If results are available, add tool result content
+        for result in tool_call.tool_results or []:
+            tool_id = result.get("tool_use_id") or result.get("tool_call_id") or ""
             content_blocks.append(ToolResultContentBlock(
-                tool_name=tool_call.name,
-                tool_id=tool_call.id or str(uuid4()),
-                result=tool_call.result
+                tool_name=tool_names.get(tool_id) or result.get("name", ""),
+                tool_id=tool_id,
+                result=result.get("content")
             ))
         
         # Create the CommonChatMessage
         return CommonChatMessage(
-            id=tool_call.id or str(uuid4()),
+            id=message_id or str(uuid4()),
             role=MessageRole.TOOL,
             content=content_blocks,
-            created_at=datetime.fromisoformat(tool_call.timestamp) if tool_call.timestamp else datetime.now()
+            created_at=datetime.fromisoformat(timestamp) if timestamp else datetime.now()
         )
     
     @staticmethod
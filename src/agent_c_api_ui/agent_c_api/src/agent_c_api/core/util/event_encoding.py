@@ -0,0 +1,22 @@
+"""
+Wire encoding for events sent to realtime clients.
+
+Events are encoded once and the resulting text is shared by every connection
+they are sent to.  Pydantic's own JSON serializer is used, as it writes
+straight from the model without building an intermediate dict.
+"""
+import json
+
+from pydantic_core import PydanticSerializationError
+
+from agent_c.models.events import BaseEvent
+
+
+def encode_event(event: BaseEvent) -> str:
+    """Encode an event as the JSON text sent over the websocket"""
+    try:
+        return event.model_dump_json()
+    except PydanticSerializationError:
+        # Values pydantic can't serialize are stringified, rather than dropping the event
+        return json.dumps(event.model_dump(), default=str)
+
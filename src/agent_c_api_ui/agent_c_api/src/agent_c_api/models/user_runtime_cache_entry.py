@@ -1,4 +1,4 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from agent_c_tools.tools.workspace.base import BaseWorkspace
 from pydantic import Field
@@ -9,6 +9,7 @@ from agent_c.agents import ClaudeChatAgent, BaseAgent
 from agent_c.agents.claude import ClaudeBedrockChatAgent
 from agent_c.agents.gpt import AzureGPTChatAgent, GPTChatAgent
 from agent_c.models.agent_config import CurrentAgentConfiguration
+from agent_c.util.blob_store import BlobStore
 
 
 
@@ -26,6 +27,7 @@ class UserRuntimeCacheEntry(BaseModel):
     model_configs: Dict[str, Any] = Field(..., description="The model configurations available to the user")
     runtime_cache: Dict[str, BaseAgent] = Field(default_factory=dict, description="Cache of runtime agents by model ID")
     workspaces: List[BaseWorkspace] = Field(default_factory=list, description="The list of workspaces associated with the user")
+    blob_store: Optional[BlobStore] = Field(None, description="Where the user's sessions keep image and file payloads, given to runtime agents")
 
     def runtime_for_agent(self, agent_config: CurrentAgentConfiguration):
         if agent_config.model_id in self.runtime_cache:
@@ -41,5 +43,5 @@ class UserRuntimeCacheEntry(BaseModel):
 
         auth_info = agent_config.agent_params.auth.model_dump() if agent_config.agent_params.auth is not None else {}
         client = runtime_cls.client(**auth_info)
-        return runtime_cls(model_name=model_config["id"], client=client)
+        return runtime_cls(model_name=model_config["id"], client=client, blob_store=self.blob_store)
 
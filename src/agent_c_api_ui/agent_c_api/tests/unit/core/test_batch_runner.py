@@ -0,0 +1,245 @@
+"""Unit tests for the headless batch job store and runner.
+
+The runner is driven by an injected executor so no agent runtime is needed,
+and each test gets its own SQLite database in a temporary directory.
+"""
+
+import asyncio
+
+import pytest
+
+from agent_c_api.core.batch import BatchJobStore, BatchJobRunner, BatchJobRequest
+
+
+async def _wait_for(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "batch_jobs.db")
+
+
+async def _store(db_path: str) -> BatchJobStore:
+    store = BatchJobStore(db_path)
+    await store.initialize_database()
+    return store
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_runner_processes_all_items_and_checkpoints_results(db_path):
+    store = await _store(db_path)
+
+    async def executor(job, item):
+        return item.input.upper()
+
+    runner = BatchJobRunner(store, executor, concurrency=3, poll_interval=0.05)
+    await runner.start()
+    try:
+        job = await runner.submit("user-1", BatchJobRequest(agent_key="default", inputs=[f"input {i}" for i in range(10)]))
+
+        async def finished():
+            return (await store.get_job(job.job_id)).status == "completed"
+
+        await _wait_for(finished)
+    finally:
+        await runner.stop()
+
+    progress = await runner.progress(job.job_id)
+    assert progress.job.completed_items == 10
+    assert progress.pending_items == 0
+    assert progress.eta_seconds is None
+
+    page = await store.get_items(job.job_id, limit=5, offset=5)
+    assert page.total_items == 10
+    assert [item.output for item in page.items] == [f"INPUT {i}" for i in range(5, 10)]
+    assert runner.stats().completed_items == 10
+    await store.close_database()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_failed_items_are_retried_then_marked_failed(db_path):
+    store = await _store(db_path)
+    calls = {}
+
+    async def executor(job, item):
+        calls[item.item_index] = calls.get(item.item_index, 0) + 1
+        if item.item_index == 0 or calls[item.item_index] == 1:
+            raise RuntimeError("model unavailable")
+        return "ok"
+
+    runner = BatchJobRunner(store, executor, concurrency=1, max_attempts=2, poll_interval=0.05, retry_backoff=0.01)
+    await runner.start()
+    try:
+        job = await runner.submit("user-1", BatchJobRequest(agent_key="default", inputs=["a", "b"]))
+
+        async def finished():
+            return (await store.get_job(job.job_id)).status == "completed"
+
+        await _wait_for(finished)
+    finally:
+        await runner.stop()
+
+    items = (await store.get_items(job.job_id)).items
+    assert [item.status for item in items] == ["failed", "completed"]
+    assert items[0].attempts == 2
+    assert items[0].error == "RuntimeError: model unavailable"
+    assert items[1].attempts == 2
+    await store.close_database()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_failed_items_wait_out_the_backoff_before_retrying(db_path):
+    store = await _store(db_path)
+    attempts = []
+
+    async def executor(job, item):
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) == 1:
+            raise RuntimeError("model unavailable")
+        return "ok"
+
+    runner = BatchJobRunner(store, executor, concurrency=1, poll_interval=0.05, retry_backoff=0.3)
+    assert [runner.retry_delay(n) for n in (1, 2, 3)] == [0.3, 0.6, 1.2]
+    await runner.start()
+    try:
+        job = await runner.submit("user-1", BatchJobRequest(agent_key="default", inputs=["a"]))
+
+        async def finished():
+            return (await store.get_job(job.job_id)).status == "completed"
+
+        await _wait_for(finished)
+    finally:
+        await runner.stop()
+
+    assert attempts[1] - attempts[0] >= 0.3
+    await store.close_database()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_stop_requeues_items_waiting_to_retry(db_path):
+    store = await _store(db_path)
+
+    async def executor(job, item):
+        raise RuntimeError("model unavailable")
+
+    runner = BatchJobRunner(store, executor, concurrency=1, poll_interval=0.05, retry_backoff=60)
+    await runner.start()
+    job = await runner.submit("user-1", BatchJobRequest(agent_key="default", inputs=["a"]))
+
+    async def waiting():
+        return bool(runner._retrying)
+
+    await _wait_for(waiting)
+    await runner.stop()
+
+    item = (await store.get_items(job.job_id)).items[0]
+    assert item.status == "pending"
+    assert item.attempts == 1
+    assert item.error == "RuntimeError: model unavailable"
+    await store.close_database()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_cancel_cancels_items_waiting_to_retry(db_path):
+    store = await _store(db_path)
+
+    async def executor(job, item):
+        raise RuntimeError("model unavailable")
+
+    runner = BatchJobRunner(store, executor, concurrency=1, poll_interval=0.05, retry_backoff=60)
+    await runner.start()
+    job = await runner.submit("user-1", BatchJobRequest(agent_key="default", inputs=["a"]))
+
+    async def waiting():
+        return bool(runner._retrying)
+
+    await _wait_for(waiting)
+    cancelled = await runner.cancel(job.job_id)
+    assert cancelled.status == "cancelled"
+    assert not runner._retrying
+    await runner.stop()
+
+    assert await store.get_status_counts(job.job_id) == {"cancelled": 1}
+    item = (await store.get_items(job.job_id)).items[0]
+    await store.fail_item(item, "late retry", max_attempts=3)
+    assert (await store.get_items(job.job_id)).items[0].status == "cancelled"
+    await store.close_database()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_interrupted_items_resume_after_restart(db_path):
+    store = await _store(db_path)
+    job = await store.create_job("user-1", BatchJobRequest(agent_key="default", inputs=["a", "b", "c"]))
+
+    # Simulate a process that died after finishing one item and while running another
+    first = await store.claim_next_item()
+    await store.complete_item(first, "done")
+    await store.claim_next_item()
+    await store.close_database()
+
+    store = await _store(db_path)
+    seen = []
+
+    async def executor(job, item):
+        seen.append(item.input)
+        return "resumed"
+
+    runner = BatchJobRunner(store, executor, concurrency=2, poll_interval=0.05)
+    await runner.start()
+    try:
+        async def finished():
+            return (await store.get_job(job.job_id)).status == "completed"
+
+        await _wait_for(finished)
+    finally:
+        await runner.stop()
+
+    assert sorted(seen) == ["b", "c"]
+    items = (await store.get_items(job.job_id)).items
+    assert [item.output for item in items] == ["done", "resumed", "resumed"]
+    await store.close_database()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_stop_returns_in_flight_items_and_cancel_skips_pending(db_path):
+    store = await _store(db_path)
+    started = asyncio.Event()
+
+    async def executor(job, item):
+        started.set()
+        await asyncio.sleep(60)
+
+    runner = BatchJobRunner(store, executor, concurrency=1, poll_interval=0.05)
+    await runner.start()
+    job = await runner.submit("user-1", BatchJobRequest(agent_key="default", inputs=["a", "b", "c"]))
+    await asyncio.wait_for(started.wait(), timeout=5)
+    await runner.stop()
+
+    counts = await store.get_status_counts(job.job_id)
+    assert counts == {"pending": 3}
+    assert (await store.get_items(job.job_id)).items[0].attempts == 0
+
+    cancelled = await runner.cancel(job.job_id)
+    assert cancelled.status == "cancelled"
+    assert await store.claim_next_item() is None
+    assert await store.get_status_counts(job.job_id) == {"cancelled": 3}
+    await store.close_database()
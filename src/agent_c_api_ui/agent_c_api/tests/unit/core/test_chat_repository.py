@@ -0,0 +1,278 @@
+"""Unit tests for reading chat history from Redis in pages, and batching writes to it.
+
+The repository is given a stand-in Redis client that keeps streams and keys
+in memory and counts the commands it receives, so no Redis server is needed.
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from agent_c.models.common_chat.models import CommonChatMessage, MessageRole, TextContentBlock
+from agent_c.models.events.chat import MessageEvent
+from agent_c.models.events.tool_calls import ToolCallEvent
+from agent_c_api.core.repositories.chat_repository import ChatRepository
+from agent_c_api.core.repositories.write_batcher import RedisWriteBatcher
+
+
+def _stream_id(entry_id: str):
+    ms, seq = entry_id.split("-")
+    return int(ms), int(seq)
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    def __getattr__(self, command):
+        return lambda *args, **kwargs: self.queued.append((command, args, kwargs))
+
+    async def execute(self, raise_on_error=True):
+        self.redis.commands.append("exec")
+        self.redis.batches.append([command for command, _, _ in self.queued])
+        commands, self.redis.commands = self.redis.commands, []
+        results = []
+        try:
+            for command, args, kwargs in self.queued:
+                try:
+                    results.append(await getattr(self.redis, command)(*args, **kwargs))
+                except Exception as e:
+                    if raise_on_error:
+                        raise
+                    results.append(e)
+            return results
+        finally:
+            self.redis.commands = commands
+
+
+class _Redis:
+    def __init__(self):
+        self.streams = {}
+        self.keys = {}
+        self.hashes = {}
+        self.commands = []
+        self.batches = []
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def set(self, key, value):
+        self.commands.append("set")
+        self.keys[key] = value.encode("utf-8")
+
+    async def mget(self, keys):
+        self.commands.append("mget")
+        return [self.keys.get(key) for key in keys]
+
+    async def get(self, key):
+        self.commands.append("get")
+        return self.keys.get(key)
+
+    async def xadd(self, key, fields):
+        self.commands.append("xadd")
+        stream = self.streams.setdefault(key, [])
+        entry_id = f"1000-{len(stream)}"
+        stream.append((entry_id.encode("utf-8"),
+                       {k.encode("utf-8"): v.encode("utf-8") for k, v in fields.items()}))
+        return entry_id.encode("utf-8")
+
+    async def xrange(self, key, start, end, count=None):
+        self.commands.append("xrange")
+        low = (0, 0) if start == "-" else _stream_id(start)
+        entries = [entry for entry in self.streams.get(key, []) if _stream_id(entry[0].decode()) >= low]
+        return entries[:count] if count else entries
+
+    async def hset(self, key, field=None, value=None, mapping=None):
+        self.commands.append("hset")
+        self.hashes.setdefault(key, {}).update(mapping or {field: value})
+
+    async def lpush(self, key, *values):
+        self.commands.append("lpush")
+        if key in self.keys:
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+
+    async def sadd(self, key, *values):
+        self.commands.append("sadd")
+
+    async def hgetall(self, key):
+        self.commands.append("hgetall")
+        return {k.encode("utf-8"): v.encode("utf-8") for k, v in self.hashes.get(key, {}).items()}
+
+
+def _message(i: int) -> CommonChatMessage:
+    return CommonChatMessage(id=f"msg-{i}", created_at=datetime.now(),
+                             role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                             content=[TextContentBlock(text=f"message {i}")])
+
+
+async def _repository_with(count: int, **kwargs):
+    redis = _Redis()
+    for i in range(count):
+        message = _message(i)
+        await redis.set(f"session:s:common_msg:{message.id}", message.model_dump_json())
+        await redis.xadd("session:s:messages", {"role": message.role.value, "content": message.text_content,
+                                               "common_msg_id": message.id})
+    redis.commands.clear()
+    return ChatRepository(redis, "s", **kwargs), redis
+
+
+@pytest.mark.asyncio
+async def test_long_history_is_read_in_a_few_round_trips():
+    repository, redis = await _repository_with(450, common_message_cache_size=0)
+
+    messages = await repository.get_messages(count=1000, msg_format="common")
+
+    assert [message.text_content for message in messages] == [f"message {i}" for i in range(450)]
+    assert redis.commands == ["xrange", "mget"] * 3
+    assert "get" not in redis.commands
+
+
+@pytest.mark.asyncio
+async def test_pages_stop_at_count():
+    repository, redis = await _repository_with(30)
+
+    messages = await repository.get_messages(count=25)
+
+    assert len(messages) == 25
+    assert messages[-1]["content"] == "message 24"
+    assert redis.commands == ["xrange"]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_streams_every_page():
+    repository, redis = await _repository_with(10)
+
+    messages = [message async for message in repository.iter_messages(page_size=3)]
+
+    assert [message["content"] for message in messages] == [f"message {i}" for i in range(10)]
+    assert redis.commands == ["xrange"] * 4
+
+
+@pytest.mark.asyncio
+async def test_recently_read_messages_are_served_from_the_cache():
+    repository, redis = await _repository_with(5)
+    await repository.get_messages(msg_format="common")
+    redis.commands.clear()
+
+    messages = await repository.get_messages(msg_format="common")
+
+    assert [message.id for message in messages] == [f"msg-{i}" for i in range(5)]
+    assert redis.commands == ["xrange"]
+
+
+def _tool_call_event() -> ToolCallEvent:
+    return ToolCallEvent(session_id="s", role="assistant", active=False, vendor="anthropic",
+                         tool_calls=[{"id": "call-1", "name": "search", "input": {"query": "weather"}}],
+                         tool_results=[{"type": "tool_result", "tool_use_id": "call-1", "content": "sunny"}])
+
+
+@pytest.mark.asyncio
+async def test_entries_without_a_stored_message_are_converted_on_read():
+    redis = _Redis()
+    repository = ChatRepository(redis, "s")
+    await repository.add_tool_call(_tool_call_event())
+    await repository.add_message({"role": "user", "content": "hello"})
+    await repository.add_message(MessageEvent(session_id="s", role="assistant", content="hi there"))
+    redis.keys.clear()
+
+    repository = ChatRepository(redis, "s")
+    messages = await repository.get_messages(msg_format="common")
+    tool_calls = await repository.get_tool_calls(msg_format="common")
+
+    assert [message.text_content for message in messages] == ["hello", "hi there"]
+    assert [message.role for message in messages] == [MessageRole.USER, MessageRole.ASSISTANT]
+    assert messages[0].id == "1000-0"
+    use, result = tool_calls[0].content
+    assert (use.tool_name, use.tool_id, use.parameters) == ("search", "call-1", {"query": "weather"})
+    assert (result.tool_name, result.result) == ("search", "sunny")
+
+
+@pytest.mark.asyncio
+async def test_interactions_are_read_in_order_in_either_format():
+    redis = _Redis()
+    repository = ChatRepository(redis, "s")
+    interaction_id = await repository.add_interaction(
+        [{"role": "user", "content": "what's the weather?"}, MessageEvent(session_id="s", role="assistant", content="sunny")],
+        tool_calls=[_tool_call_event()])
+
+    entries = await repository.get_interaction(interaction_id)
+    common = await repository.get_interaction(interaction_id, format="common")
+
+    assert [message["content"] for message in entries["messages"]] == ["what's the weather?", "sunny"]
+    assert [message.text_content for message in common["messages"]] == ["what's the weather?", "sunny"]
+    assert common["tool_calls"][0].content[0].tool_id == "call-1"
+
+
+@pytest.mark.asyncio
+async def test_a_completed_message_is_written_with_the_queued_tool_calls():
+    redis = _Redis()
+    repository = ChatRepository(redis, "s")
+
+    await repository.add_tool_call({"name": "search", "description": "look it up"})
+    await repository.set_meta("title", "first")
+    await repository.set_meta("title", "second")
+    assert redis.commands == []
+
+    await repository.add_message({"role": "user", "content": "hello"})
+
+    assert redis.commands == ["exec"]
+    assert redis.batches == [["xadd", "hset", "xadd", "hset"]]
+    assert (await repository.get_meta())["title"] == "second"
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_are_flushed_within_the_interval():
+    redis = _Redis()
+    repository = ChatRepository(redis, "s", write_batcher=RedisWriteBatcher(redis, flush_interval=0.01))
+
+    await repository.add_tool_call({"name": "search", "description": "look it up"})
+    await asyncio.sleep(0.05)
+
+    assert redis.commands == ["exec"]
+    assert len(redis.streams["session:s:tool_calls"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_command_only_fails_its_own_future():
+    redis = _Redis()
+    batcher = RedisWriteBatcher(redis)
+    queued = batcher.queue("xadd", "session:s:messages", {"content": "hello"})
+    unknown = batcher.queue("unknown_command", "key")
+    redis.keys["list"] = b"not a list"
+    wrong_type = batcher.queue("lpush", "list", "value")
+
+    assert await batcher.flush() == 1
+
+    assert queued.result() == b"1000-0"
+    assert isinstance(unknown.exception(), AttributeError)
+    assert isinstance(wrong_type.exception(), TypeError)
+    assert batcher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_reads_are_not_failed_by_other_callers_writes():
+    redis = _Redis()
+    batcher = RedisWriteBatcher(redis)
+    redis.keys["list"] = b"not a list"
+    failing = batcher.queue("lpush", "list", "value")
+    repository = ChatRepository(redis, "s", write_batcher=batcher)
+
+    await repository.set_meta("title", "first")
+    assert (await repository.get_meta())["title"] == "first"
+
+    with pytest.raises(TypeError):
+        await batcher.write(failing)
+
+
+@pytest.mark.asyncio
+async def test_close_all_flushes_the_shared_batchers():
+    redis = _Redis()
+    repository = ChatRepository(redis, "s")
+    await repository.add_tool_call({"name": "search", "description": "look it up"})
+
+    await RedisWriteBatcher.close_all()
+
+    assert redis.commands == ["exec"]
+    assert RedisWriteBatcher.for_client(redis) is not repository.writes
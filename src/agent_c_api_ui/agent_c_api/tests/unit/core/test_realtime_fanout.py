@@ -0,0 +1,173 @@
+"""Unit tests for fanning realtime events out to all of a user's sessions.
+
+The session manager is built without its loaders and given stand-in bridges,
+so no websocket or agent runtime is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent_c.models.events import TextDeltaEvent
+from starlette.websockets import WebSocketState
+
+from agent_c_api.core import realtime_session_manager
+from agent_c_api.core.realtime_bridge import RealtimeBridge
+from agent_c_api.core.realtime_session_manager import RealtimeSessionManager
+from agent_c_api.core.util.event_encoding import encode_event
+from agent_c_api.core.util.logging_utils import LoggingManager
+
+
+class _Bridge:
+    def __init__(self, ui_session_id: str, delay: float = 0.0, accepts: bool = True):
+        self.ui_session_id = ui_session_id
+        self.delay = delay
+        self.accepts = accepts
+        self.is_connected = True
+        self.sent = []
+
+    def accepts_event(self, event) -> bool:
+        return self.accepts
+
+    async def send_encoded(self, event_str: str, timeout=None) -> bool:
+        try:
+            await asyncio.wait_for(asyncio.sleep(self.delay), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.is_connected = False
+            return False
+        self.sent.append(event_str)
+        return True
+
+
+class _WebSocket:
+    client_state = WebSocketState.CONNECTED
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.close_code = None
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+def _bridge(websocket: _WebSocket) -> RealtimeBridge:
+    bridge = RealtimeBridge.__new__(RealtimeBridge)
+    bridge.ui_session_id = "tab-1"
+    bridge.logger = LoggingManager(__name__).get_logger()
+    bridge._websocket = websocket
+    bridge._websocket_lock = asyncio.Lock()
+    bridge._send_lock = asyncio.Lock()
+    bridge._stalled_websocket = None
+    bridge.is_connected = True
+    return bridge
+
+
+def _manager(bridges, user_id: str = "user-1", send_timeout: float = 1.0) -> RealtimeSessionManager:
+    manager = RealtimeSessionManager.__new__(RealtimeSessionManager)
+    manager.logger = LoggingManager(__name__).get_logger()
+    manager.send_timeout = send_timeout
+    manager.ui_sessions = {bridge.ui_session_id: SimpleNamespace(user_id=user_id, bridge=bridge) for bridge in bridges}
+    return manager
+
+
+def _event() -> TextDeltaEvent:
+    return TextDeltaEvent(session_id="chat-1", role="assistant", content="hello")
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_event_is_encoded_once_for_all_sessions(monkeypatch):
+    calls = []
+
+    def counting_encode(event):
+        calls.append(event)
+        return encode_event(event)
+
+    monkeypatch.setattr(realtime_session_manager, "encode_event", counting_encode)
+    bridges = [_Bridge(f"tab-{index}") for index in range(5)] + [_Bridge("other-chat", accepts=False)]
+    manager = _manager(bridges)
+
+    await manager.send_to_all_user_sessions("user-1", _event())
+
+    assert len(calls) == 1
+    assert all(bridge.sent == [encode_event(_event())] for bridge in bridges[:5])
+    assert bridges[5].sent == []
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_stalled_session_does_not_hold_up_the_others():
+    stalled = _Bridge("stalled", delay=10)
+    healthy = [_Bridge(f"tab-{index}") for index in range(3)]
+    manager = _manager([stalled, *healthy], send_timeout=0.05)
+
+    started = asyncio.get_running_loop().time()
+    await manager.send_to_all_user_sessions("user-1", _event())
+
+    assert asyncio.get_running_loop().time() - started < 1
+    assert all(len(bridge.sent) == 1 for bridge in healthy)
+    assert stalled.sent == []
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_other_users_are_not_sent_to():
+    bridge = _Bridge("tab-1")
+    manager = _manager([bridge], user_id="user-2")
+
+    await manager.send_to_all_user_sessions("user-1", _event())
+
+    assert bridge.sent == []
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_stalled_session_is_skipped_after_it_times_out():
+    stalled = _Bridge("stalled", delay=10)
+    healthy = _Bridge("tab-1")
+    manager = _manager([stalled, healthy], send_timeout=0.05)
+
+    await manager.send_to_all_user_sessions("user-1", _event())
+    stalled.delay = 0
+    await manager.send_to_all_user_sessions("user-1", _event())
+
+    assert stalled.sent == []
+    assert len(healthy.sent) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_bridge_drops_a_connection_that_stalls_mid_send():
+    websocket = _WebSocket(delay=10)
+    bridge = _bridge(websocket)
+
+    waiting = asyncio.create_task(bridge.send_encoded("second", timeout=0.05))
+    assert await bridge.send_encoded("first", timeout=0.05) is False
+    assert await waiting is False
+
+    assert websocket.close_code == 1011
+    assert bridge.websocket is None and not bridge.is_connected
+    assert await bridge.send_encoded("third", timeout=0.05) is False
+
+
+@pytest.mark.unit
+@pytest.mark.core
+@pytest.mark.asyncio
+async def test_bridge_sends_within_the_timeout():
+    websocket = _WebSocket()
+    bridge = _bridge(websocket)
+
+    assert await bridge.send_encoded("hello", timeout=0.05) is True
+    assert websocket.sent == ["hello"]
+    assert bridge.is_connected
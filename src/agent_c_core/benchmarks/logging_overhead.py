@@ -0,0 +1,54 @@
+"""
+Benchmark the logging overhead per streamed event.
+
+Run with:  python benchmarks/logging_overhead.py [iterations]
+
+Reports the cost of one debug call per event, made the way the hot paths
+make it, with debug logging switched off, so the figures are the overhead a
+production stream pays for its debug logging.  Compares f-string and
+%-style messages on a stdlib logger, a plain structlog BoundLogger against
+FastBoundLogger, and a SampledLogger with debug switched on.
+"""
+import logging
+import sys
+import timeit
+
+import structlog
+
+from agent_c.util.structured_logging import FastBoundLogger, SampledLogger, StructuredLoggerFactory, lazy
+
+
+def _stdlib_logger(name: str, level: int) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    logger.handlers = [logging.NullHandler()]
+    return logger
+
+
+def main(iterations: int = 200_000) -> None:
+    StructuredLoggerFactory()  # configures the processor chain
+    quiet = _stdlib_logger("benchmark.quiet", logging.INFO)
+    verbose = _stdlib_logger("benchmark.verbose", logging.DEBUG)
+    plain = structlog.wrap_logger(quiet, wrapper_class=structlog.stdlib.BoundLogger).bind(session_id="s1")
+    fast = structlog.wrap_logger(quiet, wrapper_class=FastBoundLogger).bind(session_id="s1")
+    sampled = SampledLogger(verbose, every=100)
+    event = {"type": "text_delta", "session_id": "s1", "content": "The quick brown"}
+
+    cases = {
+        "stdlib f-string": lambda: quiet.debug(f"Received event {event['type']}: {event}"),
+        "stdlib %-args": lambda: quiet.debug("Received event %s: %s", event['type'], event),
+        "stdlib lazy": lambda: quiet.debug("Received event %s", lazy(repr, event)),
+        "structlog BoundLogger": lambda: plain.debug("received_event", event_type=event['type']),
+        "structlog FastBoundLogger": lambda: fast.debug("received_event", event_type=event['type']),
+        "sampled 1/100, debug on": lambda: sampled.debug("Received event %s: %s", event['type'], event),
+    }
+
+    print(f"{'case':<28}{'usec/event':>12}")
+    for name, call in cases.items():
+        seconds = min(timeit.repeat(call, number=iterations, repeat=3))
+        print(f"{name:<28}{seconds / iterations * 1_000_000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,50 @@
+"""
+Benchmark the cost of saving a chat session after one new message.
+
+Run with:  python benchmarks/session_save.py [session_sizes...]
+
+For sessions of increasing length, reports the time and bytes written to
+record one new message: rewriting the whole session file as JSON, and
+appending the change to the session's journal as SavedChatLoader does.
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from agent_c.config.session_journal import SessionJournal
+
+
+def _message(i: int) -> dict:
+    # Roughly the size of a tool result or a short base64 image
+    return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "x" * 4000}
+
+
+def main(sizes: List[int]) -> None:
+    header = {"session_id": "benchmark", "metadata": {}}
+    print(f"{'messages':>10}{'rewrite ms':>12}{'rewrite KB':>12}{'journal ms':>12}{'journal KB':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            messages = [_message(i) for i in range(size)]
+            path = Path(directory) / "rewrite.json"
+
+            start = time.perf_counter()
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({**header, "messages": messages + [_message(size)]}, f, indent=4)
+            rewrite_ms = (time.perf_counter() - start) * 1000
+            rewrite_kb = path.stat().st_size / 1024
+
+            journal = SessionJournal(Path(directory), f"journal-{size}")
+            journal.write_snapshot(header, messages)
+            messages.append(_message(size))
+            start = time.perf_counter()
+            written = journal.record(header, messages)
+            journal_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{size:>10}{rewrite_ms:>12.2f}{rewrite_kb:>12.1f}{journal_ms:>12.2f}{written / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,50 @@
+"""
+Benchmark the per-call cost of compiled tool argument validation.
+
+Run with:  python benchmarks/tool_arg_validation.py [iterations]
+
+Reports the time taken by the validator attached by `json_schema` for a
+well formed call, a call that needs coercion and a malformed call, using a
+schema shaped like the larger workspace tools.
+"""
+import sys
+import timeit
+
+from agent_c.toolsets.json_schema import json_schema
+
+
+@json_schema("Read lines from a file in a workspace.", {
+    "path": {"type": "string", "description": "UNC path to the file", "required": True},
+    "start_line": {"type": "integer", "minimum": 0},
+    "end_line": {"type": "integer", "minimum": 0},
+    "encoding": {"type": "string", "enum": ["utf-8", "latin-1", "ascii"]},
+    "include_line_numbers": {"type": "boolean"},
+    "filters": {"type": "array", "items": {"type": "object",
+                                           "properties": {"field": {"type": "string"}, "value": {"type": "string"}},
+                                           "required": ["field"]}},
+})
+async def read_lines(**kwargs):
+    return kwargs
+
+
+CASES = {
+    "valid": {"path": "//project/src/main.py", "start_line": 10, "end_line": 40, "encoding": "utf-8",
+              "include_line_numbers": True, "filters": [{"field": "kind", "value": "def"}], "tool_context": {}},
+    "coerced": {"path": "//project/src/main.py", "start_line": "10", "end_line": 40.0, "encoding": None,
+                "include_line_numbers": "true", "filters": '[{"field": "kind", "value": "def"}]', "tool_context": {}},
+    "invalid": {"start_line": -1, "end_line": "forty", "encoding": "utf-16", "include_line_numbers": "maybe",
+                "filters": [{"value": "def"}], "tool_context": {}},
+}
+
+
+def main(iterations: int = 200_000) -> None:
+    validator = read_lines.validator
+    print(f"{'case':<10}{'errors':>8}{'usec/call':>12}")
+    for name, args in CASES.items():
+        _, errors = validator(args)
+        seconds = min(timeit.repeat(lambda: validator(args), number=iterations, repeat=3))
+        print(f"{name:<10}{len(errors):>8}{seconds / iterations * 1_000_000:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -142,7 +142,6 @@ class ClaudeChatAgent(BaseAgent):
             functions: List[Dict[str, Any]] = kwargs['schemas']
             kwargs['tool_sections'] = inference_data['sections']
 
-        kwargs['prompt_metadata']['model_id'] = model_name
         (tool_context, prompt_context) = await self._render_contexts(**kwargs)
         sys_prompt: str = prompt_context["system_prompt"]
         allow_betas: bool = kwargs.get("allow_betas", self.allow_betas)
@@ -182,13 +181,17 @@ class ClaudeChatAgent(BaseAgent):
             completion_opts['temperature'] = 1
 
 
-        if len(functions):
+        tool_index: bool = kwargs.get("tool_index", tool_chest.use_tool_index)
+        if tool_index and len(functions):
+            completion_opts['tools'] = tool_chest.session_schemas(functions, tool_context, "claude")
+        elif len(functions):
             completion_opts['tools'] = functions
 
         completion_opts['max_tokens'] = max_tokens
         completion_opts["metadata"] = {'user_id': kwargs.get('user_id', 'admin')}
 
-        opts = {"callback_opts": callback_opts, "completion_opts": completion_opts, 'tool_chest': tool_chest, 'tool_context': tool_context}
+        opts = {"callback_opts": callback_opts, "completion_opts": completion_opts, 'tool_chest': tool_chest, 'tool_context': tool_context,
+                'tool_index': tool_index, 'tool_schemas': functions}
         return opts
 
 
@@ -245,10 +248,13 @@ class ClaudeChatAgent(BaseAgent):
 
                     new_system_prompt  = await prompt_builder.render(opts['tool_context'], tool_sections=kwargs.get("tool_sections", None))
                     if new_system_prompt != opts["completion_opts"]["system"]:
-                        self.logger.debug(f"Updating system prompt for interaction {interaction_id}")
+                        self.logger.debug("Updating system prompt for interaction %s", interaction_id)
                         opts["completion_opts"]["system"] = new_system_prompt
                         await self._raise_system_prompt(new_system_prompt, **callback_opts)
 
+                    if opts['tool_index'] and opts['tool_schemas']:
+                        opts["completion_opts"]['tools'] = tool_chest.session_schemas(opts['tool_schemas'], opts['tool_context'], "claude")
+
                     delay = 3
                     messages = result
                 except RateLimitError:
@@ -1,6 +1,7 @@
 import os
 import json
 import asyncio
+import hashlib
 import threading
 
 import openai
@@ -18,20 +19,116 @@ from agent_c.models.input.audio_input import AudioInput
 from agent_c.models.events.chat import ReceivedAudioDeltaEvent, OpenAIUserMessageEvent
 from agent_c.models.input.image_input import ImageInput
 from agent_c.util.token_counter import TokenCounter
+from agent_c.util.singleton_cache import shared_cache_registry, CacheNames
 from agent_c.agents.base import BaseAgent
 from agent_c.util.logging_utils import LoggingManager
 
 
+class TikTokenEncoderRegistry:
+    """
+    Process-wide registry of tiktoken encodings.
+
+    Loading an encoding parses its BPE ranks, so each model's encoding is loaded
+    once per process and shared by every counter and agent that asks for it.
+    """
+    _encoders: Dict[str, Encoding] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def encoder_for_model(cls, model_name: str) -> Encoding:
+        """
+        Return the shared encoding for a model, loading it on first use.
+
+        Parameters:
+        - model_name (str): The model name to resolve the encoding for.
+
+        Returns:
+        Encoding: The shared tiktoken encoding.
+        """
+        encoder = cls._encoders.get(model_name)
+        if encoder is not None:
+            return encoder
+
+        with cls._lock:
+            encoder = cls._encoders.get(model_name)
+            if encoder is None:
+                encoder = encoding_for_model(model_name)
+                cls._encoders[model_name] = encoder
+
+        return encoder
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all loaded encodings.  Intended for tests."""
+        with cls._lock:
+            cls._encoders.clear()
+
+
 class TikTokenTokenCounter(TokenCounter):
     """
     This is a token counter that uses the TikToken Encoding model to count tokens.
+
+    Encodings come from the shared `TikTokenEncoderRegistry` and counts for larger
+    strings (schemas, system prompts, tool output) are kept in a process-wide LRU
+    cache keyed by a hash of the content.
     """
+    # Below this length hashing costs about as much as encoding, so don't cache.
+    MIN_CACHED_LENGTH: int = 256
+
+    def __init__(self, model_name: str = "gpt-3.5-turbo", cache_size: int = 4096):
+        self.encoder: Encoding = TikTokenEncoderRegistry.encoder_for_model(model_name)
+        self._cache = shared_cache_registry.get_cache(CacheNames.TOKEN_COUNTS, max_size=cache_size)
 
-    def __init__(self, model_name: str = "gpt-3.5-turbo"):
-        self.encoder: Encoding = encoding_for_model(model_name)
+    def _cache_key(self, text: str) -> str:
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+        return f"{self.encoder.name}:{digest}"
 
     def count_tokens(self, text: str) -> int:
-        return len(self.encoder.encode(text))
+        if len(text) < self.MIN_CACHED_LENGTH:
+            return len(self.encoder.encode(text))
+
+        key = self._cache_key(text)
+        count = self._cache.get(key)
+        if count is None:
+            count = len(self.encoder.encode(text))
+            self._cache.put(key, count)
+
+        return count
+
+    def count_many(self, texts: List[str], num_threads: int = 8) -> List[int]:
+        """
+        Count tokens for several strings at once.
+
+        Cached counts are reused and the remaining strings are encoded with
+        tiktoken's multithreaded batch encoder.
+
+        Parameters:
+        - texts (List[str]): The strings to count.
+        - num_threads (int): Threads used by tiktoken for the batch encode.
+
+        Returns:
+        List[int]: Token counts in the same order as `texts`.
+        """
+        counts: List[Optional[int]] = [None] * len(texts)
+        pending: List[Tuple[int, Optional[str]]] = []
+
+        for index, text in enumerate(texts):
+            key = None
+            if len(text) >= self.MIN_CACHED_LENGTH:
+                key = self._cache_key(text)
+                counts[index] = self._cache.get(key)
+
+            if counts[index] is None:
+                pending.append((index, key))
+
+        if pending:
+            encoded = self.encoder.encode_batch([texts[index] for index, _ in pending], num_threads=num_threads)
+            for (index, key), tokens in zip(pending, encoded):
+                counts[index] = len(tokens)
+                if key is not None:
+                    self._cache.put(key, counts[index])
+
+        return counts
 
 
 class GPTChatAgent(BaseAgent):
@@ -61,7 +158,7 @@ class GPTChatAgent(BaseAgent):
             self.logger.debug("Initializing with provided client.")
             self.client = kwargs.get("client")
 
-        self.encoding = tiktoken.encoding_for_model('gpt-3.5-turbo')
+        self.encoding = TikTokenEncoderRegistry.encoder_for_model('gpt-3.5-turbo')
         self.can_use_tools = True
         self.supports_multimodal = True
 
@@ -171,7 +268,11 @@ class GPTChatAgent(BaseAgent):
         completion_opts['stream_options'] = {"include_usage": True}
 
         # Add tools if available
-        if len(functions):
+        tool_index: bool = kwargs.get("tool_index", tool_chest.use_tool_index)
+        if tool_index and len(functions):
+            completion_opts['tools'] = tool_chest.session_schemas(functions, tool_context, "openai")
+            completion_opts['tool_choice'] = tool_choice
+        elif len(functions):
             completion_opts['tools'] = functions
             completion_opts['tool_choice'] = tool_choice
 
@@ -192,7 +293,9 @@ class GPTChatAgent(BaseAgent):
             'completion_opts': completion_opts,
             'callback_opts': self._callback_opts(**kwargs),
             'tool_chest': tool_chest,
-            'tool_context': tool_context
+            'tool_context': tool_context,
+            'tool_index': tool_index,
+            'tool_schemas': functions
         }
 
     async def _save_audio_interaction_to_session(self, mgr: ChatSessionManager, audio_id, transcript: str):
@@ -273,6 +376,8 @@ class GPTChatAgent(BaseAgent):
                     messages = result
                     # Update completion options with updated messages for next API call
                     opts['completion_opts']['messages'] = messages.copy()
+                    if opts['tool_index'] and opts['tool_schemas']:
+                        opts['completion_opts']['tools'] = tool_chest.session_schemas(opts['tool_schemas'], opts['tool_context'], "openai")
 
                 except openai.BadRequestError as e:
                     self.logger.error(f"Invalid request occurred: {e}")
@@ -483,7 +588,7 @@ class GPTChatAgent(BaseAgent):
         if not tool_calls:
             return
 
-        self.logger.debug(f"Processing {len(tool_calls)} tool call(s)")
+        self.logger.debug("Processing %d tool call(s)", len(tool_calls))
 
         # Start tool call event
         await self._raise_tool_call_start(tool_calls, vendor="open_ai", **callback_opts)
@@ -0,0 +1,55 @@
+"""
+Following a chat session's history through HistoryEvents.
+
+Agents raise HistoryEvents that carry only what changed since the version
+they raised before (see `HistoryEvent`).  `HistorySync` applies them to a
+session's messages, and keeps the events sent on to clients consistent with
+what the client was last sent: when the session's messages were replaced
+outside the agent, e.g. by the user editing them, the next event is sent with
+the entire history instead.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent_c.models.events import HistoryEvent
+
+
+class HistorySync:
+    """
+    Applies HistoryEvents to one session's messages at a time.
+    """
+
+    def __init__(self) -> None:
+        self.version: Optional[int] = None
+        self._messages: Optional[List[Dict[str, Any]]] = None
+        self._length: int = 0
+
+    def apply(self, event: HistoryEvent, messages: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], HistoryEvent]:
+        """
+        Apply an event to the session's current messages.
+
+        The messages taken from the event are deep copied, the agent keeps its own.
+        The list returned should become the session's messages; anything else
+        found in its place next time means they were replaced outside the agent.
+
+        Args:
+            event: The HistoryEvent raised by the agent
+            messages: The session's messages, as they are now
+
+        Returns:
+            The session's new messages, and the event to send on: `event` itself
+            if it applies to what was sent before, otherwise an event with the
+            entire history
+        """
+        in_step = (event.base_version is not None and event.base_version == self.version
+                   and messages is self._messages and len(messages) == self._length)
+        updated = event.apply(messages if in_step else None, self.version if in_step else None, copy_messages=True)
+        if not in_step and event.base_version is not None:
+            event = event.model_copy(update={'messages': updated, 'base_version': None, 'keep': 0})
+        self.version = event.version
+        self._messages = updated
+        self._length = len(updated)
+        return updated, event
+
+    def full_event(self, messages: List[Dict[str, Any]], **data) -> HistoryEvent:
+        """An event with the entire history, for clients that asked to resync"""
+        return HistoryEvent(messages=messages, version=self.version or 0, **data)
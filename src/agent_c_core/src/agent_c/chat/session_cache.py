@@ -0,0 +1,274 @@
+"""
+Bounded in-memory cache of chat sessions.
+
+ChatSessionManager keeps the sessions it has loaded or created here.  The
+cache holds at most `max_sessions` sessions and about `max_bytes` of session
+data, and drops sessions idle for longer than `ttl_seconds`, least recently
+used first.  Sessions that may have changed since they were last saved are
+handed to a flush callback before they are dropped, and pinned sessions,
+such as those with an interaction running, are never dropped.
+"""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from agent_c.models.chat_history.chat_session import ChatSession
+from agent_c.util.logging_utils import LoggingManager
+
+SessionKey = Tuple[str, str]
+
+
+def estimate_session_bytes(session: ChatSession) -> int:
+    """
+    Estimate the memory held by a session's messages and metadata.
+
+    Counts string and bytes lengths plus a small overhead per container and
+    value, which is close enough to compare sessions and bound a cache.
+    """
+    return _estimate(session.messages) + _estimate(session.metadata) + 1024
+
+
+def _estimate(value: Any) -> int:
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (str, bytes)):
+            size += len(item) + 50
+        elif isinstance(item, dict):
+            size += 64 + 8 * len(item)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += 56 + 8 * len(item)
+            stack.extend(item)
+        else:
+            size += 32
+    return size
+
+
+@dataclass
+class SessionCacheEntry:
+    """A cached session and what the cache knows about it"""
+    session: ChatSession
+    size: int
+    last_used: float
+    dirty: bool = False
+    pins: int = 0
+
+
+class SessionCache:
+    """
+    An LRU cache of chat sessions, bounded by count, estimated size and idle time.
+
+    Eviction is asynchronous, since dirty sessions are flushed before they are
+    dropped.  A session whose flush fails is kept, and retried on the next
+    eviction pass.
+    """
+
+    def __init__(self, max_sessions: int = 256, max_bytes: int = 512 * 1024 * 1024,
+                 ttl_seconds: Optional[float] = 60 * 60,
+                 on_evict: Optional[Callable[[ChatSession], Awaitable[None]]] = None):
+        """
+        Args:
+            max_sessions: Most sessions to keep
+            max_bytes: Most estimated session data to keep
+            ttl_seconds: Drop sessions unused for this long, None to keep them until space is needed
+            on_evict: Called to flush a dirty session before it is dropped
+        """
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self.logger = LoggingManager(__name__).get_logger()
+        self._entries: "OrderedDict[SessionKey, SessionCacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expired': 0,
+            'flushes': 0,
+            'flush_failures': 0
+        }
+
+    # Lookup
+
+    def get(self, session_id: str, user_id: str) -> Optional[ChatSession]:
+        """
+        Get a cached session, marking it as used.
+
+        An expired session is still returned, it is only dropped by `evict`,
+        after it has been flushed.
+        """
+        entry = self._entries.get((user_id, session_id))
+        if entry is None:
+            self._stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end((user_id, session_id))
+        entry.last_used = time.monotonic()
+        self._stats['hits'] += 1
+        return entry.session
+
+    def peek(self, session_id: str, user_id: str) -> Optional[ChatSession]:
+        """Get a cached session without counting a hit or marking it as used"""
+        entry = self._entries.get((user_id, session_id))
+        return entry.session if entry is not None else None
+
+    def __contains__(self, key: SessionKey) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def sessions(self, user_id: Optional[str] = None, dirty: bool = False) -> Iterator[ChatSession]:
+        """The cached sessions, all of them or those of one user, only those not yet saved when `dirty` is set"""
+        for (entry_user_id, _), entry in list(self._entries.items()):
+            if (user_id is None or entry_user_id == user_id) and (entry.dirty or not dirty):
+                yield entry.session
+
+    # Changes
+
+    async def put(self, session: ChatSession, dirty: bool = False, pin: bool = False) -> None:
+        """
+        Add or replace a session, then evict whatever no longer fits.
+
+        Args:
+            session: The session to cache
+            dirty: Whether the session has changes that are not yet saved
+            pin: Pin the session, as `pin` does
+        """
+        key = (session.user_id, session.session_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._bytes -= entry.size
+            entry.session = session
+            entry.size = estimate_session_bytes(session)
+            entry.last_used = time.monotonic()
+            entry.dirty = entry.dirty or dirty
+            self._entries.move_to_end(key)
+        else:
+            entry = SessionCacheEntry(session=session, size=estimate_session_bytes(session),
+                                      last_used=time.monotonic(), dirty=dirty)
+            self._entries[key] = entry
+        self._bytes += entry.size
+        if pin:
+            entry.pins += 1
+
+        await self.evict()
+
+    def remove(self, session_id: str, user_id: str) -> Optional[ChatSession]:
+        """Drop a session without flushing it"""
+        entry = self._entries.pop((user_id, session_id), None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        return entry.session
+
+    def clear_user(self, user_id: str) -> int:
+        """Drop a user's sessions without flushing them, returns how many were dropped"""
+        keys = [key for key in self._entries if key[0] == user_id]
+        for session_id in [key[1] for key in keys]:
+            self.remove(session_id, user_id)
+        return len(keys)
+
+    def mark_dirty(self, session_id: str, user_id: str) -> None:
+        entry = self._entries.get((user_id, session_id))
+        if entry is not None:
+            entry.dirty = True
+
+    def mark_clean(self, session_id: str, user_id: str) -> None:
+        """Record that a session has just been saved"""
+        entry = self._entries.get((user_id, session_id))
+        if entry is not None:
+            entry.dirty = False
+
+    def pin(self, session_id: str, user_id: str) -> None:
+        """Keep a session cached until it is unpinned, pins are counted"""
+        entry = self._entries.get((user_id, session_id))
+        if entry is not None:
+            entry.pins += 1
+
+    def unpin(self, session_id: str, user_id: str) -> None:
+        entry = self._entries.get((user_id, session_id))
+        if entry is not None and entry.pins > 0:
+            entry.pins -= 1
+
+    # Eviction
+
+    async def evict(self) -> int:
+        """
+        Drop expired sessions, then least recently used ones until the cache fits.
+
+        Returns:
+            The number of sessions dropped
+        """
+        evicted = 0
+        for key, entry in list(self._entries.items()):
+            if entry.pins or not self._is_expired(entry):
+                continue
+            if await self._evict(key, entry):
+                self._stats['expired'] += 1
+                evicted += 1
+
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_sessions and self._bytes <= self.max_bytes:
+                break
+            if entry.pins:
+                continue
+            if await self._evict(key, entry):
+                evicted += 1
+
+        return evicted
+
+    async def _evict(self, key: SessionKey, entry: SessionCacheEntry) -> bool:
+        if entry.dirty and self.on_evict is not None:
+            try:
+                await self.on_evict(entry.session)
+                self._stats['flushes'] += 1
+            except Exception as e:
+                self._stats['flush_failures'] += 1
+                self.logger.error(f"Failed to flush session {key[1]} before evicting it, keeping it cached: {e}")
+                return False
+
+        # The session may have been used, or replaced, while it was being flushed
+        if self._entries.get(key) is not entry or entry.pins:
+            return False
+        self.remove(key[1], key[0])
+        self._stats['evictions'] += 1
+        return True
+
+    def _is_expired(self, entry: SessionCacheEntry) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - entry.last_used > self.ttl_seconds
+
+    # Status
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        total_requests = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / total_requests if total_requests > 0 else 0.0
+        stats['size'] = len(self._entries)
+        stats['max_size'] = self.max_sessions
+        stats['resident_bytes'] = self._bytes
+        stats['max_bytes'] = self.max_bytes
+        stats['dirty'] = sum(1 for entry in self._entries.values() if entry.dirty)
+        stats['pinned'] = sum(1 for entry in self._entries.values() if entry.pins)
+        return stats
+
+    def user_counts(self) -> Dict[str, int]:
+        """The number of cached sessions per user"""
+        counts: Dict[str, int] = {}
+        for user_id, _ in self._entries:
+            counts[user_id] = counts.get(user_id, 0) + 1
+        return counts
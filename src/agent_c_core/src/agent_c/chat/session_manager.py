@@ -1,10 +1,14 @@
+import asyncio
 import json
 import yaml
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Any
 
+from agent_c.chat.session_cache import SessionCache
+from agent_c.chat.write_behind import SessionWriteBehind
 from agent_c.config.saved_chat import SavedChatLoader
 from agent_c.models.chat_history.chat_session import ChatSession, ChatSessionQueryResponse, ChatSessionIndexEntry
+from agent_c.util.blob_store import BlobStore, inflate_blobs
 from agent_c.util.logging_utils import LoggingManager
 
 
@@ -17,15 +21,29 @@ class ChatSessionManager:
     to implement all methods for functionality. On its own, it's purely a blueprint.
     """
 
-    def __init__(self, loader: Optional[SavedChatLoader] = None) -> None:
+    def __init__(self, loader: Optional[SavedChatLoader] = None, max_cached_sessions: int = 256,
+                 max_cache_bytes: int = 512 * 1024 * 1024, cache_ttl_seconds: Optional[float] = 60 * 60,
+                 write_delay: Optional[float] = None) -> None:
         """
         Initializes a new instance of ChatSessionManager with default values.
+
+        Args:
+            loader: The loader sessions are saved with
+            max_cached_sessions: Most sessions to keep in memory
+            max_cache_bytes: Most estimated session data to keep in memory
+            cache_ttl_seconds: Drop sessions from memory once unused for this long, None to keep them until space is needed
+            write_delay: Coalesce flushes of a session within this many seconds into one write, None to write on every flush
         """
         self.is_new_user: bool = True
         self.is_new_session: bool = True
         self._loader: SavedChatLoader = loader or SavedChatLoader()
-        # User-based cache: {user_id: {session_id: ChatSession}}
-        self._session_cache: Dict[str, Dict[str, ChatSession]] = {}
+        # Sessions that may have changed since they were saved are flushed before they are evicted
+        self._session_cache = SessionCache(max_sessions=max_cached_sessions, max_bytes=max_cache_bytes,
+                                           ttl_seconds=cache_ttl_seconds, on_evict=self._flush_evicted)
+        # Flushes only mark sessions for writing when this is set, call close() on shutdown to write what's pending
+        self._write_behind: Optional[SessionWriteBehind] = None
+        if write_delay:
+            self._write_behind = SessionWriteBehind(write_delay, self._write_pending)
         self.logger = LoggingManager(__name__).get_logger()
 
     async def initialize(self) -> dict:
@@ -48,12 +66,10 @@ class ChatSessionManager:
             session_id (str): The ID of the session to delete.
             user_id (str): The user ID who owns the session.
         """
-        # Remove from user's cache if present
-        if user_id in self._session_cache and session_id in self._session_cache[user_id]:
-            del self._session_cache[user_id][session_id]
-            # Clean up empty user cache
-            if not self._session_cache[user_id]:
-                del self._session_cache[user_id]
+        # Remove from the cache if present, along with any write that would recreate it
+        if self._write_behind is not None:
+            self._write_behind.discard(session_id, user_id)
+        self._session_cache.remove(session_id, user_id)
 
         await self._loader.delete_session(session_id, user_id)
 
@@ -64,15 +80,8 @@ class ChatSessionManager:
         Args:
             session: The ChatSession to create
         """
-        user_id = session.user_id
-        
-        # Ensure user cache exists
-        if user_id not in self._session_cache:
-            self._session_cache[user_id] = {}
-        
-        # Add to user's cache
-        self._session_cache[user_id][session.session_id] = session
         session.touch()
+        await self._session_cache.put(session, dirty=True)
 
     async def get_session(self, session_id: str, user_id: str) -> Optional[ChatSession]:
         """
@@ -85,23 +94,52 @@ class ChatSessionManager:
         Returns:
             Optional[ChatSession]: The chat session if found, otherwise None.
         """
-        # Check user's cache first
-        if user_id in self._session_cache and session_id in self._session_cache[user_id]:
-            return self._session_cache[user_id][session_id]
+        # Check the cache first, callers may change the session so it's treated as dirty
+        session = self._session_cache.get(session_id, user_id)
+        if session is not None:
+            self._session_cache.mark_dirty(session_id, user_id)
+            return session
 
         # Try to load from storage
         try:
             session = self._loader.load_session_id(session_id, user_id)
-            
-            # Add to user's cache
-            if user_id not in self._session_cache:
-                self._session_cache[user_id] = {}
-            self._session_cache[user_id][session_id] = session
-            
+            await self._session_cache.put(session, dirty=True)
             return session
         except FileNotFoundError:
             return None
 
+    def get_session_messages(self, session_id: str, user_id: str, offset: int = 0,
+                             limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a page of a session's messages without loading the whole session.
+
+        A cached session, which may have unsaved changes, is read from memory.
+        Otherwise only the requested messages are read from storage, and the
+        session is not added to the cache.
+
+        Args:
+            session_id (str): The ID of the session to read.
+            user_id (str): The user ID who owns the session.
+            offset (int): Index of the first message to return, negative counts from the end.
+            limit (int): Maximum number of messages to return.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The messages, oldest first, with their stored payloads in place
+                of blob references, or None if the session doesn't exist.
+        """
+        session = self._session_cache.peek(session_id, user_id)
+        if session is not None:
+            messages = session.messages
+        else:
+            try:
+                messages = self._loader.open_session(session_id, user_id)
+            except FileNotFoundError:
+                return None
+
+        if offset < 0:
+            offset = max(0, len(messages) + offset)
+        return inflate_blobs(list(messages[offset:offset + limit]), self.blob_store, strict=False)
+
     async def update(self) -> None:
         """
         Asynchronously updates the cached session and user. Meant to sync in-memory changes.
@@ -109,26 +147,71 @@ class ChatSessionManager:
         pass
 
     async def release_session(self, session_id: str, user_id: str):
-        if user_id in self._session_cache and session_id in self._session_cache[user_id]:
-            del self._session_cache[user_id][session_id]
+        # A pending write needs the cached session, so it happens now
+        if self._write_behind is not None and self._write_behind.is_pending(session_id, user_id):
+            await self._write_behind.flush([(user_id, session_id)])
+        self._session_cache.remove(session_id, user_id)
+        self._loader.release_session(session_id, user_id)
+
+    async def _flush_evicted(self, session: ChatSession) -> None:
+        """Save a session that is being evicted from the cache"""
+        if len(session.messages) > 0:
+            await self._loader.save_session(session)
+        self._loader.release_session(session.session_id, session.user_id)
+
+    async def pin_session(self, session: ChatSession) -> None:
+        """
+        Keep a session in the cache until it is unpinned, e.g. while an interaction is running.
+
+        Pins are counted, each call should be matched by a call to unpin_session.
+
+        Args:
+            session: The ChatSession to pin
+        """
+        await self._session_cache.put(session, dirty=True, pin=True)
 
-    async def flush(self, session_id: str, user_id: str) -> None:
+    def unpin_session(self, session: ChatSession) -> None:
+        """
+        Release a pin taken by pin_session.
+
+        Args:
+            session: The ChatSession to unpin
+        """
+        self._session_cache.unpin(session.session_id, session.user_id)
+
+    async def evict_expired(self) -> int:
+        """
+        Evict sessions that have been idle for longer than the cache TTL, flushing them first.
+
+        Eviction also happens as sessions are added, this is for callers that
+        want idle sessions released without waiting for that.
+
+        Returns:
+            The number of sessions evicted
+        """
+        return await self._session_cache.evict()
+
+    async def flush(self, session_id: str, user_id: str, durable: bool = False) -> None:
         """
         Flushes a session to storage.
+
+        With a write delay, the write is coalesced with other flushes of the
+        session unless `durable` is set.
         
         Args:
             session_id: The session ID to flush
             user_id: The user ID who owns the session
+            durable: Write the session before returning, even with a write delay
         """
-        session = None
-        if user_id in self._session_cache and session_id in self._session_cache[user_id]:
-            session = self._session_cache[user_id][session_id]
-            
+        session = self._session_cache.peek(session_id, user_id)
+
         if session is None or len(session.messages) == 0:
             self.logger.warning(f"Session {session_id} for user {user_id} is empty or not found, skipping flush.")
             return
-            
-        await self._loader.save_session(session)
+
+        # Re-estimates the size of the session, which may have grown since it was cached
+        await self._session_cache.put(session, dirty=True)
+        await self._save(session, durable)
 
     async def flush_and_release(self, session_id: str, user_id: str) -> None:
         """
@@ -138,21 +221,22 @@ class ChatSessionManager:
             session_id: The session ID to flush and release
             user_id: The user ID who owns the session
         """
-        await self.flush(session_id, user_id)
+        await self.flush(session_id, user_id, durable=True)
         await self.release_session(session_id, user_id)
 
-    async def flush_session(self, session: ChatSession, touch: bool = True) -> None:
+    async def flush_session(self, session: ChatSession, touch: bool = True, durable: bool = False) -> None:
         """
         Flushes a session to storage.
 
+        With a write delay, the write is coalesced with other flushes of the
+        session unless `durable` is set.
+
         Args:
             session: The ChatSession to flush
             touch: Whether to update the session's updated_at timestamp (default True)
+            durable: Write the session before returning, even with a write delay
         """
-        if session.user_id not in self._session_cache:
-            self._session_cache[session.user_id] = {}
-
-        self._session_cache[session.user_id][session.session_id] = session
+        await self._session_cache.put(session, dirty=True)
 
         if  len(session.messages) == 0:
             self.logger.warning(f"Session {session.session_id} for user {session.user_id} is empty or not found, skipping flush.")
@@ -161,7 +245,7 @@ class ChatSessionManager:
         if touch:
             session.touch()
 
-        await self._loader.save_session(session)
+        await self._save(session, durable)
 
     async def flush_and_release_session(self, session: ChatSession, touch: bool = True) -> None:
         """
@@ -171,9 +255,124 @@ class ChatSessionManager:
             session: The ChatSession to flush and release
             touch: Whether to update the session's updated_at timestamp (default True)
         """
-        await self.flush_session(session, touch)
+        await self.flush_session(session, touch, durable=True)
         await self.release_session(session.session_id, session.user_id)
 
+    async def _save(self, session: ChatSession, durable: bool) -> None:
+        if self._write_behind is not None and not durable:
+            self._write_behind.mark(session.session_id, session.user_id)
+            return
+
+        if self._write_behind is not None:
+            self._write_behind.discard(session.session_id, session.user_id)
+        await self._loader.save_session(session)
+        self._session_cache.mark_clean(session.session_id, session.user_id)
+
+    async def _write_pending(self, user_id: str, session_id: str) -> None:
+        """Write a session whose write was deferred, if it's still cached, eviction flushes it otherwise"""
+        session = self._session_cache.peek(session_id, user_id)
+        if session is None or len(session.messages) == 0:
+            return
+        await self._loader.save_session(session)
+        self._session_cache.mark_clean(session_id, user_id)
+
+    async def flush_pending(self, session_id: Optional[str] = None, user_id: Optional[str] = None) -> None:
+        """
+        Write deferred session writes now, a durability barrier for callers that need one.
+
+        Args:
+            session_id: The session to write, None for every pending session
+            user_id: The user ID who owns the session, required with session_id
+        """
+        if self._write_behind is None:
+            return
+        await self._write_behind.flush(None if session_id is None else [(user_id, session_id)])
+
+    async def close(self) -> None:
+        """
+        Write every session with changes that may not have been saved.
+
+        This should be called during application shutdown.
+        """
+        if self._write_behind is not None:
+            try:
+                await self._write_behind.close()
+            except Exception as e:
+                self.logger.error(f"Failed to write pending sessions on close: {e}")
+
+        for session in self._session_cache.sessions(dirty=True):
+            try:
+                await self._flush_evicted(session)
+                self._session_cache.mark_clean(session.session_id, session.user_id)
+            except Exception as e:
+                self.logger.error(f"Failed to save session {session.session_id} on close: {e}")
+
+    async def fork_session(self, parent: ChatSession, new_session_id: str,
+                           session_name: Optional[str] = None) -> ChatSession:
+        """
+        Fork a session, creating a new session that starts with all of its messages.
+
+        The fork shares the parent's saved messages rather than copying them,
+        so forking is cheap however long the parent is.
+
+        Args:
+            parent: The session to fork
+            new_session_id: The ID of the new session
+            session_name: The name of the new session, defaults to the parent's name with "(fork)" added
+
+        Returns:
+            The new ChatSession
+        """
+        # The fork can only share what the parent has saved
+        await self.flush_session(parent, touch=False, durable=True)
+
+        session_data = parent.model_dump(exclude={'display_name', 'vendor'})
+        session_data['session_id'] = new_session_id
+        session_data['session_name'] = session_name or f"{parent.display_name} (fork)"
+        fork = ChatSession.model_validate(session_data)
+        fork.touch()
+
+        if len(parent.messages) > 0:
+            await self._loader.fork_session(fork, parent.session_id)
+            await self._session_cache.put(fork)
+        else:
+            await self.flush_session(fork, touch=False, durable=True)
+        return fork
+
+    @property
+    def blob_store(self) -> BlobStore:
+        """The store saved sessions keep their image, document and audio payloads in, to share with agents"""
+        return self._loader.blob_store
+
+    async def inflate_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Put the stored payloads back in place of the blob references in messages about to leave the process.
+
+        References whose payload is missing are left in place rather than failing the send.
+
+        Args:
+            messages: The messages, as saved or raised by an agent
+
+        Returns:
+            `messages` itself if there are no references, otherwise an inflated copy
+        """
+        return await asyncio.to_thread(inflate_blobs, messages, self.blob_store, False)
+
+    async def collect_blobs(self, min_age: float = 3600) -> int:
+        """
+        Delete stored payloads that no session references any more.
+
+        Pending writes are flushed first so the references they add are seen.
+
+        Args:
+            min_age: Seconds a payload must have gone unstored before it can be deleted
+
+        Returns:
+            The number of payloads deleted
+        """
+        await self.flush_pending()
+        return await self._loader.collect_blobs(min_age)
+
     async def rename_session(self, session_id: str, user_id: str, new_name: str) -> Optional[ChatSessionIndexEntry]:
         """
         Renames a chat session.
@@ -195,19 +394,21 @@ class ChatSessionManager:
 
         return session.as_index_entry()
 
-    async def get_user_sessions(self, user_id: str, offset: int = 0, limit: int = 50) -> ChatSessionQueryResponse:
+    async def get_user_sessions(self, user_id: str, offset: int = 0, limit: int = 50,
+                                cursor: Optional[str] = None) -> ChatSessionQueryResponse:
         """
         Get paginated chat sessions for a user, sorted by updated_at descending.
         
         Args:
             user_id: The user ID to query sessions for
             limit: Maximum number of sessions to return (default 50)
-            offset: Number of sessions to skip for pagination (default 0)
+            offset: Number of sessions to skip for pagination (default 0), ignored when a cursor is given
+            cursor: The next_cursor of a previous response, to get the page after it
             
         Returns:
-            ChatSessionQueryResponse with chat_sessions list and total_sessions count
+            ChatSessionQueryResponse with chat_sessions list, total_sessions count and next_cursor
         """
-        return await self._loader.get_user_sessions(user_id, offset, limit)
+        return await self._loader.get_user_sessions(user_id, offset, limit, cursor)
     
     async def get_user_session_ids(self, user_id: str) -> List[str]:
         """
@@ -231,7 +432,7 @@ class ChatSessionManager:
         Returns:
             Dictionary of session_id -> ChatSession for cached sessions
         """
-        return self._session_cache.get(user_id, {})
+        return {session.session_id: session for session in self._session_cache.sessions(user_id)}
     
     def get_cached_session_count(self, user_id: str) -> int:
         """
@@ -243,7 +444,7 @@ class ChatSessionManager:
         Returns:
             Number of sessions currently cached for the user
         """
-        return len(self._session_cache.get(user_id, {}))
+        return len(self.get_cached_user_sessions(user_id))
     
     def clear_user_cache(self, user_id: str) -> None:
         """
@@ -252,8 +453,7 @@ class ChatSessionManager:
         Args:
             user_id: The user ID to clear cache for
         """
-        if user_id in self._session_cache:
-            del self._session_cache[user_id]
+        if self._session_cache.clear_user(user_id):
             self.logger.debug(f"Cleared session cache for user {user_id}")
     
     async def get_all_users_with_sessions(self) -> List[str]:
@@ -286,20 +486,22 @@ class ChatSessionManager:
         """
         return await self._loader.get_system_session_stats()
     
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the current cache usage.
         
         Returns:
-            Dictionary with cache statistics
+            Dictionary with cache statistics, including hit rate, evictions and resident bytes
         """
-        total_sessions = sum(len(user_sessions) for user_sessions in self._session_cache.values())
-        
+        sessions_per_user = self._session_cache.user_counts()
+
         return {
-            "total_users_cached": len(self._session_cache),
-            "total_sessions_cached": total_sessions,
-            "users_with_sessions": [user_id for user_id in self._session_cache.keys()],
-            "sessions_per_user": {user_id: len(sessions) for user_id, sessions in self._session_cache.items()}
+            "total_users_cached": len(sessions_per_user),
+            "total_sessions_cached": len(self._session_cache),
+            "users_with_sessions": list(sessions_per_user.keys()),
+            "sessions_per_user": sessions_per_user,
+            **self._session_cache.get_stats(),
+            **(self._write_behind.get_stats() if self._write_behind is not None else {})
         }
 
     def filtered_session_meta(self, prefix: str) -> Dict:
@@ -383,10 +585,9 @@ class ChatSessionManager:
         Raises:
             Exception: If metadata cannot be decoded properly.
         """
-        chat_session = None
-        if user_id in self._session_cache and session_id in self._session_cache[user_id]:
-            chat_session = self._session_cache[user_id][session_id]
-            
+        chat_session = self._session_cache.peek(session_id, user_id)
+
+
         if chat_session is None:
             self.logger.warning(f"Session {session_id} for user {user_id} not found in cache")
             return {}
@@ -417,10 +618,9 @@ class ChatSessionManager:
             self.logger.exception(f"Failed to encode session metameta for {prefix}")
             raise
 
-        chat_session = None
-        if user_id in self._session_cache and session_id in self._session_cache[user_id]:
-            chat_session = self._session_cache[user_id][session_id]
-            
+        chat_session = self._session_cache.peek(session_id, user_id)
+
+
         if chat_session is None:
             self.logger.warning(f"Session {session_id} for user {user_id} not found in cache")
             return
@@ -429,6 +629,7 @@ class ChatSessionManager:
             chat_session.metadata['metameta'] = {prefix: json_str}
         else:
             chat_session.metadata['metameta'][prefix] = json_str
+        self._session_cache.mark_dirty(session_id, user_id)
 
 
     def dict_to_yaml(self, data_dict: Dict) -> str:
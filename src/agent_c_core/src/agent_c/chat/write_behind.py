@@ -0,0 +1,150 @@
+"""
+Debounced, write-behind saving of chat sessions.
+
+ChatSessionManager marks a session here instead of saving it when it is
+asked to flush.  A background task writes each marked session once its
+coalescing window has passed, so a burst of interactions or metadata changes
+to the same session costs one write.  The window starts when a session is
+first marked and is not extended by later marks, which bounds how stale the
+saved copy can get.  `flush` is the durability barrier, writing pending
+sessions now, and `close` writes everything still pending.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from agent_c.util.logging_utils import LoggingManager
+
+SessionKey = Tuple[str, str]
+
+
+class SessionWriteBehind:
+    """
+    Coalesces session writes, writing each marked session once per window.
+
+    Sessions are identified by (user_id, session_id), and written by
+    awaiting `write(user_id, session_id)`.  A background write that fails is
+    logged and retried in the next window.
+    """
+
+    def __init__(self, delay: float, write: Callable[[str, str], Awaitable[None]]):
+        """
+        Args:
+            delay: Seconds to wait after a session is first marked before writing it
+            write: Writes a session, called with its user ID and session ID
+        """
+        self.delay = delay
+        self.write = write
+        self.logger = LoggingManager(__name__).get_logger()
+        self._due: Dict[SessionKey, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            'marks': 0,
+            'coalesced': 0,
+            'writes': 0,
+            'write_failures': 0
+        }
+
+    def mark(self, session_id: str, user_id: str) -> None:
+        """Schedule a session to be written, unless it already is"""
+        self._stats['marks'] += 1
+        key = (user_id, session_id)
+        if key in self._due:
+            self._stats['coalesced'] += 1
+            return
+
+        self._due[key] = time.monotonic() + self.delay
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+    def discard(self, session_id: str, user_id: str) -> None:
+        """Drop a pending write, e.g. because the session was deleted"""
+        self._due.pop((user_id, session_id), None)
+
+    def is_pending(self, session_id: str, user_id: str) -> bool:
+        return (user_id, session_id) in self._due
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    async def flush(self, keys: Optional[Iterable[SessionKey]] = None) -> None:
+        """
+        Write pending sessions now, all of them or those given.
+
+        Args:
+            keys: The (user_id, session_id) of the sessions to write, None for all
+
+        Raises:
+            Exception: The first error raised by a write, after every write has been tried
+        """
+        keys = list(self._due) if keys is None else [key for key in keys if key in self._due]
+        for key in keys:
+            self._due.pop(key, None)
+
+        results = await asyncio.gather(*[self._write(key) for key in keys], return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    async def close(self) -> None:
+        """Stop the background task and write everything still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            if not self._due:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            wait = min(self._due.values()) - time.monotonic()
+            if wait > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.monotonic()
+            due = [key for key, deadline in self._due.items() if deadline <= now]
+            for key in due:
+                self._due.pop(key, None)
+            try:
+                results = await asyncio.gather(*[self._write(key) for key in due], return_exceptions=True)
+            except asyncio.CancelledError:
+                # Closing, leave these for close() to write
+                for key in due:
+                    self._due.setdefault(key, now)
+                raise
+
+            for key, result in zip(due, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Failed to write session {key[1]}, retrying in {self.delay}s: {result}")
+                    self._due.setdefault(key, time.monotonic() + self.delay)
+
+    async def _write(self, key: SessionKey) -> None:
+        try:
+            await self.write(key[0], key[1])
+            self._stats['writes'] += 1
+        except Exception:
+            self._stats['write_failures'] += 1
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get write-behind statistics.
+
+        Returns:
+            Dictionary with write-behind statistics
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        stats['pending'] = len(self._due)
+        stats['write_delay'] = self.delay
+        return stats
@@ -0,0 +1,231 @@
+"""
+Read-only view of a saved chat session that reads messages as they are used.
+
+Opening a PagedSession reads the session's header fields, its message index
+and its journal, not its messages.  Messages are read from the snapshot and
+validated when they are first used, so showing the last page of a long
+session, or reading the tail of its history, costs the same however long the
+session is.  Use `SavedChatLoader.load_session_id` for a ChatSession that can
+be changed and saved.
+"""
+import json
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import TypeAdapter
+
+from agent_c.config.session_journal import (FORK_KEY, JOURNAL_SUFFIX, MESSAGES_OPEN, SNAPSHOT_EXCLUDE,
+                                            parent_snapshot_path, read_index, read_session_data, write_index,
+                                            _read_journal)
+from agent_c.models.chat_history.chat_session import ChatSession
+
+_message_adapter = TypeAdapter(Dict[str, Any])
+
+# A run of messages: (messages, start, stop), where messages is None for the snapshot's own,
+# a list for the journal's, or the parent's view for those a fork shares with its parent
+Segment = Tuple[Union[None, List[Dict[str, Any]], "PagedSession"], int, int]
+
+
+class PagedSession:
+    """
+    A saved session with its header loaded and its messages read on demand.
+
+    `session` is the session without its messages.  Messages are indexed like
+    a list, negative indexes and slices included, and the most recently read
+    are kept in memory.  If the session is saved again while the view is
+    open, the view reloads and shows the newly saved messages.
+    """
+
+    def __init__(self, snapshot_path: Path, cache_size: int = 256):
+        """
+        Args:
+            snapshot_path: The session's snapshot file
+            cache_size: How many read messages to keep in memory
+
+        Raises:
+            FileNotFoundError: If the snapshot doesn't exist
+            json.JSONDecodeError: If the snapshot is malformed
+        """
+        self.snapshot_path = Path(snapshot_path)
+        self.cache_size = cache_size
+        self.session: ChatSession
+        self._cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._open()
+
+    def _open(self) -> None:
+        self._stamp = self._file_stamps()
+        self._cache.clear()
+
+        header, self._offsets = self._read_header()
+        if header is None:
+            # Not written one message per line, e.g. saved before snapshots were, so read it whole
+            header = read_session_data(self.snapshot_path)
+            messages = header.pop("messages", [])
+            self._offsets = []
+            segments: List[Segment] = [(messages, 0, len(messages))]
+        else:
+            segments = [(None, 0, len(self._offsets) - 1)]
+            base = header.pop(FORK_KEY, None)
+            if base:
+                parent = PagedSession(parent_snapshot_path(self.snapshot_path, base["session_id"]), self.cache_size)
+                segments.insert(0, (parent, 0, base["keep"]))
+            for record in _read_journal(self.snapshot_path.with_suffix(JOURNAL_SUFFIX)):
+                header.update(record.get("header", {}))
+                if "keep" in record:
+                    added = record.get("messages", [])
+                    segments = _truncate(segments, record["keep"]) + [(added, 0, len(added))]
+
+        self._segments = [segment for segment in segments if segment[2] > segment[1]]
+        self._starts = []
+        total = 0
+        for messages, start, stop in self._segments:
+            self._starts.append(total)
+            total += stop - start
+        self._length = total
+        self.session = ChatSession.model_validate(header)
+
+    def _read_header(self) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+        with open(self.snapshot_path, 'rb') as f:
+            first_line = f.readline()
+            if not first_line.rstrip().endswith(MESSAGES_OPEN):
+                return None, []
+            header = json.loads(first_line.rstrip() + b"]}")
+
+            offsets = read_index(self.snapshot_path)
+            if offsets is None:
+                # Find the message lines, and the closing line, without parsing them
+                offsets = []
+                position = len(first_line)
+                for line in f:
+                    offsets.append(position)
+                    position += len(line)
+                write_index(self.snapshot_path, offsets)
+
+        for key in SNAPSHOT_EXCLUDE:
+            header.pop(key, None)
+        header.pop("messages", None)
+        return header, offsets
+
+    # Reading
+
+    def __len__(self) -> int:
+        self._refresh()
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        self._refresh()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self._message(i) for i in range(start, stop, step)]
+            return self._messages(start, stop)
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("message index out of range")
+        return self._message(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_pages()
+
+    def tail(self, count: int) -> List[Dict[str, Any]]:
+        """The last `count` messages, oldest first"""
+        self._refresh()
+        return self._messages(max(0, self._length - count), self._length)
+
+    def page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to `limit` messages starting at `offset`"""
+        self._refresh()
+        return self._messages(max(0, offset), min(self._length, max(0, offset) + limit))
+
+    def iter_pages(self, page_size: int = 100, reverse: bool = False) -> Iterator[Dict[str, Any]]:
+        """Iterate over the messages a page at a time, newest first when `reverse` is set"""
+        length = len(self)
+        if reverse:
+            for stop in range(length, 0, -page_size):
+                yield from reversed(self._messages(max(0, stop - page_size), stop))
+        else:
+            for start in range(0, length, page_size):
+                yield from self._messages(start, min(length, start + page_size))
+
+    def materialize(self) -> ChatSession:
+        """The whole session, with every message read and validated"""
+        self._refresh()
+        data = self.session.model_dump(exclude=SNAPSHOT_EXCLUDE)
+        data["messages"] = self._messages(0, self._length)
+        return ChatSession.model_validate(data)
+
+    # Internals
+
+    def _refresh(self) -> None:
+        """Reload if the session has been saved since the view was opened"""
+        if self._file_stamps() != self._stamp:
+            self._open()
+
+    def _file_stamps(self) -> Tuple[Tuple[int, int], Optional[Tuple[int, int]]]:
+        stat = self.snapshot_path.stat()
+        try:
+            journal_stat = self.snapshot_path.with_suffix(JOURNAL_SUFFIX).stat()
+            journal = (journal_stat.st_size, journal_stat.st_mtime_ns)
+        except FileNotFoundError:
+            journal = None
+        return (stat.st_size, stat.st_mtime_ns), journal
+
+    def _message(self, index: int) -> Dict[str, Any]:
+        return self._messages(index, index + 1)[0]
+
+    def _messages(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        result: List[Dict[str, Any]] = []
+        index = start
+        while index < stop:
+            cached = self._cache.get(index)
+            if cached is not None:
+                self._cache.move_to_end(index)
+                result.append(cached)
+                index += 1
+                continue
+
+            segment_number = bisect_right(self._starts, index) - 1
+            messages, segment_start, segment_stop = self._segments[segment_number]
+            first = segment_start + index - self._starts[segment_number]
+            last = min(segment_stop, first + stop - index)
+            if messages is None:
+                loaded = self._read_snapshot_messages(first, last)
+            elif isinstance(messages, PagedSession):
+                # The shared messages don't change, but compacting the parent moves them
+                messages._refresh()
+                loaded = messages._messages(first, last)
+            else:
+                loaded = [_message_adapter.validate_python(message) for message in messages[first:last]]
+
+            for message in loaded:
+                self._remember(index, message)
+                result.append(message)
+                index += 1
+        return result
+
+    def _read_snapshot_messages(self, first: int, last: int) -> List[Dict[str, Any]]:
+        with open(self.snapshot_path, 'rb') as f:
+            f.seek(self._offsets[first])
+            data = f.read(self._offsets[last] - self._offsets[first])
+        return [_message_adapter.validate_json(line.rstrip(b",")) for line in data.splitlines()]
+
+    def _remember(self, index: int, message: Dict[str, Any]) -> None:
+        self._cache[index] = message
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _truncate(segments: List[Segment], keep: int) -> List[Segment]:
+    """The first `keep` messages of a list of segments"""
+    result = []
+    for messages, start, stop in segments:
+        if keep <= 0:
+            break
+        take = min(keep, stop - start)
+        result.append((messages, start, start + take))
+        keep -= take
+    return result
@@ -4,18 +4,31 @@ Loader class for model configuration data.
 This module provides a loader class to handle loading, parsing, and saving
 of model configurations from JSON files.
 """
+import asyncio
+import base64
 import datetime
 import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set, Tuple, Any
 
-from sqlalchemy import String, Text, Index, select, delete, func
+from sqlalchemy import BigInteger, String, Text, Index, select, delete, func, event, inspect, and_, or_, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from agent_c.util.blob_store import BLOB_REFERENCE_PATTERN, BlobStore, externalize_blobs
 from agent_c.util.string import to_snake_case
 from agent_c.models.chat_history.chat_session import ChatSession, ChatSessionIndexEntry, ChatSessionQueryResponse
 from agent_c.config.config_loader import ConfigLoader
+from agent_c.config.paged_session import PagedSession
+from agent_c.config.session_journal import (SessionJournal, read_session, read_session_data, common_prefix, read_forks,
+                                            write_forks, SNAPSHOT_EXCLUDE, INDEX_SUFFIX, JOURNAL_SUFFIX)
+
+# The size and modification time of a session's files, used to skip unchanged sessions when rebuilding the index
+FileStamp = Tuple[int, int]
 
 
 class Base(DeclarativeBase):
@@ -35,25 +48,98 @@ class ChatSessionIndex(Base):
     user_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     agent_key: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     agent_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    file_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    file_mtime_ns: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     
     __table_args__ = (
-        Index("idx_user_updated", "user_id", "updated_at"),
+        # Serves the session list, newest first, with session_id breaking ties for keyset pagination
+        Index("idx_user_updated_session", "user_id", "updated_at", "session_id"),
     )
 
 
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """Use write-ahead logging, so saves don't block session listing, on every new connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+def _upgrade_index_schema(connection) -> None:
+    """Add the columns and indexes an index database created by an older version is missing"""
+    table = ChatSessionIndex.__table__
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+                                    f"{column.type.compile(connection.dialect)}"))
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+    connection.execute(text("DROP INDEX IF EXISTS idx_user_updated"))
+
+
+def _file_stamp(snapshot_path: Path) -> Optional[FileStamp]:
+    """The combined size and latest modification time of a snapshot and its journal, None if there's no snapshot"""
+    try:
+        stat = snapshot_path.stat()
+    except FileNotFoundError:
+        return None
+    size, mtime_ns = stat.st_size, stat.st_mtime_ns
+    try:
+        journal_stat = snapshot_path.with_suffix(JOURNAL_SUFFIX).stat()
+        size += journal_stat.st_size
+        mtime_ns = max(mtime_ns, journal_stat.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return size, mtime_ns
+
+
+def _encode_cursor(updated_at: str, session_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([updated_at, session_id]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        updated_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(updated_at), str(session_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid session list cursor: {cursor}") from e
+
+
 class SavedChatLoader(ConfigLoader):
     """
     Loader for model configuration files.
 
     Handles loading, parsing, validation, and saving of model configuration
     data from JSON files.
+
+    Saves append what changed to the session's journal rather than rewriting
+    the session file, and forks store only the messages they add to the
+    session they were forked from, see `agent_c.config.session_journal`.
+    Image, document and audio payloads are saved once each in a
+    content-addressed blob store and referenced from the messages, see
+    `agent_c.util.blob_store`.
     """
 
+    # Compact a journal once it reaches this size, or the size of its snapshot if larger
+    journal_compact_bytes: int = 1024 * 1024
+    # Sessions whose saved state is kept in memory, others are rewritten in full on their next save
+    max_tracked_sessions: int = 256
+    # Connections kept open to the index database
+    index_pool_size: int = 4
+    # Threads reading session files while rebuilding the index, and how many sessions are written per transaction
+    rebuild_workers: int = 8
+    rebuild_batch_size: int = 500
+
     def __init__(self, config_path: Optional[str] = None):
         super().__init__(config_path)
         self.save_file_folder = Path(self.config_path).joinpath("saved_sessions")
         self._engine = None
         self._async_session_factory = None
+        self._journals: "OrderedDict[Tuple[str, str], SessionJournal]" = OrderedDict()
+        self._compactions: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._blob_store: Optional[BlobStore] = None
 
     @property
     def db_path(self) -> str:
@@ -64,9 +150,19 @@ class SavedChatLoader(ConfigLoader):
     def engine(self):
         """Get the async SQLAlchemy engine, creating it if necessary."""
         if self._engine is None:
-            self._engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+            self._engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}",
+                                               pool_size=self.index_pool_size, max_overflow=0,
+                                               pool_recycle=-1)
+            event.listen(self._engine.sync_engine, "connect", _configure_sqlite_connection)
         return self._engine
 
+    @property
+    def blob_store(self) -> BlobStore:
+        """The store message payloads are moved to when sessions are saved, creating it if necessary."""
+        if self._blob_store is None:
+            self._blob_store = BlobStore(blob_dir=str(self.save_file_folder.parent / "session_blobs"))
+        return self._blob_store
+
     @property
     def async_session_factory(self):
         """Get the async session factory, creating it if necessary."""
@@ -88,9 +184,10 @@ class SavedChatLoader(ConfigLoader):
         # Ensure the parent directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # Create all tables
+        # Create all tables, and bring an index created by an older version up to date
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_upgrade_index_schema)
         
         self.logger.info(f"Initialized chat session database at {self.db_path}")
 
@@ -100,6 +197,9 @@ class SavedChatLoader(ConfigLoader):
         
         This should be called during application shutdown.
         """
+        if self._compactions:
+            await asyncio.gather(*self._compactions.values(), return_exceptions=True)
+
         if self._engine is not None:
             await self._engine.dispose()
             self._engine = None
@@ -118,6 +218,75 @@ class SavedChatLoader(ConfigLoader):
         sanitized_user_id = to_snake_case(user_id)
         return self.save_file_folder / sanitized_user_id
 
+    def _journal(self, session_id: str, user_id: str) -> SessionJournal:
+        """
+        Get the journal tracking a session's saved state, creating it if necessary.
+
+        Args:
+            session_id: The ID of the session
+            user_id: The user ID who owns the session
+
+        Returns:
+            The session's SessionJournal
+        """
+        key = (user_id, session_id)
+        journal = self._journals.get(key)
+        if journal is not None:
+            self._journals.move_to_end(key)
+            return journal
+
+        journal = SessionJournal(self._get_user_folder(user_id), session_id)
+        self._journals[key] = journal
+        if len(self._journals) > self.max_tracked_sessions:
+            for old_key, old_journal in list(self._journals.items()):
+                if len(self._journals) <= self.max_tracked_sessions:
+                    break
+                if not old_journal.lock.locked() and old_key not in self._compactions:
+                    del self._journals[old_key]
+        return journal
+
+    def release_session(self, session_id: str, user_id: str) -> None:
+        """
+        Stop tracking a session's saved state, freeing the memory it holds.
+
+        The next save of the session rewrites its file in full.
+
+        Args:
+            session_id: The ID of the session
+            user_id: The user ID who owns the session
+        """
+        key = (user_id, session_id)
+        if key not in self._compactions:
+            self._journals.pop(key, None)
+
+    def _schedule_compaction(self, session_id: str, user_id: str, journal: SessionJournal) -> None:
+        key = (user_id, session_id)
+        if key in self._compactions:
+            return
+
+        task = asyncio.create_task(journal.compact())
+        self._compactions[key] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            self._compactions.pop(key, None)
+            if not finished.cancelled() and finished.exception() is not None:
+                self.logger.error(f"Failed to compact journal for session {session_id}: {finished.exception()}")
+
+        task.add_done_callback(_done)
+
+    async def compact_session(self, session_id: str, user_id: str) -> None:
+        """
+        Fold a session's journal into its session file now.
+
+        Args:
+            session_id: The ID of the session to compact
+            user_id: The user ID who owns the session
+        """
+        pending = self._compactions.get((user_id, session_id))
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+        await self._journal(session_id, user_id).compact()
+
     def _session_to_index_entry(self, session: ChatSession) -> ChatSessionIndexEntry:
         """
         Convert a ChatSession to a ChatSessionIndexEntry for indexing.
@@ -138,6 +307,35 @@ class SavedChatLoader(ConfigLoader):
             agent_name=session.agent_config.name
         )
 
+    def _session_file_stamp(self, session_id: str, user_id: str) -> Optional[FileStamp]:
+        """The combined size and latest modification time of a session's snapshot and journal"""
+        return _file_stamp(self._get_user_folder(user_id) / f"{session_id}.json")
+
+    def _index_values(self, session: ChatSession, stamp: Optional[FileStamp]) -> Dict[str, Any]:
+        index_entry = self._session_to_index_entry(session)
+        values = index_entry.model_dump()
+        values["file_size"], values["file_mtime_ns"] = stamp if stamp is not None else (None, None)
+        return values
+
+    async def _upsert_index_entries(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert or replace index entries, in a single transaction.
+
+        Args:
+            rows: The column values of each entry, as made by `_index_values`
+        """
+        if not rows:
+            return
+
+        stmt = sqlite_insert(ChatSessionIndex)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChatSessionIndex.session_id],
+            set_={column: stmt.excluded[column] for column in rows[0] if column != "session_id"}
+        )
+        async with self.async_session_factory() as db_session:
+            await db_session.execute(stmt, rows)
+            await db_session.commit()
+
     async def _create_index_entry(self, session: ChatSession) -> None:
         """
         Create a new index entry for a chat session.
@@ -145,50 +343,18 @@ class SavedChatLoader(ConfigLoader):
         Args:
             session: The ChatSession to index
         """
-        index_entry = self._session_to_index_entry(session)
-        
-        async with self.async_session_factory() as db_session:
-            index_record = ChatSessionIndex(
-                session_id=index_entry.session_id,
-                session_name=index_entry.session_name,
-                created_at=index_entry.created_at,
-                updated_at=index_entry.updated_at,
-                user_id=index_entry.user_id,
-                agent_key = index_entry.agent_key,
-                agent_name = index_entry.agent_name
-            )
-            db_session.add(index_record)
-            await db_session.commit()
-        
-        self.logger.debug(f"Created index entry for session {session.session_id}")
+        await self._update_index_entry(session)
 
     async def _update_index_entry(self, session: ChatSession) -> None:
         """
-        Update an existing index entry for a chat session.
+        Create or update the index entry for a chat session.
         
         Args:
             session: The ChatSession with updated information
         """
-        index_entry = self._session_to_index_entry(session)
-        
-        async with self.async_session_factory() as db_session:
-            # Get existing record
-            stmt = select(ChatSessionIndex).where(ChatSessionIndex.session_id == session.session_id)
-            result = await db_session.execute(stmt)
-            existing_record = result.scalar_one_or_none()
-            
-            if existing_record:
-                # Update fields
-                existing_record.session_name = index_entry.session_name
-                existing_record.updated_at = index_entry.updated_at
-                existing_record.user_id = index_entry.user_id
-                existing_record.agent_key = session.agent_config.key
-                existing_record.agent_name = session.agent_config.name
-                await db_session.commit()
-                self.logger.debug(f"Updated index entry for session {session.session_id}")
-            else:
-                # Record doesn't exist, create it
-                await self._create_index_entry(session)
+        stamp = self._session_file_stamp(session.session_id, session.user_id)
+        await self._upsert_index_entries([self._index_values(session, stamp)])
+        self.logger.debug(f"Updated index entry for session {session.session_id}")
 
     async def _delete_index_entry(self, session_id: str) -> None:
         """
@@ -207,18 +373,43 @@ class SavedChatLoader(ConfigLoader):
             else:
                 self.logger.warning(f"No index entry found to delete for session {session_id}")
 
-    async def get_user_sessions(self, user_id: str, offset: int = 0, limit: int = 50) -> ChatSessionQueryResponse:
+    async def get_user_sessions(self, user_id: str, offset: int = 0, limit: int = 50,
+                                cursor: Optional[str] = None) -> ChatSessionQueryResponse:
         """
         Get paginated chat sessions for a user, sorted by updated_at descending.
+
+        Pass the `next_cursor` of a response as `cursor` to get the page after
+        it.  Paging by cursor costs the same however deep the page is, while
+        `offset` has to skip over every earlier session.
         
         Args:
             user_id: The user ID to query sessions for
             limit: Maximum number of sessions to return (default 50)
-            offset: Number of sessions to skip for pagination (default 0)
+            offset: Number of sessions to skip for pagination (default 0), ignored when a cursor is given
+            cursor: Cursor from a previous response, to continue after its last session
             
         Returns:
-            ChatSessionQueryResponse with chat_sessions list and total_sessions count
+            ChatSessionQueryResponse with chat_sessions list, total_sessions count and the cursor for the next page
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        query_stmt = (
+            select(ChatSessionIndex)
+            .where(ChatSessionIndex.user_id == user_id)
+            .order_by(ChatSessionIndex.updated_at.desc(), ChatSessionIndex.session_id.desc())
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            updated_at, session_id = _decode_cursor(cursor)
+            query_stmt = query_stmt.where(or_(
+                ChatSessionIndex.updated_at < updated_at,
+                and_(ChatSessionIndex.updated_at == updated_at, ChatSessionIndex.session_id < session_id)
+            ))
+            offset = 0
+        elif offset:
+            query_stmt = query_stmt.offset(offset)
+
         async with self.async_session_factory() as db_session:
             # Get the total count for this user
             count_stmt = select(func.count(ChatSessionIndex.session_id)).where(
@@ -227,37 +418,35 @@ class SavedChatLoader(ConfigLoader):
             count_result = await db_session.execute(count_stmt)
             total_sessions = count_result.scalar() or 0
             
-            # Get the paginated results
-            query_stmt = (
-                select(ChatSessionIndex)
-                .where(ChatSessionIndex.user_id == user_id)
-                .order_by(ChatSessionIndex.updated_at.desc())
-                .limit(limit)
-                .offset(offset)
-            )
-            
+            # Get the page, and one more to tell whether there is a next page
             query_result = await db_session.execute(query_stmt)
-            session_records = query_result.scalars().all()
-            
-            # Convert SQLAlchemy records to Pydantic models
-            chat_sessions = [
-                ChatSessionIndexEntry(
-                    session_id=record.session_id,
-                    session_name=record.session_name,
-                    created_at=record.created_at,
-                    updated_at=record.updated_at,
-                    user_id=record.user_id,
-                    agent_key=record.agent_key,
-                    agent_name=record.agent_name
-                )
-                for record in session_records
-            ]
-            
-            return ChatSessionQueryResponse(
-                chat_sessions=chat_sessions,
-                total_sessions=total_sessions,
-                offset=offset
+            session_records = list(query_result.scalars().all())
+
+        next_cursor = None
+        if len(session_records) > limit:
+            session_records = session_records[:limit]
+            next_cursor = _encode_cursor(session_records[-1].updated_at, session_records[-1].session_id)
+
+        # Convert SQLAlchemy records to Pydantic models
+        chat_sessions = [
+            ChatSessionIndexEntry(
+                session_id=record.session_id,
+                session_name=record.session_name,
+                created_at=record.created_at,
+                updated_at=record.updated_at,
+                user_id=record.user_id,
+                agent_key=record.agent_key,
+                agent_name=record.agent_name
             )
+            for record in session_records
+        ]
+        
+        return ChatSessionQueryResponse(
+            chat_sessions=chat_sessions,
+            total_sessions=total_sessions,
+            offset=offset,
+            next_cursor=next_cursor
+        )
 
     def get_user_session_ids(self, user_id: str) -> List[str]:
         """
@@ -374,21 +563,26 @@ class SavedChatLoader(ConfigLoader):
                 "average_sessions_per_user": round(total_sessions / max(total_users, 1), 2)
             }
 
-    async def rebuild_index_and_migrate_files(self) -> dict:
+    async def rebuild_index_and_migrate_files(self, force: bool = False) -> dict:
         """
         Rebuild the SQLite index from existing JSON files and migrate legacy flat structure.
         
         This method will:
-        1. Clear the existing index
-        2. Move any files from legacy flat structure to user subfolders
-        3. Rebuild the index from all JSON session files
+        1. Move any files from legacy flat structure to user subfolders
+        2. Re-index the session files that changed since they were indexed, reading them in parallel
+        3. Remove index entries for sessions whose files are gone
         
+        Args:
+            force: Re-index every session file, changed or not
+
         Returns:
             Dictionary with migration statistics
         """
         stats = {
             "migrated_files": 0,
             "indexed_sessions": 0,
+            "unchanged_sessions": 0,
+            "removed_sessions": 0,
             "errors": [],
             "users_processed": set()
         }
@@ -396,12 +590,6 @@ class SavedChatLoader(ConfigLoader):
         # Ensure database is initialized
         await self.initialize_database()
         
-        # Clear existing index
-        async with self.async_session_factory() as db_session:
-            await db_session.execute(delete(ChatSessionIndex))
-            await db_session.commit()
-        
-        self.logger.info("Cleared existing chat session index")
         paths = [self.save_file_folder, self.save_file_folder.joinpath("agent__c__user")]
         # First, migrate any files from legacy flat structure
         for path in paths:
@@ -443,10 +631,7 @@ class SavedChatLoader(ConfigLoader):
                         self.logger.error(error_msg)
         
         # Now rebuild index from all user folders
-        if self.save_file_folder.exists():
-            for user_folder in self.save_file_folder.iterdir():
-                if user_folder.is_dir() and user_folder.name not in ["deleted"]:
-                    await self._rebuild_index_for_user_folder(user_folder, stats)
+        await self._rebuild_index(stats, force)
         
         # Convert set to list for JSON serialization
         stats["users_processed"] = list(stats["users_processed"])
@@ -454,34 +639,89 @@ class SavedChatLoader(ConfigLoader):
         self.logger.info(
             f"Index rebuild complete. Migrated: {stats['migrated_files']} files, "
             f"Indexed: {stats['indexed_sessions']} sessions, "
+            f"Unchanged: {stats['unchanged_sessions']} sessions, "
+            f"Removed: {stats['removed_sessions']} sessions, "
             f"Users: {len(stats['users_processed'])}, "
             f"Errors: {len(stats['errors'])}"
         )
         
         return stats
     
-    async def _rebuild_index_for_user_folder(self, user_folder: Path, stats: dict) -> None:
+    async def _rebuild_index(self, stats: dict, force: bool = False) -> None:
         """
-        Rebuild index entries for all sessions in a user folder.
-        
+        Bring the index up to date with the session files in every user folder.
+
+        Files whose size and modification time match what was recorded when
+        they were last indexed are skipped.  The rest are read on a thread
+        pool and written to the index in batches.
+
         Args:
-            user_folder: Path to the user's session folder
             stats: Statistics dictionary to update
+            force: Re-index every session file, changed or not
         """
-        for json_file in user_folder.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    session_data = json.load(f)
-                
-                session = ChatSession.model_validate(session_data)
-                await self._create_index_entry(session)
-                stats["indexed_sessions"] += 1
-                stats["users_processed"].add(session.user_id)
-                
-            except Exception as e:
-                error_msg = f"Failed to index {json_file}: {e}"
-                stats["errors"].append(error_msg)
-                self.logger.error(error_msg)
+        async with self.async_session_factory() as db_session:
+            result = await db_session.execute(select(ChatSessionIndex.session_id, ChatSessionIndex.user_id,
+                                                     ChatSessionIndex.file_size, ChatSessionIndex.file_mtime_ns))
+            known = {row.session_id: (row.user_id, (row.file_size, row.file_mtime_ns)) for row in result}
+
+        seen = set()
+        changed: List[Tuple[Path, Optional[FileStamp]]] = []
+        for snapshot_path in self._session_files():
+            stamp = _file_stamp(snapshot_path)
+            entry = known.get(snapshot_path.stem)
+            if not force and entry is not None and entry[1] == stamp:
+                seen.add(snapshot_path.stem)
+                stats["unchanged_sessions"] += 1
+                stats["users_processed"].add(entry[0])
+            else:
+                changed.append((snapshot_path, stamp))
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.rebuild_workers, thread_name_prefix="session-index") as executor:
+            for start in range(0, len(changed), self.rebuild_batch_size):
+                batch = changed[start:start + self.rebuild_batch_size]
+                results = await asyncio.gather(*[loop.run_in_executor(executor, self._read_index_values, path, stamp)
+                                                 for path, stamp in batch], return_exceptions=True)
+                rows = []
+                for (path, _), result in zip(batch, results):
+                    if isinstance(result, BaseException):
+                        error_msg = f"Failed to index {path}: {result}"
+                        stats["errors"].append(error_msg)
+                        self.logger.error(error_msg)
+                        continue
+                    rows.append(result)
+                    seen.add(result["session_id"])
+                    stats["users_processed"].add(result["user_id"])
+
+                await self._upsert_index_entries(rows)
+                stats["indexed_sessions"] += len(rows)
+
+        stale = [session_id for session_id in known if session_id not in seen]
+        async with self.async_session_factory() as db_session:
+            for start in range(0, len(stale), self.rebuild_batch_size):
+                await db_session.execute(delete(ChatSessionIndex).where(
+                    ChatSessionIndex.session_id.in_(stale[start:start + self.rebuild_batch_size])))
+            await db_session.commit()
+        stats["removed_sessions"] += len(stale)
+
+    def _session_files(self) -> List[Path]:
+        """Every session snapshot in the user folders"""
+        if not self.save_file_folder.exists():
+            return []
+
+        files = []
+        for user_folder in os.scandir(self.save_file_folder):
+            if not user_folder.is_dir() or user_folder.name == "deleted":
+                continue
+            for entry in os.scandir(user_folder.path):
+                if entry.name.endswith(".json") and entry.is_file():
+                    files.append(Path(entry.path))
+        return files
+
+    def _read_index_values(self, snapshot_path: Path, stamp: Optional[FileStamp]) -> Dict[str, Any]:
+        """Read a session file and make its index entry, run on the rebuild thread pool"""
+        session = ChatSession.model_validate(read_session_data(snapshot_path))
+        return self._index_values(session, stamp)
 
     async def initialize_with_migration(self) -> dict:
         """
@@ -542,18 +782,49 @@ class SavedChatLoader(ConfigLoader):
             raise FileNotFoundError(f"Session file not found: {session_file}")
 
         try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            session_data, base = read_session(session_file)
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to decode JSON from {session_file}: {e}")
             raise
 
-        return ChatSession.model_validate(session_data)
+        session = ChatSession.model_validate(session_data)
+        self._journal(session_id, user_id).track(session_data, base)
+        return session
+
+    def open_session(self, session_id: str, user_id: str, cache_size: int = 256) -> PagedSession:
+        """
+        Open a saved chat session for reading, without loading its messages.
+
+        Messages are read from disk as they are used, so this is much cheaper
+        than `load_session_id` for showing part of a long session.
+
+        Args:
+            session_id: The ID of the session to open
+            user_id: The user ID to determine which subfolder to search
+            cache_size: How many read messages the view keeps in memory
+
+        Returns:
+            A read-only PagedSession
+
+        Raises:
+            FileNotFoundError: If the session file doesn't exist
+            json.JSONDecodeError: If the JSON is malformed
+        """
+        session_file = self._get_user_folder(user_id) / f"{session_id}.json"
+        if not session_file.exists():
+            self.logger.warning(f"Session file not found: {session_file}")
+            raise FileNotFoundError(f"Session file not found: {session_file}")
+
+        return PagedSession(session_file, cache_size=cache_size)
 
     async def save_session(self, session: ChatSession) -> None:
         """
         Save a chat session to a file in the user's subfolder and update the index.
 
+        Once the session has been saved or loaded, only the changes since then
+        are written, appended to the session's journal.  The journal is
+        compacted into the session file in the background once it grows.
+
         Args:
             session: ChatSession instance to save
 
@@ -562,10 +833,19 @@ class SavedChatLoader(ConfigLoader):
         """
         user_folder = self._get_user_folder(session.user_id)
         user_folder.mkdir(parents=True, exist_ok=True)
-        session_file = user_folder / f"{session.session_id}.json"
+        self._externalize_blobs(session)
+
+        journal = self._journal(session.session_id, session.user_id)
+        header = session.model_dump(exclude=SNAPSHOT_EXCLUDE | {'messages'})
+        async with journal.lock:
+            await self._protect_forks(journal, session.messages, session.user_id)
+            if journal.is_tracking and journal.snapshot_path.exists():
+                journal.record(header, session.messages)
+            else:
+                journal.write_snapshot(header, session.messages)
 
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session.model_dump(exclude={'display_name', 'vendor'}), f, indent=4)
+        if journal.needs_compaction(self.journal_compact_bytes):
+            self._schedule_compaction(session.session_id, session.user_id, journal)
         
         # Update the index
         try:
@@ -573,6 +853,132 @@ class SavedChatLoader(ConfigLoader):
         except Exception as e:
             self.logger.error(f"Failed to update index for session {session.session_id}: {e}")
 
+    async def fork_session(self, session: ChatSession, parent_session_id: str) -> None:
+        """
+        Save a new session forked from a saved one, sharing the messages they start with.
+
+        Only the messages the fork adds are written, so forking is cheap
+        however long the parent is.  The fork is given its own copy of the
+        shared messages if the parent later changes or drops them.
+
+        Args:
+            session: The new session, whose messages start with some or all of the parent's
+            parent_session_id: The saved session it was forked from, owned by the same user
+
+        Raises:
+            FileNotFoundError: If the parent session doesn't exist
+        """
+        user_folder = self._get_user_folder(session.user_id)
+        parent_file = user_folder / f"{parent_session_id}.json"
+        if not parent_file.exists():
+            raise FileNotFoundError(f"Session file not found: {parent_file}")
+
+        self._externalize_blobs(session)
+        parent_journal = self._journal(parent_session_id, session.user_id)
+        journal = self._journal(session.session_id, session.user_id)
+        header = session.model_dump(exclude=SNAPSHOT_EXCLUDE | {'messages'})
+        # Holding the parent's lock keeps it from changing the shared messages until the fork is registered
+        async with parent_journal.lock:
+            if parent_journal.is_tracking:
+                parent_messages = parent_journal.messages
+            else:
+                parent_messages = read_session_data(parent_file).get("messages", [])
+            shared = common_prefix(session.messages, parent_messages)
+
+            async with journal.lock:
+                journal.write_snapshot(header, session.messages,
+                                       base={"session_id": parent_session_id, "keep": shared} if shared else None)
+            if shared:
+                forks = read_forks(parent_file)
+                forks[session.session_id] = shared
+                write_forks(parent_file, forks)
+
+        try:
+            await self._update_index_entry(session)
+        except Exception as e:
+            self.logger.error(f"Failed to update index for session {session.session_id}: {e}")
+
+    def _externalize_blobs(self, session: ChatSession) -> None:
+        """Move the session's embedded payloads to the blob store, leaving references in its messages"""
+        messages = externalize_blobs(session.messages, self.blob_store)
+        if messages is not session.messages:
+            session.messages = messages
+
+    async def collect_blobs(self, min_age: float = 3600) -> int:
+        """
+        Delete blobs no saved session references, including deleted sessions.
+
+        Args:
+            min_age: Seconds a blob must have gone unstored before it can be deleted,
+                which protects the payloads of sessions that have not been saved yet
+
+        Returns:
+            The number of blobs deleted
+        """
+        referenced = await asyncio.to_thread(self._referenced_blobs)
+        return await asyncio.to_thread(self.blob_store.collect, referenced, min_age)
+
+    def _referenced_blobs(self) -> Set[str]:
+        """The digest of every blob referenced from a session file or journal"""
+        referenced: Set[str] = set()
+        if not self.save_file_folder.exists():
+            return referenced
+
+        for folder, _, file_names in os.walk(self.save_file_folder):
+            for file_name in file_names:
+                if not file_name.endswith((".json", JOURNAL_SUFFIX)):
+                    continue
+                try:
+                    with open(os.path.join(folder, file_name), encoding="utf-8") as f:
+                        referenced.update(BLOB_REFERENCE_PATTERN.findall(f.read()))
+                except OSError as e:
+                    # Keep everything rather than risk deleting blobs an unreadable file refers to
+                    raise RuntimeError(f"Cannot read {file_name} to find its blobs: {e}") from e
+        return referenced
+
+    async def _protect_forks(self, journal: SessionJournal, messages: List[Dict], user_id: str) -> None:
+        """
+        Give forks their own copy of the messages they share, before this save changes them.
+
+        Called with the parent's journal locked.
+
+        Args:
+            journal: The journal of the session being saved
+            messages: The messages about to be saved
+            user_id: The user ID who owns the session
+        """
+        forks = read_forks(journal.snapshot_path)
+        if not forks:
+            return
+
+        if journal.is_tracking:
+            saved = journal.messages
+        elif journal.snapshot_path.exists():
+            saved = read_session_data(journal.snapshot_path).get("messages", [])
+        else:
+            saved = []
+        shared = common_prefix(messages, saved)
+
+        remaining = {}
+        for fork_id, keep in forks.items():
+            if keep <= shared:
+                remaining[fork_id] = keep
+            else:
+                await self._detach_fork(fork_id, user_id)
+        if remaining != forks:
+            write_forks(journal.snapshot_path, remaining)
+
+    async def _detach_fork(self, session_id: str, user_id: str) -> None:
+        """Rewrite a fork with all of its messages, so it no longer depends on its parent"""
+        journal = self._journal(session_id, user_id)
+        async with journal.lock:
+            if not journal.snapshot_path.exists():
+                return
+            data = read_session_data(journal.snapshot_path)
+            messages = data.pop("messages", [])
+            journal.write_snapshot(data, messages)
+        self.logger.debug(f"Copied shared messages into fork {session_id} before its parent changed them")
+
     async def delete_session(self, session_id: str, user_id: str) -> None:
         """
         Delete a chat session file by its ID from the user's subfolder.
@@ -593,10 +999,18 @@ class SavedChatLoader(ConfigLoader):
         session: ChatSession = self.load_session_id(session_id, user_id)
         session.deleted_at = datetime.datetime.now().isoformat()
         await self.save_session(session)
+        await self.compact_session(session_id, user_id)
+        journal = self._journal(session_id, user_id)
+        async with journal.lock:
+            for fork_id in read_forks(session_file):
+                await self._detach_fork(fork_id, user_id)
+            write_forks(session_file, {})
+        self.release_session(session_id, user_id)
         # move the file to a deleted folder within the user's folder
         deleted_folder = user_folder / "deleted"
         deleted_folder.mkdir(parents=True, exist_ok=True)
         session_file.rename(deleted_folder / session_file.name)
+        session_file.with_suffix(INDEX_SUFFIX).unlink(missing_ok=True)
         
         # Remove from index
         try:
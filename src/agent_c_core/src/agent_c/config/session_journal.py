@@ -0,0 +1,362 @@
+"""
+Append-only journal for saved chat sessions.
+
+A saved session is a JSON snapshot, `{session_id}.json`, plus a journal,
+`{session_id}.journal`, holding one JSON line per save since the snapshot
+was written.  A journal record carries only what changed:
+
+    {"header": {...changed fields...}, "keep": 40, "messages": [...]}
+
+`keep` is how many of the existing messages are kept, and `messages` are
+appended after them, so an ordinary save records just the new messages and
+a rewind records a smaller `keep`.  Loading replays the journal over the
+snapshot.  Once the journal grows past the snapshot's size, it is folded
+into a new snapshot.
+
+Snapshots are written with the header fields on the first line and one
+message per line after it, which is still a plain JSON document, and
+`{session_id}.index` records where each message line starts.  That lets
+`PagedSession` read single messages without parsing the whole file.
+
+A forked session shares the messages it was forked with.  Its snapshot
+names the session it was forked from and how many of that session's
+messages it starts with, `"fork_of": {"session_id": ..., "keep": 40}`, and
+holds only the messages after them.  The parent lists its forks in
+`{session_id}.forks`, and a fork is given its own copy of the shared
+messages before its parent changes or drops them.
+
+Snapshots are replaced atomically and a torn record at the end of a journal
+is ignored, so a crash loses at most the save in progress.  Replaying a
+journal over a snapshot that already includes some of its records gives the
+same result, so a crash part way through compaction is also safe.
+"""
+import asyncio
+import copy
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SNAPSHOT_SUFFIX = ".json"
+JOURNAL_SUFFIX = ".journal"
+INDEX_SUFFIX = ".index"
+FORKS_SUFFIX = ".forks"
+FORK_KEY = "fork_of"
+SNAPSHOT_EXCLUDE = {"display_name", "vendor"}
+MESSAGES_OPEN = b'"messages": ['
+MESSAGES_CLOSE = b"]}\n"
+
+
+def read_session_data(snapshot_path: Path) -> Dict[str, Any]:
+    """
+    Read a saved session as a dict, replaying its journal if it has one.
+
+    Raises:
+        FileNotFoundError: If the snapshot doesn't exist
+        json.JSONDecodeError: If the snapshot is malformed
+    """
+    return read_session(snapshot_path)[0]
+
+
+def read_session(snapshot_path: Path) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Read a saved session as a dict, along with the messages it shares if it's a fork.
+
+    Returns:
+        The session data, and for a fork the parent session ID and how many of its messages are shared
+
+    Raises:
+        FileNotFoundError: If the snapshot, or the snapshot of a session it was forked from, doesn't exist
+        json.JSONDecodeError: If the snapshot is malformed
+    """
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    for key in SNAPSHOT_EXCLUDE:
+        data.pop(key, None)
+
+    base = data.pop(FORK_KEY, None)
+    if base:
+        parent = read_session_data(parent_snapshot_path(snapshot_path, base["session_id"]))
+        data["messages"] = parent.get("messages", [])[:base["keep"]] + data.get("messages", [])
+
+    for record in _read_journal(snapshot_path.with_suffix(JOURNAL_SUFFIX)):
+        apply_record(data, record)
+        if base and record.get("keep", base["keep"]) < base["keep"]:
+            base = {"session_id": base["session_id"], "keep": record["keep"]}
+    return data, base
+
+
+def parent_snapshot_path(snapshot_path: Path, parent_session_id: str) -> Path:
+    """The snapshot of the session a fork was made from, which may since have been deleted"""
+    path = snapshot_path.parent / f"{parent_session_id}{SNAPSHOT_SUFFIX}"
+    if not path.exists() and (snapshot_path.parent / "deleted" / path.name).exists():
+        return snapshot_path.parent / "deleted" / path.name
+    return path
+
+
+def common_prefix(first: List[Dict[str, Any]], second: List[Dict[str, Any]]) -> int:
+    """How many messages two message lists start with in common"""
+    count = 0
+    limit = min(len(first), len(second))
+    while count < limit and first[count] == second[count]:
+        count += 1
+    return count
+
+
+def read_forks(snapshot_path: Path) -> Dict[str, int]:
+    """The forks of a session, and how many of its messages each shares"""
+    try:
+        with open(snapshot_path.with_suffix(FORKS_SUFFIX), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_forks(snapshot_path: Path, forks: Dict[str, int]) -> None:
+    forks_path = snapshot_path.with_suffix(FORKS_SUFFIX)
+    if not forks:
+        forks_path.unlink(missing_ok=True)
+        return
+    temp_path = forks_path.with_suffix(f"{FORKS_SUFFIX}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(forks, f)
+    os.replace(temp_path, forks_path)
+
+
+def apply_record(data: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Apply one journal record to session data in place"""
+    data.update(record.get("header", {}))
+    if "keep" in record:
+        data["messages"] = data.get("messages", [])[:record["keep"]] + record.get("messages", [])
+
+
+def write_snapshot_file(path: Path, header: Dict[str, Any], messages: List[Dict[str, Any]]) -> List[int]:
+    """
+    Write session data as a snapshot, one message per line.
+
+    Returns:
+        The offset of each message line, followed by the offset of the closing line
+    """
+    head = json.dumps(header).encode("utf-8")
+    head = head[:-1] + (b", " if len(head) > 2 else b"") + MESSAGES_OPEN + b"\n"
+    offsets = []
+    with open(path, 'wb') as f:
+        position = f.write(head)
+        last = len(messages) - 1
+        for i, message in enumerate(messages):
+            offsets.append(position)
+            position += f.write(json.dumps(message).encode("utf-8") + (b",\n" if i < last else b"\n"))
+        offsets.append(position)
+        f.write(MESSAGES_CLOSE)
+    return offsets
+
+
+def write_index(snapshot_path: Path, offsets: List[int]) -> None:
+    """Record where a snapshot's message lines start, along with the snapshot's size and time"""
+    stat = snapshot_path.stat()
+    index = array('Q', [stat.st_size, stat.st_mtime_ns])
+    index.extend(offsets)
+    index_path = snapshot_path.with_suffix(INDEX_SUFFIX)
+    temp_path = index_path.with_suffix(f"{INDEX_SUFFIX}.tmp")
+    with open(temp_path, 'wb') as f:
+        f.write(index.tobytes())
+    os.replace(temp_path, index_path)
+
+
+def read_index(snapshot_path: Path) -> Optional[List[int]]:
+    """Read a snapshot's message offsets, None if there is no index or it is out of date"""
+    try:
+        with open(snapshot_path.with_suffix(INDEX_SUFFIX), 'rb') as f:
+            data = f.read()
+        stat = snapshot_path.stat()
+    except FileNotFoundError:
+        return None
+
+    index = array('Q')
+    try:
+        index.frombytes(data)
+    except ValueError:
+        return None
+    if len(index) < 3 or index[0] != stat.st_size or index[1] != stat.st_mtime_ns:
+        return None
+    return index[2:].tolist()
+
+
+def _read_journal(journal_path: Path) -> List[Dict[str, Any]]:
+    return _scan_journal(journal_path)[0]
+
+
+def _scan_journal(journal_path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """Read the intact records of a journal, and how many bytes they take"""
+    try:
+        with open(journal_path, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return [], 0
+
+    records, size = [], 0
+    for line in lines:
+        if not line.endswith(b"\n"):
+            break  # torn by a crash part way through a save
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+        size += len(line)
+    return records, size
+
+
+class SessionJournal:
+    """
+    Tracks what has been saved for one session, so saves write only the change.
+
+    The journal keeps its own copy of the saved messages, new messages being
+    copied as they are saved, so messages edited in place after a save are
+    still noticed.
+    """
+
+    def __init__(self, folder: Path, session_id: str):
+        self.snapshot_path = folder / f"{session_id}{SNAPSHOT_SUFFIX}"
+        self.journal_path = folder / f"{session_id}{JOURNAL_SUFFIX}"
+        self.lock = asyncio.Lock()
+        self.header: Optional[Dict[str, Any]] = None
+        self.messages: List[Dict[str, Any]] = []
+        # For a fork, the parent session and how many of its messages are still shared
+        self.base: Optional[Dict[str, Any]] = None
+        self.snapshot_bytes = 0
+        self.journal_bytes = 0
+        self._generation = 0
+
+    @property
+    def is_tracking(self) -> bool:
+        """True once the journal knows what is on disk"""
+        return self.header is not None
+
+    def track(self, data: Dict[str, Any], base: Optional[Dict[str, Any]] = None) -> None:
+        """Record session data just read from disk, and for a fork the messages it shares, as what has been saved"""
+        self.messages = copy.deepcopy(data.get("messages", []))
+        self.header = {key: value for key, value in data.items() if key != "messages"}
+        self.base = base
+        self.snapshot_bytes = _size(self.snapshot_path)
+        self.journal_bytes = _scan_journal(self.journal_path)[1]
+        if _size(self.journal_path) > self.journal_bytes:
+            # Drop a torn record so the next one starts on a line of its own
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(self.journal_bytes)
+
+    def record(self, header: Dict[str, Any], messages: List[Dict[str, Any]]) -> int:
+        """
+        Append the difference between this session data and the last save.
+
+        Returns:
+            The number of bytes appended to the journal
+        """
+        record: Dict[str, Any] = {}
+        changed = {key: value for key, value in header.items() if self.header.get(key) != value}
+        if changed:
+            record["header"] = changed
+
+        keep = common_prefix(messages, self.messages)
+        if keep < len(self.messages) or keep < len(messages):
+            record["keep"] = keep
+            record["messages"] = messages[keep:]
+
+        if not record:
+            return 0
+
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.journal_path, 'ab') as f:
+            f.write(line)
+
+        self.header = dict(header)
+        if "keep" in record:
+            self.messages = self.messages[:keep] + copy.deepcopy(record["messages"])
+            if self.base and keep < self.base["keep"]:
+                self.base = {"session_id": self.base["session_id"], "keep": keep}
+        self.journal_bytes += len(line)
+        return len(line)
+
+    def write_snapshot(self, header: Dict[str, Any], messages: List[Dict[str, Any]],
+                       base: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Replace the snapshot with this session data and discard the journal.
+
+        Args:
+            header: The session's fields other than its messages
+            messages: All of the session's messages
+            base: For a fork, the parent session ID and how many of its messages `messages` starts with
+        """
+        temp_path = self.snapshot_path.with_suffix(f"{SNAPSHOT_SUFFIX}.tmp")
+        offsets = write_snapshot_file(temp_path, *_snapshot_parts(header, messages, base))
+        self._install_snapshot(temp_path, offsets)
+        self.journal_path.unlink(missing_ok=True)
+        self.header = dict(header)
+        self.messages = copy.deepcopy(messages)
+        self.base = base
+        self.journal_bytes = 0
+        self._generation += 1
+
+    def needs_compaction(self, min_bytes: int) -> bool:
+        """True once replaying the journal would cost more than reading the snapshot"""
+        return self.journal_bytes >= max(min_bytes, self.snapshot_bytes)
+
+    async def compact(self) -> None:
+        """
+        Fold the journal into a new snapshot.
+
+        The snapshot is serialized on a worker thread; saves made meanwhile
+        stay in the journal.
+        """
+        async with self.lock:
+            if not self.is_tracking or not self.journal_bytes:
+                return
+            header, messages, mark, generation = dict(self.header), self.messages, self.journal_bytes, self._generation
+            header, messages = _snapshot_parts(header, messages, self.base)
+
+        # record() replaces self.messages rather than changing it, so this list is stable
+        temp_path = self.snapshot_path.with_suffix(f"{SNAPSHOT_SUFFIX}.compact")
+        offsets = await asyncio.to_thread(write_snapshot_file, temp_path, header, messages)
+
+        async with self.lock:
+            if generation != self._generation:
+                # A full snapshot was written meanwhile, this one is out of date
+                temp_path.unlink(missing_ok=True)
+                return
+
+            tail = b""
+            if self.journal_bytes > mark:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(mark)
+                    tail = f.read()
+
+            self._install_snapshot(temp_path, offsets)
+            if tail:
+                journal_temp_path = self.journal_path.with_suffix(f"{JOURNAL_SUFFIX}.tmp")
+                with open(journal_temp_path, 'wb') as f:
+                    f.write(tail)
+                os.replace(journal_temp_path, self.journal_path)
+            else:
+                self.journal_path.unlink(missing_ok=True)
+            self.journal_bytes = len(tail)
+            self._generation += 1
+
+    def _install_snapshot(self, temp_path: Path, offsets: List[int]) -> None:
+        os.replace(temp_path, self.snapshot_path)
+        self.snapshot_bytes = _size(self.snapshot_path)
+        write_index(self.snapshot_path, offsets)
+
+
+def _snapshot_parts(header: Dict[str, Any], messages: List[Dict[str, Any]],
+                    base: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """What a snapshot holds: a fork stores a reference to its shared messages rather than the messages"""
+    if not base or not base["keep"]:
+        return header, messages
+    return {**header, FORK_KEY: base}, messages[base["keep"]:]
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
@@ -20,6 +20,7 @@ class AgentConfigurationBase(BaseModel):
     tools: List[str] = Field(default_factory=list, description="List of enabled toolset names the agent can use")
     blocked_tool_patterns: List[str] = Field(default_factory=list, description="A list of patterns for blocking individual tools like `run_*`")
     allowed_tool_patterns: List[str] = Field(default_factory=list, description="A list of patterns for allowing individual tools like `run_pnpm` (overrides blocks)")
+    tool_index: bool = Field(False, description="Send a compact index of tool names and load full tool schemas on demand instead of sending every schema")
 
     def filter_allowed_tools(self, schemas: List[Dict[str, any]]) -> List[Dict[str, Any]]:
         """
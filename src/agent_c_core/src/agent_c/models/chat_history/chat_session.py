@@ -28,6 +28,7 @@ class ChatSessionQueryResponse(BaseModel):
     chat_sessions: List[ChatSessionIndexEntry] = Field(default_factory=list, description="List of chat session index entries")
     total_sessions: int = Field(0, description="Total number of sessions available for the query")
     offset: int = Field(0, description="The offset used in the query")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the page after this one, None if this is the last page")
 
 
 class ChatSession(BaseModel):
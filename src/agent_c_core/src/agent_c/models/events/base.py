@@ -1,10 +1,15 @@
-from typing import Any
+import copy
+from typing import Any, ClassVar, Callable, FrozenSet, Optional, Tuple
 from pydantic import Field
+from pydantic_core import PydanticUndefined
 
 from agent_c.util import to_snake_case
 from agent_c.models.base import BaseModel
 from agent_c.util.registries.event import EventRegistry
 
+_MISSING = object()
+_set_attribute = object.__setattr__
+
 
 class BaseEvent(BaseModel):
     """
@@ -21,9 +26,14 @@ class BaseEvent(BaseModel):
     """
     type: str = Field(default_factory=lambda: None, description="The type of the event. Defaults to the snake case class name without event" )
 
+    # Computed once per class, see _prepare_event_class
+    _event_type_name: ClassVar[str]
+    _trusted_fields: ClassVar[Tuple[Tuple[str, Any, Optional[Callable[[], Any]]], ...]]
+    _trusted_field_names: ClassVar[FrozenSet[str]]
+
     def __init__(self, **data: Any) -> None:
         if 'type' not in data or data['type'] is None:
-            data['type'] = to_snake_case(self.__class__.__name__.removesuffix('Event'))
+            data['type'] = self.__class__._event_type_name
 
         super().__init__(**data)
 
@@ -31,3 +41,63 @@ class BaseEvent(BaseModel):
         """Auto-register event classes when they're defined"""
         super().__init_subclass__(**kwargs)
         EventRegistry.register(cls)
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        _prepare_event_class(cls)
+
+    @classmethod
+    def trusted(cls, **data: Any) -> 'BaseEvent':
+        """
+        Builds an event without validating it.
+
+        Meant for the high-rate events the runtime raises itself, such as text deltas,
+        where the values are known to be of the right types.  Fields that are not
+        given take their defaults, and `type` defaults to the class's event type.
+        Unknown fields raise a TypeError, as the constructor would, rather than being dropped.
+        Anything built from outside input should go through the normal constructor.
+        """
+        if data.get('type') is None:
+            data['type'] = cls._event_type_name
+
+        unknown = data.keys() - cls._trusted_field_names
+        if unknown:
+            raise TypeError(f"{cls.__name__}.trusted() got unexpected fields: {', '.join(sorted(unknown))}")
+
+        values = {}
+        for name, default, factory in cls._trusted_fields:
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                if factory is None:
+                    raise TypeError(f"{cls.__name__}.trusted() missing required field '{name}'")
+                value = factory() if default is _MISSING else default
+            values[name] = value
+
+        event = cls.__new__(cls)
+        _set_attribute(event, '__dict__', values)
+        _set_attribute(event, '__pydantic_fields_set__', set(data))
+        _set_attribute(event, '__pydantic_extra__', None)
+        _set_attribute(event, '__pydantic_private__', None)
+        return event
+
+
+def _prepare_event_class(cls) -> None:
+    """Caches the default type name and the field defaults used by `BaseEvent.trusted`"""
+    cls._event_type_name = to_snake_case(cls.__name__.removesuffix('Event'))
+
+    fields = []
+    for name, info in cls.model_fields.items():
+        if info.default_factory is not None:
+            fields.append((name, _MISSING, info.default_factory))
+        elif info.default is PydanticUndefined:
+            fields.append((name, _MISSING, None))
+        elif isinstance(info.default, (list, dict, set)):
+            fields.append((name, _MISSING, lambda default=info.default: copy.copy(default)))
+        else:
+            fields.append((name, info.default, _MISSING))
+    cls._trusted_fields = tuple(fields)
+    cls._trusted_field_names = frozenset(cls.model_fields)
+
+
+_prepare_event_class(BaseEvent)
@@ -1,3 +1,5 @@
+import copy
+
 from pydantic import Field
 from typing import Optional, List, Dict, Any, Literal
 
@@ -118,6 +120,12 @@ class ThoughtDeltaEvent(TextDeltaEvent):
         super().__init__(type = "thought_delta", **data)
         self.role = self.role + " (thought)"
 
+    @classmethod
+    def trusted(cls, **data):
+        if 'role' in data:
+            data['role'] = data['role'] + " (thought)"
+        return super().trusted(**data)
+
 class CompleteThoughtEvent(TextDeltaEvent):
     """
     Sends the final thought content when a thought is completed ffor clients that don't track deltas
@@ -126,6 +134,12 @@ class CompleteThoughtEvent(TextDeltaEvent):
         super().__init__(type = "complete_thought", **data)
         self.role = self.role + " (thought)"
 
+    @classmethod
+    def trusted(cls, **data):
+        if 'role' in data:
+            data['role'] = data['role'] + " (thought)"
+        return super().trusted(**data)
+
 class AudioInputDeltaEvent(BaseEvent):
     """
     Clients that cannot use binary audio input can send audio input in chunks using this event.
@@ -151,14 +165,74 @@ class ReceivedAudioDeltaEvent(SessionEvent):
 class HistoryEvent(SessionEvent):
     """
     Sent to notify the UI that the message history has been updated.
-    It will contain the ENTIRE history of messages in vendor format
     Most clients should ignore this event, as they will maintain their own history by assembling deltas.
+
+    Each event brings the history to a new `version`.  When `base_version` is None, `messages` is the
+    ENTIRE history of messages in vendor format.  Otherwise, the event only carries what changed since
+    `base_version`: the first `keep` messages of that version are unchanged, and `messages` replaces
+    the rest.  A client that does not have `base_version` is out of step, and should ask for the full
+    history again.
+
+    Agents raise the messages with large payloads as blob references (see `agent_c.util.blob_store`);
+    these are inflated back to base64 before the event is sent to a client.
     """
     def __init__(self, **data):
         super().__init__(type = "history", **data)
 
     vendor: str = Field(..., description="The vendor of the model being used for the user request, e.g., 'openai', 'anthropic', etc.")
-    messages: List[dict] = Field(..., description="The list of messages in the current chat history")
+    messages: List[dict] = Field(..., description="The messages in the history, from index `keep` on")
+    version: int = Field(0, description="The version of the history after this event")
+    base_version: Optional[int] = Field(None, description="The version of the history this event applies to, None if it carries the entire history")
+    keep: int = Field(0, description="How many messages at the start of the base version this event keeps")
+    full_messages: Optional[List[dict]] = Field(None, exclude=True,
+                                                description="The entire history, for in-process listeners that fall out of step. Never serialized.")
+
+    @classmethod
+    def since(cls, messages: List[dict], previous: Optional[List[dict]], version: int, **data) -> "HistoryEvent":
+        """
+        Make the event for a history that was at `version` with the messages in `previous`.
+
+        A message changed in place after it was sent looks unchanged, so
+        changes must be made by replacing messages.
+
+        Args:
+            messages: The history now
+            previous: The history at `version`, None if there is no earlier version to build on
+            version: The version `previous` was sent as
+        """
+        if previous is None:
+            return cls(messages=messages, version=version + 1, full_messages=messages, **data)
+
+        keep = 0
+        limit = min(len(messages), len(previous))
+        while keep < limit and (messages[keep] is previous[keep] or messages[keep] == previous[keep]):
+            keep += 1
+        return cls(messages=messages[keep:], version=version + 1, base_version=version, keep=keep,
+                   full_messages=messages, **data)
+
+    def apply(self, messages: Optional[List[dict]], version: Optional[int], copy_messages: bool = False) -> List[dict]:
+        """
+        The history after this event, given the history at `version`.
+
+        Args:
+            messages: The history at `version`, None if unknown
+            version: The version of `messages`
+            copy_messages: Deep copy the messages taken from this event
+
+        Raises:
+            ValueError: If the event can't be applied to the history given, and doesn't have the full history
+        """
+        if self.base_version is None:
+            return copy.deepcopy(self.messages) if copy_messages else list(self.messages)
+
+        if messages is not None and version == self.base_version and len(messages) >= self.keep:
+            added = copy.deepcopy(self.messages) if copy_messages else list(self.messages)
+            return messages[:self.keep] + added
+
+        if self.full_messages is not None:
+            return copy.deepcopy(self.full_messages) if copy_messages else list(self.full_messages)
+
+        raise ValueError(f"History version {self.base_version} is needed to apply version {self.version}, have {version}")
 
 class HistoryDeltaEvent(SessionEvent):
     """
@@ -1,8 +1,10 @@
 import logging
 from openai import AsyncOpenAI
+from pydantic import BaseModel
 from typing import Callable, Optional, Tuple, Any, Dict
 
 from agent_c.models import ImageInput
+from agent_c.util.response_cache import ResponseCache
 
 
 class StructuredOneshot:
@@ -26,15 +28,20 @@ class StructuredOneshot:
                 open_ai_client (AsyncOpenAI, optional): Client for OpenAI API calls. Defaults to AsyncOpenAI().
                 temperature (float, optional): Temperature setting for the model. Defaults to 0.0.
                 max_retries (int, optional): Maximum retry attempts for validation failures. Defaults to 3.
+                response_cache (ResponseCache, optional): Cache for validated results. Defaults to None.
+                use_response_cache (bool, optional): Force the cache on or off, by default it is only
+                                                     used when temperature is 0.
         """
         self.output_model: Optional[str] = kwargs.get('output_model')
         self._completion_callback: Optional[Callable[['StructuredOneshot', Any], None]] = kwargs.get('completion_callback')
         self._validation_callback: Optional[Callable[[int, Any, Any], Tuple[bool, str]]] = kwargs.get('validation_callback')
         self.model_name: str = kwargs.get('model_name', 'gpt-4o-2024-08-06')
         self.prompt: Optional[str] = kwargs.get('prompt')
-        self.client: AsyncOpenAI = kwargs.get('open_ai_client', AsyncOpenAI())
+        self.client: AsyncOpenAI = kwargs.get('open_ai_client') or AsyncOpenAI()
         self.temperature: float = kwargs.get('temperature', 0.0)
         self.max_retries: int = kwargs.get('max_retries', 3)
+        self.response_cache: Optional[ResponseCache] = kwargs.get('response_cache')
+        self.use_response_cache: Optional[bool] = kwargs.get('use_response_cache')
 
     def completion_callback(self, result: Any) -> None:
         """
@@ -63,6 +70,18 @@ class StructuredOneshot:
             return self._validation_callback(attempt, result, state)
         return True, None
 
+    def _from_cache(self, cache_key: str, response_format: Any) -> Any:
+        cached = self.response_cache.get(cache_key)
+        if isinstance(cached, dict) and isinstance(response_format, type) and issubclass(response_format, BaseModel):
+            return response_format.model_validate(cached)
+        return cached
+
+    def _to_cache(self, cache_key: str, result: Any) -> None:
+        # Parsed results are stored as plain data so they do not depend on pickling the output model
+        if isinstance(result, BaseModel):
+            result = result.model_dump()
+        self.response_cache.set(cache_key, result)
+
     async def run(self, user_message: str, image: Optional[ImageInput] = None,
                   response_format: Optional[str] = None, prompt: Optional[str] = None) -> Dict:
         """
@@ -99,6 +118,17 @@ class StructuredOneshot:
             ]
             messages = [{"role": "system", "content": prompt}, {"role": "user", "content": contents}]
 
+        cache_key = None
+        if self.response_cache is not None and ResponseCache.should_use(self.use_response_cache, self.temperature):
+            cache_key = ResponseCache.make_key(oneshot=self.__class__.__name__, model=self.model_name,
+                                               temperature=self.temperature, messages=messages,
+                                               response_format=response_format)
+            result = self._from_cache(cache_key, response_format)
+            # Validation callbacks can differ between callers, so cached results are validated again
+            if result is not None and self.validation_callback(1, result, None)[0]:
+                self.completion_callback(result)
+                return result
+
         result = None
         attempt = 0
         state = None
@@ -122,6 +152,8 @@ class StructuredOneshot:
             # Validate the model response
             valid, val_error = self.validation_callback(attempt, result, state)
             if valid:
+                if cache_key is not None and result is not None:
+                    self._to_cache(cache_key, result)
                 break
 
             logging.warning(f"Validation failed on attempt {attempt} of {self.max_retries}. Validation message:\n{val_error}")
@@ -1,7 +1,7 @@
 import platform
 import logging
 import datetime
-from typing import Any
+from typing import Any, ClassVar, FrozenSet
 from agent_c.prompting.prompt_section import PromptSection, property_bag_item
 
 
@@ -23,6 +23,8 @@ class CoreInstructionSection(PromptSection):
                     Can contain 'template' to override the default instruction set.
     """
 
+    volatile_properties: ClassVar[FrozenSet[str]] = frozenset({"timestamp"})
+
     def __init__(self, **data: Any) -> None:
         # Default template for the instructions
         TEMPLATE: str = (
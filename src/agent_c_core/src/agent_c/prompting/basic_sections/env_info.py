@@ -2,7 +2,7 @@ import os
 import platform
 import datetime
 
-from typing import Any,  Optional, TYPE_CHECKING
+from typing import Any, ClassVar, FrozenSet, Optional, TYPE_CHECKING
 
 from agent_c.prompting.prompt_section import PromptSection, property_bag_item
 
@@ -18,6 +18,8 @@ class EnvironmentInfoSection(PromptSection):
         **data (Any): Additional keyword arguments passed to the PromptSection during initialization.
     """
 
+    volatile_properties: ClassVar[FrozenSet[str]] = frozenset({"timestamp"})
+
     def __init__(self, **data: Any) -> None:
         """
         Initializes the EnvironmentInfoSection with template, environment rules, and other relevant data.
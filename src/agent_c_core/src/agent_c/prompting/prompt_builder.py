@@ -1,6 +1,6 @@
 import re
 import logging
-from typing import List, Dict, Any, Set, Optional
+from typing import List, Dict, Any, Set, Optional, Tuple
 from agent_c.prompting.prompt_section import PromptSection
 from agent_c.util.logging_utils import LoggingManager
 
@@ -53,7 +53,24 @@ class PromptBuilder:
             KeyError: If a required key is missing from the data dictionary.
             Exception: If an unexpected error occurs during rendering.
         """
+        result, _ = await self.render_with_stable(data, tool_sections)
+        return result
+
+    async def render_with_stable(self, data: Dict[str, Any],
+                                 tool_sections: Optional[List[PromptSection]] = None) -> Tuple[str, str]:
+        """
+        Render the prompt, along with a stable rendering that leaves the sections' volatile properties,
+        such as the current time, as placeholders.
+
+        Args:
+            data (Dict[str, Any]): A dictionary containing the data to render the sections with.
+            tool_sections (Optional[List[PromptSection]]): As for `render`
+
+        Returns:
+            Tuple[str, str]: The rendered prompt and its stable rendering.
+        """
         rendered_sections: List[str] = []
+        stable_sections: List[str] = []
         if tool_sections is None:
             tool_sections = self.tool_sections
 
@@ -65,18 +82,20 @@ class PromptBuilder:
                 continue
 
             rendered_sections.append(f"# {section_list_titles[index]}\n\n")
+            stable_sections.append(rendered_sections[-1])
 
             header_prefix = "#" * (index + 1)
 
             for section in section_list:
                 try:
-                    rendered_section: str = await section.render(data)
-                    rendered_section += "\n\n"
+                    for rendered_section, sections in zip(await section.render_with_stable(data),
+                                                          (rendered_sections, stable_sections)):
+                        rendered_section += "\n\n"
 
-                    if section.render_section_header:
-                        rendered_section = f"{header_prefix} {section.name}\n{rendered_section}"
+                        if section.render_section_header:
+                            rendered_section = f"{header_prefix} {section.name}\n{rendered_section}"
 
-                    rendered_sections.append(rendered_section)
+                        sections.append(rendered_section)
                 except KeyError as e:
                     missing_key = str(e).strip("'")
                     template_vars = self._get_template_variables(section.template)
@@ -91,5 +110,4 @@ class PromptBuilder:
                     if section.required:
                         raise
 
-        result = "\n".join(rendered_sections)
-        return result
+        return "\n".join(rendered_sections), "\n".join(stable_sections)
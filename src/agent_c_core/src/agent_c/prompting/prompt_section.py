@@ -3,7 +3,7 @@ import logging
 from functools import wraps
 from string import Template
 
-from typing import Callable, Any, Dict
+from typing import Callable, Any, ClassVar, Dict, FrozenSet, Tuple
 from pydantic import BaseModel, ConfigDict
 
 from agent_c.util.logging_utils import LoggingManager
@@ -38,8 +38,11 @@ class PromptSection(BaseModel):
         template (str): The template string for the section.
         render_section_header (bool): Flag to determine if a header should be rendered for the section.
         required (bool): Flag to determine if the section is required.
+        volatile_properties (FrozenSet[str]): Dynamic properties that change from one render to the next,
+            such as the current time, left as placeholders in the stable rendering.
     """
     model_config = ConfigDict(arbitrary_types_allowed=True, protected_namespaces=())
+    volatile_properties: ClassVar[FrozenSet[str]] = frozenset()
     name: str
     template: str
     render_section_header: bool = True
@@ -89,7 +92,17 @@ class PromptSection(BaseModel):
         return dynamic_props
 
     async def render(self, data: Dict[str, Any]) -> str:
+        result, _ = await self.render_with_stable(data)
+        return result
+
+    async def render_with_stable(self, data: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Render the section, along with a stable rendering that leaves the volatile properties as placeholders.
+
+        The stable rendering only changes when something other than the volatile
+        properties does, which makes it suitable for cache keys.
+        """
         section_data: Dict[str, Any] = {**data, **await self.get_dynamic_properties(data)}
+        stable_data: Dict[str, Any] = section_data | {name: f"${{{name}}}" for name in self.volatile_properties}
         template: Template = Template(self.template)
-        result = template.substitute(section_data)
-        return result
+        return template.substitute(section_data), template.substitute(stable_data)
@@ -0,0 +1,330 @@
+"""
+Compiled validation and coercion of tool call arguments.
+
+`json_schema` compiles the parameter schema of each tool once, when the
+decorated class is defined, into a tree of small check functions.  `ToolChest`
+runs the compiled validator on the arguments the model supplied before
+dispatching the call, so malformed calls are rejected with a compact list of
+errors instead of failing somewhere inside the tool.
+
+Coercion is deliberately forgiving of the ways models commonly get types
+wrong: numbers and booleans sent as strings, arrays and objects sent as JSON
+strings, integral floats for integers, and explicit nulls for optional
+parameters (dropped so the tool's own default applies).
+"""
+import json
+import re
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Errors = List[Dict[str, str]]
+Check = Callable[[Any, str, Errors], Any]
+
+_MISSING = object()
+_TRUE_STRINGS = frozenset(("true", "yes", "1"))
+_FALSE_STRINGS = frozenset(("false", "no", "0"))
+
+
+def _describe(value: Any) -> str:
+    text = repr(value)
+    return text if len(text) <= 40 else f"{text[:37]}..."
+
+
+def _error(errors: Errors, path: str, message: str) -> Any:
+    errors.append({"param": path, "error": message})
+    return _MISSING
+
+
+def _coerce_string(value: Any, path: str, errors: Errors) -> Any:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return _error(errors, path, f"expected string, got {type(value).__name__} {_describe(value)}")
+
+
+def _coerce_integer(value: Any, path: str, errors: Errors) -> Any:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    return _error(errors, path, f"expected integer, got {type(value).__name__} {_describe(value)}")
+
+
+def _coerce_number(value: Any, path: str, errors: Errors) -> Any:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            try:
+                return float(text)
+            except ValueError:
+                pass
+    return _error(errors, path, f"expected number, got {type(value).__name__} {_describe(value)}")
+
+
+def _coerce_boolean(value: Any, path: str, errors: Errors) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    return _error(errors, path, f"expected boolean, got {type(value).__name__} {_describe(value)}")
+
+
+def _coerce_json(expected: type, name: str) -> Check:
+    def coerce(value: Any, path: str, errors: Errors) -> Any:
+        if isinstance(value, expected):
+            return value
+        if expected is list and isinstance(value, tuple):
+            return list(value)
+        if isinstance(value, str):
+            try:
+                parsed = json.loads(value)
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, expected):
+                return parsed
+        return _error(errors, path, f"expected {name}, got {type(value).__name__} {_describe(value)}")
+    return coerce
+
+
+def _coerce_null(value: Any, path: str, errors: Errors) -> Any:
+    if value is None:
+        return None
+    return _error(errors, path, f"expected null, got {type(value).__name__} {_describe(value)}")
+
+
+_TYPE_COERCERS: Dict[str, Check] = {
+    "string": _coerce_string,
+    "integer": _coerce_integer,
+    "number": _coerce_number,
+    "boolean": _coerce_boolean,
+    "array": _coerce_json(list, "array"),
+    "object": _coerce_json(dict, "object"),
+    "null": _coerce_null,
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Whether a value already is of a schema type, without any coercion
+_TYPE_MATCHES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+}
+
+
+def _type_check(schema_type: Any) -> Optional[Check]:
+    if schema_type is None:
+        return None
+    if isinstance(schema_type, str):
+        return _TYPE_COERCERS.get(schema_type)
+
+    matches = [_TYPE_MATCHES[name] for name in schema_type if name in _TYPE_MATCHES]
+    coercers = [_TYPE_COERCERS[name] for name in schema_type if name in _TYPE_COERCERS]
+    names = "|".join(schema_type)
+
+    def check_union(value: Any, path: str, errors: Errors) -> Any:
+        # A value that already is one of the types is left alone
+        if any(match(value) for match in matches):
+            return value
+        # Otherwise take the first coercer, in schema order, that accepts it
+        for coercer in coercers:
+            scratch: Errors = []
+            result = coercer(value, path, scratch)
+            if result is not _MISSING:
+                return result
+        return _error(errors, path, f"expected {names}, got {type(value).__name__} {_describe(value)}")
+    return check_union
+
+
+def _constraint_checks(schema: Dict[str, Any]) -> List[Check]:
+    checks: List[Check] = []
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        shown = ", ".join(_describe(option) for option in allowed[:8])
+
+        def check_enum(value, path, errors):
+            return value if value in allowed else _error(errors, path, f"must be one of [{shown}], got {_describe(value)}")
+        checks.append(check_enum)
+
+    for key, test, word in (("minimum", lambda v, b: v >= b, ">="), ("maximum", lambda v, b: v <= b, "<="),
+                            ("exclusiveMinimum", lambda v, b: v > b, ">"), ("exclusiveMaximum", lambda v, b: v < b, "<")):
+        bound = schema.get(key)
+        if isinstance(bound, (int, float)) and not isinstance(bound, bool):
+            def check_bound(value, path, errors, bound=bound, test=test, word=word):
+                if isinstance(value, (int, float)) and not test(value, bound):
+                    return _error(errors, path, f"must be {word} {bound}, got {value}")
+                return value
+            checks.append(check_bound)
+
+    for key, test, word in (("minLength", lambda n, b: n >= b, "at least"), ("maxLength", lambda n, b: n <= b, "at most"),
+                            ("minItems", lambda n, b: n >= b, "at least"), ("maxItems", lambda n, b: n <= b, "at most")):
+        bound = schema.get(key)
+        if isinstance(bound, int):
+            unit = "characters" if key.endswith("Length") else "items"
+
+            def check_size(value, path, errors, bound=bound, test=test, word=word, unit=unit):
+                if isinstance(value, (str, list)) and not test(len(value), bound):
+                    return _error(errors, path, f"must have {word} {bound} {unit}, got {len(value)}")
+                return value
+            checks.append(check_size)
+
+    pattern = None
+    if isinstance(schema.get("pattern"), str):
+        try:
+            pattern = re.compile(schema["pattern"])
+        except re.error:
+            # An unusable pattern in a tool schema shouldn't take the whole toolset down
+            pattern = None
+
+    if pattern is not None:
+        def check_pattern(value, path, errors):
+            if isinstance(value, str) and pattern.search(value) is None:
+                return _error(errors, path, f"must match pattern {pattern.pattern!r}")
+            return value
+        checks.append(check_pattern)
+
+    return checks
+
+
+def _compile(schema: Dict[str, Any]) -> Check:
+    type_check = _type_check(schema.get("type"))
+    constraint_checks = _constraint_checks(schema)
+
+    item_check: Optional[Check] = None
+    if isinstance(schema.get("items"), dict):
+        item_check = _compile(schema["items"])
+
+    object_check: Optional[ToolArgumentValidator] = None
+    if isinstance(schema.get("properties"), dict):
+        object_check = ToolArgumentValidator(schema)
+
+    if type_check is None and not constraint_checks and item_check is None and object_check is None:
+        return lambda value, path, errors: value
+
+    def check(value: Any, path: str, errors: Errors) -> Any:
+        if type_check is not None:
+            value = type_check(value, path, errors)
+            if value is _MISSING:
+                return value
+
+        for constraint in constraint_checks:
+            value = constraint(value, path, errors)
+            if value is _MISSING:
+                return value
+
+        if item_check is not None and isinstance(value, list):
+            checked = []
+            failed = False
+            for index, item in enumerate(value):
+                item = item_check(item, f"{path}[{index}]", errors)
+                failed = failed or item is _MISSING
+                checked.append(item)
+            value = _MISSING if failed else checked
+
+        if object_check is not None and isinstance(value, dict):
+            value = object_check.check(value, f"{path}.", errors)
+
+        return value
+
+    return check
+
+
+def _allows_null(schema: Any) -> bool:
+    if not isinstance(schema, dict):
+        return False
+    schema_type = schema.get("type")
+    return schema_type == "null" or (isinstance(schema_type, list) and "null" in schema_type)
+
+
+class ToolArgumentValidator:
+    """
+    A compiled validator for the arguments of a single tool.
+
+    Calling the validator returns the coerced arguments and a list of errors,
+    each a dict with `param` and `error` keys.  Arguments the schema does not
+    describe (such as `tool_context`) are passed through untouched.
+    """
+
+    __slots__ = ("_checks", "_required", "_nullable")
+
+    def __init__(self, parameters: Optional[Dict[str, Any]]):
+        parameters = parameters or {}
+        properties: Dict[str, Any] = parameters.get("properties") or {}
+        required = set(parameters.get("required") or [])
+        # The json_schema decorator strips per-property `required` flags, nested schemas may still carry them
+        required.update(name for name, prop in properties.items() if isinstance(prop, dict) and prop.get("required") is True)
+
+        self._checks: Tuple[Tuple[str, Check], ...] = tuple((name, _compile(prop)) for name, prop in properties.items()
+                                                            if isinstance(prop, dict))
+        self._required: Tuple[str, ...] = tuple(name for name in properties if name in required)
+        self._nullable = frozenset(name for name, prop in properties.items() if _allows_null(prop))
+
+    def __call__(self, args: Dict[str, Any]) -> Tuple[Dict[str, Any], Errors]:
+        errors: Errors = []
+        result = self.check(args, "", errors)
+        return (args if result is _MISSING else result), errors
+
+    def check(self, args: Dict[str, Any], prefix: str, errors: Errors) -> Any:
+        result = dict(args)
+        failed = False
+
+        for name in self._required:
+            if result.get(name) is None:
+                _error(errors, f"{prefix}{name}", "is required")
+                failed = True
+
+        for name, check in self._checks:
+            value = result.get(name, _MISSING)
+            if value is _MISSING:
+                continue
+            if value is None and name not in self._nullable:
+                # Models often send null for optional parameters, let the tool's default apply instead
+                result.pop(name)
+                continue
+
+            value = check(value, f"{prefix}{name}", errors)
+            if value is _MISSING:
+                failed = True
+            else:
+                result[name] = value
+
+        return _MISSING if failed else result
+
+
+def compile_validator(parameters: Optional[Dict[str, Any]]) -> ToolArgumentValidator:
+    """
+    Compile the `parameters` object of a tool schema into a ToolArgumentValidator.
+    """
+    return ToolArgumentValidator(parameters)
+
+
+def format_argument_errors(tool_name: str, errors: Errors) -> str:
+    """
+    Render validation errors as the compact JSON tool result returned to the model.
+    """
+    return json.dumps({"error": "invalid_arguments", "tool": tool_name, "details": errors,
+                       "message": "The tool was not run. Correct the listed arguments and call it again."})
@@ -1,12 +1,17 @@
 import copy
 from typing import Callable, Dict, Union, Any
 
+from agent_c.toolsets.arg_validator import compile_validator
+
 
 def json_schema(description: str, params: Union[Dict[str, dict[str, Any]], None]) -> Callable:
     """
     A decorator to attach an OpenAI compatible JSON fields_wanted to a function. The fields_wanted contains
     information about the function's name, description, parameters, and required parameters.
 
+    The parameters are also compiled into a `ToolArgumentValidator`, attached as `func.validator`,
+    which the ToolChest runs against model supplied arguments before calling the tool.
+
 
     :param description: A description of the function.
     :param params: A dictionary containing information about the parameters of the function.
@@ -48,8 +53,9 @@ def json_schema(description: str, params: Union[Dict[str, dict[str, Any]], None]
         if parameters:
             schema['function']['parameters'] = parameters
 
-        # Attach the fields_wanted to the original function
+        # Attach the fields_wanted and its compiled argument validator to the original function
         func.schema = schema
+        func.validator = compile_validator(parameters)
 
         # Return the original function
         return func
@@ -2,12 +2,14 @@ import asyncio
 import copy
 import json
 import logging
-from typing import Type, List, Union, Dict, Any, Tuple, Optional
+from collections import OrderedDict
+from typing import Type, List, Union, Dict, Any, Tuple, Optional, Set
 
 
 from agent_c.prompting.basic_sections.tool_guidelines import EndToolGuideLinesSection, BeginToolGuideLinesSection
 from agent_c.prompting.prompt_section import PromptSection
 from agent_c.toolsets.tool_set import Toolset
+from agent_c.toolsets.arg_validator import format_argument_errors
 from agent_c.util.logging_utils import LoggingManager
 
 
@@ -24,6 +26,10 @@ class ToolChest:
         __tool_opts (dict): A private dictionary to store the kwargs from the last init_tools call.
         _active_tool_schemas (List[dict]): A private list to store OpenAI schemas for active toolsets.
         _tool_name_to_instance_map (Dict[str, Toolset]): A mapping from tool function names to their toolset instance.
+        _session_tool_index (OrderedDict[str, Set[str]]): Per session, the tool names offered through the tool index.
+        _session_loaded_tools (OrderedDict[str, Set[str]]): Per session, the tool names whose full schemas have been loaded.
+        use_tool_index (bool): Default for whether agents should send a compact tool index instead of full schemas.
+        always_loaded_tools (List[str]): Tools whose full schemas are always sent when the tool index is in use.
         logger (logging.Logger): An instance of a logger.
         
     Methods:
@@ -35,9 +41,15 @@ class ToolChest:
         add_tool_instance(instance: Toolset, activate: bool = True): Add a new toolset instance directly.
         init_tools(**kwargs): Initialize toolsets based on essential toolsets configuration.
         call_tools(tool_calls: List[dict], format_type: str) -> List[dict]: Execute multiple tool calls concurrently.
+        session_schemas(schemas: List[dict], tool_context: dict, tool_format: str) -> List[dict]: Apply the tool index to a schema list.
+        load_tools(session_id: str, tool_names: List[str]) -> Tuple[List[str], List[str]]: Load full schemas for indexed tools.
         _execute_tool_call(function_id: str, function_args: Dict) -> Any: Execute a single tool call.
     """
 
+    TOOL_INDEX_TOOL_NAME: str = "load_tool_schemas"
+    # Sessions whose tool index state is kept before the least recently used is dropped
+    MAX_TOOL_INDEX_SESSIONS: int = 256
+
     def __init__(self, **kwargs):
         """
         Initializes the ToolChest with toolset instances, toolset classes, and a logger.
@@ -49,6 +61,9 @@ class ToolChest:
                 - (legacy) tool_classes: Alias for available_toolset_classes for backward compatibility
                 - tool_cache: Optional ToolCache instance to use
                 - session_manager: Optional SessionManager instance to use
+                - use_tool_index: Send a compact tool index plus a loader tool instead of every full schema
+                - always_loaded_tools: Tool names that keep their full schema when the tool index is in use
+                - validate_tool_args: Validate and coerce tool arguments against their schema before calling (default True)
         """
         # Initialize main dictionaries for toolset tracking
         self.__toolset_instances: dict[str, Toolset] = {}  # All instantiated toolsets
@@ -70,6 +85,16 @@ class ToolChest:
         self.logger = logging_manager.get_logger()
         self._active_tool_schemas: List[dict] = []
         self._tool_name_to_instance_map: Dict[str, Toolset] = {}
+
+        # Tool index (on-demand schema loading) state, tracked per session
+        self.use_tool_index: bool = kwargs.get('use_tool_index', False)
+        self.always_loaded_tools: List[str] = kwargs.get('always_loaded_tools', ['think'])
+        # Least recently used first, bounded by MAX_TOOL_INDEX_SESSIONS
+        self._session_tool_index: OrderedDict[str, Set[str]] = OrderedDict()
+        self._session_loaded_tools: OrderedDict[str, Set[str]] = OrderedDict()
+
+        # Reject malformed tool calls before they reach the tool
+        self.validate_tool_args: bool = kwargs.get('validate_tool_args', True)
         
         # Initialize tool_cache
         self.tool_cache = kwargs.get('tool_cache')
@@ -367,6 +392,173 @@ class ToolChest:
         """
         return [tool.section for tool in self.__active_toolset_instances.values() if tool.section is not None]
 
+    @staticmethod
+    def _schema_name(schema: dict) -> Optional[str]:
+        """
+        Returns the tool name from a schema in either OpenAI or Claude format.
+        """
+        if 'function' in schema:
+            return schema['function'].get('name')
+
+        return schema.get('name')
+
+    @staticmethod
+    def _is_function_schema(schema: dict) -> bool:
+        """
+        Returns True for client-side function schemas, False for server tools like web search.
+        """
+        return 'function' in schema or 'input_schema' in schema
+
+    def tool_index_schema(self, schemas: List[dict], tool_format: str = "claude") -> dict:
+        """
+        Build the loader meta-tool whose description is a compact index of the given tools.
+
+        Args:
+            schemas: Full schemas of the tools that can be loaded, in OpenAI or Claude format.
+            tool_format: Format for the returned schema ("claude" or "openai").
+
+        Returns:
+            dict: The loader tool schema.
+        """
+        lines = []
+        for schema in schemas:
+            definition = schema.get('function', schema)
+            summary = (definition.get('description') or '').strip().split('\n', 1)[0]
+            lines.append(f"- {definition['name']}: {summary}")
+
+        description = ("Load the full definitions of tools before calling them. "
+                       "Once loaded, a tool stays available for the rest of the session.\n"
+                       "Tools available to load:\n" + "\n".join(lines))
+        parameters = {
+            'type': 'object',
+            'properties': {
+                'tools': {
+                    'type': 'array',
+                    'items': {'type': 'string'},
+                    'description': 'Names of the tools to load, exactly as listed.'
+                }
+            },
+            'required': ['tools']
+        }
+
+        if tool_format.lower() == "claude":
+            return {'name': self.TOOL_INDEX_TOOL_NAME, 'description': description, 'input_schema': parameters}
+
+        return {'type': 'function',
+                'function': {'name': self.TOOL_INDEX_TOOL_NAME, 'description': description, 'parameters': parameters}}
+
+    @staticmethod
+    def tool_index_session_id(tool_context: Dict[str, Any]) -> str:
+        """
+        Returns the session id tool index state is tracked under.
+
+        Sub-agents share their parent's user session but run under their own session id,
+        so the agent's session id is preferred.
+        """
+        return tool_context.get('session_id') or tool_context.get('user_session_id')
+
+    def session_schemas(self, schemas: List[dict], tool_context: Dict[str, Any], tool_format: str = "claude") -> List[dict]:
+        """
+        Apply the tool index to a list of schemas for a session.
+
+        Tools that are always loaded, or that the session has already loaded, keep their full
+        schema. Every other function tool is replaced by an entry in the loader tool's index.
+        Server tools are passed through untouched.
+
+        Args:
+            schemas: The full list of schemas the agent would otherwise send.
+            tool_context: The tool context for the interaction, used to identify the session.
+            tool_format: Format of the schemas ("claude" or "openai").
+
+        Returns:
+            List[dict]: The schemas to send with the completion.
+        """
+        session_id = self.tool_index_session_id(tool_context)
+        loaded = self._session_loaded(session_id)
+        active: List[dict] = []
+        indexed: List[dict] = []
+        for schema in schemas:
+            name = self._schema_name(schema)
+            if not self._is_function_schema(schema) or name in loaded or name in self.always_loaded_tools:
+                active.append(schema)
+            else:
+                indexed.append(schema)
+
+        self._session_tool_index[session_id] = {self._schema_name(schema) for schema in indexed} | loaded
+        if not indexed:
+            return active
+
+        return [self.tool_index_schema(indexed, tool_format)] + active
+
+    def load_tools(self, session_id: str, tool_names: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Mark indexed tools as loaded for a session so their full schemas are sent from now on.
+
+        Args:
+            session_id: The session loading the tools.
+            tool_names: Names of the tools to load.
+
+        Returns:
+            Tuple[List[str], List[str]]: The names that were loaded and the names that are not in the index.
+        """
+        available = self._session_tool_index.get(session_id, set())
+        loaded = self._session_loaded(session_id)
+        found = [name for name in tool_names if name in available]
+        missing = [name for name in tool_names if name not in available]
+        loaded.update(found)
+        return found, missing
+
+    def _session_loaded(self, session_id: str) -> Set[str]:
+        """
+        The tools a session has loaded, marking the session as recently used.
+
+        Sessions that are never cleared, e.g. sub-agent sessions, are dropped
+        least recently used first once there are more than MAX_TOOL_INDEX_SESSIONS.
+        """
+        loaded = self._session_loaded_tools.get(session_id)
+        if loaded is None:
+            loaded = self._session_loaded_tools[session_id] = set()
+        self._session_loaded_tools.move_to_end(session_id)
+        if session_id in self._session_tool_index:
+            self._session_tool_index.move_to_end(session_id)
+
+        while len(self._session_loaded_tools) > self.MAX_TOOL_INDEX_SESSIONS:
+            evicted, _ = self._session_loaded_tools.popitem(last=False)
+            self._session_tool_index.pop(evicted, None)
+        return loaded
+
+    def clear_loaded_tools(self, session_id: Optional[str] = None) -> None:
+        """
+        Forget the tools loaded through the tool index, for one session or for all of them.
+
+        Args:
+            session_id: The session to clear, or None to clear every session.
+        """
+        if session_id is None:
+            self._session_tool_index.clear()
+            self._session_loaded_tools.clear()
+        else:
+            self._session_tool_index.pop(session_id, None)
+            self._session_loaded_tools.pop(session_id, None)
+
+    def _call_tool_index(self, function_args: Dict) -> str:
+        """
+        Handle a call to the loader meta-tool.
+        """
+        session_id = self.tool_index_session_id(function_args['tool_context'])
+        tool_names = function_args.get('tools', [])
+        if isinstance(tool_names, str):
+            tool_names = [tool_names]
+
+        found, missing = self.load_tools(session_id, tool_names)
+        response = []
+        if found:
+            response.append(f"Loaded: {', '.join(found)}. Their full definitions are now available.")
+        if missing:
+            response.append(f"Not in the tool index: {', '.join(missing)}.")
+
+        return " ".join(response) if response else "No tools were requested."
+
     def add_tool_class(self, cls: Type[Toolset]):
         """
         Add a new toolset class to the available toolsets.
@@ -537,9 +729,30 @@ class ToolChest:
         Returns:
             Any: The result of the function call.
         """
+        if function_id == self.TOOL_INDEX_TOOL_NAME:
+            return self._call_tool_index(function_args)
+
         src_obj: Toolset = self._tool_name_to_instance_map.get(function_id)
         if src_obj is None:
             return f"{function_id} is not on a valid toolset."
+
+        # A model that calls an indexed tool directly has effectively loaded it, but only
+        # tools the session was actually offered count; anything else is an unknown tool.
+        session_id = self.tool_index_session_id(function_args.get('tool_context', {}))
+        available = self._session_tool_index.get(session_id)
+        if available is not None:
+            if function_id in available:
+                self._session_loaded(session_id).add(function_id)
+            elif function_id not in self.always_loaded_tools:
+                return f"{function_id} is not on a valid toolset."
+
+        if self.validate_tool_args:
+            validator = src_obj.tool_validator(function_id)
+            if validator is not None:
+                function_args, errors = validator(function_args)
+                if errors:
+                    self.logger.warning(f"Rejected call to {function_id} with invalid arguments: {errors}")
+                    return format_argument_errors(function_id, errors)
         try:
             return await src_obj.call(function_id, function_args)
         except Exception as e:
@@ -9,6 +9,7 @@ from typing import Union, List, Dict, Any, Optional
 
 from agent_c.models.client_tool_info import ClientToolInfo
 from agent_c.toolsets.tool_cache import ToolCache
+from agent_c.toolsets.arg_validator import ToolArgumentValidator
 from agent_c.models.context.base import BaseContext
 from agent_c.util.logging_utils import LoggingManager
 from agent_c.prompting.prompt_section import PromptSection
@@ -187,6 +188,19 @@ class Toolset:
         function_to_call: Any = getattr(self, function_name)
         return await function_to_call(**args)
 
+    def tool_validator(self, tool_name: str) -> Optional[ToolArgumentValidator]:
+        """
+        Returns the compiled argument validator for a tool on this toolset, if it has one.
+
+        Args:
+            tool_name (str): The name of the tool, with or without the toolset prefix.
+
+        Returns:
+            Optional[ToolArgumentValidator]: The validator attached by `json_schema`, or None.
+        """
+        function = getattr(self, tool_name.removeprefix(self.prefix), None)
+        return getattr(function, 'validator', None)
+
     def _yaml_dump(self, data: Any) -> str:
         """
         Dumps data to a YAML formatted string.
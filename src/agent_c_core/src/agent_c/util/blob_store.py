@@ -0,0 +1,379 @@
+"""
+Content-addressed storage for the binary payloads embedded in chat messages.
+
+Images, PDFs and audio clips arrive as base64 inside message content blocks,
+which means every save, fork, history event and event log line carries them
+again.  `externalize_blobs` moves those payloads into a `BlobStore`, keyed on
+the SHA-256 of their bytes, and leaves a small reference in the message:
+
+    {"type": "base64", "media_type": m, "data": ...}   ->  {"type": "blob", "media_type": m, "sha256": h}
+    "data:<m>;base64,..."                               ->  "data:<m>;sha256,<h>"
+    {"data": ..., "format": f}  (input_audio)           ->  {"sha256": h, "format": f}
+
+`inflate_blobs` reverses this.  It is needed when building the payload for the
+provider, and before messages leave the process: clients are sent history with
+the payloads in place, never the references.  Both copy on write: messages without payloads are returned
+as-is and nothing passed in is modified.
+"""
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+import time
+import zlib
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from agent_c.models.base import BaseModel
+from agent_c.util.logging_utils import LoggingManager
+
+BLOB_REFERENCE_PATTERN = re.compile(r'sha256(?:": "|,)([0-9a-f]{64})')
+"""Matches the digest in a serialized blob reference, used to find the blobs a session file still needs."""
+
+_DATA_URL_PATTERN = re.compile(r'^data:([^;,]*);base64,(.*)$', re.DOTALL)
+_BLOB_URL_PATTERN = re.compile(r'^data:([^;,]*);sha256,([0-9a-f]{64})$')
+
+
+class BlobStoreStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    deduplicated: int = 0
+    collected: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class BlobMissingError(KeyError):
+    """Raised when a message references a blob that is not in the store."""
+
+
+class BlobStore:
+    """
+    A local, on-disk, content-addressed store for binary payloads.
+
+    Blobs are keyed on the SHA-256 of their bytes, so the same screenshot
+    uploaded twice is stored once.  Each blob is a file under a two character
+    shard directory, written atomically, and zlib compressed when that makes it
+    meaningfully smaller (most images and PDFs are already compressed, so this
+    mostly helps text and audio).  Recently read blobs are kept base64 encoded
+    in a small in-memory LRU, since the same images are inflated on every turn
+    of a conversation.
+
+    Blobs are not reference counted; `collect` sweeps the ones no longer
+    referenced by anything the caller still holds.
+    """
+
+    DEFAULT_MIN_BYTES: int = 4 * 1024
+    DEFAULT_MEMORY_LIMIT: int = 64 * 1024 * 1024
+    COMPRESSED_SUFFIX: str = ".z"
+
+    def __init__(self, **kwargs: Any) -> None:
+        """
+        Keyword Arguments:
+            blob_dir (str): The directory blobs are stored in. Defaults to ".blob_store".
+            compress (bool): Whether to zlib compress blobs that shrink by at least 10%. Defaults to True.
+            min_bytes (int): Payloads smaller than this stay inline in the message. Defaults to 4KB.
+            memory_limit (int): Bytes of base64 kept in the in-memory LRU. Defaults to 64MB.
+        """
+        self.blob_dir: Path = Path(kwargs.get('blob_dir', ".blob_store"))
+        self.compress: bool = kwargs.get('compress', True)
+        self.min_bytes: int = kwargs.get('min_bytes', self.DEFAULT_MIN_BYTES)
+        self.memory_limit: int = kwargs.get('memory_limit', self.DEFAULT_MEMORY_LIMIT)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = LoggingManager(__name__).get_logger()
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_digests: Dict[str, str] = {}
+        self._memory_bytes: int = 0
+        self._stats = BlobStoreStats()
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def _existing_path(self, digest: str) -> Optional[Path]:
+        path = self._path(digest)
+        for candidate in (path, path.with_name(digest + self.COMPRESSED_SUFFIX)):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._memory or self._existing_path(digest) is not None
+
+    def put(self, data: bytes) -> str:
+        """
+        Store a blob, returning its SHA-256 digest.
+
+        Storing a blob that is already present only refreshes its modification
+        time, which keeps it safe from a `collect` running concurrently.
+        """
+        digest = self.digest(data)
+        existing = self._existing_path(digest)
+        if existing is not None:
+            os.utime(existing)
+            self._stats.deduplicated += 1
+            return digest
+
+        path = self._path(digest)
+        payload = data
+        if self.compress:
+            compressed = zlib.compress(data, 6)
+            if len(compressed) < len(data) * 0.9:
+                payload = compressed
+                path = path.with_name(digest + self.COMPRESSED_SUFFIX)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._stats.stored += 1
+        return digest
+
+    def put_base64(self, data: str) -> str:
+        """
+        Store a base64 encoded blob, returning its digest.
+
+        Raises:
+            ValueError: If `data` is not valid base64
+        """
+        # Messages inflated from the store hand back the very same strings, so skip re-hashing them
+        digest = self._memory_digests.get(data)
+        if digest is not None:
+            self._stats.deduplicated += 1
+            return digest
+
+        try:
+            raw = base64.b64decode(data, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Not valid base64: {e}") from e
+
+        digest = self.put(raw)
+        # Whoever stored it is likely to send it to the provider next
+        self._remember(digest, data)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Read a blob.
+
+        Raises:
+            BlobMissingError: If the blob is not in the store
+        """
+        path = self._existing_path(digest)
+        if path is None:
+            raise BlobMissingError(digest)
+
+        data = path.read_bytes()
+        if path.name.endswith(self.COMPRESSED_SUFFIX):
+            data = zlib.decompress(data)
+        return data
+
+    def get_base64(self, digest: str) -> str:
+        """
+        Read a blob as base64, from memory when it was read recently.
+
+        Raises:
+            BlobMissingError: If the blob is not in the store
+        """
+        encoded = self._memory.get(digest)
+        if encoded is not None:
+            self._memory.move_to_end(digest)
+            self._stats.hits += 1
+            return encoded
+
+        self._stats.misses += 1
+        encoded = base64.b64encode(self.get(digest)).decode("ascii")
+        self._remember(digest, encoded)
+        return encoded
+
+    def _remember(self, digest: str, encoded: str) -> None:
+        if len(encoded) > self.memory_limit:
+            return
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            return
+
+        self._memory[digest] = encoded
+        self._memory_digests[encoded] = digest
+        self._memory_bytes += len(encoded)
+        while self._memory_bytes > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._forget(evicted)
+
+    def _forget(self, encoded: str) -> None:
+        self._memory_digests.pop(encoded, None)
+        self._memory_bytes -= len(encoded)
+
+    def collect(self, referenced: Set[str], min_age: float = 3600) -> int:
+        """
+        Delete blobs that are not referenced and were not stored recently.
+
+        `min_age` protects blobs stored (or re-stored) after the caller
+        gathered `referenced`, e.g. by a session that has not been saved yet.
+        Blobs in the in-memory LRU are in use and are kept too.
+
+        Args:
+            referenced: Digests that must be kept
+            min_age: Seconds since a blob was last stored before it may be deleted
+
+        Returns:
+            The number of blobs deleted
+        """
+        cutoff = time.time() - min_age
+        removed = 0
+        for shard in os.scandir(self.blob_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                digest = entry.name.removesuffix(self.COMPRESSED_SUFFIX)
+                if digest in referenced or digest in self._memory or entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.stat().st_mtime > cutoff:
+                        continue
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+
+        self._stats.collected += removed
+        if removed:
+            self.logger.info(f"Removed {removed} unreferenced blobs from {self.blob_dir}")
+        return removed
+
+    def stats(self) -> BlobStoreStats:
+        return self._stats.model_copy()
+
+
+def _externalize_block(block: Any, store: BlobStore) -> Any:
+    if not isinstance(block, dict):
+        return block
+
+    source = block.get("source")
+    if isinstance(source, dict) and source.get("type") == "base64" and len(source.get("data") or "") >= store.min_bytes:
+        try:
+            digest = store.put_base64(source["data"])
+        except ValueError:
+            return block
+        ref = {key: value for key, value in source.items() if key != "data"}
+        ref.update(type="blob", sha256=digest)
+        return {**block, "source": ref}
+
+    image_url = block.get("image_url")
+    if isinstance(image_url, dict) and len(image_url.get("url") or "") >= store.min_bytes:
+        match = _DATA_URL_PATTERN.match(image_url["url"])
+        if match is None:
+            return block
+        try:
+            digest = store.put_base64(match.group(2))
+        except ValueError:
+            return block
+        return {**block, "image_url": {**image_url, "url": f"data:{match.group(1)};sha256,{digest}"}}
+
+    audio = block.get("input_audio")
+    if isinstance(audio, dict) and len(audio.get("data") or "") >= store.min_bytes:
+        try:
+            digest = store.put_base64(audio["data"])
+        except ValueError:
+            return block
+        ref = {key: value for key, value in audio.items() if key != "data"}
+        ref["sha256"] = digest
+        return {**block, "input_audio": ref}
+
+    return block
+
+
+def _inflate_block(block: Any, store: BlobStore) -> Any:
+    if not isinstance(block, dict):
+        return block
+
+    source = block.get("source")
+    if isinstance(source, dict) and source.get("type") == "blob":
+        data = {key: value for key, value in source.items() if key != "sha256"}
+        data.update(type="base64", data=store.get_base64(source["sha256"]))
+        return {**block, "source": data}
+
+    image_url = block.get("image_url")
+    if isinstance(image_url, dict):
+        match = _BLOB_URL_PATTERN.match(image_url.get("url") or "")
+        if match is None:
+            return block
+        url = f"data:{match.group(1)};base64,{store.get_base64(match.group(2))}"
+        return {**block, "image_url": {**image_url, "url": url}}
+
+    audio = block.get("input_audio")
+    if isinstance(audio, dict) and "sha256" in audio:
+        data = {key: value for key, value in audio.items() if key != "sha256"}
+        data["data"] = store.get_base64(audio["sha256"])
+        return {**block, "input_audio": data}
+
+    return block
+
+
+def _map_blocks(messages: List[Dict[str, Any]], transform) -> List[Dict[str, Any]]:
+    result = messages
+    for index, message in enumerate(messages):
+        content = message.get("content") if isinstance(message, dict) else None
+        if not isinstance(content, list):
+            continue
+
+        blocks = [transform(block) for block in content]
+        if any(new is not old for new, old in zip(blocks, content)):
+            if result is messages:
+                result = list(messages)
+            result[index] = {**message, "content": blocks}
+    return result
+
+
+def externalize_blobs(messages: List[Dict[str, Any]], store: BlobStore) -> List[Dict[str, Any]]:
+    """
+    Move base64 payloads of at least `store.min_bytes` into the store, replacing them with references.
+
+    Returns `messages` itself when nothing was moved, otherwise a new list
+    sharing every message that did not change.
+    """
+    return _map_blocks(messages, lambda block: _externalize_block(block, store))
+
+
+def inflate_blobs(messages: List[Dict[str, Any]], store: BlobStore, strict: bool = True) -> List[Dict[str, Any]]:
+    """
+    Replace blob references with the base64 payloads they stand for.
+
+    Returns `messages` itself when there are no references, otherwise a new
+    list sharing every message that did not change.
+
+    Args:
+        messages: The messages to inflate
+        store: The store the payloads are in
+        strict: When False, a reference whose blob is not in the store is left in place
+
+    Raises:
+        BlobMissingError: If a referenced blob is not in the store and `strict` is True
+    """
+    def inflate(block: Any) -> Any:
+        try:
+            return _inflate_block(block, store)
+        except BlobMissingError as e:
+            if strict:
+                raise
+            store.logger.warning(f"Blob {e.args[0]} is missing from {store.blob_dir}, leaving the reference in place")
+            return block
+
+    return _map_blocks(messages, inflate)
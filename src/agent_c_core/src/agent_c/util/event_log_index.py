@@ -0,0 +1,332 @@
+"""
+Sidecar index for session event logs.
+
+Each session directory can carry an `index.sqlite` file recording, for every
+logged event, the segment it lives in, its byte offset and length within the
+(uncompressed) segment, its timestamp, type and the interaction it belongs
+to, plus a summary row per interaction.  EventSessionLogger fills the index
+as it writes; readers use it to count, filter and page events and then seek
+straight to the lines they need instead of parsing whole logs.
+
+Because index rows are committed in batches, the newest lines of a log may
+not be indexed yet, and logs written before the index existed have none.
+`EventLogIndex.catch_up` indexes whatever is missing and drops rows for
+segments removed by retention, so readers call it before querying.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from .event_log_segments import (
+    SEGMENT_SUFFIX, SegmentManifest, open_segment, session_segment_files
+)
+
+
+@dataclass
+class IndexEntry:
+    """The location and key fields of one logged event"""
+    segment: str
+    offset: int
+    length: int
+    timestamp: Optional[str]
+    event_type: Optional[str]
+    interaction_id: Optional[str] = None
+
+
+def plain_segment_name(name: str) -> str:
+    """The name a segment had while it was being written, which is how the index refers to it"""
+    return name[:name.index(SEGMENT_SUFFIX) + len(SEGMENT_SUFFIX)] if SEGMENT_SUFFIX in name else name
+
+
+def interaction_boundary(event: Dict[str, Any]) -> Optional[bool]:
+    """True if an event starts an interaction, False if it ends one, otherwise None"""
+    if event.get("type") == "interaction" and isinstance(event.get("started"), bool):
+        return event["started"]
+    if event.get("type") == "interaction_end":
+        return False
+    return None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    timestamp TEXT,
+    event_type TEXT,
+    interaction_id TEXT,
+    UNIQUE (segment, offset)
+);
+CREATE INDEX IF NOT EXISTS ix_events_type_time ON events (event_type, timestamp);
+CREATE INDEX IF NOT EXISTS ix_events_time ON events (timestamp);
+CREATE INDEX IF NOT EXISTS ix_events_interaction ON events (interaction_id, seq);
+CREATE TABLE IF NOT EXISTS interactions (
+    interaction_id TEXT PRIMARY KEY,
+    started_at TEXT,
+    ended_at TEXT,
+    event_count INTEGER NOT NULL,
+    first_seq INTEGER,
+    last_seq INTEGER
+);
+CREATE TABLE IF NOT EXISTS segments (
+    segment TEXT PRIMARY KEY,
+    indexed_bytes INTEGER NOT NULL,
+    open_interaction TEXT
+);
+"""
+
+
+class EventLogIndex:
+    """
+    The sidecar index of one session directory.
+
+    Not thread safe; open one per thread or guard it with a lock.  Use it as a
+    context manager, or call `close()`, to release the SQLite connection.
+    """
+    FILE_NAME = "index.sqlite"
+
+    def __init__(self, session_dir: Union[str, Path]):
+        self.session_dir = Path(session_dir)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def path(self) -> Path:
+        return self.session_dir / self.FILE_NAME
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> 'EventLogIndex':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # Writing
+
+    def add(self, entries: Sequence[IndexEntry], open_interaction: Optional[Dict[str, Optional[str]]] = None) -> int:
+        """
+        Record entries, ignoring any that are already indexed.
+
+        Args:
+            entries: Entries in log order
+            open_interaction: Segment name -> interaction still in progress at the end of the entries,
+                              so catching up later can attribute the following lines to it
+
+        Returns:
+            The number of new entries
+        """
+        if not entries:
+            return 0
+
+        conn = self.conn
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO events (segment, offset, length, timestamp, event_type, interaction_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(e.segment, e.offset, e.length, e.timestamp, e.event_type, e.interaction_id) for e in entries])
+            added = conn.total_changes - before
+
+            ends: Dict[str, int] = {}
+            for entry in entries:
+                ends[entry.segment] = max(ends.get(entry.segment, 0), entry.offset + entry.length)
+            open_interaction = open_interaction or {}
+            for segment, end in ends.items():
+                conn.execute(
+                    "INSERT INTO segments (segment, indexed_bytes, open_interaction) VALUES (?, ?, ?) "
+                    "ON CONFLICT(segment) DO UPDATE SET "
+                    "open_interaction = CASE WHEN excluded.indexed_bytes >= indexed_bytes "
+                    "THEN excluded.open_interaction ELSE open_interaction END, "
+                    "indexed_bytes = MAX(indexed_bytes, excluded.indexed_bytes)",
+                    (segment, end, open_interaction.get(segment)))
+
+            self._refresh_interactions({entry.interaction_id for entry in entries if entry.interaction_id})
+        return added
+
+    def _refresh_interactions(self, interaction_ids: Iterable[str]) -> None:
+        for interaction_id in interaction_ids:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO interactions "
+                "SELECT interaction_id, MIN(timestamp), MAX(timestamp), COUNT(*), MIN(seq), MAX(seq) "
+                "FROM events WHERE interaction_id = ? GROUP BY interaction_id", (interaction_id,))
+
+    def catch_up(self) -> int:
+        """
+        Index any log lines that are not indexed yet and forget segments that no longer exist.
+
+        Returns:
+            The number of entries added
+        """
+        files = session_segment_files(self.session_dir)
+        present = {plain_segment_name(path.name): path for path in files}
+        sealed = {plain_segment_name(segment.file): segment.raw_bytes
+                  for segment in SegmentManifest.load(self.session_dir).segments}
+        known = {row["segment"]: (row["indexed_bytes"], row["open_interaction"])
+                 for row in self.conn.execute("SELECT segment, indexed_bytes, open_interaction FROM segments")}
+
+        removed = [segment for segment in known if segment not in present]
+        if removed:
+            with self.conn:
+                placeholders = ",".join("?" * len(removed))
+                affected = [row[0] for row in self.conn.execute(
+                    f"SELECT DISTINCT interaction_id FROM events WHERE segment IN ({placeholders}) "
+                    f"AND interaction_id IS NOT NULL", removed)]
+                self.conn.execute(f"DELETE FROM events WHERE segment IN ({placeholders})", removed)
+                self.conn.execute(f"DELETE FROM segments WHERE segment IN ({placeholders})", removed)
+                self.conn.execute(f"DELETE FROM interactions WHERE interaction_id IN "
+                                  f"({','.join('?' * len(affected))})", affected)
+                self._refresh_interactions(affected)
+
+        added = 0
+        interaction_id = None
+        for name, path in present.items():
+            indexed_bytes, open_interaction = known.get(name, (0, None))
+            if indexed_bytes:
+                interaction_id = open_interaction
+            size = sealed.get(name)
+            if size is None and path.name.endswith(SEGMENT_SUFFIX):
+                size = path.stat().st_size
+            if size is not None and indexed_bytes >= size:
+                continue
+            entries, interaction_id = self._scan(name, path, indexed_bytes, interaction_id)
+            added += self.add(entries, {name: interaction_id})
+        return added
+
+    @staticmethod
+    def _scan(name: str, path: Path, start: int, interaction_id: Optional[str]):
+        entries: List[IndexEntry] = []
+        with open_segment(path) as text:
+            raw = text.buffer if hasattr(text, 'buffer') else text
+            raw.seek(start)
+            offset = start
+            for line in raw:
+                if not line.endswith(b"\n"):
+                    # A line still being written
+                    break
+                line_offset = offset
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                record = record if isinstance(record, dict) else {}
+                event = record.get("event") if isinstance(record.get("event"), dict) else {}
+
+                boundary = interaction_boundary(event)
+                if boundary is True:
+                    interaction_id = event.get("id")
+                entries.append(IndexEntry(name, line_offset, len(line), record.get("timestamp"), event.get("type"),
+                                          interaction_id))
+                if boundary is False:
+                    interaction_id = None
+        return entries, interaction_id
+
+    # Reading
+
+    def query(self, event_types: Optional[Sequence[str]] = None, start_time: Optional[str] = None,
+              end_time: Optional[str] = None, interaction_id: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0, after_seq: Optional[int] = None,
+              descending: bool = False) -> List[sqlite3.Row]:
+        """
+        Index rows matching the filters, in log order.
+
+        Timestamps are compared as ISO 8601 strings in the form the logger writes them.
+        """
+        where, params = self._where(event_types, start_time, end_time, interaction_id, after_seq)
+        sql = f"SELECT * FROM events{where} ORDER BY seq {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return self.conn.execute(sql, params).fetchall()
+
+    def count(self, event_types: Optional[Sequence[str]] = None, start_time: Optional[str] = None,
+              end_time: Optional[str] = None, interaction_id: Optional[str] = None,
+              after_seq: Optional[int] = None) -> int:
+        where, params = self._where(event_types, start_time, end_time, interaction_id, after_seq)
+        return self.conn.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    @staticmethod
+    def _where(event_types, start_time, end_time, interaction_id, after_seq):
+        clauses, params = [], []
+        if event_types:
+            clauses.append(f"event_type IN ({','.join('?' * len(event_types))})")
+            params.extend(event_types)
+        if start_time:
+            clauses.append("timestamp >= ?")
+            params.append(start_time)
+        if end_time:
+            clauses.append("timestamp <= ?")
+            params.append(end_time)
+        if interaction_id:
+            clauses.append("interaction_id = ?")
+            params.append(interaction_id)
+        if after_seq is not None:
+            clauses.append("seq > ?")
+            params.append(after_seq)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def summary(self) -> Dict[str, Any]:
+        """Event count, time range and per-type counts for the session"""
+        row = self.conn.execute("SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM events").fetchone()
+        event_types = {r[0]: r[1] for r in self.conn.execute(
+            "SELECT event_type, COUNT(*) FROM events WHERE event_type IS NOT NULL GROUP BY event_type")}
+        return {"events": row[0], "first_timestamp": row[1], "last_timestamp": row[2], "event_types": event_types}
+
+    def interactions(self, limit: Optional[int] = None, offset: int = 0, descending: bool = False) -> List[Dict[str, Any]]:
+        """Per-interaction summary rows ordered by start time"""
+        sql = f"SELECT * FROM interactions ORDER BY started_at {'DESC' if descending else 'ASC'}"
+        params: List[Any] = []
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = [limit, offset]
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def read(self, rows: Sequence[Union[sqlite3.Row, IndexEntry]]) -> List[Dict[str, Any]]:
+        """
+        Read and decode the log lines for index rows, seeking to each one.
+
+        Rows whose segment has gone missing or whose line cannot be decoded are skipped.
+        """
+        paths = {plain_segment_name(path.name): path for path in session_segment_files(self.session_dir)}
+        by_segment: Dict[str, List[int]] = {}
+        for position, row in enumerate(rows):
+            by_segment.setdefault(row["segment"] if isinstance(row, sqlite3.Row) else row.segment, []).append(position)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        for segment, positions in by_segment.items():
+            path = paths.get(segment)
+            if path is None:
+                continue
+            # Read in file order so compressed segments are only decompressed forwards
+            positions.sort(key=lambda p: rows[p]["offset"] if isinstance(rows[p], sqlite3.Row) else rows[p].offset)
+            with open_segment(path) as text:
+                raw = text.buffer if hasattr(text, 'buffer') else text
+                for position in positions:
+                    row = rows[position]
+                    offset, length = (row["offset"], row["length"]) if isinstance(row, sqlite3.Row) else (row.offset, row.length)
+                    raw.seek(offset)
+                    try:
+                        results[position] = json.loads(raw.read(length))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+        return [result for result in results if result is not None]
+
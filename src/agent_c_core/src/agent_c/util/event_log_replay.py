@@ -0,0 +1,248 @@
+"""
+Seekable, paced replay of recorded session event logs.
+
+EventLogReplay walks a session's sidecar index (`event_log_index`) rather
+than its log files: the index picks the starting point (an interaction or a
+timestamp) and filters by event type, so only the lines that will actually be
+replayed are read and decoded.  Lines are read a page at a time through
+cursors that stay open on their segments, so a replay of a multi-hour session
+starts as soon as the first page is read.
+
+Replay is an async iterator; the consumer pulls each event when it is ready
+to send it, which gives websocket and SSE consumers back-pressure for free.
+Pacing follows the original timing, optionally scaled, or runs at full speed.
+"""
+
+import asyncio
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from .event_log_index import EventLogIndex, plain_segment_name
+from .event_log_segments import open_segment, session_segment_files
+
+
+class _SegmentCursor:
+    """A forward-reading position within one segment, reopened only when asked to go backwards"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._text: Optional[io.TextIOBase] = None
+        self._raw = None
+        self._position = 0
+
+    def read(self, offset: int, length: int) -> bytes:
+        if self._raw is None or offset < self._position:
+            self.close()
+            self._text = open_segment(self.path)
+            self._raw = self._text.buffer if hasattr(self._text, 'buffer') else self._text
+            self._position = 0
+        if offset != self._position:
+            self._raw.seek(offset)
+        data = self._raw.read(length)
+        self._position = offset + len(data)
+        return data
+
+    def close(self) -> None:
+        if self._text is not None:
+            self._text.close()
+        self._text = None
+        self._raw = None
+
+
+@dataclass
+class ReplayStatus:
+    """Progress of a replay"""
+    status: str
+    current_index: int
+    total_events: int
+    real_time: bool
+    speed_factor: float
+    position: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+class EventLogReplay:
+    """
+    Replays the events of one session.
+
+    Iterate with `async for entry in replay` to receive the decoded log
+    entries (`{"timestamp": ..., "event": {...}}`).  `pause()`, `resume()`,
+    `stop()` and `seek()` may be called from other tasks while a replay runs.
+    """
+
+    def __init__(self, session_dir: Union[str, Path], event_types: Optional[Sequence[str]] = None,
+                 start_interaction: Optional[str] = None, start_time: Optional[str] = None,
+                 real_time: bool = False, speed_factor: float = 1.0, max_gap_seconds: Optional[float] = None,
+                 page_size: int = 256):
+        """
+        Args:
+            session_dir: The session's log directory
+            event_types: Only replay these event types (default: all)
+            start_interaction: Start at the first event of this interaction
+            start_time: Start at the first event at or after this timestamp (as written in the logs)
+            real_time: Reproduce the original gaps between events, otherwise replay at full speed
+            speed_factor: Divides the original gaps when replaying in real time, 2.0 is twice as fast
+            max_gap_seconds: Longest pause between two events when replaying in real time
+            page_size: Index rows read at a time
+        """
+        self.session_dir = Path(session_dir)
+        self.event_types = list(event_types) if event_types else None
+        self.real_time = real_time
+        self.speed_factor = speed_factor if speed_factor and speed_factor > 0 else 1.0
+        self.max_gap_seconds = max_gap_seconds
+        self.page_size = max(1, page_size)
+
+        self._state = "pending"
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self._seek_to: Optional[Dict[str, Optional[str]]] = {"interaction_id": start_interaction, "timestamp": start_time}
+        self._cursor_seq = 0
+        self._emitted = 0
+        self._total = 0
+        self._position: Optional[str] = None
+        self._segments: Dict[str, _SegmentCursor] = {}
+
+    # Control
+
+    def pause(self) -> None:
+        if self._state == "playing":
+            self._state = "paused"
+            self._resumed.clear()
+
+    def resume(self) -> None:
+        if self._state == "paused":
+            self._state = "playing"
+            self._resumed.set()
+
+    def stop(self) -> None:
+        self._state = "stopped"
+        self._resumed.set()
+
+    def seek(self, timestamp: Optional[str] = None, interaction_id: Optional[str] = None) -> None:
+        """Continue the replay from a timestamp or from the start of an interaction"""
+        self._seek_to = {"interaction_id": interaction_id, "timestamp": timestamp}
+
+    def status(self) -> ReplayStatus:
+        return ReplayStatus(status=self._state, current_index=self._emitted, total_events=self._total,
+                            real_time=self.real_time, speed_factor=self.speed_factor, position=self._position)
+
+    # Reading
+
+    def _index(self) -> EventLogIndex:
+        return EventLogIndex(self.session_dir)
+
+    def _resolve_start(self, index: EventLogIndex, seek: Dict[str, Optional[str]]) -> Optional[int]:
+        """The sequence number just before the starting point, or None if there is nothing to replay"""
+        if seek.get("interaction_id"):
+            row = index.conn.execute("SELECT MIN(seq) FROM events WHERE interaction_id = ?",
+                                     (seek["interaction_id"],)).fetchone()
+            return row[0] - 1 if row[0] is not None else None
+        if seek.get("timestamp"):
+            rows = index.query(start_time=seek["timestamp"], limit=1)
+            return rows[0]["seq"] - 1 if rows else None
+        return 0
+
+    def _prepare(self, seek: Dict[str, Optional[str]]):
+        with self._index() as index:
+            index.catch_up()
+            start = self._resolve_start(index, seek)
+            total = index.count(event_types=self.event_types)
+            done = total - index.count(event_types=self.event_types, after_seq=start) if start is not None else total
+        return start, total, done
+
+    def _read_page(self, after_seq: int) -> List[Dict[str, Any]]:
+        with self._index() as index:
+            rows = index.query(event_types=self.event_types, after_seq=after_seq, limit=self.page_size)
+            if len(rows) < self.page_size:
+                # Pick up anything written since the replay started
+                index.catch_up()
+                rows = index.query(event_types=self.event_types, after_seq=after_seq, limit=self.page_size)
+
+        if not rows:
+            return []
+        paths = {plain_segment_name(path.name): path for path in session_segment_files(self.session_dir)}
+        page = []
+        for row in rows:
+            segment = row["segment"]
+            cursor = self._segments.get(segment)
+            if cursor is None or (paths.get(segment) and cursor.path != paths[segment]):
+                # New segment, or the segment was sealed since it was opened
+                if cursor is not None:
+                    self._segments.pop(segment).close()
+                if segment not in paths:
+                    # Removed by retention since the index was read
+                    page.append({"seq": row["seq"], "entry": None})
+                    continue
+                cursor = self._segments[segment] = _SegmentCursor(paths[segment])
+            try:
+                entry = json.loads(cursor.read(row["offset"], row["length"]))
+            except (ValueError, OSError):
+                entry = None
+            page.append({"seq": row["seq"], "entry": entry})
+        return page
+
+    def _close_segments(self) -> None:
+        for cursor in self._segments.values():
+            cursor.close()
+        self._segments.clear()
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        if self._state == "pending":
+            self._state = "playing"
+        previous_time: Optional[datetime] = None
+        try:
+            while self._state != "stopped":
+                if self._seek_to is not None:
+                    seek, self._seek_to = self._seek_to, None
+                    start, self._total, self._emitted = await asyncio.to_thread(self._prepare, seek)
+                    if start is None:
+                        break
+                    self._cursor_seq = start
+                    previous_time = None
+
+                page = await asyncio.to_thread(self._read_page, self._cursor_seq)
+                if not page:
+                    break
+
+                for item in page:
+                    await self._resumed.wait()
+                    if self._state == "stopped" or self._seek_to is not None:
+                        break
+
+                    self._cursor_seq = item["seq"]
+                    entry = item["entry"]
+                    if entry is None:
+                        continue
+
+                    timestamp = self._parse_timestamp(entry.get("timestamp"))
+                    if self.real_time and previous_time is not None and timestamp is not None:
+                        delay = (timestamp - previous_time).total_seconds() / self.speed_factor
+                        if self.max_gap_seconds is not None:
+                            delay = min(delay, self.max_gap_seconds)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    previous_time = timestamp or previous_time
+
+                    self._emitted += 1
+                    self._position = entry.get("timestamp")
+                    yield entry
+        finally:
+            if self._state != "stopped":
+                self._state = "completed"
+            await asyncio.to_thread(self._close_segments)
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
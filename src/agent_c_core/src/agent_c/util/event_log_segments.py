@@ -0,0 +1,390 @@
+"""
+Segmented, compressed storage for per-session event logs.
+
+A session directory holds one active, plain JSONL segment that
+EventSessionLogger appends to, plus any number of sealed segments.  When the
+active segment grows past the size or age limit in the SegmentPolicy it is
+sealed: compressed (gzip, or zstd when the `zstandard` package is installed),
+and recorded in the session's `manifest.json` together with its event count
+and time range.  Retention limits are applied to sealed segments whenever a
+segment is sealed.
+
+Readers should go through `session_segment_files` / `iter_session_events`
+rather than globbing for `*.jsonl`; they span sealed and plain segments in
+order, decompress transparently and also understand directories written
+before segmentation existed.
+"""
+
+import gzip
+import io
+import json
+import os
+import time
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class SegmentCompression(str, Enum):
+    """Compression applied to sealed segments"""
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+SEGMENT_SUFFIX = ".jsonl"
+_COMPRESSED_SUFFIXES = {SegmentCompression.GZIP: ".gz", SegmentCompression.ZSTD: ".zst"}
+
+
+@dataclass
+class SegmentPolicy:
+    """
+    When to seal the active segment of a session and which sealed segments to keep.
+
+    Retention limits are all optional and apply only to sealed segments, the
+    active segment is never removed.
+    """
+    max_segment_bytes: int = 8 * 1024 * 1024
+    max_segment_age_seconds: Optional[float] = None
+    compression: SegmentCompression = SegmentCompression.GZIP
+    compression_level: Optional[int] = None
+    seal_on_close: bool = True
+    retention_max_segments: Optional[int] = None
+    retention_max_age_days: Optional[float] = None
+    retention_max_bytes: Optional[int] = None
+
+    def __post_init__(self):
+        self.compression = SegmentCompression(self.compression)
+        if self.compression is SegmentCompression.ZSTD and zstandard is None:
+            # zstd is optional, fall back rather than failing to log
+            self.compression = SegmentCompression.GZIP
+
+    @classmethod
+    def from_env(cls) -> 'SegmentPolicy':
+        """Build a policy from the AGENT_LOG_SEGMENT_* and AGENT_LOG_RETENTION_* environment variables"""
+        def optional(name: str, cast):
+            value = os.getenv(name)
+            return cast(value) if value not in (None, "") else None
+
+        return cls(
+            max_segment_bytes=int(os.getenv('AGENT_LOG_SEGMENT_MAX_BYTES', str(8 * 1024 * 1024))),
+            max_segment_age_seconds=optional('AGENT_LOG_SEGMENT_MAX_AGE', float),
+            compression=SegmentCompression(os.getenv('AGENT_LOG_COMPRESSION', 'gzip').lower()),
+            seal_on_close=os.getenv('AGENT_LOG_SEAL_ON_CLOSE', 'true').lower() == 'true',
+            retention_max_segments=optional('AGENT_LOG_RETENTION_MAX_SEGMENTS', int),
+            retention_max_age_days=optional('AGENT_LOG_RETENTION_DAYS', float),
+            retention_max_bytes=optional('AGENT_LOG_RETENTION_MAX_BYTES', int),
+        )
+
+    @property
+    def has_retention(self) -> bool:
+        return any(limit is not None for limit in (self.retention_max_segments, self.retention_max_age_days,
+                                                   self.retention_max_bytes))
+
+
+@dataclass
+class SegmentInfo:
+    """Manifest entry for a sealed segment"""
+    file: str
+    events: int
+    first_timestamp: Optional[str]
+    last_timestamp: Optional[str]
+    raw_bytes: int
+    stored_bytes: int
+    compression: str
+    sealed_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SegmentInfo':
+        return cls(**{key: data.get(key) for key in cls.__dataclass_fields__ if key in data})
+
+
+class SegmentManifest:
+    """
+    The sealed segments of one session, oldest first, stored as `manifest.json`
+    in the session directory.
+    """
+    FILE_NAME = "manifest.json"
+    VERSION = 1
+
+    def __init__(self, session_dir: Union[str, Path], segments: Optional[List[SegmentInfo]] = None):
+        self.session_dir = Path(session_dir)
+        self.segments: List[SegmentInfo] = segments or []
+
+    @property
+    def path(self) -> Path:
+        return self.session_dir / self.FILE_NAME
+
+    @classmethod
+    def load(cls, session_dir: Union[str, Path]) -> 'SegmentManifest':
+        """Load the manifest for a session, an absent or unreadable manifest is treated as empty"""
+        manifest = cls(session_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            manifest.segments = [SegmentInfo.from_dict(entry) for entry in data.get("segments", [])]
+        except (OSError, ValueError, TypeError):
+            pass
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.VERSION, "segments": [segment.to_dict() for segment in self.segments]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def files(self) -> List[str]:
+        return [segment.file for segment in self.segments]
+
+    @property
+    def event_count(self) -> int:
+        return sum(segment.events for segment in self.segments)
+
+    @property
+    def stored_bytes(self) -> int:
+        return sum(segment.stored_bytes for segment in self.segments)
+
+
+def _compression_for(path: Path) -> SegmentCompression:
+    if path.suffix == ".gz":
+        return SegmentCompression.GZIP
+    if path.suffix == ".zst":
+        return SegmentCompression.ZSTD
+    return SegmentCompression.NONE
+
+
+def is_segment_file(path: Union[str, Path]) -> bool:
+    """True for plain and compressed segment files"""
+    name = Path(path).name
+    return name.endswith(SEGMENT_SUFFIX) or any(name.endswith(SEGMENT_SUFFIX + suffix)
+                                                for suffix in _COMPRESSED_SUFFIXES.values())
+
+
+def segment_exists(path: Path) -> bool:
+    """True if a segment with this plain path exists in any form"""
+    return path.exists() or any(path.with_name(path.name + suffix).exists() for suffix in _COMPRESSED_SUFFIXES.values())
+
+
+def open_segment(path: Union[str, Path]) -> io.TextIOBase:
+    """Open a plain or compressed segment for reading as text"""
+    path = Path(path)
+    compression = _compression_for(path)
+    if compression is SegmentCompression.GZIP:
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if compression is SegmentCompression.ZSTD:
+        if zstandard is None:
+            raise RuntimeError(f"Reading {path.name} requires the 'zstandard' package")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True),
+                                encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def session_segment_files(session_dir: Union[str, Path]) -> List[Path]:
+    """
+    Every segment of a session in event order: sealed segments in manifest
+    order, then any segments missing from the manifest (plain or compressed)
+    in name order.
+    """
+    session_dir = Path(session_dir)
+    if not session_dir.is_dir():
+        return []
+
+    manifest_files = SegmentManifest.load(session_dir).files()
+    listed = set(manifest_files)
+    ordered = [session_dir / name for name in manifest_files if (session_dir / name).exists()]
+    ordered.extend(sorted((path for path in session_dir.iterdir()
+                           if is_segment_file(path) and path.name not in listed), key=lambda p: p.name))
+    return ordered
+
+
+def iter_segment_events(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the decoded entries of one segment, skipping blank and malformed lines"""
+    with open_segment(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def iter_session_events(session_dir: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the decoded entries of every segment of a session, in order"""
+    for path in session_segment_files(session_dir):
+        yield from iter_segment_events(path)
+
+
+def _scan_segment(path: Path) -> Dict[str, Any]:
+    events = 0
+    first_timestamp = None
+    last_timestamp = None
+    for entry in iter_segment_events(path):
+        events += 1
+        timestamp = entry.get("timestamp") if isinstance(entry, dict) else None
+        if timestamp:
+            first_timestamp = first_timestamp or timestamp
+            last_timestamp = timestamp
+    return {"events": events, "first_timestamp": first_timestamp, "last_timestamp": last_timestamp}
+
+
+def summarize_session(session_dir: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Event count, time range and file list for a session.
+
+    Sealed segments are summarized from the manifest, only segments missing
+    from it are read.
+    """
+    session_dir = Path(session_dir)
+    manifest = SegmentManifest.load(session_dir)
+    sealed = {segment.file: segment for segment in manifest.segments}
+    summary = {"events": 0, "first_timestamp": None, "last_timestamp": None, "files": []}
+
+    for path in session_segment_files(session_dir):
+        stats = sealed.get(path.name)
+        stats = asdict(stats) if stats is not None else _scan_segment(path)
+        summary["files"].append(path.name)
+        summary["events"] += stats["events"]
+        if stats["first_timestamp"] and (summary["first_timestamp"] is None or stats["first_timestamp"] < summary["first_timestamp"]):
+            summary["first_timestamp"] = stats["first_timestamp"]
+        if stats["last_timestamp"] and (summary["last_timestamp"] is None or stats["last_timestamp"] > summary["last_timestamp"]):
+            summary["last_timestamp"] = stats["last_timestamp"]
+    return summary
+
+
+def _compress_file(source: Path, target: Path, compression: SegmentCompression, level: Optional[int]) -> None:
+    tmp_target = target.with_name(target.name + ".tmp")
+    with open(source, 'rb') as src, open(tmp_target, 'wb') as raw:
+        if compression is SegmentCompression.GZIP:
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=level if level is not None else 6) as dst:
+                while chunk := src.read(1024 * 1024):
+                    dst.write(chunk)
+        else:
+            compressor = zstandard.ZstdCompressor(level=level if level is not None else 3)
+            with compressor.stream_writer(raw, closefd=False) as dst:
+                while chunk := src.read(1024 * 1024):
+                    dst.write(chunk)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp_target, target)
+
+
+def seal_segment(path: Union[str, Path], policy: SegmentPolicy) -> Optional[SegmentInfo]:
+    """
+    Compress a plain segment, record it in the session manifest and apply retention.
+
+    Returns the manifest entry, or None if the segment does not exist or is empty.
+    The caller must make sure nothing is still writing to the segment.
+    """
+    path = Path(path)
+    try:
+        raw_bytes = path.stat().st_size
+    except FileNotFoundError:
+        return None
+    if raw_bytes == 0:
+        path.unlink(missing_ok=True)
+        return None
+
+    stats = _scan_segment(path)
+    stored = path
+    if policy.compression is not SegmentCompression.NONE:
+        stored = path.with_name(path.name + _COMPRESSED_SUFFIXES[policy.compression])
+        _compress_file(path, stored, policy.compression, policy.compression_level)
+
+    info = SegmentInfo(file=stored.name, raw_bytes=raw_bytes, stored_bytes=stored.stat().st_size,
+                       compression=policy.compression.value, **stats)
+
+    manifest = SegmentManifest.load(path.parent)
+    manifest.segments = [segment for segment in manifest.segments if segment.file != info.file] + [info]
+    manifest.save()
+
+    # Only drop the plain file once the compressed copy is recorded
+    if stored != path:
+        path.unlink(missing_ok=True)
+
+    if policy.has_retention:
+        apply_retention(path.parent, policy, manifest)
+    return info
+
+
+def unsealed_segments(session_dir: Union[str, Path], exclude: Iterable[Path] = ()) -> List[Path]:
+    """Plain segments of a session that are not in its manifest, oldest first"""
+    session_dir = Path(session_dir)
+    if not session_dir.is_dir():
+        return []
+
+    excluded = set(exclude)
+    listed = set(SegmentManifest.load(session_dir).files())
+    return sorted(path for path in session_dir.glob(f"*{SEGMENT_SUFFIX}")
+                  if path not in excluded and path.name not in listed)
+
+
+def seal_closed_segments(session_dir: Union[str, Path], policy: SegmentPolicy,
+                         exclude: Iterable[Path] = ()) -> List[SegmentInfo]:
+    """
+    Seal every plain segment in a session directory except the excluded
+    (active) ones, such as segments left behind by an earlier process.
+    """
+    sealed = []
+    for path in unsealed_segments(session_dir, exclude):
+        info = seal_segment(path, policy)
+        if info is not None:
+            sealed.append(info)
+    return sealed
+
+
+def apply_retention(session_dir: Union[str, Path], policy: SegmentPolicy,
+                    manifest: Optional[SegmentManifest] = None) -> List[str]:
+    """
+    Delete sealed segments that fall outside the policy's retention limits.
+
+    Returns the names of the deleted segment files.
+    """
+    manifest = manifest or SegmentManifest.load(session_dir)
+    keep = list(manifest.segments)
+    removed: List[SegmentInfo] = []
+
+    if policy.retention_max_age_days is not None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=policy.retention_max_age_days)
+        for segment in list(keep):
+            if _parse_timestamp(segment.last_timestamp or segment.sealed_at) < cutoff:
+                keep.remove(segment)
+                removed.append(segment)
+
+    if policy.retention_max_segments is not None:
+        while len(keep) > max(0, policy.retention_max_segments):
+            removed.append(keep.pop(0))
+
+    if policy.retention_max_bytes is not None:
+        while keep and sum(segment.stored_bytes for segment in keep) > policy.retention_max_bytes:
+            removed.append(keep.pop(0))
+
+    if not removed:
+        return []
+
+    manifest.segments = keep
+    manifest.save()
+    for segment in removed:
+        (manifest.session_dir / segment.file).unlink(missing_ok=True)
+    return [segment.file for segment in removed]
+
+
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    if not value:
+        return datetime.fromtimestamp(time.time(), timezone.utc)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Log entries are written with naive local timestamps
+    return parsed if parsed.tzinfo else parsed.astimezone()
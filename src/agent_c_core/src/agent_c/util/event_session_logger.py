@@ -10,10 +10,13 @@ import asyncio
 import json
 import logging
 import os
+import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Optional, Dict, Union, Awaitable, TYPE_CHECKING
+from typing import Any, Callable, Optional, Dict, List, Union, Awaitable, TYPE_CHECKING
 
 from .logging_utils import LoggingManager
 from .transport_exceptions import (
@@ -21,10 +24,24 @@ from .transport_exceptions import (
     TransportConnectionError, TransportTimeoutError, SerializationError
 )
 from .transports import TransportInterface
+from .session_log_writer import SessionLogWriter, DurabilityMode
+from .event_log_segments import SegmentPolicy, SEGMENT_SUFFIX, segment_exists, seal_segment, unsealed_segments
+from .event_log_index import EventLogIndex, IndexEntry, interaction_boundary
 
 if TYPE_CHECKING:
     from agent_c.models.events.session_event import SessionEvent, SemiSessionEvent
 
+@dataclass
+class _ActiveSegment:
+    """The segment a session is currently appending to"""
+    path: Path
+    stem: str
+    sequence: int = 0
+    bytes: int = 0
+    opened_at: float = field(default_factory=time.monotonic)
+    interaction_id: Optional[str] = None  # The interaction in progress, carried over to the next segment
+
+
 class EventSessionLogger:
     """
     Gateway pattern implementation for event-driven session logging.
@@ -34,7 +51,26 @@ class EventSessionLogger:
     - Optional downstream forwarding (callback or transport)
     - Error isolation between logging and transport concerns
     - Backward compatibility with current SessionLogger behavior
+
+    Local log lines are handed to a SessionLogWriter, which batches them and
+    appends them from a background task through persistent file handles, so
+    logging does not add disk I/O latency to the event stream.  Call `flush()`
+    to wait for queued lines; the logger flushes automatically at the end of
+    each interaction and on `close()`.
+
+    Each session appends to a plain JSONL segment.  Once the segment passes
+    the size or age limit of the SegmentPolicy it is sealed (compressed and
+    recorded in the session manifest) in the background and a new segment is
+    started; see `agent_c.util.event_log_segments` for reading them back.
+
+    Unless disabled, the location, type, timestamp and interaction of every
+    line is also recorded in the session's sidecar index
+    (`agent_c.util.event_log_index`).  Index rows are committed at the end of
+    each interaction, every INDEX_BATCH_SIZE events and on `flush()`.
     """
+
+    MAX_TRACKED_SESSIONS = 4096
+    INDEX_BATCH_SIZE = 1024
     
     def __init__(
         self,
@@ -50,6 +86,12 @@ class EventSessionLogger:
         enable_local_logging: bool = True,
         session_directory_pattern: str = "{session_id}",
         unknown_session_pattern: str = "unknown_{uuid}",
+        durability: Union[str, DurabilityMode] = None,
+        max_open_files: int = None,
+        write_batch_size: int = 256,
+        write_flush_interval: float = 0.25,
+        segment_policy: Optional[SegmentPolicy] = None,
+        enable_index: Optional[bool] = None,
         **kwargs
     ) -> None:
         """
@@ -68,6 +110,14 @@ class EventSessionLogger:
             enable_local_logging: Whether to perform local logging
             session_directory_pattern: Pattern for session directories
             unknown_session_pattern: Pattern for unknown session directories
+            durability: "buffered" (default) to queue lines for background writing, or "durable"
+                        to wait for every line to be written and fsync'd before returning
+            max_open_files: Maximum session log files kept open at once (default 64)
+            write_batch_size: Queued lines that trigger a write
+            write_flush_interval: Maximum seconds a queued line waits before being written
+            segment_policy: Segment size, compression and retention (default: from AGENT_LOG_SEGMENT_*
+                            and AGENT_LOG_RETENTION_* env vars)
+            enable_index: Whether to maintain the sidecar index for each session (default: from AGENT_LOG_INDEX)
         """
         # Load configuration from environment if not provided
         config = self._load_configuration()
@@ -88,6 +138,17 @@ class EventSessionLogger:
         
         # Internal state
         self._directory_cache = set()  # Cache for created directories
+        self._session_log_files: OrderedDict[str, _ActiveSegment] = OrderedDict()  # Active segment per session
+        self.segment_policy = segment_policy or SegmentPolicy.from_env()
+        self._background_tasks: set[asyncio.Task] = set()
+        self._background_lock = asyncio.Lock()
+        self.enable_index = config['enable_index'] if enable_index is None else enable_index
+        self._pending_index: Dict[Path, List[IndexEntry]] = {}
+        self._open_interactions: Dict[Path, Dict[str, Optional[str]]] = {}
+        self.writer = SessionLogWriter(max_open_files=max_open_files or config['max_open_files'],
+                                       batch_size=write_batch_size,
+                                       flush_interval=write_flush_interval,
+                                       durability=DurabilityMode(durability or config['durability']))
         logging_manager = LoggingManager(__name__)
         self.logger = logging_manager.get_logger()
         self._closed = False
@@ -107,7 +168,10 @@ class EventSessionLogger:
             'file_naming_pattern': os.getenv('AGENT_LOG_FILE_PATTERN', '%Y%m%d_%H%M%S'),
             'enable_local_logging': os.getenv('AGENT_LOG_ENABLE_LOCAL', 'true').lower() == 'true',
             'session_directory_pattern': os.getenv('AGENT_LOG_SESSION_PATTERN', '{session_id}'),
-            'unknown_session_pattern': os.getenv('AGENT_LOG_UNKNOWN_PATTERN', 'unknown_{uuid}')
+            'unknown_session_pattern': os.getenv('AGENT_LOG_UNKNOWN_PATTERN', 'unknown_{uuid}'),
+            'durability': os.getenv('AGENT_LOG_DURABILITY', 'buffered'),
+            'max_open_files': int(os.getenv('AGENT_LOG_MAX_OPEN_FILES', '64')),
+            'enable_index': os.getenv('AGENT_LOG_INDEX', 'true').lower() == 'true'
         }
     
     def _default_error_handler(self, error: Exception, context: str) -> None:
@@ -174,10 +238,116 @@ class EventSessionLogger:
         return self.log_base_dir / session_dir_name
     
     def get_log_file_path(self, session_id: str) -> Path:
-        """Get the current log file path for a session"""
+        """
+        Get the current log file path for a session.
+
+        The file is the session's active segment, named for the time of its
+        first event.  Every later event for the session goes to the same file
+        until the segment is sealed.
+        """
+        return self._active_segment(session_id).path
+
+    def _active_segment(self, session_id: str, previous: Optional[_ActiveSegment] = None) -> _ActiveSegment:
+        segment = self._session_log_files.get(session_id)
+        if segment is not None:
+            self._session_log_files.move_to_end(session_id)
+            return segment
+
         session_dir = self.get_session_directory(session_id)
-        timestamp = datetime.now().strftime(self.file_naming_pattern)
-        return session_dir / f"{timestamp}.jsonl"
+        stem = datetime.now().strftime(self.file_naming_pattern)
+        # Segments can be rotated more than once within the resolution of the naming pattern, and the
+        # previous segment may not have reached the disk yet
+        sequence = previous.sequence + 1 if previous is not None and previous.stem == stem else 0
+        while True:
+            name = f"{stem}_{sequence:03d}" if sequence else stem
+            log_file = session_dir / f"{name}{SEGMENT_SUFFIX}"
+            if not segment_exists(log_file):
+                break
+            sequence += 1
+
+        segment = _ActiveSegment(log_file, stem, sequence,
+                                 interaction_id=previous.interaction_id if previous is not None else None)
+        self._session_log_files[session_id] = segment
+        if len(self._session_log_files) > self.MAX_TRACKED_SESSIONS:
+            self._session_log_files.popitem(last=False)
+        return segment
+
+    def _segment_is_full(self, segment: _ActiveSegment, line_bytes: int) -> bool:
+        if segment.bytes == 0:
+            return False
+        policy = self.segment_policy
+        if segment.bytes + line_bytes > policy.max_segment_bytes:
+            return True
+        return (policy.max_segment_age_seconds is not None
+                and time.monotonic() - segment.opened_at >= policy.max_segment_age_seconds)
+
+    def _rotate_segment(self, session_id: str) -> _ActiveSegment:
+        """Start a new segment for the session and seal the old one in the background"""
+        previous = self._session_log_files.pop(session_id, None)
+        segment = self._active_segment(session_id, previous)
+        self._run_in_background(self._seal_segments(segment.path.parent))
+        return segment
+
+    def _run_in_background(self, coro: Awaitable[None]) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _track_index_entry(self, session_dir: Path, segment: _ActiveSegment, event_data: Dict[str, Any],
+                           timestamp: str, offset: int, length: int) -> None:
+        """Queue the index row for a line about to be written at `offset` in the session's active segment"""
+        boundary = interaction_boundary(event_data)
+        if boundary is True:
+            segment.interaction_id = event_data.get('id')
+
+        pending = self._pending_index.setdefault(session_dir, [])
+        pending.append(IndexEntry(segment.path.name, offset, length, timestamp,
+                                  event_data.get('type'), segment.interaction_id))
+        if boundary is False:
+            segment.interaction_id = None
+        self._open_interactions.setdefault(session_dir, {})[segment.path.name] = segment.interaction_id
+
+        if len(pending) >= self.INDEX_BATCH_SIZE:
+            self._run_in_background(self._commit_index(session_dir))
+
+    async def _commit_index(self, session_dir: Path) -> None:
+        """Write queued index rows for a session once the lines they point at are on disk"""
+        async with self._background_lock:
+            entries = self._pending_index.pop(session_dir, None)
+            open_interactions = self._open_interactions.pop(session_dir, None)
+            if not entries:
+                return
+            try:
+                await self.writer.flush()
+                await asyncio.to_thread(self._write_index, session_dir, entries, open_interactions)
+            except Exception as e:
+                self.error_handler(e, f"index_commit:{session_dir}")
+
+    @staticmethod
+    def _write_index(session_dir: Path, entries: List[IndexEntry], open_interactions: Dict[str, Optional[str]]) -> None:
+        with EventLogIndex(session_dir) as index:
+            index.add(entries, open_interactions)
+
+    async def _commit_all_indexes(self) -> None:
+        for session_dir in list(self._pending_index):
+            await self._commit_index(session_dir)
+
+    async def _seal_segments(self, session_dir: Path) -> None:
+        """Seal every segment in a session directory that is no longer being appended to"""
+        async with self._background_lock:
+            try:
+                # Segments only reach the disk once the writer gets to them
+                await self.writer.flush()
+                active = [segment.path for segment in self._session_log_files.values()] if not self._closed else []
+                closed = unsealed_segments(session_dir, active)
+
+                # Make sure the writer has finished with the segments and closed their handles
+                for path in closed:
+                    await self.writer.release(path)
+                for path in closed:
+                    await asyncio.to_thread(seal_segment, path, self.segment_policy)
+            except Exception as e:
+                self.error_handler(e, f"segment_seal:{session_dir}")
     
     def _serialize_event(self, event: Any) -> Dict[str, Any]:
         """
@@ -247,66 +417,40 @@ class EventSessionLogger:
             event_data = self._serialize_event(event)
             
             # Create log entry
+            timestamp = datetime.now().isoformat()
             log_entry = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "event": event_data
             }
             
-            # Get log file path (create new file for each session)
-            log_file = self.get_log_file_path(session_id)
-            
-            # Attempt to write to file with error recovery
-            return self._write_log_entry_with_recovery(log_entry, log_file, session_dir)
-            
+            # Get the session's active segment, starting a new one if it is full
+            line = json.dumps(log_entry, default=str) + '\n'
+            length = len(line.encode('utf-8'))
+            segment = self._active_segment(session_id)
+            if self._segment_is_full(segment, length):
+                segment = self._rotate_segment(session_id)
+
+            # Reserve the line's place before waiting on the writer, so concurrent writes get their own offsets
+            offset = segment.bytes
+            segment.bytes += length
+
+            # Queue the line for the background writer, flushing the session at the end of an interaction
+            if self.enable_index:
+                self._track_index_entry(session_dir, segment, event_data, timestamp, offset, length)
+            await self.writer.write(segment.path, line)
+            if self._is_interaction_end(event_data):
+                await self.writer.flush()
+                if self.enable_index:
+                    self._run_in_background(self._commit_index(session_dir))
+            return True
+
         except Exception as e:
             raise LocalLoggingError(f"Local logging failed: {e}")
-    
-    def _write_log_entry_with_recovery(self, log_entry: Dict[str, Any], log_file: Path, session_dir: Path) -> bool:
-        """
-        Write log entry with directory recovery if needed.
-        
-        Args:
-            log_entry: Log entry to write
-            log_file: Path to log file
-            session_dir: Session directory path
-            
-        Returns:
-            bool: True if write succeeded
-            
-        Raises:
-            LocalLoggingError: If write fails after recovery attempt
-        """
-        try:
-            # First attempt: write to file
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, default=str) + '\n')
-            return True
-            
-        except (FileNotFoundError, OSError) as e:
-            # Directory might have been moved/deleted - attempt recovery
-            try:
-                # Remove stale cache entry
-                session_dir_str = str(session_dir)
-                if session_dir_str in self._directory_cache:
-                    self._directory_cache.remove(session_dir_str)
-                
-                # Attempt to recreate directory
-                if not self._ensure_directory_exists(session_dir):
-                    raise LocalLoggingError(f"Failed to recreate session directory after recovery: {session_dir}")
-                
-                # Retry file write once
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry, default=str) + '\n')
-                
-                # Log successful recovery
-                self.logger.info(f"Successfully recovered from missing directory: {session_dir}")
-                return True
-                
-            except Exception as recovery_error:
-                # Recovery failed - log but don't raise (let downstream continue)
-                error_msg = f"File write failed and recovery unsuccessful. Original error: {e}, Recovery error: {recovery_error}"
-                self.logger.error(error_msg)
-                raise LocalLoggingError(error_msg)
+
+    @staticmethod
+    def _is_interaction_end(event_data: Dict[str, Any]) -> bool:
+        event_type = event_data.get('type')
+        return event_type == 'interaction_end' or (event_type == 'interaction' and event_data.get('started') is False)
     
     async def _retry_operation(self, operation: Callable, operation_name: str) -> bool:
         """
@@ -330,7 +474,7 @@ class EventSessionLogger:
                 if attempt < self.max_retry_attempts - 1:
                     delay = self.retry_delay_seconds * (2 ** attempt)  # Exponential backoff
                     await asyncio.sleep(delay)
-                    self.logger.debug(f"Retrying {operation_name} (attempt {attempt + 2}/{self.max_retry_attempts})")
+                    self.logger.debug("Retrying %s (attempt %d/%d)", operation_name, attempt + 2, self.max_retry_attempts)
         
         # All retries failed
         self.error_handler(last_exception, f"retry_failed:{operation_name}")
@@ -432,12 +576,36 @@ class EventSessionLogger:
         """Update downstream transport (for runtime reconfiguration)"""
         self.downstream_transport = transport
     
+    async def flush(self) -> None:
+        """Wait until every queued log line has been written, indexed and pending segments are sealed"""
+        await self.writer.flush()
+        if self._background_tasks:
+            await asyncio.gather(*list(self._background_tasks), return_exceptions=True)
+        await self._commit_all_indexes()
+
+    def get_write_metrics(self) -> Dict[str, Any]:
+        """Local log writer throughput and latency metrics"""
+        return self.writer.metrics.summary() | {"open_files": self.writer.open_files,
+                                                 "queue_depth": self.writer.queue_depth}
+
     async def close(self) -> None:
         """Clean shutdown - close transport connections and flush logs"""
         if self._closed:
             return
         
         self._closed = True
+
+        # Write anything still queued, seal the active segments and release the session file handles
+        try:
+            if self._background_tasks:
+                await asyncio.gather(*list(self._background_tasks), return_exceptions=True)
+            await self._commit_all_indexes()
+            if self.segment_policy.seal_on_close:
+                for session_dir in {segment.path.parent for segment in self._session_log_files.values()}:
+                    await self._seal_segments(session_dir)
+            await self.writer.close()
+        except Exception as e:
+            self.error_handler(e, "writer_close")
         
         # Close transport if available
         if self.downstream_transport:
@@ -448,6 +616,7 @@ class EventSessionLogger:
         
         # Clear caches
         self._directory_cache.clear()
+        self._session_log_files.clear()
     
     async def __aenter__(self) -> 'EventSessionLogger':
         """Async context manager entry"""
@@ -25,8 +25,9 @@ from .event_session_logger import EventSessionLogger
 from .logging_utils import LoggingManager
 from .transports import (
     TransportInterface, CallbackTransport, LoggingTransport, NullTransport,
-    FileTransport, HTTPTransport, QueueTransport, RetryTransport
+    FileTransport, HTTPTransport, QueueTransport, RedisStreamTransport, RetryTransport
 )
+from .spill_queue import SpillQueue
 from .transport_exceptions import EventSessionLoggerError
 
 
@@ -46,6 +47,7 @@ class TransportType(Enum):
     FILE = "file"
     HTTP = "http"
     QUEUE = "queue"
+    REDIS_STREAM = "redis_stream"
     RETRY = "retry"
 
 
@@ -71,6 +73,8 @@ class LoggerConfiguration:
     enable_retry: bool = False
     fallback_transport_type: Optional[TransportType] = None
     fallback_transport_config: Dict[str, Any] = field(default_factory=dict)
+    spill_directory: Optional[str] = None
+    spill_max_bytes: int = 1024 * 1024 * 1024
     
     # Environment-specific settings
     environment: LoggerEnvironment = LoggerEnvironment.DEVELOPMENT
@@ -150,6 +154,8 @@ def load_configuration_from_env() -> LoggerConfiguration:
     config.max_retry_attempts = int(os.getenv('AGENT_LOG_MAX_RETRIES', str(config.max_retry_attempts)))
     config.retry_delay_seconds = float(os.getenv('AGENT_LOG_RETRY_DELAY', str(config.retry_delay_seconds)))
     config.enable_retry = os.getenv('AGENT_LOG_ENABLE_RETRY', 'false').lower() == 'true'
+    config.spill_directory = os.getenv('AGENT_LOG_SPILL_DIR', config.spill_directory)
+    config.spill_max_bytes = int(os.getenv('AGENT_LOG_SPILL_MAX_BYTES', str(config.spill_max_bytes)))
     
     # Environment settings
     env_str = os.getenv('AGENT_ENVIRONMENT', 'development')
@@ -170,6 +176,10 @@ def load_configuration_from_env() -> LoggerConfiguration:
         config.transport_config = {
             'endpoint_url': os.getenv('AGENT_HTTP_ENDPOINT'),
             'timeout': float(os.getenv('AGENT_HTTP_TIMEOUT', '30.0')),
+            'max_batch_events': int(os.getenv('AGENT_HTTP_BATCH_EVENTS', '100')),
+            'max_batch_bytes': int(os.getenv('AGENT_HTTP_BATCH_BYTES', str(1024 * 1024))),
+            'max_batch_delay': float(os.getenv('AGENT_HTTP_BATCH_DELAY', '1.0')),
+            'compression': os.getenv('AGENT_HTTP_COMPRESSION', 'gzip').lower() or None,
             'headers': {}
         }
         
@@ -184,6 +194,13 @@ def load_configuration_from_env() -> LoggerConfiguration:
             'connection_string': os.getenv('AGENT_QUEUE_CONNECTION')
         }
     
+    elif config.transport_type == TransportType.REDIS_STREAM:
+        config.transport_config = {
+            'redis_url': os.getenv('AGENT_REDIS_URL', 'redis://localhost:6379/0'),
+            'stream_key': os.getenv('AGENT_REDIS_STREAM_KEY', 'agent_c:events'),
+            'max_len': int(os.getenv('AGENT_REDIS_STREAM_MAXLEN', '100000'))
+        }
+    
     elif config.transport_type == TransportType.FILE:
         config.transport_config = {
             'file_path': os.getenv('AGENT_FILE_TRANSPORT_PATH', 'transport_events.jsonl')
@@ -398,7 +415,9 @@ def _create_transport(transport_type: TransportType, config: Dict[str, Any]) ->
             raise EventSessionLoggerError("HTTP transport requires 'endpoint_url' in config")
         headers = config.get('headers', {})
         timeout = config.get('timeout', 30.0)
-        return HTTPTransport(endpoint_url, headers, timeout)
+        batching = {key: config[key] for key in ('max_batch_events', 'max_batch_bytes', 'max_batch_delay', 'compression')
+                    if key in config}
+        return HTTPTransport(endpoint_url, headers, timeout, **batching)
     
     elif transport_type == TransportType.QUEUE:
         queue_name = config.get('queue_name')
@@ -407,6 +426,11 @@ def _create_transport(transport_type: TransportType, config: Dict[str, Any]) ->
             raise EventSessionLoggerError("Queue transport requires 'queue_name' and 'connection_string' in config")
         return QueueTransport(queue_name, connection_string)
     
+    elif transport_type == TransportType.REDIS_STREAM:
+        options = {key: config[key] for key in ('redis_url', 'stream_key', 'max_len', 'max_batch_events', 'max_batch_delay')
+                   if key in config}
+        return RedisStreamTransport(**options)
+    
     else:
         raise EventSessionLoggerError(f"Unknown transport type: {transport_type}")
 
@@ -432,11 +456,16 @@ def create_logger_from_config(config: LoggerConfiguration) -> EventSessionLogger
                     config.fallback_transport_config
                 )
             
+            spill_queue = None
+            if config.spill_directory:
+                spill_queue = SpillQueue(config.spill_directory, max_bytes=config.spill_max_bytes)
+            
             transport = RetryTransport(
                 transport,
                 max_retries=config.max_retry_attempts,
                 base_delay=config.retry_delay_seconds,
-                fallback_transport=fallback_transport
+                fallback_transport=fallback_transport,
+                spill_queue=spill_queue
             )
     
     # Create error handler for debugging
@@ -0,0 +1,120 @@
+import os
+import json
+import hashlib
+
+from typing import Any, Optional
+
+from diskcache import Cache
+from pydantic import BaseModel as PydanticModel
+
+from agent_c.models.base import BaseModel
+from agent_c.util.logging_utils import LoggingManager
+
+
+class ResponseCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """
+    A local, on-disk cache of model responses for deterministic requests.
+
+    Entries are keyed on a canonical hash of everything that determines the
+    model's output (model, sampling parameters, system prompt, messages and
+    output schema), so identical one-shot requests can be answered without
+    calling the provider.  Backed by diskcache, which gives us TTLs, a size
+    limit with LRU eviction and hit/miss statistics that survive restarts.
+    """
+
+    DEFAULT_TTL: int = 7 * 24 * 60 * 60
+    DEFAULT_SIZE_LIMIT: int = 512 * 1024 * 1024
+
+    def __init__(self, **kwargs: Any) -> None:
+        """
+        Keyword Arguments:
+            cache (Optional[Cache]): An existing diskcache Cache instance. If not provided, one will be created.
+            cache_dir (Optional[str]): The directory for cache data if a new cache is created. Defaults to ".response_cache".
+            ttl (Optional[int]): Seconds until an entry expires, None for no expiry. Defaults to one week.
+            size_limit (int): Maximum size of the cache on disk in bytes. Defaults to 512MB.
+        """
+        self.ttl: Optional[int] = kwargs.get('ttl', self.DEFAULT_TTL)
+        self.cache: Optional[Cache] = kwargs.get('cache')
+        if self.cache is None:
+            cache_dir: str = kwargs.get('cache_dir', ".response_cache")
+            os.makedirs(cache_dir, exist_ok=True)
+            self.cache = Cache(cache_dir, size_limit=kwargs.get('size_limit', self.DEFAULT_SIZE_LIMIT),
+                               eviction_policy='least-recently-used', statistics=1)
+        self.logger = LoggingManager(__name__).get_logger()
+
+    @classmethod
+    def make_key(cls, **parts: Any) -> str:
+        """
+        Build a cache key from the parts of a request that determine its response.
+
+        Parts are serialized to canonical JSON (sorted keys, pydantic models
+        and classes reduced to their data / JSON schema) before hashing, so
+        logically identical requests produce the same key regardless of dict
+        ordering.
+        """
+        canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=cls._canonical_default)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _canonical_default(value: Any) -> Any:
+        if isinstance(value, type) and issubclass(value, PydanticModel):
+            return value.model_json_schema()
+        if isinstance(value, PydanticModel):
+            return value.model_dump(mode='json')
+        if isinstance(value, (set, frozenset)):
+            return sorted(str(item) for item in value)
+        if isinstance(value, bytes):
+            return hashlib.sha256(value).hexdigest()
+        return str(value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response, or None on a miss.
+        """
+        return self.cache.get(key, default=None)
+
+    def set(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        """
+        Store a response, expiring after `expire` seconds or the cache's TTL.
+        """
+        self.cache.set(key, value, expire=expire if expire is not None else self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics."""
+        self.cache.clear()
+        self.cache.stats(reset=True)
+
+    def stats(self) -> ResponseCacheStats:
+        hits, misses = self.cache.stats()
+        return ResponseCacheStats(hits=hits, misses=misses, entries=len(self.cache), size_bytes=self.cache.volume())
+
+    def close(self) -> None:
+        self.cache.close()
+
+    @staticmethod
+    def should_use(use_cache: Optional[bool], temperature: Optional[float]) -> bool:
+        """
+        Decide whether a request may be served from the cache.
+
+        An explicit True or False from the caller wins; otherwise only
+        requests sampled at temperature 0 are considered deterministic enough
+        to cache.
+        """
+        if use_cache is not None:
+            return use_cache
+        return temperature is not None and temperature == 0
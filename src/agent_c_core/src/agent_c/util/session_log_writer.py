@@ -0,0 +1,294 @@
+"""
+Buffered asynchronous writer for session log files.
+
+EventSessionLogger hands each serialized log line to a SessionLogWriter
+instead of opening, appending to and closing the session file itself.  The
+writer queues lines, and a single background task batches them and writes
+them from a worker thread through file handles that stay open between
+batches (bounded by an LRU limit), so the event loop that is streaming tokens
+never waits on disk I/O.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Deque, Dict, IO, List, Optional, Tuple
+
+from .logging_utils import LoggingManager
+
+
+class DurabilityMode(Enum):
+    """How far a line must get before a write call returns"""
+    BUFFERED = "buffered"  # Return once queued, lines are batched and written in the background
+    DURABLE = "durable"    # Return once the line is written and fsync'd to disk
+
+
+@dataclass
+class WriterMetrics:
+    """Session log writer throughput and latency metrics"""
+    lines_written: int = 0
+    bytes_written: int = 0
+    batches_written: int = 0
+    failed_lines: int = 0
+    handles_opened: int = 0
+    handles_evicted: int = 0
+    batch_latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+    line_lags: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    @staticmethod
+    def _percentile(samples: Deque[float], percentile: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters plus write latency (per batch) and lag (enqueue to disk, per line) in milliseconds"""
+        return {
+            "lines_written": self.lines_written,
+            "bytes_written": self.bytes_written,
+            "batches_written": self.batches_written,
+            "failed_lines": self.failed_lines,
+            "handles_opened": self.handles_opened,
+            "handles_evicted": self.handles_evicted,
+            "average_batch_size": self.lines_written / self.batches_written if self.batches_written else 0.0,
+            "write_latency_ms_p50": self._percentile(self.batch_latencies, 0.5) * 1000,
+            "write_latency_ms_p99": self._percentile(self.batch_latencies, 0.99) * 1000,
+            "write_latency_ms_max": max(self.batch_latencies, default=0.0) * 1000,
+            "line_lag_ms_p50": self._percentile(self.line_lags, 0.5) * 1000,
+            "line_lag_ms_p99": self._percentile(self.line_lags, 0.99) * 1000,
+        }
+
+
+_LINE = "line"
+_FLUSH = "flush"
+_RELEASE = "release"
+_STOP = "stop"
+
+# (kind, path, text, enqueued_at, waiter)
+_QueueItem = Tuple[str, Optional[Path], str, float, Optional[asyncio.Future]]
+
+
+class SessionLogWriter:
+    """
+    Batches log lines and appends them to their files from a background task.
+
+    Lines are flushed to the OS when `batch_size` lines are pending or
+    `flush_interval` seconds have passed since the first of them was queued,
+    whichever comes first.  `flush()` waits until everything queued before it
+    has been written.
+    """
+
+    def __init__(self, max_open_files: int = 64, batch_size: int = 256, flush_interval: float = 0.25,
+                 durability: DurabilityMode = DurabilityMode.BUFFERED, max_queue_size: int = 10000) -> None:
+        """
+        Args:
+            max_open_files: Maximum number of file handles kept open, least recently used are closed first
+            batch_size: Number of queued lines that triggers a write
+            flush_interval: Maximum seconds a queued line waits before being written
+            durability: BUFFERED to return as soon as a line is queued, DURABLE to wait for it to be fsync'd
+            max_queue_size: Lines that may be queued before writers are made to wait
+        """
+        self.max_open_files = max(1, max_open_files)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.durability = DurabilityMode(durability)
+        self.max_queue_size = max_queue_size
+        self.metrics = WriterMetrics()
+        self.logger = LoggingManager(__name__).get_logger()
+
+        self._handles: "OrderedDict[Path, IO[str]]" = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def open_files(self) -> int:
+        return len(self._handles)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.get_running_loop().create_task(self._run(self._queue))
+        return self._queue
+
+    async def write(self, path: Path, text: str) -> None:
+        """
+        Queue text (one or more complete lines) to be appended to a file.
+
+        In DURABLE mode this waits until the text has been written and fsync'd.
+        """
+        if self._closed:
+            raise RuntimeError("SessionLogWriter is closed")
+
+        queue = self._ensure_started()
+        waiter = asyncio.get_running_loop().create_future() if self.durability is DurabilityMode.DURABLE else None
+        await queue.put((_LINE, path, text, time.perf_counter(), waiter))
+        if waiter is not None:
+            await waiter
+
+    async def flush(self) -> None:
+        """Wait until every line queued before this call has been written."""
+        if self._queue is None or self._task is None or self._task.done():
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        await self._queue.put((_FLUSH, None, "", time.perf_counter(), waiter))
+        await waiter
+
+    async def release(self, path: Path) -> None:
+        """
+        Wait until every line queued before this call has been written, then close the handle for `path`.
+
+        Used when a file is finished with, such as a log segment about to be sealed.
+        """
+        if self._queue is None or self._task is None or self._task.done():
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        await self._queue.put((_RELEASE, Path(path), "", time.perf_counter(), waiter))
+        await waiter
+
+    async def close(self) -> None:
+        """Write everything still queued, close all file handles and stop the background task."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._task is not None and not self._task.done():
+            waiter = asyncio.get_running_loop().create_future()
+            await self._queue.put((_STOP, None, "", time.perf_counter(), waiter))
+            await waiter
+        else:
+            self._close_handles()
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_QueueItem] = [await queue.get()]
+            deadline = loop.time() + self.flush_interval
+            line_count = 1 if batch[0][0] == _LINE else 0
+
+            # Keep collecting until the batch is full, the interval is up or someone is waiting on it
+            while line_count < self.batch_size and batch[-1][0] == _LINE and batch[-1][4] is None:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        break
+                batch.append(item)
+                if item[0] == _LINE:
+                    line_count += 1
+
+            stop = await self._write_batch(batch)
+            if stop:
+                return
+
+    async def _write_batch(self, batch: List[_QueueItem]) -> bool:
+        grouped: Dict[Path, List[str]] = {}
+        for kind, path, text, _, _ in batch:
+            if kind == _LINE:
+                grouped.setdefault(path, []).append(text)
+
+        stop = any(item[0] == _STOP for item in batch)
+        error: Optional[BaseException] = None
+        start = time.perf_counter()
+        if grouped:
+            try:
+                written = await asyncio.to_thread(self._write_sync, grouped, self.durability is DurabilityMode.DURABLE)
+                done = time.perf_counter()
+                self.metrics.batches_written += 1
+                self.metrics.bytes_written += written
+                self.metrics.batch_latencies.append(done - start)
+                for kind, _, _, enqueued_at, _ in batch:
+                    if kind == _LINE:
+                        self.metrics.lines_written += 1
+                        self.metrics.line_lags.append(done - enqueued_at)
+            except Exception as e:
+                error = e
+                self.metrics.failed_lines += sum(1 for item in batch if item[0] == _LINE)
+                self.logger.error(f"Failed writing session log batch: {e}")
+
+        released = [path for kind, path, _, _, _ in batch if kind == _RELEASE]
+        if stop:
+            await asyncio.to_thread(self._close_handles)
+        elif released:
+            await asyncio.to_thread(self._discard_handles, released)
+
+        for kind, _, _, _, waiter in batch:
+            if waiter is None or waiter.done():
+                continue
+            if error is not None and kind == _LINE:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(None)
+
+        return stop
+
+    def _write_sync(self, grouped: Dict[Path, List[str]], fsync: bool) -> int:
+        written = 0
+        for path, texts in grouped.items():
+            data = "".join(texts)
+            handle = self._handle(path)
+            try:
+                handle.write(data)
+                handle.flush()
+            except OSError:
+                # The session directory may have been moved or deleted, reopen and try once more
+                self._discard_handle(path)
+                handle = self._handle(path)
+                handle.write(data)
+                handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+            written += len(data.encode("utf-8"))
+        return written
+
+    def _handle(self, path: Path) -> IO[str]:
+        handle = self._handles.get(path)
+        if handle is not None and not handle.closed:
+            self._handles.move_to_end(path)
+            return handle
+
+        while len(self._handles) >= self.max_open_files:
+            _, evicted = self._handles.popitem(last=False)
+            evicted.close()
+            self.metrics.handles_evicted += 1
+
+        try:
+            handle = open(path, 'a', encoding='utf-8')
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(path, 'a', encoding='utf-8')
+
+        self._handles[path] = handle
+        self.metrics.handles_opened += 1
+        return handle
+
+    def _discard_handle(self, path: Path) -> None:
+        handle = self._handles.pop(path, None)
+        if handle is not None:
+            try:
+                handle.close()
+            except OSError:
+                pass
+
+    def _discard_handles(self, paths: List[Path]) -> None:
+        for path in paths:
+            self._discard_handle(path)
+
+    def _close_handles(self) -> None:
+        self._discard_handles(list(self._handles))
@@ -599,9 +599,10 @@ shared_cache_registry = SharedCacheRegistry()
 
 # Predefined cache names for common operations
 class CacheNames:
-    """Standard cache names for config loader operations."""
+    """Standard cache names for shared cache operations."""
     PATH_RESOLUTION = "path_resolution"
     FILE_CONTENT = "file_content"
     JSON_PARSING = "json_parsing"
     AGENT_CONFIGS = "agent_configs"
-    MODEL_CONFIGS = "model_configs"
\ No newline at end of file
+    MODEL_CONFIGS = "model_configs"
+    TOKEN_COUNTS = "token_counts"
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Bounded on-disk queue for events a transport could not deliver.
+
+RetryTransport spills events here while its downstream is unhealthy and
+drains them once it recovers.  Records are appended, as JSON lines, to
+numbered segment files in the queue's directory.  A small cursor file
+records how far the queue has been drained, and segments are deleted once
+everything in them has been delivered.  Only the cursor and a few counters
+are held in memory, however long the outage.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .logging_utils import LoggingManager
+
+SEGMENT_SUFFIX = ".spill"
+CURSOR_FILE = "cursor.json"
+
+
+@dataclass
+class SpillStatus:
+    """Depth and age of a spill queue"""
+    depth: int
+    bytes: int
+    segments: int
+    oldest_age_seconds: Optional[float]
+    dropped: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+
+@dataclass
+class SpillBatch:
+    """Records read from the front of a queue, removed by `SpillQueue.commit`"""
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    end: Tuple[int, int] = (0, 0)
+    bytes: int = 0
+
+
+class SpillQueue:
+    """
+    A FIFO queue of JSON records kept in append-only segment files.
+
+    The queue is safe to use from several threads; each call holds a lock for
+    its duration.
+
+    Once the queue holds `max_bytes` of undelivered records, further records
+    are refused and counted in `dropped`, so a long outage fills the disk
+    only up to a known limit.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_segment_bytes: int = 8 * 1024 * 1024,
+                 max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            directory: Where the segments are kept, records left there by an earlier run are kept
+            max_segment_bytes: Start a new segment once the current one reaches this size
+            max_bytes: Most undelivered data the queue will hold
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self.logger = LoggingManager(__name__).get_logger()
+
+        # put_many and commit run in worker threads while status is read on the event loop
+        self._lock = threading.RLock()
+        self._cursor = self._load_cursor()
+        self._write_handle = None
+        self._write_segment = max(self._segment_numbers(), default=self._cursor[0])
+        self._depth, self._bytes = self._measure()
+
+    # Writing
+
+    def put(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Append records to the queue, returns how many were accepted"""
+        return self.put_many([records])[0]
+
+    def put_many(self, groups: Sequence[Iterable[Dict[str, Any]]]) -> List[int]:
+        """Append several callers' records with a single flush, returns how many of each group were accepted"""
+        with self._lock:
+            counts = []
+            refused = 0
+            for records in groups:
+                accepted = 0
+                for record in records:
+                    line = json.dumps(record, default=str).encode("utf-8") + b"\n"
+                    if self._bytes + len(line) > self.max_bytes:
+                        refused += 1
+                        continue
+                    self._writer(len(line)).write(line)
+                    self._depth += 1
+                    self._bytes += len(line)
+                    accepted += 1
+                counts.append(accepted)
+
+            if self._write_handle is not None:
+                self._write_handle.flush()
+            if refused:
+                self.dropped += refused
+                self.logger.error(f"Spill queue {self.directory} is full, dropped {refused} events ({self.dropped} in total)")
+            return counts
+
+    def _writer(self, size: int):
+        if self._write_handle is not None and self._write_handle.tell() + size > self.max_segment_bytes \
+                and self._write_handle.tell() > 0:
+            self._write_handle.close()
+            self._write_handle = None
+            self._write_segment += 1
+        if self._write_handle is None:
+            self._write_handle = open(self._segment_path(self._write_segment), "ab")
+        return self._write_handle
+
+    # Reading
+
+    def peek(self, limit: int) -> SpillBatch:
+        """Read up to `limit` records from the front of the queue without removing them"""
+        with self._lock:
+            batch = SpillBatch(end=self._cursor)
+            segment, offset = self._cursor
+            while True:
+                path = self._segment_path(segment)
+                if path.exists():
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        for line in f:
+                            if len(batch.records) >= limit or not line.endswith(b"\n"):
+                                break
+                            offset += len(line)
+                            batch.bytes += len(line)
+                            batch.end = (segment, offset)
+                            try:
+                                batch.records.append(json.loads(line))
+                            except ValueError:
+                                self.logger.warning(f"Skipping unreadable record in {path.name}")
+                if len(batch.records) >= limit or segment >= self._write_segment:
+                    return batch
+                # The rest of this segment has been read
+                segment, offset = segment + 1, 0
+                batch.end = (segment, 0)
+
+    def commit(self, batch: SpillBatch) -> None:
+        """Remove a batch returned by `peek` from the queue, once it has been delivered"""
+        with self._lock:
+            if batch.end == self._cursor:
+                return
+            self._cursor = batch.end
+            self._save_cursor()
+            self._depth = max(0, self._depth - len(batch.records))
+            self._bytes = max(0, self._bytes - batch.bytes)
+            for number in self._segment_numbers():
+                if number < self._cursor[0]:
+                    self._segment_path(number).unlink(missing_ok=True)
+
+    # Status
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def __len__(self) -> int:
+        return self._depth
+
+    def status(self) -> SpillStatus:
+        with self._lock:
+            oldest_age = None
+            if self._depth:
+                front = self.peek(1).records
+                if front and front[0].get("spilled_at"):
+                    oldest_age = max(0.0, time.time() - front[0]["spilled_at"])
+            return SpillStatus(depth=self._depth, bytes=self._bytes, segments=len(self._segment_numbers()),
+                               oldest_age_seconds=oldest_age, dropped=self.dropped)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._write_handle is not None:
+                self._write_handle.close()
+                self._write_handle = None
+
+    # Files
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{number:012d}{SEGMENT_SUFFIX}"
+
+    def _segment_numbers(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.directory.glob(f"*{SEGMENT_SUFFIX}") if path.stem.isdigit())
+
+    def _load_cursor(self) -> Tuple[int, int]:
+        try:
+            with open(self.directory / CURSOR_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return int(data["segment"]), int(data["offset"])
+        except (OSError, ValueError, KeyError):
+            return min(self._segment_numbers(), default=0), 0
+
+    def _save_cursor(self) -> None:
+        temp_path = self.directory / f"{CURSOR_FILE}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"segment": self._cursor[0], "offset": self._cursor[1]}, f)
+        os.replace(temp_path, self.directory / CURSOR_FILE)
+
+    def _measure(self) -> Tuple[int, int]:
+        """Count the undelivered records left by an earlier run"""
+        depth = size = 0
+        for number in self._segment_numbers():
+            if number < self._cursor[0]:
+                continue
+            with open(self._segment_path(number), "rb") as f:
+                if number == self._cursor[0]:
+                    f.seek(self._cursor[1])
+                for line in f:
+                    if line.endswith(b"\n"):
+                        depth += 1
+                        size += len(line)
+        return depth, size
@@ -24,6 +24,11 @@ Usage:
     with LoggingContext(correlation_id="req-456", user_id="user-123"):
         logger.info("Processing request")  # Automatically includes context
         
+    # Hot paths: lazy arguments and sampling
+    from agent_c.util.structured_logging import lazy, SampledLogger
+    logger.debug("Tool calls: %s", lazy(json.dumps, tool_calls))
+    SampledLogger(logger, every=100).debug("Received event %s", event.type)
+    
     # Factory usage for advanced configuration
     from agent_c.util.structured_logging import StructuredLoggerFactory
     factory = StructuredLoggerFactory()
@@ -32,6 +37,7 @@ Usage:
 
 from .factory import StructuredLoggerFactory, get_logger
 from .context import LoggingContext, get_current_context, clear_context
+from .fast_path import FastBoundLogger, SampledLogger, lazy, get_bound_logger
 from .compatibility import (
     StructuredLoggingAdapter,
     StructuredLoggingMonkeyPatch,
@@ -73,6 +79,11 @@ __all__ = [
     "LoggingContext",
     "get_current_context",
     "clear_context",
+    # Hot path helpers
+    "FastBoundLogger",
+    "SampledLogger",
+    "lazy",
+    "get_bound_logger",
     # Compatibility layer
     "StructuredLoggingAdapter",
     "StructuredLoggingMonkeyPatch",
@@ -8,7 +8,8 @@ with consistent configuration across the Agent C framework.
 import os
 import logging
 import threading
-from typing import Optional, Protocol, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Protocol, Dict, Any, Tuple
 from pathlib import Path
 
 import structlog
@@ -47,6 +48,8 @@ class StructuredLoggerFactory:
     _lock = threading.Lock()
     _configured = False
     _logger_cache: Dict[str, LoggerProtocol] = {}
+    _bound_logger_cache: "OrderedDict[Tuple[str, Tuple[Tuple[str, Any], ...]], LoggerProtocol]" = OrderedDict()
+    _bound_logger_cache_size = 1024
     
     def __new__(cls) -> "StructuredLoggerFactory":
         """Ensure singleton pattern."""
@@ -76,6 +79,7 @@ class StructuredLoggerFactory:
             add_agent_context,
             filter_sensitive_data
         )
+        from .fast_path import FastBoundLogger, FastPathLoggerFactory
         
         # Build processor chain
         processors = [
@@ -106,8 +110,8 @@ class StructuredLoggerFactory:
         # Configure structlog
         structlog.configure(
             processors=processors,
-            wrapper_class=structlog.stdlib.BoundLogger,
-            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=FastBoundLogger,
+            logger_factory=FastPathLoggerFactory(),
             cache_logger_on_first_use=True,
         )
         
@@ -189,6 +193,46 @@ class StructuredLoggerFactory:
         
         return logger
     
+    def get_bound_logger(self, name: str, **context: Any) -> LoggerProtocol:
+        """
+        Get a logger for `name` with `context` bound to it.
+
+        Bound loggers are cached by name and context, the least recently used
+        being dropped once the cache is full, so hot paths can fetch the same
+        bound logger for every event instead of binding again.
+
+        Args:
+            name: Logger name, typically __name__ from the calling module
+            **context: Values included in every entry, e.g. session_id
+
+        Returns:
+            LoggerProtocol: A bound logger, or a LoggerAdapter for legacy loggers
+        """
+        try:
+            key = (name, tuple(sorted(context.items())))
+            hash(key)
+        except TypeError:
+            return self._bind(self.get_logger(name), context)
+
+        with self._lock:
+            logger = self._bound_logger_cache.get(key)
+            if logger is not None:
+                self._bound_logger_cache.move_to_end(key)
+                return logger
+
+        logger = self._bind(self.get_logger(name), context)
+        with self._lock:
+            self._bound_logger_cache[key] = logger
+            while len(self._bound_logger_cache) > self._bound_logger_cache_size:
+                self._bound_logger_cache.popitem(last=False)
+        return logger
+
+    @staticmethod
+    def _bind(logger: LoggerProtocol, context: Dict[str, Any]) -> LoggerProtocol:
+        if hasattr(logger, "bind"):
+            return logger.bind(**context)
+        return logging.LoggerAdapter(logger, context)
+    
     def _create_structured_logger(self, name: str) -> LoggerProtocol:
         """Create a structured logger using structlog."""
         return structlog.get_logger(name)
@@ -202,6 +246,7 @@ class StructuredLoggerFactory:
         """Clear the logger cache. Useful for testing."""
         with self._lock:
             self._logger_cache.clear()
+            self._bound_logger_cache.clear()
     
     @classmethod
     def reset(cls) -> None:
@@ -210,6 +255,7 @@ class StructuredLoggerFactory:
             cls._instance = None
             cls._configured = False
             cls._logger_cache.clear()
+            cls._bound_logger_cache.clear()
 
 
 # Global factory instance
@@ -0,0 +1,172 @@
+"""
+Fast Path for Logging in Hot Loops
+
+Helpers that keep log calls on per-event and per-tool-call paths cheap:
+
+- FastBoundLogger checks the level before structlog builds the event dict and
+  runs the processor chain, so disabled calls cost a level check.
+- `lazy()` defers building an expensive argument until a record is emitted.
+- SampledLogger passes one call in N through, for sites that would otherwise
+  log every streamed event.
+- `get_bound_logger()` caches loggers bound to a fixed context.
+
+Usage:
+    from agent_c.util.structured_logging import lazy, SampledLogger
+
+    logger.debug("Tool calls: %s", lazy(json.dumps, tool_calls))
+
+    event_logger = SampledLogger(logger, every=100)
+    event_logger.debug("Received event %s", event.type)
+"""
+
+import itertools
+import logging
+import sys
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+_METHOD_LEVELS: Dict[str, int] = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "fatal": logging.CRITICAL,
+}
+
+
+class FastBoundLogger(structlog.stdlib.BoundLogger):
+    """
+    A stdlib BoundLogger that drops calls below the logger's level up front.
+
+    structlog's own `filter_by_level` processor only runs after the context
+    has been copied into a new event dict; this skips all of that.
+    """
+
+    def _proxy_to_logger(self, method_name: str, event: Any = None, *event_args: Any, **event_kw: Any) -> Any:
+        level = _METHOD_LEVELS.get(method_name)
+        if level is not None and not self._logger.isEnabledFor(level):
+            return None
+        return super()._proxy_to_logger(method_name, event, *event_args, **event_kw)
+
+
+_IGNORED_FRAME_PREFIXES = ("logging", "structlog", __name__)
+
+
+class _CallerLogger(logging.Logger):
+    """
+    A stdlib logger that attributes records to the code that called structlog.
+
+    structlog's own logger class only skips structlog and logging frames,
+    FastBoundLogger's frame has to be skipped as well.
+    """
+
+    def findCaller(self, stack_info: bool = False, stacklevel: int = 1) -> Tuple[str, int, str, Optional[str]]:
+        frame = sys._getframe(1)
+        while frame.f_back is not None and frame.f_globals.get("__name__", "?").startswith(_IGNORED_FRAME_PREFIXES):
+            frame = frame.f_back
+        for _ in range(max(0, stacklevel - 1)):
+            if frame.f_back is None:
+                break
+            frame = frame.f_back
+
+        sinfo = None
+        if stack_info:
+            sinfo = "Stack (most recent call last):\n" + "".join(traceback.format_stack(frame)).rstrip("\n")
+        return frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name, sinfo
+
+
+class FastPathLoggerFactory(structlog.stdlib.LoggerFactory):
+    """
+    The stdlib LoggerFactory to use with FastBoundLogger.
+
+    Records get the location of the log call rather than FastBoundLogger's.
+    """
+
+    def __init__(self, ignore_frame_names: Optional[List[str]] = None):
+        super().__init__(ignore_frame_names=[__name__, *(ignore_frame_names or [])])
+        logging.setLoggerClass(_CallerLogger)
+
+
+class lazy:
+    """
+    A log argument computed only if the record is formatted.
+
+    Pass it as a %-style argument, not inside an f-string:
+    `logger.debug("Payload: %s", lazy(json.dumps, payload))`.
+    """
+
+    __slots__ = ("_func", "_args", "_kwargs")
+
+    def __init__(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args, **self._kwargs))
+
+    def __repr__(self) -> str:
+        return repr(self._func(*self._args, **self._kwargs))
+
+
+class SampledLogger:
+    """
+    Wraps a logger so only one call in `every`, per level, is logged.
+
+    Calls below the wrapped logger's level are dropped before they are
+    counted, so sampling starts from the first call that would be logged.
+    Works with stdlib loggers and structlog bound loggers.
+    """
+
+    def __init__(self, logger: Any, every: int = 100):
+        self.logger = logger
+        self.every = max(1, every)
+        self._counters = {level: itertools.count() for level in set(_METHOD_LEVELS.values())}
+        self._is_enabled_for = getattr(logger, "isEnabledFor", None)
+
+    def _sample(self, level: int) -> bool:
+        if self._is_enabled_for is not None and not self._is_enabled_for(level):
+            return False
+        return next(self._counters[level]) % self.every == 0
+
+    def debug(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self._sample(logging.DEBUG):
+            self.logger.debug(msg, *args, **kwargs)
+
+    def info(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self._sample(logging.INFO):
+            self.logger.info(msg, *args, **kwargs)
+
+    def warning(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self._sample(logging.WARNING):
+            self.logger.warning(msg, *args, **kwargs)
+
+    def error(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self._sample(logging.ERROR):
+            self.logger.error(msg, *args, **kwargs)
+
+    def critical(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self._sample(logging.CRITICAL):
+            self.logger.critical(msg, *args, **kwargs)
+
+    def exception(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if self._sample(logging.ERROR):
+            self.logger.exception(msg, *args, **kwargs)
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self._is_enabled_for is None or self._is_enabled_for(level)
+
+
+def get_bound_logger(name: str, **context: Any) -> Any:
+    """
+    Get a logger with `context` bound, cached per name and context.
+
+    For loops that bind the same values on every iteration, e.g. a session ID.
+    """
+    from .factory import StructuredLoggerFactory
+    return StructuredLoggerFactory().get_bound_logger(name, **context)
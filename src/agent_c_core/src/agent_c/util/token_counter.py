@@ -1,3 +1,6 @@
+from typing import List
+
+
 class TokenCounter:
     """
     This is an abstract class representing a token counter. Subclasses are expected
@@ -37,6 +40,20 @@ class TokenCounter:
         """
         raise NotImplementedError("If you're seeing this, you need to call TokenCounter.set_counter with a valid TokenCounter instance.")
 
+    def count_many(self, texts: List[str]) -> List[int]:
+        """
+        Count the number of tokens in each of the provided texts.
+
+        Subclasses with a native batch API should override this.
+
+        Parameters:
+        - texts (List[str]): The texts for which to count the tokens.
+
+        Returns:
+        List[int]: The number of tokens in each text, in order.
+        """
+        return [self.count_tokens(text) for text in texts]
+
     @classmethod
     def count(cls, text: str) -> int:
         return cls.counter().count_tokens(text)
\ No newline at end of file
@@ -6,15 +6,27 @@ for different transport layers including queues, message buses, HTTP endpoints,
 """
 
 import asyncio
+import gzip
 import json
 import logging
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Dict, List, Callable, Union
+from contextlib import suppress
+from typing import Any, Optional, Dict, List, Callable, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
+import httpx
+
+try:
+    import redis.asyncio as aioredis
+    from redis import exceptions as redis_exceptions
+except ImportError:
+    aioredis = None
+    redis_exceptions = None
+
 from .logging_utils import LoggingManager
+from .spill_queue import SpillQueue, SpillStatus
 from .transport_exceptions import TransportError, TransportConnectionError, TransportTimeoutError
 
 
@@ -409,7 +421,146 @@ class FileTransport(TransportInterface):
         self.state = TransportState.CLOSED
 
 
-class HTTPTransport(TransportInterface):
+def _event_data(event: Any) -> Any:
+    """Serialize event data the way the transports do"""
+    if hasattr(event, 'model_dump'):
+        return event.model_dump()
+    elif isinstance(event, dict):
+        return event
+    return {"content": str(event)}
+
+
+class BatchingTransport(TransportInterface):
+    """
+    Base for transports that deliver events in batches.
+
+    Events are serialized and buffered by `send()`.  The buffer is sent when it
+    reaches `max_batch_events` events or `max_batch_bytes` bytes, or when its
+    oldest event is `max_batch_delay` seconds old, and on disconnect.  `send()`
+    returns once an event is buffered, unless it fills the batch, in which case
+    it returns whether the batch was delivered.
+
+    Subclasses implement `send_batch()`, which delivers a list of
+    `(encoded, event, metadata)` entries and raises a TransportError on
+    failure, and may override `_encode()`.  When wrapped in a RetryTransport,
+    batches are retried and routed to the fallback transport by the
+    RetryTransport, and count against its circuit breaker.
+    """
+
+    def __init__(self, name: str = None, max_batch_events: int = 100, max_batch_bytes: int = 1024 * 1024,
+                 max_batch_delay: float = 1.0, max_in_flight: int = 4):
+        super().__init__(name)
+        self.max_batch_events = max(1, max_batch_events)
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_delay = max_batch_delay
+        self.batches_sent = 0
+
+        self._pending: List[tuple] = []
+        self._pending_bytes = 0
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+        self._flush_task: Optional[asyncio.Task] = None
+        self._batch_sender: Callable[[List[tuple]], Any] = self._send_batch_logged
+
+    @abstractmethod
+    async def send_batch(self, batch: List[tuple]) -> bool:
+        """
+        Deliver one batch of buffered `(encoded, event, metadata)` entries.
+
+        Raises:
+            TransportError: If the batch could not be delivered
+        """
+        pass
+
+    def _encode(self, payload: Dict[str, Any]) -> tuple:
+        """Returns the encoded entry and its size in bytes"""
+        line = json.dumps(payload, default=str).encode('utf-8') + b'\n'
+        return line, len(line)
+
+    def build_entry(self, event: Any, metadata: Optional[Dict[str, Any]] = None) -> tuple:
+        """Returns the `(encoded, event, metadata)` batch entry for an event, and its size"""
+        payload = {
+            "timestamp": time.time(),
+            "transport": self.name,
+            "event": _event_data(event),
+            "metadata": metadata or {}
+        }
+        encoded, size = self._encode(payload)
+        return (encoded, event, metadata), size
+
+    async def send(self, event: Any, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Buffer an event, sending the batch if it is full"""
+        if not self.is_connected:
+            raise TransportConnectionError(f"{self.name} not connected")
+        
+        try:
+            entry, size = self.build_entry(event, metadata)
+        except Exception as e:
+            self.metrics.total_failed += 1
+            self.metrics.last_failure_time = time.time()
+            self._logger.error(f"{self.name} failed to serialize event: {e}")
+            return False
+
+        self._pending.append(entry)
+        self._pending_bytes += size
+        if len(self._pending) >= self.max_batch_events or self._pending_bytes >= self.max_batch_bytes:
+            return await self.flush()
+        return True
+
+    async def flush(self) -> bool:
+        """Send the buffered events now, returns whether they were delivered"""
+        if not self._pending:
+            return True
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        async with self._in_flight:
+            return await self._batch_sender(batch)
+
+    def set_batch_sender(self, sender: Callable[[List[tuple]], Any]) -> None:
+        """Route full batches through `sender`, which RetryTransport uses to retry them"""
+        self._batch_sender = sender
+
+    def _record_batch(self, batch: List[tuple], start_time: float) -> None:
+        """Update metrics for a delivered batch, send times are averaged per batch"""
+        self.batches_sent += 1
+        self.metrics.total_sent += len(batch)
+        self.metrics.last_success_time = time.time()
+        send_time = time.time() - start_time
+        self.metrics.average_send_time = (
+            (self.metrics.average_send_time * (self.batches_sent - 1) + send_time)
+            / self.batches_sent
+        )
+
+    async def _send_batch_logged(self, batch: List[tuple]) -> bool:
+        try:
+            return await self.send_batch(batch)
+        except Exception as e:
+            self.metrics.total_failed += len(batch)
+            self.metrics.last_failure_time = time.time()
+            self._logger.error(f"{self.name} failed to send {len(batch)} events: {e}")
+            return False
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.max_batch_delay)
+            try:
+                await self.flush()
+            except Exception as e:
+                self._logger.error(f"{self.name} flush failed: {e}")
+
+    def _start_flushing(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def _stop_flushing(self) -> None:
+        """Stop the flush timer and send anything still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+
+class HTTPTransport(BatchingTransport):
     """
     Transport that sends events via HTTP POST requests.
     
@@ -418,74 +569,79 @@ class HTTPTransport(TransportInterface):
     - REST API endpoints
     - Cloud service integration
     - Remote logging services
+
+    Batches (see BatchingTransport) are posted as newline delimited JSON, one
+    entry per line, over a pooled keep-alive connection.  Bodies of at least
+    `compress_min_bytes` are gzipped.  Use `max_batch_events=1` to post every
+    event on its own.
     """
     
-    def __init__(self, endpoint_url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30.0):
-        super().__init__("HTTPTransport")
+    def __init__(self, endpoint_url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30.0,
+                 max_batch_events: int = 100, max_batch_bytes: int = 1024 * 1024, max_batch_delay: float = 1.0,
+                 compression: Optional[str] = "gzip", compress_min_bytes: int = 1024,
+                 max_connections: int = 10, max_in_flight: int = 4,
+                 client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            endpoint_url: URL the batches are posted to
+            headers: Extra request headers, e.g. Authorization
+            timeout: Request timeout in seconds
+            max_batch_events: Send a batch once it holds this many events
+            max_batch_bytes: Send a batch once its body reaches this size
+            max_batch_delay: Longest time, in seconds, an event waits in the buffer
+            compression: "gzip", or None to send bodies uncompressed
+            compress_min_bytes: Smallest body that is compressed
+            max_connections: Size of the connection pool
+            max_in_flight: Batches posted at the same time
+            client: A shared httpx client to post with, left open on close
+        """
+        super().__init__("HTTPTransport", max_batch_events, max_batch_bytes, max_batch_delay, max_in_flight)
         self.endpoint_url = endpoint_url
-        self.headers = headers or {"Content-Type": "application/json"}
+        self.headers = headers or {}
         self.timeout = timeout
-        self._session = None
-    
-    async def send(self, event: Any, metadata: Optional[Dict[str, Any]] = None) -> bool:
-        """Send event via HTTP POST"""
-        if not self.is_connected:
-            raise TransportConnectionError("HTTPTransport not connected")
-        
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes
+        self.max_connections = max_connections
+
+        self._client = client
+        self._owns_client = client is None
+
+    async def send_batch(self, batch: List[tuple]) -> bool:
+        """
+        Post one batch of buffered `(line, event, metadata)` entries.
+
+        Raises:
+            TransportTimeoutError: If the request timed out
+            TransportError: If the request failed or the endpoint returned an error status
+        """
         start_time = time.time()
-        
+        body = b''.join(line for line, _, _ in batch)
+        headers = {**self.headers, "Content-Type": "application/x-ndjson"}
+        if self.compression == "gzip" and len(body) >= self.compress_min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+
         try:
-            # Serialize event data
-            if hasattr(event, 'model_dump'):
-                event_data = event.model_dump()
-            elif isinstance(event, dict):
-                event_data = event
-            else:
-                event_data = {"content": str(event)}
-            
-            # Create HTTP payload
-            payload = {
-                "timestamp": time.time(),
-                "transport": self.name,
-                "event": event_data,
-                "metadata": metadata or {}
-            }
-            
-            # This is a placeholder - in real implementation would use aiohttp or similar
-            # For now, just simulate the HTTP call
-            await asyncio.sleep(0.01)  # Simulate network delay
-            
-            # In real implementation:
-            # async with self._session.post(
-            #     self.endpoint_url,
-            #     json=payload,
-            #     headers=self.headers,
-            #     timeout=self.timeout
-            # ) as response:
-            #     response.raise_for_status()
-            
-            # Update metrics
-            self.metrics.total_sent += 1
-            self.metrics.last_success_time = time.time()
-            send_time = time.time() - start_time
-            self.metrics.average_send_time = (
-                (self.metrics.average_send_time * (self.metrics.total_sent - 1) + send_time) 
-                / self.metrics.total_sent
-            )
-            
-            return True
-            
-        except Exception as e:
-            self.metrics.total_failed += 1
-            self.metrics.last_failure_time = time.time()
-            self._logger.error(f"HTTP transport failed: {e}")
-            return False
+            response = await self._client.post(self.endpoint_url, content=body, headers=headers)
+            response.raise_for_status()
+        except httpx.TimeoutException as e:
+            raise TransportTimeoutError(f"HTTP request to {self.endpoint_url} timed out: {e}") from e
+        except httpx.HTTPError as e:
+            raise TransportError(f"HTTP request to {self.endpoint_url} failed: {e}") from e
+
+        self._record_batch(batch, start_time)
+        return True
     
     async def connect(self) -> bool:
         """Initialize HTTP session"""
         try:
             self.state = TransportState.CONNECTING
-            # In real implementation: self._session = aiohttp.ClientSession()
+            if self._client is None:
+                limits = httpx.Limits(max_connections=self.max_connections,
+                                      max_keepalive_connections=self.max_connections)
+                self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, headers=self.headers)
+                self._owns_client = True
+            self._start_flushing()
             self.state = TransportState.CONNECTED
             self.metrics.connection_count += 1
             return True
@@ -494,10 +650,12 @@ class HTTPTransport(TransportInterface):
             raise TransportConnectionError(f"Failed to initialize HTTP session: {e}")
     
     async def disconnect(self) -> None:
-        """Close HTTP session"""
-        if self._session:
-            # In real implementation: await self._session.close()
-            self._session = None
+        """Send any buffered events and close HTTP session"""
+        if self._client is not None:
+            await self._stop_flushing()
+            if self._owns_client:
+                await self._client.aclose()
+                self._client = None
         self.state = TransportState.DISCONNECTED
     
     async def close(self) -> None:
@@ -506,6 +664,252 @@ class HTTPTransport(TransportInterface):
         self.state = TransportState.CLOSED
 
 
+class RedisStreamTransport(BatchingTransport):
+    """
+    Transport that appends events to Redis Streams.
+
+    Useful for:
+    - Fanning events out to other services through consumer groups
+    - A durable event bus shared with the API's Redis
+
+    Batches (see BatchingTransport) are written with one pipelined XADD per
+    event.  Each entry has `type`, `session_id` and `data` fields, `data`
+    holding the JSON payload.  Streams are capped at about `max_len` entries
+    with `MAXLEN ~` trimming.  `stream_key` may contain `{session_id}` to
+    write a stream per session.  Use RedisStreamConsumer to read them back.
+    """
+
+    def __init__(self, stream_key: str = "agent_c:events", redis_url: str = "redis://localhost:6379/0",
+                 client: Optional[Any] = None, max_len: Optional[int] = 100_000, approximate_trim: bool = True,
+                 max_batch_events: int = 100, max_batch_bytes: int = 1024 * 1024, max_batch_delay: float = 0.05,
+                 max_in_flight: int = 4):
+        """
+        Args:
+            stream_key: Stream to write to, may contain `{session_id}`
+            redis_url: Redis to connect to when no client is given
+            client: A shared redis.asyncio client to write with, left open on close
+            max_len: Trim streams to about this many entries, None to keep everything
+            approximate_trim: Trim with `MAXLEN ~`, which is much cheaper than exact trimming
+            max_batch_events: Write a batch once it holds this many events
+            max_batch_bytes: Write a batch once its payloads reach this size
+            max_batch_delay: Longest time, in seconds, an event waits in the buffer
+            max_in_flight: Pipelines written at the same time
+        """
+        super().__init__("RedisStreamTransport", max_batch_events, max_batch_bytes, max_batch_delay, max_in_flight)
+        self.stream_key = stream_key
+        self.redis_url = redis_url
+        self.max_len = max_len
+        self.approximate_trim = approximate_trim
+
+        self._client = client
+        self._owns_client = client is None
+
+    def _encode(self, payload: Dict[str, Any]) -> tuple:
+        event_data = payload["event"]
+        event_type = event_data.get("type") if isinstance(event_data, dict) else None
+        session_id = event_data.get("session_id") if isinstance(event_data, dict) else None
+        stream = self.stream_key.format(session_id=session_id or "none") if "{" in self.stream_key else self.stream_key
+
+        data = json.dumps(payload, default=str)
+        fields = {"type": event_type or "", "session_id": session_id or "", "data": data}
+        return (stream, fields), len(data)
+
+    async def send_batch(self, batch: List[tuple]) -> bool:
+        """
+        Write one batch of buffered `((stream, fields), event, metadata)` entries.
+
+        Raises:
+            TransportTimeoutError: If Redis timed out
+            TransportConnectionError: If Redis could not be reached
+            TransportError: If Redis rejected the batch
+        """
+        start_time = time.time()
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for (stream, fields), _, _ in batch:
+                    pipe.xadd(stream, fields, maxlen=self.max_len, approximate=self.approximate_trim)
+                await pipe.execute()
+        except redis_exceptions.TimeoutError as e:
+            raise TransportTimeoutError(f"Redis stream write timed out: {e}") from e
+        except redis_exceptions.ConnectionError as e:
+            raise TransportConnectionError(f"Redis stream write failed to connect: {e}") from e
+        except redis_exceptions.RedisError as e:
+            raise TransportError(f"Redis stream write failed: {e}") from e
+
+        self._record_batch(batch, start_time)
+        return True
+
+    async def connect(self) -> bool:
+        """Connect to Redis"""
+        if aioredis is None:
+            self.state = TransportState.FAILED
+            raise TransportConnectionError("RedisStreamTransport requires the redis package")
+        try:
+            self.state = TransportState.CONNECTING
+            if self._client is None:
+                self._client = aioredis.from_url(self.redis_url)
+                self._owns_client = True
+            await self._client.ping()
+            self._start_flushing()
+            self.state = TransportState.CONNECTED
+            self.metrics.connection_count += 1
+            return True
+        except Exception as e:
+            self.state = TransportState.FAILED
+            raise TransportConnectionError(f"Failed to connect to Redis at {self.redis_url}: {e}")
+
+    async def disconnect(self) -> None:
+        """Write any buffered events and disconnect from Redis"""
+        if self._client is not None:
+            await self._stop_flushing()
+            if self._owns_client:
+                await self._client.aclose()
+                self._client = None
+        self.state = TransportState.DISCONNECTED
+
+    async def close(self) -> None:
+        """Close Redis stream transport"""
+        await self.disconnect()
+        self.state = TransportState.CLOSED
+
+
+@dataclass
+class StreamEntry:
+    """An event read back from a Redis stream"""
+    id: str
+    stream: str
+    type: Optional[str]
+    session_id: Optional[str]
+    payload: Dict[str, Any]
+
+    @property
+    def event(self) -> Any:
+        return self.payload.get("event")
+
+
+class RedisStreamConsumer:
+    """
+    Reads the events written by RedisStreamTransport as a member of a consumer group.
+
+    Each consumer in a group receives a share of the stream's entries.  An
+    entry stays pending until it is acknowledged with `ack()`, and entries
+    left pending by a consumer that died are taken over with `recover()`.
+    Iterating a consumer recovers stale entries first, then reads new ones::
+
+        consumer = RedisStreamConsumer(client, "agent_c:events", "indexer", "worker-1")
+        async for entry in consumer:
+            await handle(entry.event)
+            await consumer.ack(entry)
+    """
+
+    def __init__(self, client: Any, stream_key: str, group: str, consumer: str, count: int = 100,
+                 block_ms: int = 5000, claim_idle_ms: int = 60_000, start_id: str = "0"):
+        """
+        Args:
+            client: A redis.asyncio client
+            stream_key: The stream to read
+            group: Consumer group name, created if it does not exist
+            consumer: This consumer's name within the group
+            count: Most entries returned by one read
+            block_ms: How long a read waits for new entries
+            claim_idle_ms: How long an entry must have been pending before `recover()` takes it over
+            start_id: Where a newly created group starts reading, "0" for the whole stream or "$" for new entries
+        """
+        self.client = client
+        self.stream_key = stream_key
+        self.group = group
+        self.consumer = consumer
+        self.count = count
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.start_id = start_id
+        self._group_ready = False
+        self._stopped = False
+
+    async def ensure_group(self) -> None:
+        """Create the consumer group, and the stream, if they don't exist"""
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(self.stream_key, self.group, id=self.start_id, mkstream=True)
+        except redis_exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def read(self, count: Optional[int] = None, block_ms: Optional[int] = None) -> List[StreamEntry]:
+        """Read entries not yet delivered to any consumer in the group"""
+        await self.ensure_group()
+        response = await self.client.xreadgroup(self.group, self.consumer, {self.stream_key: ">"},
+                                                count=count or self.count,
+                                                block=self.block_ms if block_ms is None else block_ms)
+        entries = []
+        for stream, messages in response or []:
+            entries.extend(self._entry(stream, entry_id, fields) for entry_id, fields in messages)
+        return entries
+
+    async def recover(self, min_idle_ms: Optional[int] = None, count: Optional[int] = None) -> List[StreamEntry]:
+        """Take over entries that have been pending, unacknowledged, for at least `min_idle_ms`"""
+        await self.ensure_group()
+        limit = count or self.count
+        min_idle_ms = self.claim_idle_ms if min_idle_ms is None else min_idle_ms
+        entries = []
+        cursor = "0-0"
+        while len(entries) < limit:
+            response = await self.client.xautoclaim(self.stream_key, self.group, self.consumer,
+                                                    min_idle_time=min_idle_ms, start_id=cursor,
+                                                    count=limit - len(entries))
+            cursor, messages = _text(response[0]), response[1]
+            # Entries trimmed from the stream while pending come back empty
+            entries.extend(self._entry(self.stream_key, entry_id, fields) for entry_id, fields in messages if fields)
+            if cursor == "0-0":
+                break
+        return entries
+
+    async def ack(self, *entries: Union[StreamEntry, str]) -> int:
+        """Acknowledge entries, by entry or ID, so they are not delivered again"""
+        ids = [entry.id if isinstance(entry, StreamEntry) else entry for entry in entries]
+        if not ids:
+            return 0
+        return await self.client.xack(self.stream_key, self.group, *ids)
+
+    async def pending_count(self) -> int:
+        """Number of entries delivered to the group but not yet acknowledged"""
+        await self.ensure_group()
+        summary = await self.client.xpending(self.stream_key, self.group)
+        return summary["pending"] if summary else 0
+
+    def stop(self) -> None:
+        """End iteration after the current read"""
+        self._stopped = True
+
+    async def __aiter__(self):
+        self._stopped = False
+        recover = True
+        while not self._stopped:
+            entries = await self.recover() if recover else await self.read()
+            # Look for stale entries again whenever the stream goes quiet
+            recover = not entries and not recover
+            for entry in entries:
+                yield entry
+                if self._stopped:
+                    return
+
+    @staticmethod
+    def _entry(stream: Any, entry_id: Any, fields: Dict[Any, Any]) -> StreamEntry:
+        fields = {_text(key): _text(value) for key, value in fields.items()}
+        try:
+            payload = json.loads(fields.get("data") or "{}")
+        except ValueError:
+            payload = {"event": fields.get("data")}
+        return StreamEntry(id=_text(entry_id), stream=_text(stream), type=fields.get("type") or None,
+                           session_id=fields.get("session_id") or None, payload=payload)
+
+
+def _text(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
 class QueueTransport(TransportInterface):
     """
     Example queue transport (non-functional, for documentation).
@@ -612,6 +1016,17 @@ class RetryTransport(TransportInterface):
     - Exponential backoff
     - Circuit breaker pattern
     - Fallback transport support
+    - Spilling to disk during outages
+
+    With a `spill_queue`, events that can't be delivered, because the retries
+    ran out or the circuit is open, are appended to the on-disk queue instead
+    of going to the fallback transport.  Once the circuit closes the queue is
+    drained in the background, at most `drain_rate` events a second, and new
+    events queue behind the backlog so they stay in order.  Delivery from the
+    queue is at least once: a batch that fails part way is sent again.
+
+    The queue's file I/O runs in a worker thread.  Events spilled while a write
+    is in progress are written together by the next one.
     """
     
     def __init__(
@@ -621,7 +1036,11 @@ class RetryTransport(TransportInterface):
         base_delay: float = 1.0,
         max_delay: float = 60.0,
         backoff_multiplier: float = 2.0,
-        fallback_transport: Optional[TransportInterface] = None
+        fallback_transport: Optional[TransportInterface] = None,
+        spill_queue: Optional[SpillQueue] = None,
+        drain_rate: float = 1000.0,
+        drain_batch_size: int = 100,
+        drain_interval: float = 1.0
     ):
         super().__init__(f"Retry({wrapped_transport.name})")
         self.wrapped_transport = wrapped_transport
@@ -630,23 +1049,168 @@ class RetryTransport(TransportInterface):
         self.max_delay = max_delay
         self.backoff_multiplier = backoff_multiplier
         self.fallback_transport = fallback_transport
+        self.spill_queue = spill_queue
+        self.drain_rate = drain_rate
+        self.drain_batch_size = drain_batch_size
+        self.drain_interval = drain_interval
         self._circuit_breaker_failures = 0
         self._circuit_breaker_threshold = 10
         self._circuit_breaker_reset_time = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._spill_pending: List[Tuple[List[Dict[str, Any]], asyncio.Future]] = []
+        self._spill_writer: Optional[asyncio.Task] = None
+        self._spill_lock = asyncio.Lock()
+
+        # Buffering transports hand their batches back here to be retried
+        self._batching = hasattr(wrapped_transport, 'set_batch_sender')
+        if self._batching:
+            wrapped_transport.set_batch_sender(self.send_batch)
     
     async def send(self, event: Any, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """Send with retry logic"""
+        if self._batching:
+            # Only buffers the event, the batch is retried by send_batch
+            return await self.wrapped_transport.send(event, metadata)
+
+        if self._should_spill():
+            return await self._spill([(event, metadata)])
+
         # Check circuit breaker
         if self._is_circuit_open():
             if self.fallback_transport:
                 return await self.fallback_transport.send(event, metadata)
             return False
         
+        if await self._with_retries(lambda: self.wrapped_transport.send(event, metadata), 1):
+            return True
+
+        if self.spill_queue is not None:
+            return await self._spill([(event, metadata)])
+        
+        # Try fallback if available
+        if self.fallback_transport:
+            try:
+                return await self.fallback_transport.send(event, metadata)
+            except Exception:
+                pass
+        return False
+
+    async def send_batch(self, batch: List[tuple]) -> bool:
+        """Send a batch of `(encoded, event, metadata)` entries from a buffering transport with retry logic"""
+        if self._should_spill():
+            return await self._spill([(event, metadata) for _, event, metadata in batch])
+
+        if self._is_circuit_open():
+            return await self._send_batch_to_fallback(batch)
+
+        if await self._with_retries(lambda: self.wrapped_transport.send_batch(batch), len(batch)):
+            return True
+
+        if self.spill_queue is not None:
+            return await self._spill([(event, metadata) for _, event, metadata in batch])
+        return await self._send_batch_to_fallback(batch)
+
+    async def _send_batch_to_fallback(self, batch: List[tuple]) -> bool:
+        if not self.fallback_transport:
+            return False
+        delivered = True
+        for _, event, metadata in batch:
+            try:
+                delivered = await self.fallback_transport.send(event, metadata) and delivered
+            except Exception:
+                delivered = False
+        return delivered
+
+    # Spilling
+
+    def _should_spill(self) -> bool:
+        """Spill while the circuit is open, and while there is a backlog, so events stay in order"""
+        return self.spill_queue is not None and (len(self.spill_queue) > 0 or self._spill_in_progress()
+                                                 or self._is_circuit_open())
+
+    def _spill_in_progress(self) -> bool:
+        return bool(self._spill_pending) or (self._spill_writer is not None and not self._spill_writer.done())
+
+    async def _spill(self, entries: List[tuple]) -> bool:
+        now = time.time()
+        records = [{"spilled_at": now, "event": _event_data(event), "metadata": metadata or {}}
+                   for event, metadata in entries]
+        written = asyncio.get_running_loop().create_future()
+        self._spill_pending.append((records, written))
+        if self._spill_writer is None or self._spill_writer.done():
+            self._spill_writer = asyncio.create_task(self._write_spilled())
+
+        accepted = await asyncio.shield(written)
+        if accepted < len(records):
+            self.metrics.total_failed += len(records) - accepted
+            self.metrics.last_failure_time = now
+        return accepted == len(records)
+
+    async def _write_spilled(self) -> None:
+        """Append everything spilled so far to the queue, off the event loop"""
+        while self._spill_pending:
+            pending, self._spill_pending = self._spill_pending, []
+            try:
+                async with self._spill_lock:
+                    counts = await asyncio.to_thread(self.spill_queue.put_many, [records for records, _ in pending])
+            except Exception as e:
+                self._logger.error(f"Failed to write {len(pending)} batches to the spill queue: {e}")
+                counts = [0] * len(pending)
+            for (_, written), accepted in zip(pending, counts):
+                written.set_result(accepted)
+
+    def spill_status(self) -> Optional[SpillStatus]:
+        """Depth and age of the spill queue, None without one"""
+        return self.spill_queue.status() if self.spill_queue is not None else None
+
+    async def _deliver_spilled(self, records: List[Dict[str, Any]]) -> bool:
+        """One attempt at delivering records from the spill queue, counted by the circuit breaker"""
+        try:
+            if self._batching:
+                batch = [self.wrapped_transport.build_entry(record["event"], record.get("metadata"))[0]
+                         for record in records]
+                delivered = not batch or await self.wrapped_transport.send_batch(batch)
+            else:
+                delivered = True
+                for record in records:
+                    if not await self.wrapped_transport.send(record["event"], record.get("metadata")):
+                        delivered = False
+                        break
+        except Exception as e:
+            self._logger.debug("Draining spill queue failed: %s", e)
+            delivered = False
+
+        if delivered:
+            self._circuit_breaker_failures = 0
+            self._circuit_breaker_reset_time = None
+            self.metrics.total_sent += len(records)
+            self.metrics.last_success_time = time.time()
+        else:
+            self._circuit_breaker_failures += 1
+        return delivered
+
+    async def _drain_spill_queue(self) -> None:
+        while True:
+            if not len(self.spill_queue) or self._is_circuit_open():
+                await asyncio.sleep(self.drain_interval)
+                continue
+
+            async with self._spill_lock:
+                batch = await asyncio.to_thread(self.spill_queue.peek, self.drain_batch_size)
+            if await self._deliver_spilled(batch.records):
+                async with self._spill_lock:
+                    await asyncio.to_thread(self.spill_queue.commit, batch)
+                await asyncio.sleep(len(batch.records) / self.drain_rate if self.drain_rate > 0 else 0)
+            else:
+                await asyncio.sleep(self.base_delay)
+
+    async def _with_retries(self, operation: Callable[[], Any], event_count: int) -> bool:
+        """Run a send operation until it succeeds or the retries run out, tracking the circuit breaker"""
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
             try:
-                result = await self.wrapped_transport.send(event, metadata)
+                result = await operation()
                 if result:
                     # Reset circuit breaker on success
                     self._circuit_breaker_failures = 0
@@ -655,7 +1219,7 @@ class RetryTransport(TransportInterface):
                     # Update metrics
                     if attempt > 0:
                         self.metrics.total_retries += attempt
-                    self.metrics.total_sent += 1
+                    self.metrics.total_sent += event_count
                     self.metrics.last_success_time = time.time()
                     
                     return True
@@ -669,20 +1233,13 @@ class RetryTransport(TransportInterface):
                 if attempt < self.max_retries:
                     delay = min(self.base_delay * (self.backoff_multiplier ** attempt), self.max_delay)
                     await asyncio.sleep(delay)
-                    self._logger.debug(f"Retrying transport (attempt {attempt + 2}/{self.max_retries + 1})")
+                    self._logger.debug("Retrying transport (attempt %d/%d)", attempt + 2, self.max_retries + 1)
         
         # All retries failed
-        self.metrics.total_failed += 1
+        self.metrics.total_failed += event_count
         self.metrics.total_retries += self.max_retries
         self.metrics.last_failure_time = time.time()
         
-        # Try fallback if available
-        if self.fallback_transport:
-            try:
-                return await self.fallback_transport.send(event, metadata)
-            except Exception:
-                pass
-        
         self._logger.error(f"Transport failed after {self.max_retries + 1} attempts: {last_exception}")
         return False
     
@@ -708,18 +1265,33 @@ class RetryTransport(TransportInterface):
         if result:
             self.state = TransportState.CONNECTED
             self.metrics.connection_count += 1
+            if self.spill_queue is not None and self._drain_task is None:
+                self._drain_task = asyncio.create_task(self._drain_spill_queue())
         return result
+
+    async def _stop_draining(self) -> None:
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._drain_task
+            self._drain_task = None
     
     async def disconnect(self) -> None:
         """Disconnect wrapped transport"""
+        await self._stop_draining()
         await self.wrapped_transport.disconnect()
         if self.fallback_transport:
             await self.fallback_transport.disconnect()
         self.state = TransportState.DISCONNECTED
     
     async def close(self) -> None:
-        """Close wrapped transport"""
+        """Close wrapped transport, events left in the spill queue are sent after the next connect"""
+        await self._stop_draining()
         await self.wrapped_transport.close()
+        if self._spill_writer is not None:
+            await self._spill_writer
+        if self.spill_queue is not None:
+            self.spill_queue.close()
         if self.fallback_transport:
             await self.fallback_transport.close()
         self.state = TransportState.CLOSED
@@ -1,9 +1,11 @@
 """Tests for the ToolChest class."""
 
 import asyncio
+import json
 import pytest
 from unittest import mock
 
+from agent_c.toolsets.json_schema import json_schema
 from agent_c.toolsets.tool_chest import ToolChest
 from agent_c.toolsets.tool_set import Toolset
 
@@ -201,4 +203,169 @@ class TestToolChest:
         assert success
         
         # Toolset should be active
-        assert "NonEssentialMockToolset" in chest.active_tools
\ No newline at end of file
+        assert "NonEssentialMockToolset" in chest.active_tools
+
+
+class IndexedMockToolset(Toolset):
+    """A toolset with real tool functions for tool index tests."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="idx", **kwargs)
+
+    @json_schema("Search the records.\nLong details the index should leave out.",
+                 {"query": {"type": "string", "description": "What to search for", "required": True}})
+    async def search(self, **kwargs):
+        return f"found {kwargs.get('query')}"
+
+    @json_schema("Delete a record.", {"record_id": {"type": "string", "required": True}})
+    async def delete(self, **kwargs):
+        return "deleted"
+
+
+class TestToolIndex:
+    """Tests for on-demand schema loading through the tool index."""
+
+    @pytest.fixture
+    def chest(self):
+        chest = ToolChest(use_tool_index=True)
+        asyncio.run(chest.add_tool_instance(IndexedMockToolset()))
+        return chest
+
+    @pytest.mark.asyncio
+    async def test_index_replaces_full_schemas(self, chest):
+        tool_context = {"session_id": "s1"}
+        schemas = chest.session_schemas(chest.active_claude_schemas, tool_context, "claude")
+
+        assert [schema["name"] for schema in schemas] == [ToolChest.TOOL_INDEX_TOOL_NAME]
+        description = schemas[0]["description"]
+        assert "- idx_search: Search the records." in description
+        assert "Long details" not in description
+        assert "- idx_delete: Delete a record." in description
+
+    @pytest.mark.asyncio
+    async def test_loading_tools_is_tracked_per_session(self, chest):
+        s1 = {"session_id": "s1"}
+        s2 = {"session_id": "s2"}
+        chest.session_schemas(chest.active_claude_schemas, s1, "claude")
+        chest.session_schemas(chest.active_claude_schemas, s2, "claude")
+
+        result = await chest._execute_tool_call(ToolChest.TOOL_INDEX_TOOL_NAME,
+                                                {"tools": ["idx_search", "nope"], "tool_context": s1})
+        assert "Loaded: idx_search" in result
+        assert "Not in the tool index: nope" in result
+
+        s1_names = [schema["name"] for schema in chest.session_schemas(chest.active_claude_schemas, s1, "claude")]
+        s2_names = [schema["name"] for schema in chest.session_schemas(chest.active_claude_schemas, s2, "claude")]
+        assert s1_names == [ToolChest.TOOL_INDEX_TOOL_NAME, "idx_search"]
+        assert s2_names == [ToolChest.TOOL_INDEX_TOOL_NAME]
+
+    @pytest.mark.asyncio
+    async def test_index_dropped_once_everything_is_loaded(self, chest):
+        tool_context = {"session_id": "s1"}
+        chest.session_schemas(chest.active_open_ai_schemas, tool_context, "openai")
+        chest.load_tools("s1", ["idx_search", "idx_delete"])
+
+        schemas = chest.session_schemas(chest.active_open_ai_schemas, tool_context, "openai")
+        assert schemas == chest.active_open_ai_schemas
+
+    @pytest.mark.asyncio
+    async def test_direct_call_marks_tool_loaded(self, chest):
+        tool_context = {"session_id": "s1"}
+        chest.session_schemas(chest.active_claude_schemas, tool_context, "claude")
+
+        result = await chest._execute_tool_call("idx_search", {"query": "abc", "tool_context": tool_context})
+
+        assert result == "found abc"
+        assert "idx_search" in chest._session_loaded_tools["s1"]
+
+    @pytest.mark.asyncio
+    async def test_direct_call_to_unknown_tool_is_not_marked_loaded(self, chest):
+        tool_context = {"session_id": "s1"}
+        chest.session_schemas([schema for schema in chest.active_claude_schemas if schema["name"] != "idx_delete"],
+                              tool_context, "claude")
+
+        unknown = await chest._execute_tool_call("idx_nope", {"tool_context": tool_context})
+        not_offered = await chest._execute_tool_call("idx_delete", {"record_id": "1", "tool_context": tool_context})
+
+        assert unknown == "idx_nope is not on a valid toolset."
+        assert not_offered == "idx_delete is not on a valid toolset."
+        assert chest._session_loaded_tools["s1"] == set()
+
+    @pytest.mark.asyncio
+    async def test_session_state_is_bounded(self, chest):
+        chest.MAX_TOOL_INDEX_SESSIONS = 3
+        for index in range(5):
+            chest.session_schemas(chest.active_claude_schemas, {"session_id": f"s{index}"}, "claude")
+        chest.load_tools("s2", ["idx_search"])
+        chest.session_schemas(chest.active_claude_schemas, {"session_id": "s5"}, "claude")
+
+        assert list(chest._session_loaded_tools) == ["s4", "s2", "s5"]
+        assert set(chest._session_tool_index) == {"s4", "s2", "s5"}
+
+        chest.clear_loaded_tools("s2")
+        assert "s2" not in chest._session_loaded_tools and "s2" not in chest._session_tool_index
+
+    @pytest.mark.asyncio
+    async def test_server_tools_pass_through(self, chest):
+        server_tool = {"type": "web_search_20250305", "name": "web_search", "max_uses": 2}
+        schemas = chest.session_schemas(chest.active_claude_schemas + [server_tool], {"session_id": "s1"}, "claude")
+
+        assert schemas[-1] is server_tool
+
+
+class ValidatedMockToolset(Toolset):
+    """A toolset whose tool records the arguments it receives."""
+
+    def __init__(self, **kwargs):
+        super().__init__(name="val", **kwargs)
+        self.received = []
+
+    @json_schema("Read lines from a file.",
+                 {"path": {"type": "string", "required": True},
+                  "limit": {"type": "integer", "minimum": 1},
+                  "mode": {"type": "string", "enum": ["head", "tail"]}})
+    async def read(self, **kwargs):
+        self.received.append(kwargs)
+        return "ok"
+
+
+class TestToolArgumentValidation:
+    """Tests for argument validation before tool dispatch."""
+
+    @pytest.fixture
+    def toolset(self):
+        return ValidatedMockToolset()
+
+    @pytest.fixture
+    def chest(self, toolset):
+        chest = ToolChest()
+        asyncio.run(chest.add_tool_instance(toolset))
+        return chest
+
+    @pytest.mark.asyncio
+    async def test_arguments_are_coerced_before_dispatch(self, chest, toolset):
+        tool_context = {"session_id": "s1"}
+        result = await chest._execute_tool_call("val_read", {"path": "a.txt", "limit": "5", "mode": None,
+                                                             "tool_context": tool_context})
+
+        assert result == "ok"
+        assert toolset.received == [{"path": "a.txt", "limit": 5, "tool_context": tool_context}]
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_are_rejected_without_calling_the_tool(self, chest, toolset):
+        result = await chest._execute_tool_call("val_read", {"limit": 0, "mode": "middle",
+                                                             "tool_context": {"session_id": "s1"}})
+
+        payload = json.loads(result)
+        assert payload["error"] == "invalid_arguments"
+        assert payload["tool"] == "val_read"
+        assert [detail["param"] for detail in payload["details"]] == ["path", "limit", "mode"]
+        assert toolset.received == []
+
+    @pytest.mark.asyncio
+    async def test_validation_can_be_disabled(self, toolset):
+        chest = ToolChest(validate_tool_args=False)
+        await chest.add_tool_instance(toolset)
+
+        await chest._execute_tool_call("val_read", {"path": "a.txt", "limit": "5", "tool_context": {}})
+        assert toolset.received[0]["limit"] == "5"
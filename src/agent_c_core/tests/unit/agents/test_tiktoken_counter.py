@@ -0,0 +1,93 @@
+"""Tests for the shared tiktoken encoder registry and TikTokenTokenCounter."""
+
+import pytest
+
+from agent_c.agents import gpt
+from agent_c.agents.gpt import TikTokenEncoderRegistry, TikTokenTokenCounter
+from agent_c.util.singleton_cache import shared_cache_registry, CacheNames
+
+
+class FakeEncoding:
+    """Whitespace tokenizer standing in for a tiktoken Encoding."""
+
+    def __init__(self, name: str = "fake_base"):
+        self.name = name
+        self.encode_calls = 0
+        self.batch_calls = []
+
+    def encode(self, text):
+        self.encode_calls += 1
+        return text.split()
+
+    def encode_batch(self, texts, num_threads=8):
+        self.batch_calls.append(list(texts))
+        return [text.split() for text in texts]
+
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    loads = []
+
+    def fake_encoding_for_model(model_name):
+        encoding = FakeEncoding()
+        loads.append(model_name)
+        return encoding
+
+    monkeypatch.setattr(gpt, "encoding_for_model", fake_encoding_for_model)
+    TikTokenEncoderRegistry.clear()
+    shared_cache_registry.clear_cache(CacheNames.TOKEN_COUNTS)
+    yield loads
+    TikTokenEncoderRegistry.clear()
+    shared_cache_registry.clear_cache(CacheNames.TOKEN_COUNTS)
+
+
+def long_text(word: str) -> str:
+    return " ".join([word] * TikTokenTokenCounter.MIN_CACHED_LENGTH)
+
+
+class TestTikTokenEncoderRegistry:
+
+    def test_encoding_loaded_once_per_model(self, fake_encoding):
+        first = TikTokenTokenCounter("gpt-4o")
+        second = TikTokenTokenCounter("gpt-4o")
+        TikTokenTokenCounter("gpt-3.5-turbo")
+
+        assert first.encoder is second.encoder
+        assert fake_encoding == ["gpt-4o", "gpt-3.5-turbo"]
+
+
+class TestTikTokenTokenCounter:
+
+    def test_short_text_is_counted_directly(self, fake_encoding):
+        counter = TikTokenTokenCounter()
+
+        assert counter.count_tokens("one two three") == 3
+        assert counter.count_tokens("one two three") == 3
+        assert counter.encoder.encode_calls == 2
+
+    def test_long_text_count_is_cached_across_counters(self, fake_encoding):
+        text = long_text("schema")
+        first = TikTokenTokenCounter()
+
+        assert first.count_tokens(text) == TikTokenTokenCounter.MIN_CACHED_LENGTH
+        assert TikTokenTokenCounter().count_tokens(text) == TikTokenTokenCounter.MIN_CACHED_LENGTH
+        assert first.encoder.encode_calls == 1
+
+    def test_count_many_preserves_order_and_uses_batch(self, fake_encoding):
+        counter = TikTokenTokenCounter()
+        cached = long_text("prompt")
+        counter.count_tokens(cached)
+
+        counts = counter.count_many(["a b", cached, "c d e", long_text("tool")])
+
+        assert counts == [2, TikTokenTokenCounter.MIN_CACHED_LENGTH, 3, TikTokenTokenCounter.MIN_CACHED_LENGTH]
+        assert counter.encoder.batch_calls == [["a b", "c d e", long_text("tool")]]
+
+    def test_count_many_caches_long_results(self, fake_encoding):
+        counter = TikTokenTokenCounter()
+        text = long_text("history")
+
+        counter.count_many([text])
+        counter.count_many([text])
+
+        assert len(counter.encoder.batch_calls) == 1
@@ -0,0 +1,117 @@
+"""
+Tests for history events that carry only what changed, and applying them with HistorySync.
+"""
+
+import pytest
+
+from agent_c.agents.base import BaseAgent
+from agent_c.chat.history_sync import HistorySync
+from agent_c.models.events import HistoryEvent
+
+
+def _message(i: int) -> dict:
+    return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "x" * 500}
+
+
+class HistoryAgent(BaseAgent):
+    """Agent that only raises history events."""
+
+    def __init__(self):
+        self.events = []
+
+        async def callback(event):
+            self.events.append(event)
+
+        super().__init__(model_name="mock-model", streaming_callback=callback)
+
+    async def raise_history(self, messages, session_id="history-session"):
+        await self._raise_history_event(messages, session_id=session_id, role="assistant")
+        return self.events[-1]
+
+
+@pytest.mark.asyncio
+async def test_rounds_after_the_first_carry_only_new_messages():
+    agent = HistoryAgent()
+    messages = [_message(i) for i in range(200)]
+
+    first = await agent.raise_history(messages)
+    messages = messages + [_message(200), _message(201)]
+    second = await agent.raise_history(messages)
+
+    assert (first.version, first.base_version, len(first.messages)) == (1, None, 200)
+    assert (second.version, second.base_version, second.keep) == (2, 1, 200)
+    assert second.messages == [_message(200), _message(201)]
+    assert "full_messages" not in second.model_dump_json()
+    assert len(second.model_dump_json()) < len(first.model_dump_json()) / 50
+
+
+@pytest.mark.asyncio
+async def test_changed_messages_are_replaced_from_the_first_difference():
+    agent = HistoryAgent()
+    messages = [_message(i) for i in range(10)]
+    await agent.raise_history(messages)
+
+    rewound = messages[:4] + [_message(100)]
+    event = await agent.raise_history(rewound)
+
+    assert event.keep == 4
+    assert event.apply(messages, 1) == rewound
+
+
+@pytest.mark.asyncio
+async def test_sync_follows_the_agent_history():
+    agent = HistoryAgent()
+    sync = HistorySync()
+    session_messages = []
+    messages = []
+    for i in range(5):
+        messages = messages + [_message(i)]
+        session_messages, forwarded = sync.apply(await agent.raise_history(messages), session_messages)
+        assert session_messages == messages
+        assert forwarded.base_version == (None if i == 0 else i)
+
+    # The agent's messages are not shared with the session
+    assert session_messages[-1] is not messages[-1]
+
+
+@pytest.mark.asyncio
+async def test_replaced_session_messages_get_the_entire_history():
+    agent = HistoryAgent()
+    sync = HistorySync()
+    messages = [_message(0), _message(1)]
+    session_messages, _ = sync.apply(await agent.raise_history(messages), [])
+
+    # e.g. the user edited the session's messages
+    session_messages = [_message(0)]
+    messages = messages + [_message(2)]
+    session_messages, forwarded = sync.apply(await agent.raise_history(messages), session_messages)
+
+    assert session_messages == messages
+    assert forwarded.base_version is None
+    assert forwarded.messages == messages
+    assert sync.full_event(session_messages, vendor="none", session_id="s", role="system").version == 2
+
+
+@pytest.mark.asyncio
+async def test_out_of_step_client_must_resync():
+    agent = HistoryAgent()
+    await agent.raise_history([_message(0)])
+    event = await agent.raise_history([_message(0), _message(1)])
+    received = HistoryEvent(**event.model_dump(exclude={"type"}))
+
+    with pytest.raises(ValueError):
+        received.apply([_message(0)], 0)
+    assert received.apply([_message(0)], 1) == [_message(0), _message(1)]
+
+
+@pytest.mark.asyncio
+async def test_each_session_has_its_own_versions():
+    agent = HistoryAgent()
+    await agent.raise_history([_message(0)], session_id="first")
+
+    other = await agent.raise_history([_message(1)], session_id="second")
+    agent.reset_history_versions("first")
+    again = await agent.raise_history([_message(0)], session_id="first")
+
+    assert (other.version, other.base_version) == (1, None)
+    assert (again.version, again.base_version) == (1, None)
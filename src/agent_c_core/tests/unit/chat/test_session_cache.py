@@ -0,0 +1,118 @@
+"""
+Tests for the bounded chat session cache and its use by ChatSessionManager.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agent_c.chat import ChatSessionManager
+from agent_c.chat.session_cache import SessionCache, estimate_session_bytes
+from agent_c.models.chat_history.chat_session import ChatSession
+
+
+def _session(session_id: str, size: int = 10, user_id: str = "admin") -> ChatSession:
+    return ChatSession(session_id=session_id, user_id=user_id, messages=[{"role": "user", "content": "x" * size}])
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_session_is_evicted():
+    cache = SessionCache(max_sessions=2)
+    await cache.put(_session("a"))
+    await cache.put(_session("b"))
+    cache.get("a", "admin")
+
+    await cache.put(_session("c"))
+
+    assert ("admin", "a") in cache
+    assert ("admin", "b") not in cache
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_by_estimated_bytes():
+    big = _session("big", size=10_000)
+    cache = SessionCache(max_bytes=estimate_session_bytes(big) + 100)
+    await cache.put(big)
+
+    await cache.put(_session("small", size=1000))
+
+    assert ("admin", "big") not in cache
+    assert cache.resident_bytes <= cache.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_dirty_sessions_are_flushed_before_eviction():
+    flushed = []
+
+    async def on_evict(session):
+        flushed.append(session.session_id)
+
+    cache = SessionCache(max_sessions=1, on_evict=on_evict)
+    await cache.put(_session("clean"))
+    await cache.put(_session("dirty"), dirty=True)
+    await cache.put(_session("last"))
+
+    assert flushed == ["dirty"]
+    assert cache.get_stats()["flushes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_is_kept_when_its_flush_fails():
+    cache = SessionCache(max_sessions=1, on_evict=AsyncMock(side_effect=OSError("disk full")))
+    await cache.put(_session("dirty"), dirty=True)
+
+    await cache.put(_session("next"))
+
+    assert ("admin", "dirty") in cache
+    assert cache.get_stats()["flush_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pinned_sessions_are_not_evicted():
+    cache = SessionCache(max_sessions=1)
+    await cache.put(_session("active"), pin=True)
+    await cache.put(_session("other"))
+
+    assert ("admin", "active") in cache
+
+    cache.unpin("active", "admin")
+    await cache.put(_session("third"))
+    assert ("admin", "active") not in cache
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_expire():
+    cache = SessionCache(ttl_seconds=60)
+    await cache.put(_session("idle"))
+    cache._entries[("admin", "idle")].last_used -= 120
+
+    assert await cache.evict() == 1
+    assert cache.get_stats()["expired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hit_rate_is_reported():
+    cache = SessionCache()
+    await cache.put(_session("a"))
+    cache.get("a", "admin")
+    cache.get("missing", "admin")
+
+    stats = cache.get_stats()
+    assert stats["hit_rate"] == 0.5
+    assert stats["resident_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_manager_flushes_evicted_sessions(loader):
+    manager = ChatSessionManager(loader=loader, max_cached_sessions=1)
+    first = _session("manager-first")
+    await manager.new_session(first)
+    first.messages.append({"role": "assistant", "content": "unsaved"})
+
+    await manager.new_session(_session("manager-second"))
+
+    assert manager.get_cached_session_count("admin") == 1
+    reloaded = await manager.get_session("manager-first", "admin")
+    assert reloaded is not first
+    assert reloaded.messages == first.messages
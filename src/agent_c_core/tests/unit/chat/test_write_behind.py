@@ -0,0 +1,103 @@
+"""
+Tests for debounced write-behind saving in ChatSessionManager.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agent_c.chat import ChatSessionManager
+from agent_c.chat.write_behind import SessionWriteBehind
+from agent_c.models.chat_history.chat_session import ChatSession
+
+
+@pytest.fixture
+def loader(loader):
+    loader.save_session = AsyncMock(side_effect=loader.save_session)
+    return loader
+
+
+def _session(session_id: str) -> ChatSession:
+    return ChatSession(session_id=session_id, messages=[{"role": "user", "content": "hello"}])
+
+
+@pytest.mark.asyncio
+async def test_burst_of_flushes_is_one_write(loader):
+    manager = ChatSessionManager(loader=loader, write_delay=0.05)
+    session = _session("burst")
+    for i in range(10):
+        session.messages.append({"role": "assistant", "content": f"reply {i}"})
+        await manager.flush_session(session)
+    assert loader.save_session.await_count == 0
+
+    await asyncio.sleep(0.15)
+
+    assert loader.save_session.await_count == 1
+    assert loader.load_session_id("burst", "admin").messages == session.messages
+    assert manager.get_cache_stats()["coalesced"] == 9
+
+
+@pytest.mark.asyncio
+async def test_durable_flush_writes_immediately(loader):
+    manager = ChatSessionManager(loader=loader, write_delay=60)
+    session = _session("durable")
+    await manager.flush_session(session)
+
+    await manager.flush_session(session, durable=True)
+
+    assert loader.save_session.await_count == 1
+    assert manager.get_cache_stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_pending_is_a_barrier(loader):
+    manager = ChatSessionManager(loader=loader, write_delay=60)
+    await manager.flush_session(_session("barrier-a"))
+    await manager.flush_session(_session("barrier-b"))
+
+    await manager.flush_pending("barrier-a", "admin")
+    assert loader.save_session.await_count == 1
+
+    await manager.flush_pending()
+    assert loader.save_session.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_close_writes_everything_dirty(loader):
+    manager = ChatSessionManager(loader=loader, write_delay=60)
+    await manager.flush_session(_session("close-pending"))
+    await manager.new_session(_session("close-dirty"))
+
+    await manager.close()
+
+    assert set(loader.get_user_session_ids("admin")) == {"close-pending", "close-dirty"}
+
+
+@pytest.mark.asyncio
+async def test_release_writes_a_pending_session(loader):
+    manager = ChatSessionManager(loader=loader, write_delay=60)
+    session = _session("release")
+    await manager.flush_session(session)
+
+    await manager.release_session("release", "admin")
+
+    assert loader.load_session_id("release", "admin").messages == session.messages
+
+
+@pytest.mark.asyncio
+async def test_failed_background_write_is_retried():
+    written = []
+    write = AsyncMock(side_effect=[OSError("disk full"), None])
+
+    async def record(user_id, session_id):
+        await write(user_id, session_id)
+        written.append(session_id)
+
+    write_behind = SessionWriteBehind(0.02, record)
+    write_behind.mark("retry", "admin")
+    await asyncio.sleep(0.1)
+    await write_behind.close()
+
+    assert written == ["retry"]
+    assert write_behind.get_stats()["write_failures"] == 1
@@ -0,0 +1,13 @@
+"""
+Test configuration for saved chat session tests.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def message():
+    """Build the i-th message of a conversation; it spans lines and is large enough to journal."""
+    def build(i: int) -> dict:
+        return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}\nwith a newline " + "x" * 200}
+    return build
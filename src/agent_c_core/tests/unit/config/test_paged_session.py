@@ -0,0 +1,126 @@
+"""
+Tests for reading saved chat sessions a page at a time.
+"""
+
+import json
+from typing import Callable
+
+import pytest
+
+from agent_c.chat import ChatSessionManager
+from agent_c.config.paged_session import PagedSession
+from agent_c.config.saved_chat import SavedChatLoader
+from agent_c.config.session_journal import INDEX_SUFFIX, read_session_data
+from agent_c.models.chat_history.chat_session import ChatSession
+
+
+async def _saved(loader: SavedChatLoader, message: Callable[[int], dict], session_id: str, count: int) -> ChatSession:
+    session = ChatSession(session_id=session_id, session_name="Paged", messages=[message(i) for i in range(count)])
+    await loader.save_session(session)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_still_plain_json(loader, message):
+    session = await _saved(loader, message, "paged-json", 3)
+
+    with open(loader._get_user_folder(session.user_id) / "paged-json.json", encoding="utf-8") as f:
+        data = json.load(f)
+    assert data["messages"] == session.messages
+    assert data["session_name"] == "Paged"
+
+
+@pytest.mark.asyncio
+async def test_reads_pages_and_tail(loader, message):
+    await _saved(loader, message, "paged-read", 100)
+
+    paged = loader.open_session("paged-read", "admin")
+
+    assert len(paged) == 100
+    assert paged.session.session_name == "Paged"
+    assert paged.session.messages == []
+    assert paged.tail(3) == [message(97), message(98), message(99)]
+    assert paged.page(10, 2) == [message(10), message(11)]
+    assert paged.page(99, 10) == [message(99)]
+
+
+@pytest.mark.asyncio
+async def test_indexes_like_a_list(loader, message):
+    await _saved(loader, message, "paged-index", 10)
+
+    paged = loader.open_session("paged-index", "admin")
+
+    assert paged[0] == message(0)
+    assert paged[-1] == message(9)
+    assert paged[2:5] == [message(2), message(3), message(4)]
+    assert paged[::4] == [message(0), message(4), message(8)]
+    assert list(paged.iter_pages(page_size=3, reverse=True))[:2] == [message(9), message(8)]
+    with pytest.raises(IndexError):
+        paged[10]
+
+
+@pytest.mark.asyncio
+async def test_journaled_saves_are_included(loader, message):
+    session = await _saved(loader, message, "paged-journal", 5)
+    session.messages = session.messages[:3] + [message(30), message(31)]
+    await loader.save_session(session)
+    session.messages.append(message(32))
+    await loader.save_session(session)
+
+    paged = loader.open_session("paged-journal", "admin")
+
+    assert list(paged) == session.messages
+    assert paged.materialize().messages == session.messages
+
+
+@pytest.mark.asyncio
+async def test_view_reloads_after_a_save(loader, message):
+    session = await _saved(loader, message, "paged-refresh", 4)
+    paged = loader.open_session("paged-refresh", "admin")
+    assert paged.tail(1) == [message(3)]
+
+    session.messages.append(message(4))
+    await loader.save_session(session)
+
+    assert len(paged) == 5
+    assert paged.tail(1) == [message(4)]
+
+
+@pytest.mark.asyncio
+async def test_missing_or_stale_index_is_rebuilt(loader, message):
+    session = await _saved(loader, message, "paged-stale", 6)
+    snapshot = loader._get_user_folder(session.user_id) / "paged-stale.json"
+    index = snapshot.with_suffix(INDEX_SUFFIX)
+
+    index.unlink()
+    assert PagedSession(snapshot)[4] == message(4)
+    assert index.exists()
+
+    index.write_bytes(b"\0" * 40)
+    assert PagedSession(snapshot)[-2:] == [message(4), message(5)]
+
+
+def test_sessions_saved_in_the_old_format_are_read_whole(tmp_path, message):
+    snapshot = tmp_path / "old.json"
+    data = ChatSession(session_id="old", session_name="Old", messages=[message(0), message(1)]).model_dump()
+    snapshot.write_text(json.dumps(data, indent=4), encoding="utf-8")
+
+    paged = PagedSession(snapshot)
+
+    assert len(paged) == 2
+    assert paged[-1] == message(1)
+    assert paged.materialize().messages == read_session_data(snapshot)["messages"]
+
+
+@pytest.mark.asyncio
+async def test_manager_pages_messages(loader, message):
+    await _saved(loader, message, "paged-manager", 20)
+    manager = ChatSessionManager(loader=loader)
+
+    assert manager.get_session_messages("paged-manager", "admin", offset=-2) == [message(18), message(19)]
+    assert manager.get_cached_session_count("admin") == 0
+    assert manager.get_session_messages("missing", "admin") is None
+
+    session = await manager.get_session("paged-manager", "admin")
+    session.messages.append(message(20))
+    assert manager.get_session_messages("paged-manager", "admin", offset=19, limit=5) == [message(19), message(20)]
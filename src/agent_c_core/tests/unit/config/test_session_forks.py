@@ -0,0 +1,130 @@
+"""
+Tests for forked sessions sharing their parent's saved messages.
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+
+from agent_c.chat import ChatSessionManager
+from agent_c.config.saved_chat import SavedChatLoader
+from agent_c.config.session_journal import FORK_KEY, read_forks
+from agent_c.models.chat_history.chat_session import ChatSession
+
+
+def _snapshot(loader: SavedChatLoader, session_id: str):
+    return loader._get_user_folder("admin") / f"{session_id}.json"
+
+
+def _fork_of(loader: SavedChatLoader, session_id: str):
+    with open(_snapshot(loader, session_id), encoding="utf-8") as f:
+        return json.load(f).get(FORK_KEY)
+
+
+async def _fork(loader: SavedChatLoader, parent: ChatSession, session_id: str, extra=()) -> ChatSession:
+    fork = ChatSession(session_id=session_id, messages=list(parent.messages) + list(extra))
+    await loader.fork_session(fork, parent.session_id)
+    return fork
+
+
+@pytest_asyncio.fixture
+async def parent(loader, message):
+    parent = ChatSession(session_id="fork-parent", messages=[message(i) for i in range(50)])
+    await loader.save_session(parent)
+    return parent
+
+
+@pytest.mark.asyncio
+async def test_fork_stores_only_what_it_adds(loader, parent, message):
+    fork = await _fork(loader, parent, "fork-child", [message(100)])
+
+    assert _snapshot(loader, "fork-child").stat().st_size < _snapshot(loader, "fork-parent").stat().st_size / 10
+    assert _fork_of(loader, "fork-child") == {"session_id": "fork-parent", "keep": 50}
+    loader.release_session("fork-child", "admin")
+    assert loader.load_session_id("fork-child", "admin").messages == fork.messages
+
+
+@pytest.mark.asyncio
+async def test_forks_of_forks_resolve_through_the_chain(loader, parent, message):
+    child = await _fork(loader, parent, "fork-child", [message(100)])
+    grandchild = await _fork(loader, child, "fork-grandchild", [message(200)])
+
+    assert loader.load_session_id("fork-grandchild", "admin").messages == grandchild.messages
+    assert loader.open_session("fork-grandchild", "admin").tail(3) == grandchild.messages[-3:]
+
+
+@pytest.mark.asyncio
+async def test_parent_appending_keeps_sharing(loader, parent, message):
+    await _fork(loader, parent, "fork-child")
+
+    parent.messages.append(message(50))
+    await loader.save_session(parent)
+
+    assert _fork_of(loader, "fork-child") is not None
+    assert read_forks(_snapshot(loader, "fork-parent")) == {"fork-child": 50}
+    assert len(loader.load_session_id("fork-child", "admin").messages) == 50
+
+
+@pytest.mark.asyncio
+async def test_parent_rewind_gives_the_fork_its_own_copy(loader, parent, message):
+    fork = await _fork(loader, parent, "fork-child", [message(100)])
+
+    parent.messages = parent.messages[:10]
+    await loader.save_session(parent)
+
+    assert _fork_of(loader, "fork-child") is None
+    assert read_forks(_snapshot(loader, "fork-parent")) == {}
+    loader.release_session("fork-child", "admin")
+    assert loader.load_session_id("fork-child", "admin").messages == fork.messages
+
+
+@pytest.mark.asyncio
+async def test_fork_rewound_past_its_branch_point_still_shares(loader, parent, message):
+    fork = await _fork(loader, parent, "fork-child")
+    fork.messages = fork.messages[:20] + [message(300)]
+    await loader.save_session(fork)
+
+    await loader.compact_session("fork-child", "admin")
+
+    assert _fork_of(loader, "fork-child") == {"session_id": "fork-parent", "keep": 20}
+    loader.release_session("fork-child", "admin")
+    assert loader.load_session_id("fork-child", "admin").messages == fork.messages
+
+
+@pytest.mark.asyncio
+async def test_deleting_the_parent_keeps_the_fork(loader, parent):
+    fork = await _fork(loader, parent, "fork-child")
+
+    await loader.delete_session("fork-parent", "admin")
+
+    assert _fork_of(loader, "fork-child") is None
+    assert loader.load_session_id("fork-child", "admin").messages == fork.messages
+
+
+@pytest.mark.asyncio
+async def test_paged_fork_survives_parent_compaction(loader, parent, message):
+    await _fork(loader, parent, "fork-child")
+    paged = loader.open_session("fork-child", "admin")
+    assert paged[0] == message(0)
+
+    parent.messages.append(message(50))
+    await loader.save_session(parent)
+    await loader.compact_session("fork-parent", "admin")
+
+    assert paged[:3] == [message(0), message(1), message(2)]
+    assert paged[-1] == message(49)
+
+
+@pytest.mark.asyncio
+async def test_manager_forks_without_copying(loader, message):
+    manager = ChatSessionManager(loader=loader)
+    parent = ChatSession(session_id="manager-parent", session_name="Chat", messages=[message(0), message(1)])
+    await manager.new_session(parent)
+
+    fork = await manager.fork_session(parent, "manager-fork")
+
+    assert fork.session_name == "Chat (fork)"
+    assert fork.messages == parent.messages
+    assert _fork_of(loader, "manager-fork") == {"session_id": "manager-parent", "keep": 2}
+    assert await manager.get_session("manager-fork", "admin") is fork
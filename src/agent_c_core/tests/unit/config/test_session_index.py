@@ -0,0 +1,138 @@
+"""
+Tests for the SQLite chat session index: paging, incremental rebuilds and schema upgrades.
+"""
+
+import json
+import sqlite3
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from agent_c.config.saved_chat import SavedChatLoader
+from agent_c.models.agent_config import CurrentAgentConfiguration
+from agent_c.models.chat_history.chat_session import ChatSession
+
+
+@pytest_asyncio.fixture
+async def loader(tmp_path):
+    loader = SavedChatLoader(str(tmp_path))
+    await loader.initialize_database()
+    yield loader
+    await loader.close_database()
+
+
+def _session(session_id: str, updated_at: str, user_id: str = "admin") -> ChatSession:
+    agent_config = CurrentAgentConfiguration(version=2, name="Agent", key="agent", model_id="model", persona="")
+    return ChatSession(session_id=session_id, session_name=session_id, user_id=user_id, updated_at=updated_at,
+                       agent_config=agent_config, messages=[{"role": "user", "content": "hello"}])
+
+
+async def _index_ids(loader: SavedChatLoader):
+    async with loader.async_session_factory() as db_session:
+        result = await db_session.execute(text("SELECT session_id FROM chat_session_index"))
+        return {row[0] for row in result}
+
+
+@pytest.mark.asyncio
+async def test_index_uses_write_ahead_logging(loader):
+    async with loader.engine.connect() as conn:
+        result = await conn.execute(text("PRAGMA journal_mode"))
+        assert result.scalar() == "wal"
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_session_once(loader):
+    # Several sessions share an updated_at, so pages must break ties by session_id
+    for i in range(7):
+        await loader.save_session(_session(f"session-{i}", f"2024-01-0{1 + i // 3}T00:00:00"))
+    await loader.save_session(_session("other-user", "2024-02-01T00:00:00", user_id="someone"))
+
+    seen = []
+    cursor = None
+    while True:
+        page = await loader.get_user_sessions("admin", limit=3, cursor=cursor)
+        assert page.total_sessions == 7
+        seen.extend(entry.session_id for entry in page.chat_sessions)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 7 and set(seen) == {f"session-{i}" for i in range(7)}
+    assert seen[:1] == ["session-6"]
+    offset_page = await loader.get_user_sessions("admin", offset=3, limit=3)
+    assert [entry.session_id for entry in offset_page.chat_sessions] == seen[3:6]
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_rejected(loader):
+    with pytest.raises(ValueError):
+        await loader.get_user_sessions("admin", cursor="not a cursor")
+
+
+@pytest.mark.asyncio
+async def test_rebuild_skips_unchanged_files(loader):
+    first = _session("rebuild-first", "2024-01-01T00:00:00")
+    second = _session("rebuild-second", "2024-01-02T00:00:00")
+    await loader.save_session(first)
+    await loader.save_session(second)
+
+    stats = await loader.rebuild_index_and_migrate_files()
+    assert stats["indexed_sessions"] == 0
+    assert stats["unchanged_sessions"] == 2
+
+    # Changed outside the loader, so only a rebuild can pick it up
+    snapshot = loader._get_user_folder("admin") / "rebuild-second.json"
+    data = json.loads(snapshot.read_text(encoding="utf-8"))
+    data["session_name"] = "Renamed"
+    snapshot.write_text(json.dumps(data), encoding="utf-8")
+
+    stats = await loader.rebuild_index_and_migrate_files()
+    assert stats["indexed_sessions"] == 1
+    assert stats["unchanged_sessions"] == 1
+    page = await loader.get_user_sessions("admin")
+    assert page.chat_sessions[0].session_name == "Renamed"
+
+    stats = await loader.rebuild_index_and_migrate_files(force=True)
+    assert stats["indexed_sessions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_new_files_and_removes_missing_ones(loader):
+    await loader.save_session(_session("rebuild-kept", "2024-01-01T00:00:00"))
+    await loader.save_session(_session("rebuild-removed", "2024-01-02T00:00:00"))
+    folder = loader._get_user_folder("admin")
+    (folder / "rebuild-removed.json").unlink()
+    (folder / "rebuild-broken.json").write_text("{", encoding="utf-8")
+
+    stats = await loader.rebuild_index_and_migrate_files()
+
+    assert stats["removed_sessions"] == 1
+    assert len(stats["errors"]) == 1
+    assert await _index_ids(loader) == {"rebuild-kept"}
+
+
+@pytest.mark.asyncio
+async def test_index_created_by_an_older_version_is_upgraded(tmp_path):
+    with sqlite3.connect(tmp_path / "chat_sessions.db") as conn:
+        conn.execute("CREATE TABLE chat_session_index (session_id VARCHAR(255) PRIMARY KEY, session_name TEXT, "
+                     "created_at VARCHAR(32) NOT NULL, updated_at VARCHAR(32) NOT NULL, "
+                     "user_id VARCHAR(255) NOT NULL, agent_key VARCHAR(255) NOT NULL, "
+                     "agent_name VARCHAR(255) NOT NULL)")
+        conn.execute("CREATE INDEX idx_user_updated ON chat_session_index (user_id, updated_at)")
+        conn.execute("INSERT INTO chat_session_index VALUES ('old', 'Old', '2024', '2024', 'admin', 'a', 'A')")
+
+    loader = SavedChatLoader(str(tmp_path))
+    await loader.initialize_database()
+    try:
+        page = await loader.get_user_sessions("admin")
+        assert [entry.session_id for entry in page.chat_sessions] == ["old"]
+        await loader.save_session(_session("new", "2025-01-01T00:00:00"))
+        assert await _index_ids(loader) == {"old", "new"}
+    finally:
+        await loader.close_database()
+
+    with sqlite3.connect(tmp_path / "chat_sessions.db") as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(chat_session_index)")}
+    assert "idx_user_updated_session" in indexes
+    assert "idx_user_updated" not in indexes
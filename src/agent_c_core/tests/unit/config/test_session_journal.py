@@ -0,0 +1,136 @@
+"""
+Tests for journaled session saves in SavedChatLoader.
+"""
+
+import json
+
+import pytest
+
+from agent_c.config.saved_chat import SavedChatLoader
+from agent_c.config.session_journal import SessionJournal, read_session_data
+from agent_c.models.chat_history.chat_session import ChatSession
+
+
+def _paths(loader: SavedChatLoader, session: ChatSession):
+    folder = loader._get_user_folder(session.user_id)
+    return folder / f"{session.session_id}.json", folder / f"{session.session_id}.journal"
+
+
+@pytest.mark.asyncio
+async def test_saves_after_the_first_append_only_the_change(loader, message):
+    session = ChatSession(session_id="journal-append", messages=[message(i) for i in range(50)])
+    await loader.save_session(session)
+    snapshot, journal = _paths(loader, session)
+    snapshot_size = snapshot.stat().st_size
+
+    session.messages.append(message(50))
+    await loader.save_session(session)
+
+    assert snapshot.stat().st_size == snapshot_size
+    record = json.loads(journal.read_text())
+    assert record["keep"] == 50
+    assert record["messages"] == [message(50)]
+    assert journal.stat().st_size < snapshot_size / 10
+
+
+@pytest.mark.asyncio
+async def test_load_replays_journal(loader, message):
+    session = ChatSession(session_id="journal-replay", messages=[message(0)])
+    await loader.save_session(session)
+    session.messages.extend([message(1), message(2)])
+    session.session_name = "Renamed"
+    await loader.save_session(session)
+    session.messages = session.messages[:1] + [message(9)]
+    await loader.save_session(session)
+
+    loaded = loader.load_session_id(session.session_id, session.user_id)
+
+    assert loaded.messages == [message(0), message(9)]
+    assert loaded.session_name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_messages_edited_in_place_are_saved(loader, message):
+    session = ChatSession(session_id="journal-in-place", messages=[message(0), message(1)])
+    await loader.save_session(session)
+
+    session.messages[0]["content"] = "edited"
+    await loader.save_session(session)
+
+    snapshot, _ = _paths(loader, session)
+    assert read_session_data(snapshot)["messages"][0]["content"] == "edited"
+
+
+@pytest.mark.asyncio
+async def test_unchanged_session_writes_nothing(loader, message):
+    session = ChatSession(session_id="journal-unchanged", messages=[message(0)])
+    await loader.save_session(session)
+    await loader.save_session(session)
+
+    _, journal = _paths(loader, session)
+    assert not journal.exists()
+
+
+@pytest.mark.asyncio
+async def test_compaction_folds_journal_into_snapshot(loader, message):
+    session = ChatSession(session_id="journal-compact", messages=[message(0)])
+    await loader.save_session(session)
+    for i in range(1, 20):
+        session.messages.append(message(i))
+        await loader.save_session(session)
+
+    await loader.compact_session(session.session_id, session.user_id)
+
+    snapshot, journal = _paths(loader, session)
+    assert not journal.exists()
+    with open(snapshot, encoding="utf-8") as f:
+        assert json.load(f)["messages"] == session.messages
+
+
+@pytest.mark.asyncio
+async def test_large_journal_is_compacted_in_background(loader, message):
+    loader.journal_compact_bytes = 1
+    session = ChatSession(session_id="journal-background", messages=[message(0)])
+    await loader.save_session(session)
+    for i in range(1, 5):
+        session.messages.append(message(i))
+        await loader.save_session(session)
+
+    await loader.close_database()
+
+    snapshot, _ = _paths(loader, session)
+    assert read_session_data(snapshot)["messages"] == session.messages
+
+
+@pytest.mark.asyncio
+async def test_torn_journal_record_is_ignored_and_truncated(loader, message):
+    session = ChatSession(session_id="journal-torn", messages=[message(0)])
+    await loader.save_session(session)
+    session.messages.append(message(1))
+    await loader.save_session(session)
+    snapshot, journal = _paths(loader, session)
+    with open(journal, "ab") as f:
+        f.write(b'{"keep": 2, "messages": [{"role": "us')
+
+    loader.release_session(session.session_id, session.user_id)
+    loaded = loader.load_session_id(session.session_id, session.user_id)
+    assert loaded.messages == [message(0), message(1)]
+
+    loaded.messages.append(message(2))
+    await loader.save_session(loaded)
+    assert read_session_data(snapshot)["messages"] == [message(0), message(1), message(2)]
+
+
+@pytest.mark.asyncio
+async def test_replay_over_a_newer_snapshot_is_idempotent(tmp_path, message):
+    journal = SessionJournal(tmp_path, "idempotent")
+    journal.write_snapshot({"session_id": "idempotent"}, [message(0)])
+    journal.record({"session_id": "idempotent"}, [message(0), message(1)])
+    journal.record({"session_id": "idempotent"}, [message(0), message(2), message(3)])
+    journal_bytes = journal.journal_path.read_bytes()
+
+    # A crash after the snapshot is replaced but before the journal is cut
+    journal.write_snapshot(journal.header, journal.messages)
+    journal.journal_path.write_bytes(journal_bytes)
+
+    assert read_session_data(journal.snapshot_path)["messages"] == [message(0), message(2), message(3)]
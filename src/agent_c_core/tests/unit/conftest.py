@@ -0,0 +1,17 @@
+"""
+Shared fixtures for the unit tests.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agent_c.config.saved_chat import SavedChatLoader
+
+
+@pytest.fixture
+def loader(tmp_path):
+    """A SavedChatLoader saving under a temporary directory, with the session index stubbed out."""
+    loader = SavedChatLoader(str(tmp_path))
+    loader._update_index_entry = AsyncMock()
+    return loader
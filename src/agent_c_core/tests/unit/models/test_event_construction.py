@@ -0,0 +1,70 @@
+"""
+Tests for cached event type names and trusted event construction.
+"""
+
+from typing import List
+
+import pytest
+from pydantic import Field, ValidationError
+
+from agent_c.models.events import BaseEvent
+from agent_c.models.events.chat import TextDeltaEvent, ThoughtDeltaEvent, CompleteThoughtEvent
+from agent_c.util import to_snake_case
+from agent_c.util.registries.event import EventRegistry
+
+DELTA = {"session_id": "s1", "role": "assistant", "user_session_id": "u1", "content": "hello"}
+
+
+class ScratchListEvent(BaseEvent):
+    items: List[str] = Field([], description="Collected items")
+    tags: List[str] = Field(default_factory=list, description="Tags")
+
+
+class TestTypeNames:
+    """Test the per class event type names."""
+
+    def test_type_names_match_class_names(self):
+        for event_class in [BaseEvent, *map(EventRegistry.get_class, EventRegistry.list_types())]:
+            assert event_class._event_type_name == to_snake_case(event_class.__name__.removesuffix('Event'))
+
+    def test_explicit_type_wins(self):
+        assert TextDeltaEvent(type="custom", **DELTA).type == "custom"
+        assert TextDeltaEvent.trusted(type="custom", **DELTA).type == "custom"
+
+
+class TestTrustedConstruction:
+    """Test that trusted construction matches the validating constructor."""
+
+    @pytest.mark.parametrize("event_class", [TextDeltaEvent, ThoughtDeltaEvent, CompleteThoughtEvent])
+    def test_matches_validated_event(self, event_class):
+        validated = event_class(**DELTA)
+        trusted = event_class.trusted(**DELTA)
+
+        assert trusted == validated
+        assert trusted.model_dump_json() == validated.model_dump_json()
+        assert trusted.model_fields_set == validated.model_fields_set
+
+    def test_thought_role_suffix(self):
+        assert ThoughtDeltaEvent.trusted(**DELTA).role == "assistant (thought)"
+
+    def test_mutable_defaults_are_not_shared(self):
+        first = ScratchListEvent.trusted()
+        first.items.append("a")
+        first.tags.append("b")
+        second = ScratchListEvent.trusted()
+        assert second.items == [] and second.tags == []
+        assert first.type == "scratch_list"
+
+    def test_missing_required_field(self):
+        with pytest.raises(TypeError):
+            TextDeltaEvent.trusted(session_id="s1", role="assistant")
+
+    def test_unknown_field(self):
+        with pytest.raises(TypeError, match="unknown_field"):
+            TextDeltaEvent.trusted(unknown_field=1, **DELTA)
+
+    def test_validated_path_still_validates(self):
+        with pytest.raises(ValidationError):
+            TextDeltaEvent(session_id="s1", role="assistant", content=None)
+        with pytest.raises(ValidationError):
+            TextDeltaEvent(unknown_field=1, **DELTA)
@@ -0,0 +1,119 @@
+"""
+Tests for compiled tool argument validation and coercion.
+"""
+
+from agent_c.toolsets.arg_validator import compile_validator, format_argument_errors
+from agent_c.toolsets.json_schema import json_schema
+
+
+def _validator(properties, required=None):
+    parameters = {"type": "object", "properties": properties}
+    if required:
+        parameters["required"] = required
+    return compile_validator(parameters)
+
+
+class TestCoercion:
+    """Test the type coercions applied to model supplied arguments."""
+
+    def test_scalars_sent_as_strings(self):
+        validator = _validator({"count": {"type": "integer"}, "ratio": {"type": "number"},
+                                "flag": {"type": "boolean"}, "name": {"type": "string"}})
+
+        args, errors = validator({"count": "3", "ratio": "0.5", "flag": "False", "name": 12})
+        assert errors == []
+        assert args == {"count": 3, "ratio": 0.5, "flag": False, "name": "12"}
+
+    def test_integral_float_for_integer(self):
+        args, errors = _validator({"count": {"type": "integer"}})({"count": 4.0})
+        assert errors == [] and args["count"] == 4 and isinstance(args["count"], int)
+
+    def test_json_strings_for_arrays_and_objects(self):
+        validator = _validator({"paths": {"type": "array", "items": {"type": "string"}},
+                                "options": {"type": "object", "properties": {"depth": {"type": "integer"}}}})
+
+        args, errors = validator({"paths": '["a", "b"]', "options": '{"depth": "2"}'})
+        assert errors == []
+        assert args == {"paths": ["a", "b"], "options": {"depth": 2}}
+
+    def test_null_optional_arguments_are_dropped(self):
+        validator = _validator({"limit": {"type": "integer"}, "cursor": {"type": ["string", "null"]}})
+
+        args, errors = validator({"limit": None, "cursor": None})
+        assert errors == []
+        assert args == {"cursor": None}
+
+    def test_union_keeps_values_that_already_match(self):
+        validator = _validator({"id": {"type": ["integer", "string"]}, "key": {"type": ["string", "integer"]}})
+
+        args, errors = validator({"id": "42", "key": 7})
+        assert errors == []
+        assert args == {"id": "42", "key": 7}
+
+        args, errors = _validator({"count": {"type": ["integer", "null"]}})({"count": "5"})
+        assert errors == [] and args == {"count": 5}
+
+    def test_unknown_arguments_pass_through(self):
+        context = object()
+        args, errors = _validator({"path": {"type": "string"}})({"path": "x", "tool_context": context})
+        assert errors == []
+        assert args["tool_context"] is context
+
+
+class TestErrors:
+    """Test the errors reported for arguments that cannot be fixed."""
+
+    def test_all_problems_are_reported(self):
+        validator = _validator({"path": {"type": "string"}, "limit": {"type": "integer", "minimum": 1},
+                                "mode": {"type": "string", "enum": ["head", "tail"]},
+                                "tags": {"type": "array", "items": {"type": "string", "minLength": 2}}},
+                               required=["path"])
+
+        original = {"limit": "many", "mode": "middle", "tags": ["ok", "x"]}
+        args, errors = validator(original)
+
+        assert args is original
+        assert errors == [
+            {"param": "path", "error": "is required"},
+            {"param": "limit", "error": "expected integer, got str 'many'"},
+            {"param": "mode", "error": "must be one of ['head', 'tail'], got 'middle'"},
+            {"param": "tags[1]", "error": "must have at least 2 characters, got 1"},
+        ]
+
+    def test_nested_required_properties(self):
+        validator = _validator({"filter": {"type": "object", "properties": {"field": {"type": "string"}},
+                                           "required": ["field"]}})
+
+        _, errors = validator({"filter": {}})
+        assert errors == [{"param": "filter.field", "error": "is required"}]
+
+    def test_long_values_are_truncated(self):
+        _, errors = _validator({"count": {"type": "integer"}})({"count": "x" * 500})
+        assert len(errors[0]["error"]) < 80
+
+    def test_format_argument_errors(self):
+        message = format_argument_errors("files_read", [{"param": "path", "error": "is required"}])
+        assert '"tool": "files_read"' in message
+        assert '"param": "path"' in message
+
+
+class TestJsonSchemaDecorator:
+    """Test that json_schema compiles a validator for the decorated tool."""
+
+    def test_validator_is_attached(self):
+        @json_schema("Fetch a page.", {"url": {"type": "string", "required": True},
+                                       "timeout": {"type": "number"}})
+        async def fetch(**kwargs):
+            return kwargs
+
+        args, errors = fetch.validator({"url": "https://example.com", "timeout": "2.5"})
+        assert errors == []
+        assert args["timeout"] == 2.5
+        assert fetch.validator({})[1] == [{"param": "url", "error": "is required"}]
+
+    def test_tool_without_parameters(self):
+        @json_schema("Ping.", None)
+        async def ping(**kwargs):
+            return "pong"
+
+        assert ping.validator({"tool_context": {}}) == ({"tool_context": {}}, [])
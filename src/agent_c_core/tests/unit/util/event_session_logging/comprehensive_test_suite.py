@@ -174,6 +174,7 @@ async def test_gateway_core_functionality():
         assert result == True, "Gateway should process events successfully"
 
         # Verify local logging
+        await logger.flush()
         session_dir = Path(temp_dir) / "gateway_test"
         assert session_dir.exists(), "Session directory should be created"
 
@@ -253,6 +254,7 @@ async def test_error_isolation():
         assert result == True, "Local logging should succeed despite transport failure"
 
         # Verify local logging worked
+        await logger.flush()
         session_dir = Path(temp_dir) / "error_isolation_test"
         assert session_dir.exists(), "Session directory should be created"
 
@@ -330,6 +332,7 @@ async def test_event_model_integration():
             assert result == True, f"Should process {event.__class__.__name__} successfully"
 
         # Verify all events were logged
+        await logger.flush()
         session_dir = Path(temp_dir) / "integration_test"
         assert session_dir.exists(), "Session directory should be created"
 
@@ -383,6 +386,7 @@ async def test_agent_compatibility():
         assert received_events[0] == event, "Callback should receive correct event"
 
         # Verify local logging
+        await logger.flush()
         session_dir = Path(temp_dir) / "agent_compat_test"
         assert session_dir.exists(), "Local logging should still work"
 
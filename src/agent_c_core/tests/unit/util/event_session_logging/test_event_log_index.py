@@ -0,0 +1,127 @@
+"""
+Tests for the sidecar event log index.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_c.util.event_session_logger import EventSessionLogger
+from agent_c.util.event_log_index import EventLogIndex
+from agent_c.util.event_log_segments import SegmentPolicy, seal_closed_segments
+
+
+async def _log_interactions(logger, session_id, count, deltas=5):
+    for number in range(count):
+        interaction_id = f"interaction-{number}"
+        await logger({"type": "interaction", "session_id": session_id, "started": True, "id": interaction_id})
+        for index in range(deltas):
+            await logger({"type": "text_delta", "session_id": session_id, "content": f"{number}.{index}"})
+        await logger({"type": "tool_call", "session_id": session_id, "tool_calls": [{"name": f"tool_{number}"}]})
+        await logger({"type": "interaction", "session_id": session_id, "started": False, "id": interaction_id})
+
+
+class TestLoggerIndexing:
+    """Test the index EventSessionLogger maintains as it writes."""
+
+    @pytest.mark.asyncio
+    async def test_index_tracks_events_and_interactions(self, tmp_path):
+        logger = EventSessionLogger(log_base_dir=tmp_path)
+        await _log_interactions(logger, "s1", 3)
+        await logger.flush()
+
+        with EventLogIndex(tmp_path / "s1") as index:
+            assert index.count() == 24
+            assert index.count(event_types=["tool_call"]) == 3
+            assert index.summary()["event_types"]["text_delta"] == 15
+
+            interactions = index.interactions()
+            assert [row["interaction_id"] for row in interactions] == ["interaction-0", "interaction-1", "interaction-2"]
+            assert all(row["event_count"] == 8 for row in interactions)
+
+            rows = index.query(interaction_id="interaction-1", event_types=["text_delta"])
+            assert [entry["event"]["content"] for entry in index.read(rows)] == [f"1.{i}" for i in range(5)]
+        await logger.close()
+
+    @pytest.mark.asyncio
+    async def test_index_reads_across_sealed_segments(self, tmp_path):
+        logger = EventSessionLogger(log_base_dir=tmp_path, segment_policy=SegmentPolicy(max_segment_bytes=1500))
+        await _log_interactions(logger, "s1", 6)
+        await logger.close()
+
+        with EventLogIndex(tmp_path / "s1") as index:
+            assert index.catch_up() == 0
+            rows = index.query(event_types=["tool_call"])
+            names = [entry["event"]["tool_calls"][0]["name"] for entry in index.read(rows)]
+            assert names == [f"tool_{n}" for n in range(6)]
+
+            page = index.query(event_types=["text_delta"], limit=4, offset=8)
+            assert [entry["event"]["content"] for entry in index.read(page)] == ["1.3", "1.4", "2.0", "2.1"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_durable_writes_get_their_own_offsets(self, tmp_path):
+        logger = EventSessionLogger(log_base_dir=tmp_path, durability="durable")
+        await asyncio.gather(*(logger({"type": "text_delta", "session_id": "s1", "content": f"délta {i}"})
+                               for i in range(20)))
+        await logger.close()
+
+        with EventLogIndex(tmp_path / "s1") as index:
+            rows = index.query(event_types=["text_delta"])
+            assert len({row["offset"] for row in rows}) == 20
+            assert sorted(entry["event"]["content"] for entry in index.read(rows)) == sorted(f"délta {i}" for i in range(20))
+
+    @pytest.mark.asyncio
+    async def test_indexing_can_be_disabled(self, tmp_path):
+        logger = EventSessionLogger(log_base_dir=tmp_path, enable_index=False)
+        await _log_interactions(logger, "s1", 1)
+        await logger.close()
+        assert not (tmp_path / "s1" / EventLogIndex.FILE_NAME).exists()
+
+
+class TestCatchUp:
+    """Test indexing logs the logger did not index."""
+
+    def _write_log(self, path, interactions):
+        when = datetime.now()
+        with open(path, "w", encoding="utf-8") as f:
+            for number in range(interactions):
+                for event in ({"type": "interaction", "started": True, "id": f"i{number}"},
+                              {"type": "text_delta", "content": str(number)},
+                              {"type": "interaction", "started": False, "id": f"i{number}"}):
+                    when += timedelta(seconds=1)
+                    f.write(json.dumps({"timestamp": when.isoformat(), "event": event}) + "\n")
+
+    def test_legacy_logs_are_indexed(self, tmp_path):
+        self._write_log(tmp_path / "20240101_000000.jsonl", 2)
+        seal_closed_segments(tmp_path, SegmentPolicy())
+        self._write_log(tmp_path / "20240102_000000.jsonl", 1)
+
+        with EventLogIndex(tmp_path) as index:
+            assert index.catch_up() == 9
+            assert index.catch_up() == 0
+            assert len(index.interactions()) == 2  # i0 appears in both files
+            assert index.count(interaction_id="i1") == 3
+
+    def test_partial_tail_is_indexed_later(self, tmp_path):
+        path = tmp_path / "a.jsonl"
+        self._write_log(path, 1)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2024-01-01T00:00:00", "event": {"type": "text_')
+
+        with EventLogIndex(tmp_path) as index:
+            assert index.catch_up() == 3
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('delta"}}\n')
+            assert index.catch_up() == 1
+            assert index.count(event_types=["text_delta"]) == 2
+
+    def test_removed_segments_are_forgotten(self, tmp_path):
+        self._write_log(tmp_path / "a.jsonl", 1)
+        self._write_log(tmp_path / "b.jsonl", 1)
+        with EventLogIndex(tmp_path) as index:
+            index.catch_up()
+            (tmp_path / "a.jsonl").unlink()
+            index.catch_up()
+            assert index.count() == 3
@@ -0,0 +1,115 @@
+"""
+Tests for seekable, paced replay of session event logs.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_c.util.event_session_logger import EventSessionLogger
+from agent_c.util.event_log_replay import EventLogReplay
+from agent_c.util.event_log_segments import SegmentPolicy
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    async def record():
+        logger = EventSessionLogger(log_base_dir=tmp_path, segment_policy=SegmentPolicy(max_segment_bytes=2000))
+        for number in range(5):
+            interaction_id = f"interaction-{number}"
+            await logger({"type": "interaction", "session_id": "s1", "started": True, "id": interaction_id})
+            for index in range(10):
+                await logger({"type": "text_delta", "session_id": "s1", "content": f"{number}.{index}"})
+            await logger({"type": "interaction", "session_id": "s1", "started": False, "id": interaction_id})
+        await logger.close()
+
+    asyncio.run(record())
+    return tmp_path / "s1"
+
+
+async def _collect(replay, limit=None):
+    events = []
+    async for entry in replay:
+        events.append(entry["event"])
+        if limit is not None and len(events) >= limit:
+            break
+    return events
+
+
+@pytest.mark.asyncio
+async def test_full_replay_across_sealed_segments(session_dir):
+    replay = EventLogReplay(session_dir, page_size=7)
+    events = await _collect(replay)
+
+    assert len(events) == 60
+    assert replay.status().status == "completed"
+    assert replay.status().current_index == 60
+
+
+@pytest.mark.asyncio
+async def test_start_at_interaction_with_type_filter(session_dir):
+    replay = EventLogReplay(session_dir, event_types=["text_delta"], start_interaction="interaction-3")
+    contents = [event["content"] for event in await _collect(replay)]
+
+    assert contents == [f"{number}.{index}" for number in (3, 4) for index in range(10)]
+    assert replay.status().total_events == 50
+
+
+@pytest.mark.asyncio
+async def test_seek_while_playing(session_dir):
+    replay = EventLogReplay(session_dir, event_types=["text_delta"], page_size=4)
+    seen = []
+    async for entry in replay:
+        seen.append(entry["event"]["content"])
+        if seen == ["0.0", "0.1"]:
+            replay.seek(interaction_id="interaction-4")
+
+    assert seen[:3] == ["0.0", "0.1", "4.0"]
+    assert len(seen) == 12
+
+
+@pytest.mark.asyncio
+async def test_pause_resume_and_stop(session_dir):
+    replay = EventLogReplay(session_dir)
+    received = []
+
+    async def consume():
+        async for entry in replay:
+            received.append(entry)
+            await asyncio.sleep(0)  # Stand-in for sending to the client
+
+    task = asyncio.create_task(consume())
+    while not received:
+        await asyncio.sleep(0)
+    replay.pause()
+    await asyncio.sleep(0.05)
+    paused_at = len(received)
+    await asyncio.sleep(0.05)
+    assert len(received) == paused_at
+    assert replay.status().status == "paused"
+
+    replay.stop()
+    await asyncio.wait_for(task, timeout=1)
+    assert replay.status().status == "stopped"
+    assert len(received) < 60
+
+
+@pytest.mark.asyncio
+async def test_real_time_pacing_is_scaled_and_capped(tmp_path):
+    logger = EventSessionLogger(log_base_dir=tmp_path)
+    for index in range(3):
+        await logger({"type": "text_delta", "session_id": "s1", "content": str(index)})
+        await asyncio.sleep(0.1)
+    await logger.close()
+
+    started = time.monotonic()
+    await _collect(EventLogReplay(tmp_path / "s1", real_time=True, speed_factor=4.0))
+    scaled = time.monotonic() - started
+
+    started = time.monotonic()
+    await _collect(EventLogReplay(tmp_path / "s1", real_time=True, max_gap_seconds=0.01))
+    capped = time.monotonic() - started
+
+    assert 0.04 <= scaled < 0.2
+    assert capped < 0.1
@@ -0,0 +1,130 @@
+"""
+Tests for segmented, compressed session event logs.
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_c.util.event_session_logger import EventSessionLogger
+from agent_c.util.event_log_segments import (
+    SegmentPolicy, SegmentManifest, SegmentCompression, apply_retention, iter_session_events,
+    seal_closed_segments, session_segment_files, summarize_session
+)
+
+
+def _write_segment(path, count, start=0, when=None):
+    when = when or datetime.now()
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(start, start + count):
+            entry = {"timestamp": (when + timedelta(seconds=index)).isoformat(),
+                     "event": {"type": "text_delta", "content": "token " * 20 + str(index)}}
+            f.write(json.dumps(entry) + "\n")
+
+
+class TestSealing:
+    """Test sealing, manifests and reading across segments."""
+
+    def test_sealed_segments_are_compressed_and_listed(self, tmp_path):
+        _write_segment(tmp_path / "20250101_000000.jsonl", 200)
+        _write_segment(tmp_path / "20250101_010000.jsonl", 50, start=200)
+
+        sealed = seal_closed_segments(tmp_path, SegmentPolicy(), exclude=[tmp_path / "20250101_010000.jsonl"])
+
+        assert [info.file for info in sealed] == ["20250101_000000.jsonl.gz"]
+        assert sealed[0].events == 200
+        assert sealed[0].stored_bytes * 10 < sealed[0].raw_bytes
+        assert not (tmp_path / "20250101_000000.jsonl").exists()
+        with gzip.open(tmp_path / "20250101_000000.jsonl.gz", "rt") as f:
+            assert len(f.readlines()) == 200
+
+        manifest = SegmentManifest.load(tmp_path)
+        assert manifest.files() == ["20250101_000000.jsonl.gz"]
+        assert manifest.segments[0].first_timestamp < manifest.segments[0].last_timestamp
+
+    def test_readers_span_sealed_and_active_segments(self, tmp_path):
+        _write_segment(tmp_path / "a.jsonl", 10)
+        seal_closed_segments(tmp_path, SegmentPolicy())
+        _write_segment(tmp_path / "b.jsonl", 5, start=10)
+
+        assert [path.name for path in session_segment_files(tmp_path)] == ["a.jsonl.gz", "b.jsonl"]
+        contents = [entry["event"]["content"] for entry in iter_session_events(tmp_path)]
+        assert [int(content.split()[-1]) for content in contents] == list(range(15))
+
+        summary = summarize_session(tmp_path)
+        assert summary["events"] == 15
+        assert summary["files"] == ["a.jsonl.gz", "b.jsonl"]
+
+    def test_uncompressed_policy(self, tmp_path):
+        _write_segment(tmp_path / "a.jsonl", 3)
+        sealed = seal_closed_segments(tmp_path, SegmentPolicy(compression=SegmentCompression.NONE))
+        assert sealed[0].file == "a.jsonl"
+        assert len(list(iter_session_events(tmp_path))) == 3
+
+
+class TestRetention:
+    """Test removal of old sealed segments."""
+
+    def _sealed_session(self, tmp_path, count, when=None):
+        for index in range(count):
+            _write_segment(tmp_path / f"{index:02d}.jsonl", 5, when=when)
+        seal_closed_segments(tmp_path, SegmentPolicy())
+
+    def test_max_segments_keeps_newest(self, tmp_path):
+        self._sealed_session(tmp_path, 4)
+        removed = apply_retention(tmp_path, SegmentPolicy(retention_max_segments=2))
+        assert removed == ["00.jsonl.gz", "01.jsonl.gz"]
+        assert SegmentManifest.load(tmp_path).files() == ["02.jsonl.gz", "03.jsonl.gz"]
+        assert not (tmp_path / "00.jsonl.gz").exists()
+
+    def test_max_age(self, tmp_path):
+        self._sealed_session(tmp_path, 2, when=datetime.now() - timedelta(days=10))
+        assert len(apply_retention(tmp_path, SegmentPolicy(retention_max_age_days=30))) == 0
+        assert len(apply_retention(tmp_path, SegmentPolicy(retention_max_age_days=7))) == 2
+
+    def test_max_bytes(self, tmp_path):
+        self._sealed_session(tmp_path, 3)
+        segment_size = SegmentManifest.load(tmp_path).segments[0].stored_bytes
+        apply_retention(tmp_path, SegmentPolicy(retention_max_bytes=segment_size * 2 + 10))
+        assert len(SegmentManifest.load(tmp_path).segments) == 2
+
+
+class TestLoggerRotation:
+    """Test EventSessionLogger rotating and sealing segments."""
+
+    @pytest.mark.asyncio
+    async def test_segments_rotate_by_size_and_seal_on_close(self, tmp_path):
+        logger = EventSessionLogger(log_base_dir=tmp_path, segment_policy=SegmentPolicy(max_segment_bytes=2000))
+
+        for index in range(100):
+            await logger({"type": "text_delta", "session_id": "s1", "content": f"token {index}"})
+        await logger.flush()
+
+        session_dir = tmp_path / "s1"
+        manifest = SegmentManifest.load(session_dir)
+        assert len(manifest.segments) > 1
+        assert len(list(session_dir.glob("*.jsonl"))) == 1
+
+        await logger.close()
+
+        assert not list(session_dir.glob("*.jsonl"))
+        events = [entry["event"]["content"] for entry in iter_session_events(session_dir)]
+        assert events == [f"token {index}" for index in range(100)]
+        assert summarize_session(session_dir)["events"] == 100
+
+    @pytest.mark.asyncio
+    async def test_retention_applies_during_rotation(self, tmp_path):
+        policy = SegmentPolicy(max_segment_bytes=1000, retention_max_segments=2, seal_on_close=False)
+        logger = EventSessionLogger(log_base_dir=tmp_path, segment_policy=policy)
+
+        for index in range(200):
+            await logger({"type": "text_delta", "session_id": "s1", "content": f"token {index}"})
+        await logger.close()
+
+        session_dir = tmp_path / "s1"
+        assert len(SegmentManifest.load(session_dir).segments) == 2
+        events = [entry["event"]["content"] for entry in iter_session_events(session_dir)]
+        assert events[-1] == "token 199"
+        assert len(events) < 200
@@ -0,0 +1,173 @@
+"""
+Tests for the batching HTTPTransport against a local stub server.
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from agent_c.util.transports import HTTPTransport, NullTransport, RetryTransport
+
+
+class _StubServer:
+    """Records posted batches, failing the first `fail_first` requests with a 503"""
+
+    def __init__(self, fail_first: int = 0):
+        self.batches = []
+        self.connections = set()
+        self.fail_first = fail_first
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                with stub._lock:
+                    stub.connections.add(self.client_address)
+                    failing = stub.fail_first > 0
+                    if failing:
+                        stub.fail_first -= 1
+                    else:
+                        stub.batches.append({"encoding": self.headers.get("Content-Encoding"),
+                                             "authorization": self.headers.get("Authorization"),
+                                             "events": [json.loads(line) for line in body.splitlines()]})
+                self.send_response(503 if failing else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/events"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def events(self):
+        return [entry for batch in self.batches for entry in batch["events"]]
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = _StubServer()
+    yield server
+    server.stop()
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_by_count(stub_server):
+    transport = HTTPTransport(stub_server.url, max_batch_events=100, max_batch_delay=60)
+    await transport.connect()
+
+    for index in range(250):
+        assert await transport.send({"type": "text_delta", "index": index}, {"source": "test"})
+    assert len(stub_server.batches) == 2
+
+    await transport.close()
+
+    assert [len(batch["events"]) for batch in stub_server.batches] == [100, 100, 50]
+    assert [entry["event"]["index"] for entry in stub_server.events] == list(range(250))
+    assert stub_server.events[0]["metadata"] == {"source": "test"}
+    assert stub_server.batches[0]["encoding"] == "gzip"
+    assert transport.metrics.total_sent == 250
+    assert transport.batches_sent == 3
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_by_bytes_and_time(stub_server):
+    transport = HTTPTransport(stub_server.url, max_batch_events=1000, max_batch_bytes=2000, max_batch_delay=0.05,
+                              compression=None)
+    await transport.connect()
+
+    for index in range(20):
+        await transport.send({"type": "text_delta", "content": "x" * 200})
+    assert len(stub_server.batches) == 2
+    assert stub_server.batches[0]["encoding"] is None
+
+    await transport.send({"type": "text_delta", "content": "late"})
+    await asyncio.sleep(0.3)
+    assert stub_server.events[-1]["event"]["content"] == "late"
+
+    await transport.close()
+    assert len(stub_server.events) == 21
+
+
+@pytest.mark.asyncio
+async def test_configured_headers_are_sent_with_an_injected_client(stub_server):
+    async with httpx.AsyncClient() as client:
+        transport = HTTPTransport(stub_server.url, headers={"Authorization": "Bearer sink-token"}, client=client,
+                                  max_batch_events=10, max_batch_delay=60)
+        await transport.connect()
+        for index in range(10):
+            await transport.send({"type": "text_delta", "index": index})
+        await transport.close()
+
+        assert not client.is_closed
+
+    assert [batch["authorization"] for batch in stub_server.batches] == ["Bearer sink-token"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_by_retry_transport():
+    server = _StubServer(fail_first=2)
+    try:
+        transport = RetryTransport(HTTPTransport(server.url, max_batch_events=10, max_batch_delay=60),
+                                   max_retries=3, base_delay=0.01)
+        await transport.connect()
+        for index in range(10):
+            await transport.send({"type": "text_delta", "index": index})
+        await transport.close()
+
+        assert len(server.batches) == 1
+        assert len(server.events) == 10
+        assert transport.metrics.total_sent == 10
+        assert transport.metrics.total_retries == 2
+    finally:
+        server.stop()
+
+
+@pytest.mark.asyncio
+async def test_undeliverable_batches_go_to_fallback():
+    server = _StubServer(fail_first=100)
+    fallback = NullTransport()
+    try:
+        transport = RetryTransport(HTTPTransport(server.url, max_batch_events=5, max_batch_delay=60),
+                                   max_retries=1, base_delay=0.01, fallback_transport=fallback)
+        await transport.connect()
+        for index in range(5):
+            await transport.send({"type": "text_delta", "index": index})
+
+        assert fallback.metrics.total_sent == 5
+        assert transport.metrics.total_failed == 5
+        await transport.close()
+    finally:
+        server.stop()
+
+
+@pytest.mark.asyncio
+async def test_throughput_uses_few_requests_and_connections(stub_server):
+    transport = HTTPTransport(stub_server.url, max_batch_events=500, max_batch_delay=60, max_connections=4)
+    await transport.connect()
+
+    count = 20_000
+    for index in range(count):
+        await transport.send({"type": "text_delta", "session_id": "s1", "content": f"token {index}"})
+    await transport.close()
+
+    assert len(stub_server.events) == count
+    assert len(stub_server.batches) == count // 500
+    assert len(stub_server.connections) <= 4
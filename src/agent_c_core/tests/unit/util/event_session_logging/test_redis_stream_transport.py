@@ -0,0 +1,120 @@
+"""
+Tests for the Redis Streams transport and consumer, run against fakeredis.
+"""
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from agent_c.util.transports import RedisStreamConsumer, RedisStreamTransport, RetryTransport
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis()
+
+
+async def _publish(client, count, **kwargs):
+    transport = RedisStreamTransport(client=client, **kwargs)
+    await transport.connect()
+    for index in range(count):
+        await transport.send({"type": "text_delta", "session_id": "s1", "content": f"token {index}"}, {"n": index})
+    await transport.close()
+    return transport
+
+
+class TestRedisStreamTransport:
+    """Test writing events to streams."""
+
+    @pytest.mark.asyncio
+    async def test_events_are_written_in_pipelined_batches(self, redis_client):
+        transport = await _publish(redis_client, 250, max_batch_events=100, max_batch_delay=60)
+
+        assert transport.batches_sent == 3
+        assert transport.metrics.total_sent == 250
+        entries = await redis_client.xrange("agent_c:events")
+        assert len(entries) == 250
+        _, fields = entries[0]
+        assert fields[b"type"] == b"text_delta"
+        assert fields[b"session_id"] == b"s1"
+
+    @pytest.mark.asyncio
+    async def test_streams_are_trimmed_and_keyed_by_session(self, redis_client):
+        await _publish(redis_client, 50, stream_key="events:{session_id}", max_len=20, approximate_trim=False,
+                       max_batch_events=10)
+        assert await redis_client.xlen("events:s1") == 20
+
+    @pytest.mark.asyncio
+    async def test_buffered_events_are_written_on_timer(self, redis_client):
+        transport = RedisStreamTransport(client=redis_client, max_batch_events=100, max_batch_delay=0.02)
+        await transport.connect()
+        await transport.send({"type": "text_delta", "content": "hello"})
+        await asyncio.sleep(0.2)
+        assert await redis_client.xlen("agent_c:events") == 1
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_works_under_retry_transport(self, redis_client):
+        transport = RetryTransport(RedisStreamTransport(client=redis_client, max_batch_events=5), base_delay=0.01)
+        await transport.connect()
+        for index in range(5):
+            await transport.send({"type": "text_delta", "content": str(index)})
+        assert transport.metrics.total_sent == 5
+        await transport.close()
+
+
+class TestRedisStreamConsumer:
+    """Test reading streams through consumer groups."""
+
+    @pytest.mark.asyncio
+    async def test_group_members_share_entries_and_ack(self, redis_client):
+        await _publish(redis_client, 10)
+        first = RedisStreamConsumer(redis_client, "agent_c:events", "indexer", "worker-1", count=6, block_ms=10)
+        second = RedisStreamConsumer(redis_client, "agent_c:events", "indexer", "worker-2", count=6, block_ms=10)
+
+        taken = await first.read()
+        rest = await second.read()
+        assert len(taken) == 6 and len(rest) == 4
+        assert taken[0].event["content"] == "token 0"
+        assert taken[0].payload["metadata"] == {"n": 0}
+        assert taken[0].type == "text_delta" and taken[0].session_id == "s1"
+
+        assert await first.ack(*taken) == 6
+        assert await first.pending_count() == 4
+
+    @pytest.mark.asyncio
+    async def test_stale_pending_entries_are_recovered(self, redis_client):
+        await _publish(redis_client, 5)
+        crashed = RedisStreamConsumer(redis_client, "agent_c:events", "indexer", "crashed", block_ms=10)
+        assert len(await crashed.read()) == 5
+
+        survivor = RedisStreamConsumer(redis_client, "agent_c:events", "indexer", "survivor", block_ms=10,
+                                       claim_idle_ms=10)
+        assert await survivor.recover(min_idle_ms=60_000) == []
+        await asyncio.sleep(0.05)
+        recovered = await survivor.recover()
+        assert [entry.event["content"] for entry in recovered] == [f"token {index}" for index in range(5)]
+
+        await survivor.ack(*recovered)
+        assert await survivor.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_iteration_recovers_then_reads(self, redis_client):
+        await _publish(redis_client, 3)
+        crashed = RedisStreamConsumer(redis_client, "agent_c:events", "indexer", "crashed", count=2, block_ms=10)
+        await crashed.read()
+        await _publish(redis_client, 2)
+
+        consumer = RedisStreamConsumer(redis_client, "agent_c:events", "indexer", "worker", block_ms=10,
+                                       claim_idle_ms=0)
+        seen = []
+        async for entry in consumer:
+            seen.append(entry.event["content"])
+            await consumer.ack(entry)
+            if len(seen) == 5:
+                consumer.stop()
+
+        assert sorted(seen) == ["token 0", "token 0", "token 1", "token 1", "token 2"]
+        assert await consumer.pending_count() == 0
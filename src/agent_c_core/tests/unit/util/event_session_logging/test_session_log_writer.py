@@ -0,0 +1,112 @@
+"""
+Tests for the buffered session log writer and its use by EventSessionLogger.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from agent_c.util.event_session_logger import EventSessionLogger
+from agent_c.util.session_log_writer import SessionLogWriter, DurabilityMode
+from agent_c.util.event_log_segments import iter_session_events
+
+
+def _lines(path: Path):
+    return path.read_text(encoding="utf-8").splitlines() if path.exists() else []
+
+
+@pytest.mark.asyncio
+async def test_lines_are_batched_until_flush(tmp_path):
+    writer = SessionLogWriter(batch_size=1000, flush_interval=60)
+    path = tmp_path / "session" / "log.jsonl"
+
+    for index in range(50):
+        await writer.write(path, f"line {index}\n")
+    await asyncio.sleep(0)
+
+    assert _lines(path) == []
+
+    await writer.flush()
+    assert _lines(path) == [f"line {index}" for index in range(50)]
+    assert writer.metrics.lines_written == 50
+    assert writer.metrics.batches_written == 1
+    assert writer.open_files == 1
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_size_and_interval_trigger_writes(tmp_path):
+    writer = SessionLogWriter(batch_size=10, flush_interval=0.05)
+    path = tmp_path / "log.jsonl"
+
+    for index in range(25):
+        await writer.write(path, f"{index}\n")
+    await asyncio.sleep(0.2)
+
+    assert len(_lines(path)) == 25
+    assert writer.metrics.batches_written >= 3
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_open_handles_are_bounded(tmp_path):
+    writer = SessionLogWriter(max_open_files=2, batch_size=1, flush_interval=0)
+    paths = [tmp_path / f"s{index}.jsonl" for index in range(4)]
+
+    for round_number in range(2):
+        for path in paths:
+            await writer.write(path, f"{round_number}\n")
+        await writer.flush()
+
+    assert writer.open_files == 2
+    assert writer.metrics.handles_evicted > 0
+    assert all(_lines(path) == ["0", "1"] for path in paths)
+    await writer.close()
+    assert writer.open_files == 0
+
+
+@pytest.mark.asyncio
+async def test_durable_writes_are_on_disk_when_write_returns(tmp_path):
+    writer = SessionLogWriter(durability=DurabilityMode.DURABLE, batch_size=1000, flush_interval=60)
+    path = tmp_path / "log.jsonl"
+
+    await writer.write(path, "committed ✓\n")
+
+    assert _lines(path) == ["committed ✓"]
+    summary = writer.metrics.summary()
+    assert summary["lines_written"] == 1
+    assert summary["bytes_written"] == path.stat().st_size
+    assert summary["write_latency_ms_max"] > 0
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_logger_uses_one_file_per_session_and_flushes_on_interaction_end(tmp_path):
+    logger = EventSessionLogger(log_base_dir=tmp_path, write_batch_size=1000, write_flush_interval=60)
+
+    for index in range(20):
+        await logger({"type": "text_delta", "session_id": "s1", "content": str(index)})
+    await logger({"type": "interaction", "session_id": "s1", "started": False})
+
+    files = list((tmp_path / "s1").glob("*.jsonl"))
+    assert len(files) == 1
+    entries = [json.loads(line) for line in _lines(files[0])]
+    assert [entry["event"].get("content") for entry in entries[:20]] == [str(index) for index in range(20)]
+    assert entries[-1]["event"]["type"] == "interaction"
+
+    metrics = logger.get_write_metrics()
+    assert metrics["lines_written"] == 21
+    assert metrics["open_files"] == 1
+    await logger.close()
+
+
+@pytest.mark.asyncio
+async def test_logger_close_writes_queued_lines(tmp_path):
+    logger = EventSessionLogger(log_base_dir=tmp_path, write_batch_size=1000, write_flush_interval=60)
+    await logger({"type": "text_delta", "session_id": "s2", "content": "tail"})
+
+    await logger.close()
+
+    assert [entry["event"]["content"] for entry in iter_session_events(tmp_path / "s2")] == ["tail"]
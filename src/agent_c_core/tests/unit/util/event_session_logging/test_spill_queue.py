@@ -0,0 +1,203 @@
+"""
+Tests for the on-disk spill queue and RetryTransport spilling through outages.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agent_c.util.spill_queue import SpillQueue
+from agent_c.util.transport_exceptions import TransportConnectionError
+from agent_c.util.transports import BatchingTransport, RetryTransport, TransportInterface, TransportState
+
+
+def _records(start, count):
+    return [{"spilled_at": time.time(), "event": {"index": index}, "metadata": {}} for index in range(start, start + count)]
+
+
+class TestSpillQueue:
+    """Test the segmented queue on its own."""
+
+    def test_fifo_across_segments(self, tmp_path):
+        queue = SpillQueue(tmp_path, max_segment_bytes=200)
+        assert queue.put(_records(0, 20)) == 20
+        assert len(list(tmp_path.glob("*.spill"))) > 3
+
+        seen = []
+        while len(queue):
+            batch = queue.peek(7)
+            seen.extend(record["event"]["index"] for record in batch.records)
+            queue.commit(batch)
+
+        assert seen == list(range(20))
+        assert len(list(tmp_path.glob("*.spill"))) == 1
+        assert queue.status().bytes == 0
+
+    def test_backlog_survives_reopening(self, tmp_path):
+        queue = SpillQueue(tmp_path, max_segment_bytes=200)
+        queue.put(_records(0, 10))
+        queue.commit(queue.peek(4))
+        queue.close()
+
+        reopened = SpillQueue(tmp_path, max_segment_bytes=200)
+        assert len(reopened) == 6
+        reopened.put(_records(10, 2))
+        assert [record["event"]["index"] for record in reopened.peek(100).records] == list(range(4, 12))
+
+    def test_full_queue_refuses_and_counts(self, tmp_path):
+        queue = SpillQueue(tmp_path, max_bytes=500)
+        accepted = queue.put(_records(0, 20))
+        status = queue.status()
+        assert 0 < accepted < 20
+        assert status.depth == accepted
+        assert status.dropped == 20 - accepted
+        assert status.bytes <= 500
+
+    def test_status_reports_age(self, tmp_path):
+        queue = SpillQueue(tmp_path)
+        assert queue.status().oldest_age_seconds is None
+        queue.put([{"spilled_at": time.time() - 30, "event": {}, "metadata": {}}])
+        assert queue.status().oldest_age_seconds >= 30
+
+
+class _Downstream(TransportInterface):
+    """Records events, failing every send while `down` is set"""
+
+    def __init__(self):
+        super().__init__("Downstream")
+        self.down = False
+        self.received = []
+
+    async def send(self, event, metadata=None):
+        if self.down:
+            raise TransportConnectionError("downstream is down")
+        self.received.append(event)
+        return True
+
+    async def connect(self):
+        self.state = TransportState.CONNECTED
+        return True
+
+    async def disconnect(self):
+        self.state = TransportState.DISCONNECTED
+
+    async def close(self):
+        self.state = TransportState.CLOSED
+
+
+class _BatchingDownstream(BatchingTransport):
+    def __init__(self):
+        super().__init__("BatchingDownstream", max_batch_events=10, max_batch_delay=60)
+        self.down = False
+        self.received = []
+
+    async def send_batch(self, batch):
+        if self.down:
+            raise TransportConnectionError("downstream is down")
+        self.received.extend(event for _, event, _ in batch)
+        return True
+
+    async def connect(self):
+        self.state = TransportState.CONNECTED
+        return True
+
+    async def disconnect(self):
+        await self.flush()
+        self.state = TransportState.DISCONNECTED
+
+    async def close(self):
+        await self.disconnect()
+        self.state = TransportState.CLOSED
+
+
+async def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+class TestRetryTransportSpilling:
+    """Test RetryTransport spilling to disk and draining."""
+
+    @pytest.mark.asyncio
+    async def test_outage_is_spilled_and_drained_in_order(self, tmp_path):
+        downstream = _Downstream()
+        # Failed drains wait base_delay, long enough that the outage can't open the circuit breaker
+        transport = RetryTransport(downstream, max_retries=0, base_delay=0.25, drain_interval=0.01,
+                                   spill_queue=SpillQueue(tmp_path))
+        await transport.connect()
+
+        await transport.send({"index": 0})
+        downstream.down = True
+        for index in range(1, 500):
+            assert await transport.send({"index": index})
+        assert transport.spill_status().depth == 499
+        assert transport.spill_status().oldest_age_seconds is not None
+
+        downstream.down = False
+        await transport.send({"index": 500})
+        # The drained batch is committed after it is delivered, so wait for both
+        await _wait_for(lambda: len(downstream.received) == 501 and transport.spill_status().depth == 0)
+
+        assert [event["index"] for event in downstream.received] == list(range(501))
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_batches_are_spilled_and_drained(self, tmp_path):
+        downstream = _BatchingDownstream()
+        transport = RetryTransport(downstream, max_retries=1, base_delay=0.01, drain_interval=0.01,
+                                   spill_queue=SpillQueue(tmp_path))
+        await transport.connect()
+
+        downstream.down = True
+        for index in range(95):
+            await transport.send({"index": index})
+        await downstream.flush()
+        assert transport.spill_status().depth == 95
+
+        downstream.down = False
+        await _wait_for(lambda: len(downstream.received) == 95)
+        assert [event["index"] for event in downstream.received] == list(range(95))
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_draining_is_rate_limited(self, tmp_path):
+        queue = SpillQueue(tmp_path)
+        queue.put(_records(0, 100))
+        downstream = _Downstream()
+        transport = RetryTransport(downstream, spill_queue=queue, drain_rate=500, drain_batch_size=10,
+                                   drain_interval=0.01)
+
+        started = time.monotonic()
+        await transport.connect()
+        await _wait_for(lambda: len(downstream.received) == 100)
+
+        assert time.monotonic() - started >= 0.15
+        await transport.close()
+
+    @pytest.mark.asyncio
+    async def test_spills_are_written_off_the_event_loop_in_batches(self, tmp_path):
+        queue = SpillQueue(tmp_path)
+        writes = []
+        put_many = queue.put_many
+
+        def recording_put_many(groups):
+            writes.append(threading.get_ident())
+            return put_many(groups)
+
+        queue.put_many = recording_put_many
+        downstream = _Downstream()
+        downstream.down = True
+        transport = RetryTransport(downstream, max_retries=0, spill_queue=queue)
+
+        results = await asyncio.gather(*[transport.send({"index": index}) for index in range(50)])
+
+        assert all(results)
+        assert threading.get_ident() not in writes
+        assert len(writes) < 50
+        assert [record["event"]["index"] for record in queue.peek(100).records] == list(range(50))
+        await transport.close()
@@ -14,6 +14,7 @@ import tempfile
 import time
 from datetime import datetime
 from pathlib import Path
+import httpx
 import pytest
 
 # Add the src directory to Python path for imports
@@ -251,23 +252,33 @@ async def test_file_transport(temp_dir, sample_message_event):
 
 @pytest.mark.asyncio
 async def test_http_transport():
-    """Test HTTPTransport functionality (placeholder implementation)"""
-    transport = HTTPTransport("https://example.com/webhook")
+    """Test HTTPTransport functionality (see test_http_transport.py for batching)"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    transport = HTTPTransport("https://example.com/webhook", max_batch_events=1, client=client)
 
     # Test connection
     await transport.connect()
     assert transport.is_connected == True, "Should be connected"
 
-    # Test send (placeholder implementation)
+    # Test send
     event = {"type": "http_test", "data": "HTTP transport test"}
     result = await transport.send(event, {"endpoint": "webhook"})
-    assert result == True, "Send should succeed (placeholder)"
+    assert result == True, "Send should succeed"
+    assert len(requests) == 1, "Should post the event"
+    assert json.loads(requests[0].content)["event"] == event, "Should post the event data"
 
     # Test metrics
     assert transport.metrics.total_sent == 1, "Should track sent events"
     assert transport.metrics.success_rate == 100.0, "Should have success"
 
     await transport.close()
+    await client.aclose()
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,158 @@
+"""
+Tests for the structured logging fast path
+
+These tests validate that disabled log calls skip the processor chain, that
+lazy arguments are only built for emitted records, that SampledLogger passes
+one call in N through, and that bound loggers are cached.
+"""
+
+import logging
+from unittest.mock import MagicMock
+
+import structlog
+
+from agent_c.util.structured_logging import FastBoundLogger, SampledLogger, lazy, get_bound_logger
+from agent_c.util.structured_logging.factory import StructuredLoggerFactory
+
+
+def _stdlib_logger(name: str, level: int) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    logger.handlers = [logging.NullHandler()]
+    return logger
+
+
+class TestFastBoundLogger:
+    """Test cases for FastBoundLogger."""
+
+    def _logger(self, level: int):
+        seen = []
+
+        def record(logger, method_name, event_dict):
+            seen.append((method_name, event_dict["event"]))
+            return event_dict["event"]
+
+        logger = structlog.wrap_logger(_stdlib_logger(f"test.fast_path.{level}", level),
+                                       wrapper_class=FastBoundLogger, processors=[record])
+        return logger.bind(session_id="s1"), seen
+
+    def test_disabled_level_skips_processors(self):
+        logger, seen = self._logger(logging.INFO)
+
+        logger.debug("hidden")
+        logger.info("shown")
+
+        assert seen == [("info", "shown")]
+
+    def test_enabled_level_runs_processors(self):
+        logger, seen = self._logger(logging.DEBUG)
+
+        logger.debug("shown")
+
+        assert seen == [("debug", "shown")]
+
+    def test_factory_configures_fast_bound_logger(self):
+        logger = StructuredLoggerFactory().get_logger("test.fast_path.factory")
+
+        assert isinstance(logger.bind(), FastBoundLogger)
+
+    def test_records_keep_the_callers_location(self):
+        records = []
+        logger = StructuredLoggerFactory().get_logger("test.fast_path.caller")
+        logger.info("creates the stdlib logger")
+        stdlib_logger = _stdlib_logger("test.fast_path.caller", logging.INFO)
+        stdlib_logger.handlers[0].handle = records.append
+
+        def log_from_here():
+            logger.info("located")
+            return log_from_here.__code__.co_firstlineno + 1
+
+        line = log_from_here()
+
+        assert records[0].funcName == "log_from_here"
+        assert records[0].lineno == line
+        assert records[0].pathname == __file__
+
+
+class TestLazy:
+    """Test cases for lazy log arguments."""
+
+    def test_not_evaluated_when_disabled(self):
+        logger = _stdlib_logger("test.fast_path.lazy_off", logging.INFO)
+        func = MagicMock(return_value="value")
+
+        logger.debug("Payload: %s", lazy(func, 1, key=2))
+
+        func.assert_not_called()
+
+    def test_evaluated_when_formatted(self):
+        func = MagicMock(return_value="value")
+
+        assert "Payload: %s" % lazy(func, 1, key=2) == "Payload: value"
+        func.assert_called_once_with(1, key=2)
+
+
+class TestSampledLogger:
+    """Test cases for SampledLogger."""
+
+    def test_logs_one_call_in_every(self):
+        inner = MagicMock()
+        inner.isEnabledFor.return_value = True
+        sampled = SampledLogger(inner, every=10)
+
+        for i in range(25):
+            sampled.debug("event %d", i)
+
+        assert [c.args[1] for c in inner.debug.call_args_list] == [0, 10, 20]
+
+    def test_levels_are_sampled_separately(self):
+        inner = MagicMock()
+        inner.isEnabledFor.return_value = True
+        sampled = SampledLogger(inner, every=10)
+
+        sampled.debug("first debug")
+        sampled.info("first info")
+
+        inner.debug.assert_called_once_with("first debug")
+        inner.info.assert_called_once_with("first info")
+
+    def test_disabled_calls_are_not_counted(self):
+        inner = MagicMock()
+        inner.isEnabledFor.side_effect = lambda level: level >= logging.INFO
+        sampled = SampledLogger(inner, every=10)
+
+        for _ in range(5):
+            sampled.debug("hidden")
+        sampled.info("shown")
+
+        inner.debug.assert_not_called()
+        inner.info.assert_called_once_with("shown")
+
+
+class TestBoundLoggerCache:
+    """Test cases for get_bound_logger."""
+
+    def test_same_context_returns_cached_logger(self):
+        first = get_bound_logger("test.fast_path.bound", session_id="s1")
+
+        assert get_bound_logger("test.fast_path.bound", session_id="s1") is first
+        assert get_bound_logger("test.fast_path.bound", session_id="s2") is not first
+
+    def test_cache_is_bounded(self):
+        factory = StructuredLoggerFactory()
+        factory._bound_logger_cache_size = 2
+        try:
+            for i in range(5):
+                factory.get_bound_logger("test.fast_path.bounded", n=i)
+            assert len(factory._bound_logger_cache) == 2
+        finally:
+            del factory._bound_logger_cache_size
+
+    def test_unhashable_context_is_not_cached(self):
+        factory = StructuredLoggerFactory()
+
+        logger = factory.get_bound_logger("test.fast_path.unhashable", tags=["a"])
+
+        assert hasattr(logger, "info")
+        assert len(factory._bound_logger_cache) == 0
@@ -0,0 +1,161 @@
+"""
+Tests for the content-addressed blob store and moving message payloads in and out of it.
+"""
+
+import base64
+import json
+import os
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from agent_c.agents.base import BaseAgent
+from agent_c.chat.session_manager import ChatSessionManager
+from agent_c.config.saved_chat import SavedChatLoader
+from agent_c.models.chat_history.chat_session import ChatSession
+from agent_c.util.blob_store import BlobMissingError, BlobStore, externalize_blobs, inflate_blobs
+
+PNG = base64.b64encode(b"\x89PNG" + os.urandom(8 * 1024)).decode("ascii")
+WAV = base64.b64encode(b"RIFF" + b"\x00" * 16 * 1024).decode("ascii")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(blob_dir=str(tmp_path / "blobs"))
+
+
+def _claude_image(data: str = PNG) -> dict:
+    return {"role": "user", "content": [{"type": "text", "text": "what is this?"},
+                                        {"type": "image", "source": {"type": "base64", "media_type": "image/png",
+                                                                     "data": data}}]}
+
+
+def _gpt_message() -> dict:
+    return {"role": "user", "content": [{"type": "image_url", "image_url": {"url": f"data:image/png;base64,{PNG}"}},
+                                        {"type": "input_audio", "input_audio": {"data": WAV, "format": "wav"}}]}
+
+
+def test_round_trip_restores_every_payload_shape(store):
+    messages = [{"role": "user", "content": "hello"}, _claude_image(), _gpt_message()]
+
+    stored = externalize_blobs(messages, store)
+
+    assert stored[0] is messages[0]
+    assert PNG not in json.dumps(stored) and WAV not in json.dumps(stored)
+    assert stored[1]["content"][1]["source"]["type"] == "blob"
+    assert inflate_blobs(stored, store) == messages
+    assert messages[1]["content"][1]["source"]["data"] == PNG
+
+
+def test_identical_payloads_are_stored_once(store):
+    externalize_blobs([_claude_image()], store)
+    externalize_blobs([_claude_image(PNG[:])], store)
+
+    stats = store.stats()
+    assert stats.stored == 1
+    assert stats.deduplicated == 1
+
+
+def test_small_and_invalid_payloads_stay_inline(store):
+    messages = [_claude_image("aGVsbG8="), _claude_image("not base64!" * 1024)]
+
+    assert externalize_blobs(messages, store) is messages
+
+
+def test_compressible_blobs_are_compressed(store):
+    digest = store.put_base64(WAV)
+
+    path = store.blob_dir / digest[:2] / (digest + BlobStore.COMPRESSED_SUFFIX)
+    assert path.stat().st_size < len(WAV) / 10
+    store._memory.clear()
+    store._memory_digests.clear()
+    assert store.get_base64(digest) == WAV
+
+
+def test_collect_keeps_referenced_and_recent_blobs(tmp_path):
+    store = BlobStore(blob_dir=str(tmp_path / "blobs"), memory_limit=0)
+    kept = store.put(b"kept" * 2048)
+    dropped = store.put(b"dropped" * 2048)
+    recent = store.put(b"recent" * 2048)
+    old = time.time() - 7200
+    for digest in (kept, dropped):
+        os.utime(store._existing_path(digest), (old, old))
+
+    assert store.collect({kept}, min_age=3600) == 1
+
+    assert kept in store and recent in store and dropped not in store
+    with pytest.raises(BlobMissingError):
+        store.get(dropped)
+
+
+@pytest.mark.asyncio
+async def test_saved_sessions_reference_blobs(tmp_path):
+    loader = SavedChatLoader(str(tmp_path))
+    loader._update_index_entry = AsyncMock()
+    session = ChatSession(session_id="blob-session", messages=[_claude_image(), _claude_image()])
+
+    await loader.save_session(session)
+
+    snapshot = loader._get_user_folder("admin") / "blob-session.json"
+    assert snapshot.stat().st_size < len(PNG)
+    assert loader.blob_store.stats().stored == 1
+    loader.release_session("blob-session", "admin")
+    loaded = loader.load_session_id("blob-session", "admin")
+    assert inflate_blobs(loaded.messages, loader.blob_store)[1] == _claude_image()
+
+    old = time.time() - 7200
+    digest = session.messages[0]["content"][1]["source"]["sha256"]
+    os.utime(loader.blob_store._existing_path(digest), (old, old))
+    loader.blob_store._memory.clear()
+    assert await loader.collect_blobs() == 0
+    await loader.delete_session("blob-session", "admin")
+    assert await loader.collect_blobs() == 0
+
+
+def test_lenient_inflate_leaves_missing_references(store):
+    stored = externalize_blobs([_claude_image()], store)
+    for path in store.blob_dir.rglob("*"):
+        if path.is_file():
+            path.unlink()
+    store._memory.clear()
+
+    with pytest.raises(BlobMissingError):
+        inflate_blobs(stored, store)
+    assert inflate_blobs(stored, store, strict=False) == stored
+
+
+@pytest.mark.asyncio
+async def test_session_manager_sends_payloads_not_references(tmp_path):
+    loader = SavedChatLoader(str(tmp_path))
+    loader._update_index_entry = AsyncMock()
+    manager = ChatSessionManager(loader=loader)
+    await loader.save_session(ChatSession(session_id="blob-session", messages=[_claude_image()]))
+    loader.release_session("blob-session", "admin")
+
+    saved = loader.load_session_id("blob-session", "admin").messages
+    assert saved[0]["content"][1]["source"]["type"] == "blob"
+    assert await manager.inflate_messages(saved) == [_claude_image()]
+    assert manager.get_session_messages("blob-session", "admin") == [_claude_image()]
+
+
+class RecordingAgent(BaseAgent):
+    async def chat(self, **kwargs):
+        return await self._construct_message_array(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_agent_inflates_for_the_provider_and_raises_references(store):
+    events = []
+
+    async def callback(event):
+        events.append(event)
+
+    agent = RecordingAgent(model_name="mock-model", blob_store=store, streaming_callback=callback)
+    history = externalize_blobs([_claude_image()], store)
+
+    payload = await agent.chat(messages=history, user_message="and now?")
+    await agent._raise_history_event(payload, session_id="s", role="assistant", streaming_callback=callback)
+
+    assert payload[0] == _claude_image()
+    assert events[0].messages[0] == history[0]
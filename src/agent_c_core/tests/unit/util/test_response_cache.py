@@ -0,0 +1,193 @@
+"""
+Tests for the deterministic response cache and its use by one-shots.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from agent_c.agents.base import BaseAgent
+from agent_c.one_shots.structured import StructuredOneshot
+from agent_c.prompting.prompt_builder import PromptBuilder
+from agent_c.prompting.prompt_section import PromptSection, property_bag_item
+from agent_c.util.response_cache import ResponseCache
+
+
+class Classification(BaseModel):
+    label: str
+    confidence: float
+
+
+class CountingAgent(BaseAgent):
+    """Agent whose chat() records calls instead of hitting a provider."""
+
+    def __init__(self, **kwargs):
+        super().__init__(model_name="mock-model", **kwargs)
+        self.calls = 0
+
+    async def chat(self, **kwargs):
+        self.calls += 1
+        _, prompt_context = await self._render_contexts(**kwargs)
+        self.system_prompt = prompt_context["system_prompt"]
+        return [{"role": "user", "content": kwargs["user_message"]},
+                {"role": "assistant", "content": f"reply {self.calls}"}]
+
+
+class ClockSection(PromptSection):
+    """Section whose time changes with every render."""
+    volatile_properties = frozenset({"timestamp"})
+
+    def __init__(self, **data):
+        super().__init__(name="Clock", template="Now: ${timestamp}, mood: ${mood}", **data)
+        self._renders = 0
+
+    @property
+    def renders(self) -> int:
+        return self._renders
+
+    @property_bag_item
+    async def timestamp(self) -> str:
+        self._renders += 1
+        return f"tick {self._renders}"
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / "responses"), ttl=60)
+    yield cache
+    cache.close()
+
+
+class TestResponseCache:
+    """Test key building, storage and statistics."""
+
+    def test_key_is_independent_of_dict_order(self):
+        first = ResponseCache.make_key(model="m", params={"a": 1, "b": 2}, messages=[{"role": "user", "content": "x"}])
+        second = ResponseCache.make_key(messages=[{"content": "x", "role": "user"}], params={"b": 2, "a": 1}, model="m")
+        assert first == second
+        assert first != ResponseCache.make_key(model="m", params={"a": 1, "b": 3}, messages=[{"role": "user", "content": "x"}])
+
+    def test_key_includes_output_schema(self):
+        class Other(BaseModel):
+            label: str
+
+        assert ResponseCache.make_key(response_format=Classification) != ResponseCache.make_key(response_format=Other)
+
+    def test_stats_track_hits_and_misses(self, response_cache):
+        assert response_cache.get("missing") is None
+        response_cache.set("key", {"value": 1})
+        assert response_cache.get("key") == {"value": 1}
+
+        stats = response_cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+        response_cache.clear()
+        assert response_cache.stats().entries == 0
+        assert response_cache.stats().hits == 0
+
+    def test_should_use(self):
+        assert ResponseCache.should_use(None, 0)
+        assert not ResponseCache.should_use(None, 0.7)
+        assert ResponseCache.should_use(True, 0.7)
+        assert not ResponseCache.should_use(False, 0)
+
+
+class TestOneShotCaching:
+    """Test BaseAgent.one_shot with a response cache."""
+
+    def test_identical_deterministic_requests_are_served_from_cache(self, response_cache):
+        agent = CountingAgent(response_cache=response_cache)
+
+        first = asyncio.run(agent.one_shot(user_message="classify this", prompt="sys", temperature=0))
+        second = asyncio.run(agent.one_shot(user_message="classify this", prompt="sys", temperature=0))
+        third = asyncio.run(agent.one_shot(user_message="classify that", prompt="sys", temperature=0))
+
+        assert agent.calls == 2
+        assert first == second
+        assert third[-1]["content"] == "reply 2"
+
+    def test_system_prompt_is_part_of_the_key(self, response_cache):
+        agent = CountingAgent(response_cache=response_cache)
+
+        asyncio.run(agent.one_shot(user_message="hello", prompt="be terse", temperature=0))
+        asyncio.run(agent.one_shot(user_message="hello", prompt="be verbose", temperature=0))
+
+        assert agent.calls == 2
+
+    def test_volatile_prompt_properties_are_not_part_of_the_key(self, response_cache):
+        section = ClockSection()
+        agent = CountingAgent(response_cache=response_cache, prompt_builder=PromptBuilder(sections=[section]))
+
+        first = asyncio.run(agent.one_shot(user_message="hello", prompt_metadata={"mood": "calm"}, temperature=0))
+        assert section.renders == 1
+        assert "Now: tick 1, mood: calm" in agent.system_prompt
+
+        second = asyncio.run(agent.one_shot(user_message="hello", prompt_metadata={"mood": "calm"}, temperature=0))
+        asyncio.run(agent.one_shot(user_message="hello", prompt_metadata={"mood": "wary"}, temperature=0))
+
+        assert agent.calls == 2
+        assert first == second
+
+    def test_thinking_budget_may_be_none(self, response_cache):
+        agent = CountingAgent(response_cache=response_cache)
+
+        for _ in range(2):
+            asyncio.run(agent.one_shot(user_message="hello", prompt="sys", temperature=0, budget_tokens=None))
+        assert agent.calls == 1
+
+    def test_sampled_and_tool_requests_are_not_cached_by_default(self, response_cache):
+        agent = CountingAgent(response_cache=response_cache)
+
+        for _ in range(2):
+            asyncio.run(agent.one_shot(user_message="hello", prompt="sys", temperature=0.8))
+            asyncio.run(agent.one_shot(user_message="hello", prompt="sys", temperature=0, toolsets=["ThinkTools"]))
+        assert agent.calls == 4
+
+        for _ in range(2):
+            asyncio.run(agent.one_shot(user_message="hello", prompt="sys", temperature=0.8, use_response_cache=True))
+        assert agent.calls == 5
+
+    def test_no_cache_configured(self):
+        agent = CountingAgent()
+        asyncio.run(agent.one_shot(user_message="hello", temperature=0))
+        asyncio.run(agent.one_shot(user_message="hello", temperature=0))
+        assert agent.calls == 2
+
+
+class TestStructuredOneshotCaching:
+    """Test StructuredOneshot against a mock OpenAI client."""
+
+    @staticmethod
+    def _client(result: Classification):
+        completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=result, content=result.model_dump_json()))])
+        client = SimpleNamespace(beta=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=AsyncMock(return_value=completion)))))
+        return client, client.beta.chat.completions.parse
+
+    def test_repeated_runs_hit_the_cache(self, response_cache):
+        client, parse = self._client(Classification(label="invoice", confidence=0.9))
+        oneshot = StructuredOneshot(open_ai_client=client, prompt="Classify the document.",
+                                    output_model=Classification, response_cache=response_cache)
+
+        first = asyncio.run(oneshot.run("document text"))
+        second = asyncio.run(oneshot.run("document text"))
+
+        assert parse.await_count == 1
+        assert isinstance(second, Classification)
+        assert second == first
+
+    def test_cached_results_are_revalidated(self, response_cache):
+        client, parse = self._client(Classification(label="invoice", confidence=0.4))
+        oneshot = StructuredOneshot(open_ai_client=client, prompt="Classify the document.",
+                                    output_model=Classification, response_cache=response_cache)
+        asyncio.run(oneshot.run("document text"))
+
+        strict = StructuredOneshot(open_ai_client=client, prompt="Classify the document.",
+                                   output_model=Classification, response_cache=response_cache, max_retries=1,
+                                   validation_callback=lambda attempt, result, state: (result.confidence > 0.5, "low confidence"))
+        asyncio.run(strict.run("document text"))
+
+        assert parse.await_count == 2
@@ -123,6 +123,7 @@ class AgentAssistToolBase(Toolset):
             await self.tool_chest.initialize_toolsets(agent.tools)
             tool_params = self.tool_chest.get_inference_data(agent.tools, agent_runtime.tool_format)
             tool_params["toolsets"] = agent.tools
+            tool_params["tool_index"] = agent.tool_index
 
         agent_params = agent.agent_params.model_dump(exclude_none=True)
         if "model_name" not in agent_params: